@@ -0,0 +1,9 @@
+"""Benchmarks of the multigait algorithms and pipeline.
+
+- ``benchmarks.synthetic``: deterministic generator of synthetic multi-day wrist recordings with ground truth.
+- ``benchmarks.suite``: scaling benchmarks of all algorithms and the full pipeline (1 h, 24 h and 7 d recordings),
+  machine-readable result files and the comparison of two result files.
+  Run ``python -m benchmarks --help`` for the command line interface.
+- ``benchmarks.bench_*``: comparisons of individual optimisations against the previous implementation
+  (e.g. ``python -m benchmarks.bench_hickey_gsd``).
+"""
@@ -0,0 +1,98 @@
+"""Command line interface of the benchmark suite.
+
+Usage::
+
+    python -m benchmarks list
+    python -m benchmarks run --sizes 1h 24h --output results.json
+    python -m benchmarks run --sizes 7d --benchmarks "^gsd\\." --repeats 1 --output gsd_7d.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.1
+
+``compare`` exits with code 1, if any benchmark got slower by more than the threshold (or failed).
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+from benchmarks.suite import BENCHMARKS, SIZES, compare_results, load_results, run_suite, save_results
+
+
+def _print_progress(result: dict) -> None:
+    if result["error"] is not None:
+        print(f"{result['benchmark']:>42} [{result['size']:>3}]: failed\n{result['error']}", flush=True)
+        return
+    print(
+        f"{result['benchmark']:>42} [{result['size']:>3}]: {result['min_s']:9.3f} s "
+        f"({result['samples_per_s']:.3g} samples/s)",
+        flush=True,
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    results = run_suite(
+        args.sizes, args.benchmarks, repeats=args.repeats, seed=args.seed, progress=_print_progress
+    )
+    save_results(results, args.output)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    comparison = compare_results(
+        load_results(args.baseline),
+        load_results(args.candidate),
+        threshold=args.threshold,
+        metric=args.metric,
+        min_time_s=args.min_time_s,
+    )
+    with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200):
+        print(comparison)
+    failed = comparison[comparison["status"].isin(["regression", "error"])]
+    if not failed.empty:
+        print(f"\n{len(failed)} regression(s) above {args.threshold:.0%}:")
+        for (benchmark, size), row in failed.iterrows():
+            print(f"  {benchmark} [{size}]: {row['status']} (ratio {row['ratio']:.2f})")
+        return 1
+    return 0
+
+
+def _list(_: argparse.Namespace) -> int:
+    print("Benchmarks:")
+    for name in BENCHMARKS:
+        print(f"  {name}")
+    print("Sizes:")
+    for size, days in SIZES.items():
+        print(f"  {size} ({days:g} days)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run the benchmarks and write the results to a JSON file.")
+    run.add_argument("--sizes", nargs="+", default=["1h"], choices=list(SIZES), help="Recording lengths.")
+    run.add_argument("--benchmarks", nargs="+", default=None, help="Regular expressions selecting benchmarks.")
+    run.add_argument("--repeats", type=int, default=3, help="Timed repetitions per benchmark (min is compared).")
+    run.add_argument("--seed", type=int, default=0, help="Seed of the synthetic recordings.")
+    run.add_argument("--output", required=True, help="Path of the JSON result file.")
+    run.set_defaults(func=_run)
+
+    compare = subparsers.add_parser("compare", help="Compare two result files and flag regressions.")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Relative slow-down flagged as regression.")
+    compare.add_argument("--metric", choices=["min_s", "median_s"], default="min_s")
+    compare.add_argument("--min-time-s", type=float, default=0.001, help="Ignore benchmarks faster than this.")
+    compare.set_defaults(func=_compare)
+
+    list_parser = subparsers.add_parser("list", help="List all benchmarks and sizes.")
+    list_parser.set_defaults(func=_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
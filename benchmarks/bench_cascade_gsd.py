@@ -0,0 +1,87 @@
+"""Benchmark of the cascade mode (activity pre-screen before the detector) against full runs of the GSD algorithms.
+
+For each detector, the run time of a full run and of ``CascadeGSD`` is reported together with the fraction of the
+recording skipped by the pre-screen and the recall of the cascade relative to the full run:
+
+- sample recall: fraction of the samples within gait sequences of the full run that are within gait sequences of the
+  cascade.
+- GS recall: fraction of the gait sequences of the full run that overlap with a gait sequence of the cascade.
+
+Usage::
+
+    python -m benchmarks.bench_cascade_gsd --hours 24
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import ACC_COLS, SyntheticRecordingConfig, generate_recording
+from multigait.GSD.base_gsd import BaseGsdDetector
+from multigait.GSD.cascade_gsd import CascadeGSD
+from multigait.GSD.GSD1 import IonescuGSD
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.GSD.GSD5 import KerenGSD
+from multigait.utils.array import intersect_intervals
+
+DETECTORS = {
+    "KerenGSD": KerenGSD(),
+    "IonescuGSD": IonescuGSD(),
+    "HickeyGSD": HickeyGSD(),
+}
+
+
+def _gs_array(gs_list: pd.DataFrame) -> np.ndarray:
+    return gs_list[["start", "end"]].to_numpy(dtype="int64").reshape(-1, 2)
+
+
+def recall(reference: pd.DataFrame, candidate: pd.DataFrame) -> tuple[float, float]:
+    """Sample and GS recall of ``candidate`` relative to ``reference`` (both 1 if the reference is empty)."""
+    reference, candidate = _gs_array(reference), _gs_array(candidate)
+    if len(reference) == 0:
+        return 1.0, 1.0
+    overlap = intersect_intervals(reference, candidate)
+    sample_recall = (overlap[:, 1] - overlap[:, 0]).sum() / (reference[:, 1] - reference[:, 0]).sum()
+    # A gait sequence of the reference is found, if any overlap starts within it
+    first_overlap = np.searchsorted(overlap[:, 0], reference[:, 0], side="left")
+    n_found = np.count_nonzero(first_overlap < np.searchsorted(overlap[:, 0], reference[:, 1], side="left"))
+    return float(sample_recall), n_found / len(reference)
+
+
+def _time_detect(detector: BaseGsdDetector, data: pd.DataFrame) -> tuple[float, BaseGsdDetector]:
+    start = time.perf_counter()
+    result = detector.clone().detect(data, sampling_rate_hz=100)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24, help="Length of the synthetic recording in hours.")
+    parser.add_argument("--detectors", nargs="+", default=list(DETECTORS), choices=list(DETECTORS))
+    parser.add_argument("--padding-s", type=float, default=10.0, help="Context around the active windows.")
+    parser.add_argument("--min-gap-s", type=float, default=300.0, help="Minimal length of skipped gaps.")
+    parser.add_argument("--std-threshold", type=float, default=0.1, help="Pre-screen threshold in m/s^2.")
+    args = parser.parse_args()
+
+    data = generate_recording(SyntheticRecordingConfig(days=args.hours / 24)).data[ACC_COLS]
+    print(f"Synthetic recording: {args.hours} h, {len(data)} samples at 100 Hz")
+    for name in args.detectors:
+        detector = DETECTORS[name]
+        cascade = CascadeGSD(
+            detector, padding_s=args.padding_s, min_gap_s=args.min_gap_s, std_threshold_ms2=args.std_threshold
+        )
+        full_s, full = _time_detect(detector, data)
+        cascade_s, cascade = _time_detect(cascade, data)
+        sample_recall, gs_recall = recall(full.gs_list_, cascade.gs_list_)
+        print(
+            f"{name:>12}: full {full_s:8.2f} s | cascade {cascade_s:7.2f} s | "
+            f"speed-up {full_s / cascade_s:5.1f}x | skipped {cascade.skipped_fraction_:6.1%} | "
+            f"sample recall {sample_recall:6.1%} | GS recall {gs_recall:6.1%} "
+            f"({len(full.gs_list_)} GSs, identical: {full.gs_list_.equals(cascade.gs_list_)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
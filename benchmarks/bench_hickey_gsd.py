@@ -0,0 +1,135 @@
+"""Benchmark of the vectorised HickeyGSD against the previous loop-based window statistics and bout merging.
+
+The previous implementation is reproduced by temporarily replacing the vectorised helpers of ``multigait.GSD.GSD2``
+with the original loop versions.
+Note, that the original per-window threshold loop is not part of the legacy code path, so the measured speed-up is a
+lower bound.
+
+Usage::
+
+    python -m benchmarks.bench_hickey_gsd --hours 24
+"""
+
+import argparse
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import multigait.GSD.GSD2 as gsd2
+from multigait.GSD.GSD2 import HickeyGSD
+
+
+def synthetic_wrist_data(hours: float, sampling_rate_hz: float = 100, seed: int = 0) -> pd.DataFrame:
+    """Alternating walking-like and resting periods with random durations."""
+    rng = np.random.default_rng(seed)
+    n_samples = int(hours * 3600 * sampling_rate_hz)
+    acc = np.empty((n_samples, 3))
+    i = 0
+    walking = False
+    while i < n_samples:
+        duration = int(rng.uniform(5, 120) * sampling_rate_hz)
+        t = np.arange(min(duration, n_samples - i)) / sampling_rate_hz
+        segment = np.tile([9.81, 0.0, 0.0], (len(t), 1)) + rng.normal(0, 0.05, (len(t), 3))
+        if walking:
+            step_freq = rng.uniform(1.6, 2.0)
+            amplitude = rng.uniform(1, 4)
+            # Step frequency, stride frequency and a higher harmonic resembling the heel strike impacts
+            segment += amplitude * np.column_stack(
+                [
+                    np.sin(2 * np.pi * step_freq * t) + 0.5 * np.sin(2 * np.pi * 4 * step_freq * t),
+                    np.sin(np.pi * step_freq * t),
+                    np.cos(2 * np.pi * step_freq * t) + 0.5 * np.cos(2 * np.pi * 4 * step_freq * t),
+                ]
+            )
+        acc[i : i + len(t)] = segment
+        i += len(t)
+        walking = not walking
+    return pd.DataFrame(acc, columns=["acc_is", "acc_ml", "acc_pa"])
+
+
+def _window_std_loop(signal, window_size):
+    win_num = len(signal) // window_size
+    std_acc = np.zeros(win_num)
+    for i in range(win_num):
+        std_acc[i] = np.std(signal[i * window_size : (i + 1) * window_size])
+    return std_acc
+
+
+def _window_mean_loop(signal, window_size):
+    win_num = len(signal) // window_size
+    mean_acc = np.zeros(win_num)
+    for i in range(win_num):
+        mean_acc[i] = np.mean(signal[i * window_size : (i + 1) * window_size])
+    return mean_acc
+
+
+def _merge_active_windows_loop(active, max_break, min_length):
+    active = np.asarray(active).copy()
+    active[0] = 0
+    active[-1] = 0
+    diffs = np.diff(active)
+    starts = np.where(diffs == 1)[0] + 1
+    stops = np.where(diffs == -1)[0] + 1
+    between = np.zeros(len(starts), dtype=int)
+    between[0] = starts[0]
+    for i in range(1, len(starts)):
+        between[i] = abs(stops[i - 1] - starts[i])
+    bouts = np.column_stack((starts, stops, between, stops - starts))
+    i = 1
+    while i < len(bouts):
+        if bouts[i, 2] <= max_break:
+            bouts[i - 1, 1] = bouts[i, 1]
+            bouts[i - 1, 3] += bouts[i, 3]
+            bouts = np.delete(bouts, i, axis=0)
+        else:
+            i += 1
+    bouts = bouts[bouts[:, 3] > min_length]
+    return np.delete(bouts, [2, 3], axis=1)
+
+
+@contextmanager
+def legacy_implementation():
+    originals = (gsd2._window_std, gsd2._window_mean, gsd2._merge_active_windows)
+    gsd2._window_std, gsd2._window_mean, gsd2._merge_active_windows = (
+        _window_std_loop,
+        _window_mean_loop,
+        _merge_active_windows_loop,
+    )
+    try:
+        yield
+    finally:
+        gsd2._window_std, gsd2._window_mean, gsd2._merge_active_windows = originals
+
+
+def _time_detect(detector: HickeyGSD, data: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    gs_list = detector.clone().detect(data, sampling_rate_hz=100).gs_list_
+    return time.perf_counter() - start, gs_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24, help="Length of the synthetic recording in hours.")
+    parser.add_argument(
+        "--versions", nargs="+", default=["wrist", "improved_lowback", "original_lowback"], help="HickeyGSD versions."
+    )
+    args = parser.parse_args()
+
+    data = synthetic_wrist_data(args.hours)
+    print(f"Synthetic recording: {args.hours} h, {len(data)} samples at 100 Hz")
+    for version in args.versions:
+        detector = HickeyGSD(version=version)
+        vectorised_s, vectorised_gs = _time_detect(detector, data)
+        with legacy_implementation():
+            legacy_s, legacy_gs = _time_detect(detector, data)
+        identical = legacy_gs.equals(vectorised_gs)
+        print(
+            f"{version:>17}: legacy {legacy_s:8.2f} s | vectorised {vectorised_s:6.2f} s | "
+            f"speed-up {legacy_s / vectorised_s:6.1f}x | {len(vectorised_gs)} GSs | identical: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
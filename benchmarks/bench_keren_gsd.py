@@ -0,0 +1,76 @@
+"""Benchmark of the batched KerenGSD spectral and regularity checks against the previous per-window SciPy calls.
+
+The previous implementation is reproduced by temporarily replacing the batched helpers of ``multigait.GSD.GSD5``
+with loops over the per-window reference functions.
+
+Usage::
+
+    python -m benchmarks.bench_keren_gsd --hours 24
+"""
+
+import argparse
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import multigait.GSD.GSD5 as gsd5
+from benchmarks.bench_hickey_gsd import synthetic_wrist_data
+from multigait.GSD.GSD5 import KerenGSD
+
+
+def _dominant_frequencies_loop(windows, sampling_rate_hz):
+    return np.array([gsd5._dominant_frequency_single(window, sampling_rate_hz) for window in windows])
+
+
+def _autocorrelation_regularity_loop(windows, threshold=0.15):
+    return np.array([gsd5._regularity_single(window, threshold) for window in windows], dtype=int)
+
+
+@contextmanager
+def legacy_implementation():
+    originals = (gsd5.dominant_frequencies, gsd5.autocorrelation_regularity)
+    gsd5.dominant_frequencies, gsd5.autocorrelation_regularity = (
+        _dominant_frequencies_loop,
+        _autocorrelation_regularity_loop,
+    )
+    try:
+        yield
+    finally:
+        gsd5.dominant_frequencies, gsd5.autocorrelation_regularity = originals
+
+
+def _time_detect(detector: KerenGSD, data: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    gs_list = detector.clone().detect(data, sampling_rate_hz=100).gs_list_
+    return time.perf_counter() - start, gs_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24, help="Length of the synthetic recording in hours.")
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        default=["original_wrist", "improved_wrist", "adaptive_wrist"],
+        help="KerenGSD versions.",
+    )
+    args = parser.parse_args()
+
+    data = synthetic_wrist_data(args.hours)
+    print(f"Synthetic recording: {args.hours} h, {len(data)} samples at 100 Hz")
+    for version in args.versions:
+        detector = KerenGSD(version=version)
+        batched_s, batched_gs = _time_detect(detector, data)
+        with legacy_implementation():
+            legacy_s, legacy_gs = _time_detect(detector, data)
+        identical = legacy_gs.equals(batched_gs)
+        print(
+            f"{version:>15}: legacy {legacy_s:8.2f} s | batched {batched_s:6.2f} s | "
+            f"speed-up {legacy_s / batched_s:6.1f}x | {len(batched_gs)} GSs | identical: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
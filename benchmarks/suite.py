@@ -0,0 +1,425 @@
+"""Scaling benchmarks of all algorithms and the full pipeline on synthetic recordings.
+
+Every benchmark is a factory that receives a :class:`~benchmarks.synthetic.SyntheticRecording`, prepares the inputs
+(not timed) and returns the function that is timed.
+Per-GS algorithms (ICD, cadence, stride length) are run on every ground truth walking bout of the recording, so their
+run time scales with the amount of walking like inside the pipeline.
+"""
+
+import inspect
+import json
+import platform
+import re
+import subprocess
+import time
+import traceback
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticRecording, SyntheticRecordingConfig, generate_recording
+from multigait.aggregation._generic_aggregator import GenericAggregator
+from multigait.CAD.cad import Cadence
+from multigait.GSD.GSD1 import IonescuGSD
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.GSD.GSD3 import KheirkhahanGSD
+from multigait.GSD.GSD4 import MacLeanGSD
+from multigait.GSD.GSD5 import KerenGSD
+from multigait.ICD.ICD1 import MicoAmigoIC
+from multigait.ICD.ICD2 import McCamleyIC
+from multigait.ICD.ICD3 import PhamIC
+from multigait.ICD.ICD4 import ZijlstraIC
+from multigait.ICD.ICD5 import DucharmeIC
+from multigait.ICD.ICD6 import GuIC
+from multigait.pipeline.multimobility_pipeline import MultimobilityPipelineSuggested
+from multigait.pipeline.utils._var_dmos import within_wb_var
+from multigait.pipeline.utils._wb_assembly import WbAssembly
+from multigait.pipeline.utils.alpha import compute_alpha_mle
+from multigait.SL.SL1 import WeinbergSL
+from multigait.SL.SL2 import KimSL
+from multigait.SL.SL3 import BylemansSL
+
+RESULT_FORMAT_VERSION = 1
+
+# Recording lengths in days
+SIZES = {"1h": 1 / 24, "24h": 1.0, "7d": 7.0}
+
+PARTICIPANT_METADATA = {"height_m": 1.75, "foot_length_cm": 26.0}
+
+BenchmarkFactory = Callable[[SyntheticRecording], Callable[[], Any]]
+
+
+def _detect_kwargs(method: Callable, sampling_rate_hz: float) -> dict[str, float]:
+    # Some detectors take the sampling rate as parameter of the constructor instead of the action method
+    if "sampling_rate_hz" in inspect.signature(method).parameters:
+        return {"sampling_rate_hz": sampling_rate_hz}
+    return {}
+
+
+def _gsd(algorithm: Any) -> BenchmarkFactory:
+    def factory(recording: SyntheticRecording) -> Callable[[], Any]:
+        kwargs = _detect_kwargs(algorithm.detect, recording.sampling_rate_hz)
+        return lambda: algorithm.clone().detect(recording.data, **kwargs).gs_list_
+
+    return factory
+
+
+def _bout_data(recording: SyntheticRecording) -> list[tuple[pd.DataFrame, pd.DataFrame]]:
+    """Data and initial contacts (relative to the bout start) of every ground truth walking bout."""
+    bouts = []
+    for wb_id, start, end in recording.walking_bouts[["start", "end"]].itertuples():
+        ics = recording.initial_contacts.loc[wb_id] - start
+        bouts.append((recording.data.iloc[start:end].reset_index(drop=True), ics))
+    return bouts
+
+
+def _icd(algorithm: Any) -> BenchmarkFactory:
+    def factory(recording: SyntheticRecording) -> Callable[[], Any]:
+        bouts = _bout_data(recording)
+        kwargs = _detect_kwargs(algorithm.detect, recording.sampling_rate_hz)
+        return lambda: [algorithm.clone().detect(data, **kwargs).ic_list_ for data, _ in bouts]
+
+    return factory
+
+
+def _icd_batch(algorithm: Any) -> BenchmarkFactory:
+    def factory(recording: SyntheticRecording) -> Callable[[], Any]:
+        signal = recording.data.to_numpy()
+        gs_bounds = recording.walking_bouts[["start", "end"]].to_numpy()
+        return lambda: algorithm.clone().detect_batch(
+            signal, gs_bounds, sampling_rate_hz=recording.sampling_rate_hz
+        ).ic_positions_
+
+    return factory
+
+
+def _per_bout_calculator(algorithm: Any, result_attribute: str) -> BenchmarkFactory:
+    def factory(recording: SyntheticRecording) -> Callable[[], Any]:
+        bouts = _bout_data(recording)
+        kwargs = {"sampling_rate_hz": recording.sampling_rate_hz, **PARTICIPANT_METADATA}
+        return lambda: [
+            getattr(algorithm.clone().calculate(data, initial_contacts=ics, **kwargs), result_attribute)
+            for data, ics in bouts
+        ]
+
+    return factory
+
+
+def ground_truth_strides(recording: SyntheticRecording) -> pd.DataFrame:
+    """
+    Stride list in the format of the stride selection output based on the ground truth initial contacts.
+
+    Every walking bout of the recording is treated as a gait sequence and every initial contact starts a stride that
+    ends at the next initial contact.
+    """
+    ics = recording.initial_contacts
+    if ics.empty:
+        return pd.DataFrame(
+            columns=["original_gs_id", "start", "end", "stride_duration_s", *recording.walking_bouts.columns[2:]],
+            index=pd.Index([], name="s_id"),
+        )
+    wb_ids = ics.index.get_level_values("wb_id").to_numpy()
+    step_ids = ics.index.get_level_values("step_id").to_numpy()
+    starts = ics["ic"].to_numpy()
+    is_stride = np.append(wb_ids[1:] == wb_ids[:-1], False)
+    ends = np.append(starts[1:], 0)
+    truth = recording.walking_bouts.loc[wb_ids[is_stride]]
+    strides = pd.DataFrame(
+        {
+            "original_gs_id": wb_ids[is_stride],
+            "start": starts[is_stride],
+            "end": ends[is_stride],
+            "stride_duration_s": (ends[is_stride] - starts[is_stride]) / recording.sampling_rate_hz,
+            "cadence_spm": truth["cadence_spm"].to_numpy(),
+            "stride_length_m": truth["stride_length_m"].to_numpy(),
+            "walking_speed_mps": truth["walking_speed_mps"].to_numpy(),
+        },
+        index=pd.Index([f"{w}_{s}" for w, s in zip(wb_ids[is_stride], step_ids[is_stride])], name="s_id"),
+    )
+    return strides
+
+
+def _raw_initial_contacts(recording: SyntheticRecording) -> pd.DataFrame:
+    return recording.initial_contacts.rename_axis(index={"wb_id": "gs_id"})
+
+
+def _wba(recording: SyntheticRecording) -> Callable[[], Any]:
+    strides = ground_truth_strides(recording)
+    raw_ics = _raw_initial_contacts(recording)
+    return lambda: WbAssembly().assemble(
+        strides, raw_initial_contacts=raw_ics, sampling_rate_hz=recording.sampling_rate_hz
+    ).wb_meta_parameters_
+
+
+def ground_truth_per_wb_dmos(recording: SyntheticRecording) -> pd.DataFrame:
+    """Per-WB DMOs (including within WB variability and the measurement date) from the ground truth strides."""
+    params = ["stride_duration_s", "cadence_spm", "stride_length_m", "walking_speed_mps"]
+    wba = WbAssembly().assemble(
+        ground_truth_strides(recording),
+        raw_initial_contacts=_raw_initial_contacts(recording),
+        sampling_rate_hz=recording.sampling_rate_hz,
+    )
+    per_stride = wba.annotated_stride_list_
+    per_wb = pd.concat(
+        [
+            wba.wb_meta_parameters_,
+            per_stride.reindex(columns=params).groupby(["wb_id"]).mean(),
+            within_wb_var(per_stride),
+        ],
+        axis=1,
+    ).drop(columns="rule_obj", errors="ignore")
+    samples_per_day = 24 * 3600 * recording.sampling_rate_hz
+    per_wb["measurement_date"] = (per_wb["start"] // samples_per_day).astype(int)
+    return compute_alpha_mle(per_wb)
+
+
+def _aggregation(recording: SyntheticRecording) -> Callable[[], Any]:
+    per_wb = ground_truth_per_wb_dmos(recording)
+    aggregator = GenericAggregator(**GenericAggregator.PredefinedParameters.multimobility_data_date)
+    return lambda: aggregator.clone().aggregate(per_wb).aggregated_data_
+
+
+class _Datapoint:
+    """Minimal datapoint interface required by the pipeline."""
+
+    participant_metadata = PARTICIPANT_METADATA
+    recording_metadata: dict[str, Any] = {}
+    group_label = "synthetic"
+
+    def __init__(self, recording: SyntheticRecording) -> None:
+        self.data_ss = recording.data
+        self.sampling_rate_hz = recording.sampling_rate_hz
+
+
+def _pipeline(recording: SyntheticRecording) -> Callable[[], Any]:
+    datapoint = _Datapoint(recording)
+    return lambda: MultimobilityPipelineSuggested().run(datapoint).per_wb_parameters_
+
+
+BENCHMARKS: dict[str, BenchmarkFactory] = {
+    "gsd.IonescuGSD": _gsd(IonescuGSD()),
+    "gsd.HickeyGSD": _gsd(HickeyGSD()),
+    "gsd.KheirkhahanGSD": _gsd(KheirkhahanGSD()),
+    "gsd.MacLeanGSD": _gsd(MacLeanGSD()),
+    "gsd.KerenGSD": _gsd(KerenGSD()),
+    "icd.MicoAmigoIC": _icd(MicoAmigoIC()),
+    "icd.McCamleyIC": _icd(McCamleyIC()),
+    "icd.PhamIC": _icd(PhamIC()),
+    "icd.ZijlstraIC": _icd(ZijlstraIC()),
+    "icd.DucharmeIC": _icd(DucharmeIC()),
+    "icd.GuIC": _icd(GuIC()),
+    "icd_batch.McCamleyIC": _icd_batch(McCamleyIC()),
+    "icd_batch.PhamIC": _icd_batch(PhamIC()),
+    "icd_batch.ZijlstraIC": _icd_batch(ZijlstraIC()),
+    "icd_batch.DucharmeIC": _icd_batch(DucharmeIC()),
+    "cad.Cadence": _per_bout_calculator(Cadence(), "cadence_per_sec_"),
+    "sl.WeinbergSL": _per_bout_calculator(WeinbergSL(), "stride_length_per_sec_"),
+    "sl.KimSL": _per_bout_calculator(KimSL(), "stride_length_per_sec_"),
+    "sl.BylemansSL": _per_bout_calculator(BylemansSL(), "stride_length_per_sec_"),
+    "wba.WbAssembly": _wba,
+    "aggregation.GenericAggregator": _aggregation,
+    "pipeline.MultimobilityPipelineSuggested": _pipeline,
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of a single benchmark on a single recording size."""
+
+    benchmark: str
+    size: str
+    n_samples: int
+    times_s: list[float]
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        valid = bool(self.times_s) and self.error is None
+        return {
+            "benchmark": self.benchmark,
+            "size": self.size,
+            "n_samples": self.n_samples,
+            "times_s": self.times_s,
+            "min_s": min(self.times_s) if valid else None,
+            "median_s": float(np.median(self.times_s)) if valid else None,
+            "samples_per_s": self.n_samples / min(self.times_s) if valid and min(self.times_s) > 0 else None,
+            "error": self.error,
+        }
+
+
+def select_benchmarks(patterns: Optional[Iterable[str]] = None) -> list[str]:
+    """Names of all benchmarks matching any of the regular expressions (all benchmarks, if None)."""
+    if not patterns:
+        return list(BENCHMARKS)
+    compiled = [re.compile(p) for p in patterns]
+    return [name for name in BENCHMARKS if any(p.search(name) for p in compiled)]
+
+
+def run_benchmark(name: str, recording: SyntheticRecording, size: str, repeats: int) -> BenchmarkResult:
+    """Prepare and time a single benchmark. Errors are recorded in the result instead of being raised."""
+    result = BenchmarkResult(benchmark=name, size=size, n_samples=len(recording.data), times_s=[])
+    try:
+        func = BENCHMARKS[name](recording)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            result.times_s.append(time.perf_counter() - start)
+    except Exception:  # noqa: BLE001
+        result.error = traceback.format_exc(limit=3)
+    return result
+
+
+def _environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def run_suite(
+    sizes: Iterable[str] = ("1h",),
+    benchmarks: Optional[Iterable[str]] = None,
+    *,
+    repeats: int = 3,
+    seed: int = 0,
+    days_override: Optional[dict[str, float]] = None,
+    progress: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Run the selected benchmarks on synthetic recordings of the selected sizes.
+
+    Parameters
+    ----------
+    sizes
+        Keys of ``SIZES``.
+    benchmarks
+        Regular expressions selecting the benchmarks by name. All benchmarks, if None.
+    repeats
+        Number of timed repetitions of every benchmark.
+    seed
+        Seed of the synthetic recordings.
+    days_override
+        Custom sizes (name -> days) in addition to ``SIZES``.
+    progress
+        Called with every result (as dict) directly after the benchmark finished.
+
+    Returns
+    -------
+    dict
+        The machine-readable results (see ``save_results``).
+    """
+    all_sizes = {**SIZES, **(days_override or {})}
+    names = select_benchmarks(benchmarks)
+    results = []
+    recordings = {}
+    for size in sizes:
+        if size not in all_sizes:
+            raise ValueError(f"Unknown size '{size}'. Valid sizes are {list(all_sizes)}.")
+        recording = generate_recording(SyntheticRecordingConfig(days=all_sizes[size], seed=seed))
+        recordings[size] = recording.metadata()
+        for name in names:
+            result = run_benchmark(name, recording, size, repeats).to_dict()
+            results.append(result)
+            if progress is not None:
+                progress(result)
+        del recording
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "environment": _environment(),
+        "recordings": recordings,
+        "results": results,
+    }
+
+
+def save_results(results: dict[str, Any], path: Union[str, Path]) -> None:
+    """Write the results of ``run_suite`` as JSON."""
+    Path(path).write_text(json.dumps(results, indent=2, default=str))
+
+
+def load_results(path: Union[str, Path]) -> pd.DataFrame:
+    """Load a result file as DataFrame indexed by benchmark and size."""
+    content = json.loads(Path(path).read_text())
+    if content.get("format_version") != RESULT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported result file format version {content.get('format_version')} in {path}.")
+    columns = ["benchmark", "size", "n_samples", "min_s", "median_s", "samples_per_s", "error"]
+    return pd.DataFrame(content["results"], columns=columns).set_index(["benchmark", "size"])
+
+
+def compare_results(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    *,
+    threshold: float = 0.1,
+    metric: str = "min_s",
+    min_time_s: float = 0.001,
+) -> pd.DataFrame:
+    """
+    Compare two result tables (see ``load_results``) and classify every benchmark.
+
+    Parameters
+    ----------
+    baseline, candidate
+        The results to compare.
+    threshold
+        Relative change of the run time above which a benchmark is flagged as regression (or improvement).
+    metric
+        The timing column to compare ("min_s" or "median_s").
+    min_time_s
+        Run times below this value (in both files) are considered as noise and never flagged.
+
+    Returns
+    -------
+    pd.DataFrame
+        Baseline and candidate time, their ratio and a ``status`` column ("regression", "improvement",
+        "unchanged", "error" or "missing").
+    """
+    joined = baseline[[metric, "error"]].join(
+        candidate[[metric, "error"]], how="outer", lsuffix="_baseline", rsuffix="_candidate"
+    )
+    base = joined[f"{metric}_baseline"].astype(float)
+    cand = joined[f"{metric}_candidate"].astype(float)
+    ratio = cand / base
+
+    status = pd.Series("unchanged", index=joined.index)
+    status[ratio > 1 + threshold] = "regression"
+    status[ratio < 1 / (1 + threshold)] = "improvement"
+    status[(base < min_time_s) & (cand < min_time_s)] = "unchanged"
+    status[joined["error_candidate"].notna() & joined["error_baseline"].isna()] = "error"
+    status[(base.isna() | cand.isna()) & (status != "error")] = "missing"
+    return pd.DataFrame(
+        {"baseline_s": base, "candidate_s": cand, "ratio": ratio, "status": status}, index=joined.index
+    )
+
+
+__all__ = [
+    "BENCHMARKS",
+    "SIZES",
+    "BenchmarkResult",
+    "compare_results",
+    "ground_truth_per_wb_dmos",
+    "ground_truth_strides",
+    "load_results",
+    "run_benchmark",
+    "run_suite",
+    "save_results",
+    "select_benchmarks",
+]
@@ -0,0 +1,294 @@
+"""Deterministic generator of synthetic multi-day wrist IMU recordings with known walking bouts.
+
+The signals are not meant to be physiologically exact.
+They provide the structures the algorithms react to (periods of rest with different arm orientations, non-walking arm
+movements and walking bouts with arm swing at the stride frequency and heel strike impacts at the step frequency) in
+realistic proportions, so that the run time of the algorithms scales like on real recordings.
+
+Every day is generated from its own random stream derived from the seed, so the data of a day does not depend on the
+total number of generated days.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+GRAVITY_MS2 = 9.81
+ACC_COLS = ["acc_is", "acc_ml", "acc_pa"]
+SECONDS_PER_DAY = 24 * 3600
+
+
+@dataclass(frozen=True)
+class SyntheticRecordingConfig:
+    """
+    Settings of the synthetic recording.
+
+    Parameters
+    ----------
+    days : float
+        Length of the recording in days (e.g. ``1 / 24`` for one hour).
+    sampling_rate_hz : float
+        Sampling rate of the generated signal.
+    awake_hours : tuple[float, float]
+        Hours after the start of every recorded day between which walking bouts and arm movements occur.
+        The default assumes that the recording starts when the participant wakes up, so that short recordings
+        (e.g. one hour) contain walking.
+    bouts_per_hour : float
+        Average number of walking bouts per awake hour.
+    bout_duration_median_s, bout_duration_sigma : float
+        The duration of the walking bouts follows a log-normal distribution with this median and shape parameter.
+        Real-world walking bouts are mostly short with a long tail of long bouts.
+    bout_duration_range_s : tuple[float, float]
+        Bout durations are clipped to this range.
+    cadence_spm : tuple[float, float]
+        Range of the (per bout uniformly sampled) cadence in steps per minute.
+    walking_speed_mps : tuple[float, float]
+        Range of the (per bout uniformly sampled) walking speed.
+    step_time_jitter : float
+        Relative standard deviation of the individual step durations within a bout.
+    movements_per_hour : float
+        Average number of non-walking arm movements per awake hour.
+    noise_std_ms2 : float
+        Standard deviation of the white sensor noise.
+    seed : int
+        Seed of the random number generator.
+    """
+
+    days: float = 1.0
+    sampling_rate_hz: float = 100.0
+    awake_hours: tuple[float, float] = (0.0, 16.0)
+    bouts_per_hour: float = 12.0
+    bout_duration_median_s: float = 20.0
+    bout_duration_sigma: float = 1.0
+    bout_duration_range_s: tuple[float, float] = (5.0, 1800.0)
+    cadence_spm: tuple[float, float] = (90.0, 125.0)
+    walking_speed_mps: tuple[float, float] = (0.7, 1.5)
+    step_time_jitter: float = 0.02
+    movements_per_hour: float = 20.0
+    noise_std_ms2: float = 0.05
+    seed: int = 0
+
+
+@dataclass
+class SyntheticRecording:
+    """
+    A synthetic recording and its ground truth.
+
+    Attributes
+    ----------
+    data : pd.DataFrame
+        Acceleration in m/s^2 with the columns ``acc_is``, ``acc_ml`` and ``acc_pa``.
+    sampling_rate_hz : float
+        Sampling rate of ``data``.
+    walking_bouts : pd.DataFrame
+        One row per walking bout (index ``wb_id``) with ``start`` and ``end`` (samples), ``cadence_spm``,
+        ``stride_length_m`` and ``walking_speed_mps``.
+    initial_contacts : pd.DataFrame
+        Initial contacts (column ``ic`` in samples of the recording) indexed by ``wb_id`` and ``step_id``.
+    config : SyntheticRecordingConfig
+        The settings used to generate the recording.
+    """
+
+    data: pd.DataFrame
+    sampling_rate_hz: float
+    walking_bouts: pd.DataFrame
+    initial_contacts: pd.DataFrame
+    config: SyntheticRecordingConfig
+
+    def metadata(self) -> dict[str, Any]:
+        """JSON serializable description of the recording."""
+        return {
+            **asdict(self.config),
+            "n_samples": len(self.data),
+            "n_walking_bouts": len(self.walking_bouts),
+            "n_initial_contacts": len(self.initial_contacts),
+        }
+
+
+def _random_orientations(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Gravity vectors of random arm orientations, biased towards the arm hanging down (gravity along -ml)."""
+    vectors = rng.normal(0, 0.6, (n, 3)) + np.array([0.0, -1.0, 0.0])
+    return GRAVITY_MS2 * vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _smoothed_noise(rng: np.random.Generator, n: int, width: int) -> np.ndarray:
+    """Low-pass filtered white noise (moving average) with unit standard deviation."""
+    noise = rng.normal(0, 1, (n + width, 3))
+    cumsum = np.cumsum(noise, axis=0)
+    smoothed = (cumsum[width:] - cumsum[:-width]) / np.sqrt(width)
+    return smoothed[:n]
+
+
+def _place_events(
+    rng: np.random.Generator,
+    rate_per_s: float,
+    window: tuple[int, int],
+    durations_s: Callable[[int], np.ndarray],
+    sampling_rate_hz: float,
+    occupied: np.ndarray,
+) -> list[tuple[int, int]]:
+    """Place non-overlapping events at random times of a window and mark them in ``occupied``."""
+    start_s, end_s = window[0] / sampling_rate_hz, window[1] / sampling_rate_hz
+    n_events = rng.poisson(rate_per_s * max(end_s - start_s, 0))
+    starts = np.sort(rng.uniform(start_s, end_s, n_events))
+    durations = durations_s(n_events)
+    events = []
+    for start, duration in zip(starts, durations):
+        start_sample = int(start * sampling_rate_hz)
+        end_sample = min(int((start + duration) * sampling_rate_hz), window[1])
+        # Keep a short gap to the neighbouring events, so that they are not merged by the algorithms
+        gap = int(2 * sampling_rate_hz)
+        if end_sample <= start_sample or occupied[max(start_sample - gap, 0) : end_sample + gap].any():
+            continue
+        occupied[start_sample:end_sample] = True
+        events.append((start_sample, end_sample))
+    return events
+
+
+def _walking_segment(
+    rng: np.random.Generator, n_samples: int, cadence_spm: float, config: SyntheticRecordingConfig
+) -> tuple[np.ndarray, np.ndarray]:
+    """Acceleration (without gravity) and initial contacts (relative samples) of a single walking bout."""
+    fs = config.sampling_rate_hz
+    mean_step_s = 60 / cadence_spm
+    n_steps = int(n_samples / fs / mean_step_s) + 2
+    step_durations = mean_step_s * (1 + config.step_time_jitter * rng.standard_normal(n_steps))
+    step_times = np.concatenate([[0.0], np.cumsum(step_durations)])
+    ics = np.round(step_times * fs).astype(int)
+    ics = ics[ics < n_samples]
+
+    t = np.arange(n_samples) / fs
+    # Continuous step phase (1 per step) from the step times; the arm swings once per stride (two steps)
+    step_phase = np.interp(t, step_times, np.arange(len(step_times)))
+    swing_amplitude = rng.uniform(1.0, 3.0)
+    swing = swing_amplitude * np.sin(np.pi * step_phase)
+
+    impulses = np.zeros(n_samples)
+    impulses[ics] = rng.uniform(2.0, 5.0, len(ics))
+    kernel_t = np.arange(int(0.1 * fs)) / fs
+    kernel = np.exp(-kernel_t / 0.02) * np.sin(2 * np.pi * 15 * kernel_t)
+    impacts = np.convolve(impulses, kernel)[:n_samples]
+
+    acc = np.column_stack(
+        [
+            0.6 * swing + impacts,
+            0.3 * swing_amplitude * np.sin(2 * np.pi * step_phase),
+            swing + 0.5 * impacts,
+        ]
+    )
+    return acc, ics
+
+
+def _generate_day(
+    rng: np.random.Generator, n_samples: int, config: SyntheticRecordingConfig
+) -> tuple[np.ndarray, list[dict[str, float]], list[np.ndarray]]:
+    fs = config.sampling_rate_hz
+    acc = config.noise_std_ms2 * rng.standard_normal((n_samples, 3))
+
+    # Postures: piecewise constant gravity orientation
+    posture_starts = np.unique(
+        np.concatenate([[0], np.sort(rng.integers(0, max(n_samples, 1), rng.poisson(n_samples / fs / 600)))])
+    )
+    posture_lengths = np.diff(np.append(posture_starts, n_samples))
+    acc += np.repeat(_random_orientations(rng, len(posture_starts)), posture_lengths, axis=0)
+
+    awake = (
+        min(int(config.awake_hours[0] * 3600 * fs), n_samples),
+        min(int(config.awake_hours[1] * 3600 * fs), n_samples),
+    )
+    occupied = np.zeros(n_samples, dtype=bool)
+
+    low, high = config.bout_duration_range_s
+    bouts = _place_events(
+        rng,
+        config.bouts_per_hour / 3600,
+        awake,
+        lambda n: np.clip(rng.lognormal(np.log(config.bout_duration_median_s), config.bout_duration_sigma, n), low, high),
+        fs,
+        occupied,
+    )
+    bout_truth = []
+    bout_ics = []
+    for start, end in bouts:
+        cadence = rng.uniform(*config.cadence_spm)
+        speed = rng.uniform(*config.walking_speed_mps)
+        walking_acc, ics = _walking_segment(rng, end - start, cadence, config)
+        acc[start:end] = (
+            np.tile(_random_orientations(rng, 1), (end - start, 1))
+            + walking_acc
+            + config.noise_std_ms2 * rng.standard_normal((end - start, 3))
+        )
+        bout_truth.append(
+            {
+                "start": start,
+                "end": end,
+                "cadence_spm": cadence,
+                "stride_length_m": 2 * speed * 60 / cadence,
+                "walking_speed_mps": speed,
+            }
+        )
+        bout_ics.append(ics + start)
+
+    movements = _place_events(
+        rng, config.movements_per_hour / 3600, awake, lambda n: rng.uniform(2, 30, n), fs, occupied
+    )
+    for start, end in movements:
+        acc[start:end] += rng.uniform(0.5, 2.0) * _smoothed_noise(rng, end - start, max(int(0.2 * fs), 1))
+
+    return acc, bout_truth, bout_ics
+
+
+def generate_recording(config: SyntheticRecordingConfig = SyntheticRecordingConfig()) -> SyntheticRecording:
+    """
+    Generate a synthetic wrist recording.
+
+    Parameters
+    ----------
+    config : SyntheticRecordingConfig
+        The settings of the recording.
+
+    Returns
+    -------
+    SyntheticRecording
+        The data and the ground truth walking bouts and initial contacts.
+    """
+    fs = config.sampling_rate_hz
+    n_total = int(round(config.days * SECONDS_PER_DAY * fs))
+    samples_per_day = int(round(SECONDS_PER_DAY * fs))
+    n_days = int(np.ceil(n_total / samples_per_day))
+
+    data = np.empty((n_total, 3))
+    bouts = []
+    ics = []
+    for day, seed in enumerate(np.random.SeedSequence(config.seed).spawn(n_days)):
+        offset = day * samples_per_day
+        n_samples = min(samples_per_day, n_total - offset)
+        day_acc, day_bouts, day_ics = _generate_day(np.random.default_rng(seed), n_samples, config)
+        data[offset : offset + n_samples] = day_acc
+        bouts.extend({**b, "start": b["start"] + offset, "end": b["end"] + offset} for b in day_bouts)
+        ics.extend(i + offset for i in day_ics)
+
+    walking_bouts = pd.DataFrame(
+        bouts, columns=["start", "end", "cadence_spm", "stride_length_m", "walking_speed_mps"]
+    ).rename_axis("wb_id")
+    if ics:
+        initial_contacts = pd.concat(
+            {wb_id: pd.DataFrame({"ic": wb_ics}).rename_axis("step_id") for wb_id, wb_ics in enumerate(ics)},
+            names=["wb_id"],
+        )
+    else:
+        empty_index = pd.MultiIndex.from_tuples([], names=["wb_id", "step_id"])
+        initial_contacts = pd.DataFrame({"ic": pd.Series([], dtype=int)}, index=empty_index)
+
+    return SyntheticRecording(
+        data=pd.DataFrame(data, columns=ACC_COLS),
+        sampling_rate_hz=fs,
+        walking_bouts=walking_bouts,
+        initial_contacts=initial_contacts,
+        config=config,
+    )
+
+
+__all__ = ["SyntheticRecording", "SyntheticRecordingConfig", "generate_recording"]
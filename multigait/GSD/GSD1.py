@@ -1,6 +1,6 @@
 import warnings
 from typing import Any
-from multigait.GSD.utils.GSD1_utils import find_pulse_trains, find_intersections, find_active_period_peak_threshold, NoActivePeriodsDetectedError, format_gait_sequences, combine_intervals
+from multigait.GSD.utils.GSD1_utils import find_pulse_trains, find_intersections, find_active_period_peak_threshold, NoActivePeriodsDetectedError, format_gait_sequences, combine_intervals, step_stats_per_gait_sequence
 from multigait.utils.data_conversions import seconds_to_samples
 from multigait.GSD.base_gsd import BaseGsdDetector
 import numpy as np
@@ -132,16 +132,14 @@ class _BaseIonescuGSD(BaseGsdDetector):
             self.gs_list_.index.name = 'gs_id'
             return self
 
-        # Find all max_peaks within each final gs
-        steps_per_gs = [[x for x in max_peaks if gs[0] <= x <= gs[1]] for gs in combined_final]
-        n_steps_per_gs = np.array([len(steps) for steps in steps_per_gs])
+        # Find the number of max_peaks and their mean distance within each final gs
         # It can happen that we only have one step in a gs, in this case we can not calculate the mean step time
-        # Numpy will output NaN and throw a warning.
+        # and it is NaN. Numpy will throw a warning, when padding with NaN.
         # We don't want ot see the warning, so we suppress it.
         # GSs that don't have enough steps will be removed later anyway.
+        n_steps_per_gs, mean_step_times = step_stats_per_gait_sequence(max_peaks, combined_final)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=RuntimeWarning)
-            mean_step_times = np.array([np.mean(np.diff(steps)) for steps in steps_per_gs])
             # Pad each gs by padding*mean_step_times before and after
             combined_final[:, 0] = np.fix(combined_final[:, 0] - self.padding * mean_step_times)
             combined_final[:, 1] = np.fix(combined_final[:, 1] + self.padding * mean_step_times)
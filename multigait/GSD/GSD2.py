@@ -1,7 +1,7 @@
 from typing_extensions import Self
 import pandas as pd
 import numpy as np
-from typing import Literal
+from typing import Literal, Union
 from multigait.GSD.utils.gravity_remove_butter import gravity_motion_butterworth
 from multigait.GSD.utils.cwb import cwb
 from multigait.GSD.base_gsd import BaseGsdDetector
@@ -12,6 +12,82 @@ from mobgap.data_transform import (
 )
 
 
+def _window_std(signal: np.ndarray, window_size: int) -> np.ndarray:
+    """Standard deviation of consecutive non-overlapping windows. Incomplete windows at the end are ignored."""
+    signal = np.asarray(signal, dtype=float).ravel()
+    win_num = len(signal) // window_size
+    return signal[: win_num * window_size].reshape(win_num, window_size).std(axis=1)
+
+
+def _window_mean(signal: Union[pd.Series, pd.DataFrame], window_size: int) -> np.ndarray:
+    """Mean of consecutive non-overlapping windows. Incomplete windows at the end are ignored.
+
+    The windows replicate ``signal[i * window_size : (i + 1) * window_size]``.
+    For pandas objects with a float index (e.g. the output of the resampling step), this slice is label based and
+    includes both ends, i.e. it spans all samples with index values within ``[i * window_size, (i + 1) * window_size]``.
+    """
+    values = np.asarray(signal, dtype=float)
+    values = values.reshape(len(values), -1).mean(axis=1) if values.ndim > 1 else values
+    win_num = len(values) // window_size
+
+    if not pd.api.types.is_float_dtype(signal.index):
+        return values[: win_num * window_size].reshape(win_num, window_size).mean(axis=1)
+
+    # Label based windows using prefix sums
+    window_edges = np.arange(win_num + 1) * window_size
+    left = np.searchsorted(signal.index, window_edges[:-1], side="left")
+    right = np.searchsorted(signal.index, window_edges[1:], side="right")
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (cumsum[right] - cumsum[left]) / (right - left)
+
+
+def _merge_active_windows(active: np.ndarray, max_break: float, min_length: float) -> np.ndarray:
+    """
+    Convert a window-wise activity mask into merged bouts (in window units).
+
+    Bouts separated by a break of at most ``max_break`` windows are merged.
+    Afterwards, bouts are removed, if the summed length of their active windows (breaks excluded) is not larger than
+    ``min_length``.
+    Both steps are done in one pass using the cumulative count of "long" breaks as bout id.
+
+    Parameters
+    ----------
+    active : np.ndarray
+        1D mask with 1 for active windows and 0 otherwise.
+    max_break : float
+        Maximal break (in windows) between two bouts to merge them.
+    min_length : float
+        Bouts with an active length smaller or equal to this value (in windows) are removed.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_bouts, 2) with the start and stop window of each bout.
+    """
+    active = np.asarray(active).copy()
+    # first and last elements should be 0 to identify transitions
+    active[0] = 0
+    active[-1] = 0
+
+    # difference in array elements indicate start (1) and stop (-1)
+    diffs = np.diff(active)
+    starts = np.flatnonzero(diffs == 1) + 1
+    stops = np.flatnonzero(diffs == -1) + 1
+    if len(starts) == 0:
+        return np.empty((0, 2), dtype=int)
+
+    # A new merged bout begins whenever the break to the previous bout is longer than max_break
+    new_bout = np.ones(len(starts), dtype=bool)
+    new_bout[1:] = (starts[1:] - stops[:-1]) > max_break
+    first = np.flatnonzero(new_bout)
+    last = np.append(first[1:], len(starts)) - 1
+
+    merged = np.column_stack((starts[first], stops[last]))
+    active_length = np.add.reduceat(stops - starts, first)
+    return merged[active_length > min_length]
+
+
 class HickeyGSD(BaseGsdDetector):
     """
     Implementation of the Gait Sequence Detection (GSD) algorithm by Hickey et al. (2017), adapted for wrist- and lowback-worn devices.
@@ -206,23 +282,11 @@ class HickeyGSD(BaseGsdDetector):
             acc_filt = np.asarray(chain_transformers(acc_norm_centered, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
 
             # SD and mean calculation for all axes every 0.1s
-            std_acc = np.zeros(win_num)
-            mean_acc = np.zeros(win_num)
-
-            for i in range(win_num):
-                start_idx = int(i * n)
-                end_idx = int((i + 1) * n)
-
-                std_acc[i] = np.std(acc_filt[start_idx:end_idx])
-                mean_acc[i] = np.mean(data[start_idx:end_idx])
+            std_acc = _window_std(acc_filt, n)
+            mean_acc = _window_mean(data, n)
 
-            # Initialize the result array with zeros
-            i_array_move_st_si = np.zeros(win_num)
-
-            # Apply the conditions to each window
-            for i in range(win_num):
-                if std_acc[i] >= self.ThresholdStill and mean_acc[i] <= self.ThresholdUpright:
-                    i_array_move_st_si[i] = 1
+            # Windows with movement (high variability) while being upright
+            i_array_move_st_si = ((std_acc >= self.ThresholdStill) & (mean_acc <= self.ThresholdUpright)).astype(float)
 
             # if i_array_move_st_si is all ones then the function should return a dataframe with the start and end of the signal!
             if i_array_move_st_si.sum() == win_num:
@@ -238,64 +302,13 @@ class HickeyGSD(BaseGsdDetector):
                 self.gs_list_.index.name = 'gs_id'
                 return self
 
-            #Calculating starts and ends of walking
-            # first and last elements should be 0 to identify transitions
-            i_array_move_st_si[0] = 0
-            i_array_move_st_si[-1] = 0
-
-            # difference in array elements indicate start (1) and stop (-1)
-            diffs = np.diff(i_array_move_st_si)
-            bout_start_move_st_si = np.where(diffs == 1)[0] + 1
-            bout_stop_move_st_si = np.where(diffs == -1)[0] + 1
-
-            # Combine start and stop bouts into one array
-            bout_array_move_st_si = np.column_stack((bout_start_move_st_si, bout_stop_move_st_si))
-
-            # Initialize Difference Arrays
-            betweenbbout_array_move_st_si = np.zeros(len(bout_array_move_st_si), dtype=int)
-
-            # Set the first value of DifferenceArrayAMoveStSi to be similar to the first value of BoutArrayMoveStSi
-            # the reason is that this represents the difference from the beginning of the signal to the first bout
-            betweenbbout_array_move_st_si[0] = bout_array_move_st_si[0,0]
-
-            # Calculate the bout lengths
-            boutlength_array_move_st_si = bout_stop_move_st_si - bout_start_move_st_si
-
-            # Working out the differences between consecutive bouts
-            for i in range(1, len(bout_array_move_st_si)):
-                betweenbbout_array_move_st_si[i] = abs(bout_stop_move_st_si[i-1] - bout_start_move_st_si[i])
-
-            # Combine all the variables into one array, including start, stop, difference between bouts and bout length
-            difference_array_move_st_si = np.column_stack((
-                bout_start_move_st_si,
-                bout_stop_move_st_si,
-                betweenbbout_array_move_st_si,
-                boutlength_array_move_st_si
-            ))
-
             # Here we merge bouts which are 2.25s or less apart. Rationale is that two consequtive ICs
             # are expected to be from 0.25 to 2.25s appart so if two bouts have a smaller break than 2.25s then the break is walking
             # Using 22.5 due to scaling of windows to 0.1s so 2.25 seconds is 22.5 values
-            i = 1  # Start from the second bout since we are merging with the previous one
-            while i < len(difference_array_move_st_si):
-                if difference_array_move_st_si[i, 2] <= 22.5:
-                    # Merge current bout with the last one (index i-1)
-                    difference_array_move_st_si[i - 1, 1] = difference_array_move_st_si[
-                        i, 1]  # Update the stop time of the last bout
-                    difference_array_move_st_si[i - 1, 3] += difference_array_move_st_si[i, 3]  # Combine bout lengths
-
-                    # Remove the current row after merging
-                    difference_array_move_st_si = np.delete(difference_array_move_st_si, i, axis=0)
-                else:
-                    i += 1  # Move to the next row if no merge is needed
-
             # According to consensus (Mob-D) a stride cannot be lower than 0.2s and if we need at least 2 strides to form a bout
             # we need to remove bouts that are shorter than 0.5s. This is in accordance with the original publication as well
             # Using 5 due to scaling of windows to 0.1s so half a second is 5 values
-            difference_array_move_st_si = difference_array_move_st_si[difference_array_move_st_si[:, 3] > 5]
-
-            # Removing the 3rd column indicating the "pause" between bouts
-            difference_array_move_st_si = np.delete(difference_array_move_st_si, 2, axis=1)
+            difference_array_move_st_si = _merge_active_windows(i_array_move_st_si, max_break=22.5, min_length=5)
 
             # Converting back to samples
             difference_array_move_st_si = (difference_array_move_st_si * n).astype(int)
@@ -356,33 +369,13 @@ class HickeyGSD(BaseGsdDetector):
                 chain_transformers(acc_pa_centered, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
 
             # SD and mean calculation for all axes every 0.1s (window)
-            std_acc_is = np.zeros(win_num)
-            std_acc_ml = np.zeros(win_num)
-            std_acc_pa = np.zeros(win_num)
-
-            mean_acc_is = np.zeros(win_num)
-
-            for i in range(win_num):
-                start_idx = int(i * n)
-                end_idx = int((i + 1) * n)
-
-                std_acc_is[i] = np.std(acc_is_filt[start_idx:end_idx])
-                std_acc_ml[i] = np.std(acc_ml_filt[start_idx:end_idx])
-                std_acc_pa[i] = np.std(acc_pa_filt[start_idx:end_idx])
-
-                mean_acc_is[i] = np.mean(acc_is[start_idx:end_idx])
-
             # Create a combined array of standard deviations
-            std_acc = std_acc_is + std_acc_ml + std_acc_pa
-
-            # Initialize the result array with zeros
-            i_array_move_st_si = np.zeros(win_num)
+            std_acc = _window_std(acc_is_filt, n) + _window_std(acc_ml_filt, n) + _window_std(acc_pa_filt, n)
+            mean_acc_is = _window_mean(acc_is, n)
 
             # Apply the conditions to each window. For the SD calculation, the centered and filter signal is used
             # For the standing threshold I use the raw signal
-            for i in range(win_num):
-                if std_acc[i] >= self.ThresholdStill and mean_acc_is[i] <= self.ThresholdUpright:
-                    i_array_move_st_si[i] = 1
+            i_array_move_st_si = ((std_acc >= self.ThresholdStill) & (mean_acc_is <= self.ThresholdUpright)).astype(float)
 
             # if i_array_move_st_si is all ones then the function should return a dataframe with the start and end of the signal!
             if i_array_move_st_si.sum() == win_num:
@@ -398,64 +391,13 @@ class HickeyGSD(BaseGsdDetector):
                 self.gs_list_.index.name = 'gs_id'
                 return self
 
-            # Calculating starts and ends of walking
-            # first and last elements should be 0 to identify transitions
-            i_array_move_st_si[0] = 0
-            i_array_move_st_si[-1] = 0
-
-            # difference in array elements indicate start (1) and stop (-1)
-            diffs = np.diff(i_array_move_st_si)
-            bout_start_move_st_si = np.where(diffs == 1)[0] + 1
-            bout_stop_move_st_si = np.where(diffs == -1)[0] + 1
-
-            # Combine start and stop bouts into one array
-            bout_array_move_st_si = np.column_stack((bout_start_move_st_si, bout_stop_move_st_si))
-
-            # Initialize Difference Arrays
-            betweenbbout_array_move_st_si = np.zeros(len(bout_array_move_st_si), dtype=int)
-
-            # Set the first value of DifferenceArrayAMoveStSi to be similar to the first value of BoutArrayMoveStSi
-            # the reason is that this represents the difference from the beginning of the signal to the first bout
-            betweenbbout_array_move_st_si[0] = bout_array_move_st_si[0, 0]
-
-            # Calculate the bout lengths
-            boutlength_array_move_st_si = bout_stop_move_st_si - bout_start_move_st_si
-
-            # Working out the differences between consecutive bouts
-            for i in range(1, len(bout_array_move_st_si)):
-                betweenbbout_array_move_st_si[i] = abs(bout_stop_move_st_si[i - 1] - bout_start_move_st_si[i])
-
-            # Combine all the variables into one array, including start, stop, difference between bouts and bout length
-            difference_array_move_st_si = np.column_stack((
-                bout_start_move_st_si,
-                bout_stop_move_st_si,
-                betweenbbout_array_move_st_si,
-                boutlength_array_move_st_si
-            ))
-
             # Here we merge bouts which are 2.25s or less apart. Rationale is that two consequtive ICs
             # are expected to be from 0.25 to 2.25s appart so if two bouts have a smaller break than 2.25s then the break is walking
             # Using 22.5 due to scaling of windows to 0.1s so 2.25 seconds is 22.5 values
-            i = 1  # Start from the second bout since we are merging with the previous one
-            while i < len(difference_array_move_st_si):
-                if difference_array_move_st_si[i, 2] <= 22.5:
-                    # Merge current bout with the last one (index i-1)
-                    difference_array_move_st_si[i - 1, 1] = difference_array_move_st_si[
-                        i, 1]  # Update the stop time of the last bout
-                    difference_array_move_st_si[i - 1, 3] += difference_array_move_st_si[i, 3]  # Combine bout lengths
-
-                    # Remove the current row after merging
-                    difference_array_move_st_si = np.delete(difference_array_move_st_si, i, axis=0)
-                else:
-                    i += 1  # Move to the next row if no merge is needed
-
             # According to consensus (Mob-D) a stride cannot be lower than 0.2s and if we need at least 2 strides to form a bout
             # we need to remove bouts that are shorter than 0.5s. This is in accordance with the original publication as well
             # Using 5 due to scaling of windows to 0.1s so half a second is 5 values
-            difference_array_move_st_si = difference_array_move_st_si[difference_array_move_st_si[:, 3] > 5]
-
-            # Removing the 3rd column indicating the "pause" between bouts
-            difference_array_move_st_si = np.delete(difference_array_move_st_si, 2, axis=1)
+            difference_array_move_st_si = _merge_active_windows(i_array_move_st_si, max_break=22.5, min_length=5)
 
             # Converting back to samples
             difference_array_move_st_si = (difference_array_move_st_si * n).astype(int)
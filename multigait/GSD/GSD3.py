@@ -1,12 +1,25 @@
 from typing_extensions import Self, Literal
 import pandas as pd
 import  numpy as np
-from multigait.GSD.utils.GSD3_utils import window, sum_partial_overlapping_windows, remove_outliers, calc_activity_parameter, resample_to_orginal_data_length, generate_gs_list
+from multigait.GSD.utils.GSD3_utils import window, sum_partial_overlapping_windows, remove_outliers, calc_activity_parameter, generate_gs_list_from_seconds
 from multigait.GSD.utils.ActivityCounts import ActivityCounts
 from multigait.GSD.base_gsd import BaseGsdDetector
 from multigait.GSD.utils.cwb import cwb
 
 
+class _LazyAccNormG:
+    """Norm of the acceleration in g, calculated only for the slices of the data that are accessed."""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, item: slice) -> np.ndarray:
+        return np.linalg.norm(self.data.iloc[item][['acc_is', 'acc_ml', 'acc_pa']], axis=1) / 9.81
+
+
 class KheirkhahanGSD(BaseGsdDetector):
     """
     Implementation of the Gait Sequence Detection algorithm by Kheirkhahan et al. (2017) [1].
@@ -100,14 +113,14 @@ class KheirkhahanGSD(BaseGsdDetector):
         self.data_len = len(data)
 
         # In the current implementation for wrist worn sensors we use the norm
-        cols = ['acc_is', 'acc_ml', 'acc_pa']
-        acc = self.data[cols]
-        norm_acc = np.linalg.norm(acc, axis=1)
+        # turning acc to g-units for activity counts calculation
+        norm_acc = _LazyAccNormG(self.data)
 
         # Finds the activity counts per second
-        # turning acc to g-units for activity counts calculation
-        norm_acc = norm_acc / 9.81
-        activity_counts = ActivityCounts().calculate(data=norm_acc.copy(), sampling_rate=self.sampling_rate_hz).activity_counts_
+        # The counts are calculated block by block, so that only the norm of the current block is calculated
+        activity_counts = np.concatenate(
+            list(ActivityCounts().iter_calculate(norm_acc, sampling_rate=self.sampling_rate_hz))
+        )
 
         # shortcut if all activity counts are 0 no gait can be detected
         if np.all(activity_counts == 0):
@@ -140,10 +153,8 @@ class KheirkhahanGSD(BaseGsdDetector):
         # Shows how many times each second's activity counts are included in the moving window
         detected_walking = sum_partial_overlapping_windows(walking_windows, activity_counts, self.win_size_s, self.win_shift_s)
 
-        # Interpolates the walking windows to the original data length (True or False for all data points)
-        detected_walking = resample_to_orginal_data_length(detected_walking, len(norm_acc)).astype(bool)
-
-        gs = generate_gs_list(detected_walking)
+        # Maps the walking seconds to the original data length (as nearest neighbour interpolation of the seconds)
+        gs = generate_gs_list_from_seconds(detected_walking, self.data_len)
         # Clipping start and end to be within limits of file
         gs[['start', 'end']] = np.clip(gs[['start', 'end']], 0, len(self.data))
 
@@ -1,7 +1,8 @@
 from typing_extensions import Self, Literal
-from multigait.GSD.utils.merge_bouts import merge_bouts
+from multigait.GSD.utils.merge_bouts import merge_bouts_across_gaps
 from multigait.GSD.utils.cwb import cwb
 from multigait.GSD.base_gsd import BaseGsdDetector
+from multigait.utils.array import RunLengthMask, filter_intervals_by_length
 import pandas as pd
 import  numpy as np
 from mobgap.data_transform import (
@@ -166,62 +167,42 @@ class MacLeanGSD(BaseGsdDetector):
             self.gap_threshold = np.percentile(magnitude, self.gap_threshold_percentile)
             self.walk_threshold = np.percentile(magnitude, self.walk_threshold_percentile)
 
-        # finding datapoint above the threshold (1) or below (0)
-        magnitude_thresh = (magnitude > self.threshold_binary).astype(int)
+        # finding the runs of datapoints above the threshold, stored as start and end (exclusive) of every run
+        above_thresh = RunLengthMask.from_threshold(magnitude, self.threshold_binary)
 
-        # if first or last value is 1 then inserting 0 at the beginning or end. This is to detect the start and end of the first and last bouts
-        if magnitude_thresh[0] == 1:
-            magnitude_thresh = np.insert(magnitude_thresh, 0, 0)
-        if magnitude_thresh[-1] == 1:
-            magnitude_thresh = np.append(magnitude_thresh, 0)
-
-        # finding the start and end of the gait sequence on the binary signal
-        # 0 = no change, 1 = start of bout, -1 = end of bout
-        mtdiff = np.diff(magnitude_thresh)
-        start = np.where(mtdiff == 1)[0] + 1
-        end = np.where(mtdiff == -1)[0] + 1
-
-        # if end and start are empty then we shortcut since no gait was detected
-        if start.size == 0 or end.size == 0:
+        # if no run was found then we shortcut since no gait was detected
+        if above_thresh.n_runs == 0:
             self.gs_list_ = pd.DataFrame(columns=["start", "end"])
             self.gs_list_.index.name = 'gs_id'
             return self
 
-        # if the first end is before the first start we start the walking bout from the beginning of the file
-        if end[0] < start[0]:
-            start = np.insert(start, 0, 0)
-        # if the last start is after the last end we end the walking bout at the end of the file
-        if end[-1] < start[-1]:
-            end = np.append(end, len(mtdiff))
+        # if first or last value is above the threshold then a 0 is inserted at the beginning or end of the binary
+        # signal. This is to detect the start and end of the first and last bouts. The inserted 0 at the beginning
+        # shifts all starts and ends by one datapoint.
+        pad_start = int(above_thresh.starts[0] == 0)
+        pad_end = int(above_thresh.ends[-1] == len(magnitude))
+        start = above_thresh.starts + pad_start
+        end = above_thresh.ends + pad_start
+        magnitude_thresh = RunLengthMask(above_thresh.intervals + pad_start, len(magnitude) + pad_start + pad_end)
 
         # smoothing binary data, sigma has been selected from comparisons with matlab which does not have a sigma parameter (it is calculated internally)
         filter_chain = [("gaussian_1", GaussianFilter(sigma_s=10 / self.sampling_rate_hz))]
-        smoothed_data = np.asarray(chain_transformers(magnitude_thresh.astype(float), filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+        smoothed_data = np.asarray(chain_transformers(magnitude_thresh.to_dense(float), filter_chain, sampling_rate_hz=self.sampling_rate_hz))
 
         # gapindex includes end of each bout and start of the next
-        # and a column to store the sum of the smoothed data below the threshold
-        gapindex = np.column_stack((end[:-1], start[1:], np.zeros(len(start) - 1, dtype=int)))
+        gapindex = np.column_stack((end[:-1], start[1:]))
 
-        # iterating through each gap to make checks
-        gapindex[:, 2] = np.array([
-            np.sum(smoothed_data[start:end] < self.gap_threshold)
-            for start, end in zip(gapindex[:, 0], gapindex[:, 1])
-        ])
+        # counting the datapoints of the smoothed data below the threshold within each gap
+        # the counts are looked up in the cumulative sum of the runs below the threshold instead of summing each gap
+        below_gap_thresh = RunLengthMask.from_bool(smoothed_data < self.gap_threshold)
+        gap_counts = below_gap_thresh.count_true(gapindex)
 
         # identifying invalid gaps (i.e., gaps which should be included as walking bouts)
         # using the threshold indicating the number of data points below which a gap is invalid
-        invalid_gaps = gapindex[:, 2] < self.gap_index
-
-        # extracting all ends of invalid gaps (to merge them with walking bouts)
-        boutends_notinactive = gapindex[invalid_gaps, 1]
-
-        # extracting all starts where the preceding gap is invalid (to merge them with walking bouts)
-        boutstarts_notinactive = gapindex[invalid_gaps, 0]
-
-        valid_wb_indices = []
+        invalid_gaps = gap_counts < self.gap_index
 
         # we need to merge the detected bouts starts and ends with the gaps which include activity
-        merged_starts, merged_ends = merge_bouts(start, end, boutstarts_notinactive, boutends_notinactive)
+        merged_starts, merged_ends = merge_bouts_across_gaps(start, end, invalid_gaps)
 
         # gaussian filter in the euclidian norm signal
         filter_chain = [("gaussian_1", GaussianFilter(sigma_s=2 / self.sampling_rate_hz))]
@@ -229,35 +210,30 @@ class MacLeanGSD(BaseGsdDetector):
 
         # Having all the walking bouts (originating from the detected starts and ends merged with the invalid gaps)
         # we perform a check to see if the signal exceeds a threshold for a specific number of data points
-        # in order to reduce computational resources we calculate the walk_index_values value for each walking bout outside of the loop
         # walk_index_values is the limit based on the walk_index
         walk_index_values = np.round((merged_ends - merged_starts) * self.walk_index).astype(int)
 
-        for i in range(len(merged_starts)):
-            # extracting the smoothed magnitude data for each walking bout and
-            # determining if the data exceeds the threshold
-            dt_thresh_bout = (magnitude_smooth[merged_starts[i]:merged_ends[i]] > self.walk_threshold).astype(int)
+        # counting the datapoints of the smoothed magnitude above the threshold within each walking bout
+        above_walk_thresh = RunLengthMask.from_threshold(magnitude_smooth, self.walk_threshold)
+        walk_counts = above_walk_thresh.count_true(np.column_stack((merged_starts, merged_ends)))
 
-            # if the data exceeds the threshold for less than walk_index_values points (5% of the bout length), we include the bout
-            # using precomputed walk_index_values values rather than calculating them on the fly in each loop
-            if np.sum(dt_thresh_bout) < walk_index_values[i]:
-                valid_wb_indices.append(i)
+        # if the data exceeds the threshold for less than walk_index_values points (5% of the bout length), we include the bout
+        valid_wb = walk_counts < walk_index_values
 
         # extracting valid walking bout starts and ends after the threshold check
-        walk_start_checked = np.array(merged_starts)[valid_wb_indices]
-        walk_end_checked = np.array(merged_ends)[valid_wb_indices]
+        walk_start_checked = merged_starts[valid_wb]
+        walk_end_checked = merged_ends[valid_wb]
 
         # a second check includes removing bouts shorter than 2 seconds
-        bout_duration = walk_end_checked - walk_start_checked
         # minimum bout length is 2 seconds
         min_bout_length = 2 * self.sampling_rate_hz
 
         # filtering out short bouts
-        valid_bouts = bout_duration > min_bout_length
+        valid_bouts = filter_intervals_by_length(np.column_stack([walk_start_checked, walk_end_checked]), min_bout_length)
 
         # final start and end of non-walking bouts
-        final_wb_start = walk_start_checked[valid_bouts]
-        final_wb_end = walk_end_checked[valid_bouts]
+        final_wb_start = valid_bouts[:, 0]
+        final_wb_end = valid_bouts[:, 1]
 
         # creating a dataframe with the final start and end of the walking bouts
         gs = pd.DataFrame({"start": final_wb_start, "end": final_wb_end})
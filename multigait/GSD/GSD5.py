@@ -2,8 +2,9 @@ import warnings
 from typing_extensions import Self, Literal
 import pandas as pd
 import  numpy as np
-from scipy.signal import welch, correlate, find_peaks
-from multigait.utils.array import create_sliding_windows
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.signal import welch, correlate, find_peaks, get_window
+from multigait.utils.array import create_sliding_windows, merge_interval
 from multigait.GSD.utils.cwb import cwb
 from multigait.GSD.base_gsd import BaseGsdDetector
 from mobgap.data_transform import (
@@ -12,6 +13,160 @@ from mobgap.data_transform import (
 )
 
 
+# Number of windows processed at once by the batched spectral and autocorrelation steps.
+# Limits the size of the intermediate FFT arrays for long recordings.
+_BATCH_SIZE = 2048
+
+# Relative (PSD) and absolute (normalised autocorrelation) tolerance below which the batched FFT results are not
+# trusted to reproduce the decisions of the per-window SciPy calls. Affected windows are recalculated with the
+# original per-window implementation, so that the resulting masks are identical.
+_AMBIGUITY_TOL = 1e-9
+
+
+def _dominant_frequency_single(window: np.ndarray, sampling_rate_hz: float) -> float:
+    f, pxx = welch(window, fs=sampling_rate_hz, window="hamming", nperseg=len(window))
+    return f[np.argmax(pxx)]
+
+
+def _regularity_single(window: np.ndarray, threshold: float) -> int:
+    autocorr = correlate(window, window, mode="full")
+    autocorr = autocorr[autocorr.size // 2 :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        autocorr = autocorr / autocorr[0]
+    peaks, _ = find_peaks(autocorr, height=0)
+    if len(peaks) < 2:
+        return 0
+    return int(autocorr[peaks[0]] > threshold and autocorr[peaks[1]] > threshold)
+
+
+def dominant_frequencies(windows: np.ndarray, sampling_rate_hz: float) -> np.ndarray:
+    """Frequency with the highest Welch power for each row of a window matrix.
+
+    Equivalent to calling ``scipy.signal.welch(window, fs, window="hamming", nperseg=len(window))`` followed by
+    an ``argmax`` for every window, but the periodograms of all windows are calculated with a single batched rFFT.
+    As the window spans the entire segment, the Welch estimate is the (mean-detrended, Hamming-windowed)
+    periodogram of the window.
+    Scaling factors do not change the position of the maximum and are omitted.
+    Windows where the two largest power values are so close that numerical differences between the FFT
+    implementations could change the ``argmax`` are recalculated with ``welch``.
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        2D array of shape (n_windows, window_size).
+    sampling_rate_hz : float
+        Sampling rate of the signal in Hz.
+
+    Returns
+    -------
+    np.ndarray
+        The dominant frequency of each window in Hz.
+    """
+    n_windows, n = windows.shape
+    if n_windows == 0:
+        return np.empty(0)
+    # Using the frequencies returned by welch ensures the exact same values for the threshold comparisons
+    freqs, _ = welch(windows[0], fs=sampling_rate_hz, window="hamming", nperseg=n)
+    taper = get_window("hamming", n)
+    # One-sided spectrum: all bins except DC and (for even lengths) Nyquist are doubled
+    one_sided = np.full(n // 2 + 1, 2.0)
+    one_sided[0] = 1.0
+    if n % 2 == 0:
+        one_sided[-1] = 1.0
+
+    max_idx = np.empty(n_windows, dtype=np.intp)
+    for batch_start in range(0, n_windows, _BATCH_SIZE):
+        batch = windows[batch_start : batch_start + _BATCH_SIZE]
+        spectrum = rfft((batch - batch.mean(axis=1, keepdims=True)) * taper, axis=1)
+        power = (spectrum.real**2 + spectrum.imag**2) * one_sided
+        batch_idx = np.argmax(power, axis=1)
+        if power.shape[1] > 1:
+            top_two = np.partition(power, -2, axis=1)[:, -2:]
+            ambiguous = top_two[:, 0] >= top_two[:, 1] * (1 - _AMBIGUITY_TOL)
+            for i in np.flatnonzero(ambiguous):
+                _, pxx = welch(batch[i], fs=sampling_rate_hz, window="hamming", nperseg=n)
+                batch_idx[i] = np.argmax(pxx)
+        max_idx[batch_start : batch_start + len(batch)] = batch_idx
+    return freqs[max_idx]
+
+
+def autocorrelation_regularity(windows: np.ndarray, threshold: float = 0.15) -> np.ndarray:
+    """Check the step and stride regularity of each row of a window matrix.
+
+    For each window the normalised autocorrelation (positive lags) is calculated and the first two peaks with a
+    non-negative height (``scipy.signal.find_peaks(autocorr, height=0)``) are interpreted as step and stride
+    regularity.
+    A window is regular, if both values exceed ``threshold``.
+
+    The autocorrelations of all windows are calculated with a batched FFT and the peak search is vectorised.
+    Windows where any decision (slope sign, peak height sign, threshold comparison) is within the numerical
+    tolerance of the FFT are recalculated with the direct per-window implementation, so that the results are
+    identical to per-window calls of ``scipy.signal.correlate`` and ``find_peaks``.
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        2D array of shape (n_windows, window_size).
+    threshold : float, default=0.15
+        Minimal step and stride regularity.
+
+    Returns
+    -------
+    np.ndarray
+        Integer array with 1 for regular and 0 for irregular windows.
+    """
+    n_windows, n = windows.shape
+    regular = np.zeros(n_windows, dtype=int)
+    if n_windows == 0 or n < 3:
+        for i, window in enumerate(windows):
+            regular[i] = _regularity_single(window, threshold)
+        return regular
+
+    nfft = next_fast_len(2 * n - 1, real=True)
+    lags = np.arange(n - 1)
+    for batch_start in range(0, n_windows, _BATCH_SIZE):
+        batch = windows[batch_start : batch_start + _BATCH_SIZE]
+        spectrum = rfft(batch, nfft, axis=1)
+        autocorr = irfft(spectrum.real**2 + spectrum.imag**2, nfft, axis=1)[:, :n]
+        # Windows without any signal have an undefined autocorrelation and therefore no peaks
+        all_zero = ~np.any(batch, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            autocorr = autocorr / autocorr[:, :1]
+        autocorr[all_zero] = 0
+
+        slope = np.diff(autocorr, axis=1)
+        sign = np.sign(slope)
+        # Sign of the last non-flat slope before each sample (handles plateaus like find_peaks)
+        last_non_flat = np.where(sign != 0, lags, 0)
+        np.maximum.accumulate(last_non_flat, axis=1, out=last_non_flat)
+        prev_sign = np.zeros_like(sign)
+        prev_sign[:, 1:] = np.take_along_axis(sign, last_non_flat, axis=1)[:, :-1]
+        is_peak = (sign < 0) & (prev_sign > 0)
+        is_valid_peak = is_peak & (autocorr[:, :-1] >= 0)
+
+        n_peaks = np.cumsum(is_valid_peak, axis=1)
+        has_two = n_peaks[:, -1] >= 2
+        first = np.argmax(n_peaks >= 1, axis=1)
+        second = np.argmax(n_peaks >= 2, axis=1)
+        rows = np.arange(len(batch))
+        step_regularity = autocorr[rows, first]
+        stride_regularity = autocorr[rows, second]
+        batch_regular = has_two & (step_regularity > threshold) & (stride_regularity > threshold)
+
+        peak_heights = np.where(is_peak, np.abs(autocorr[:, :-1]), np.inf)
+        ambiguous = ~all_zero & (
+            np.any(np.abs(slope) < _AMBIGUITY_TOL, axis=1)
+            | np.any(peak_heights < _AMBIGUITY_TOL, axis=1)
+            | (has_two & (np.abs(step_regularity - threshold) < _AMBIGUITY_TOL))
+            | (has_two & (np.abs(stride_regularity - threshold) < _AMBIGUITY_TOL))
+        )
+        batch_regular = batch_regular.astype(int)
+        for i in np.flatnonzero(ambiguous):
+            batch_regular[i] = _regularity_single(batch[i], threshold)
+        regular[batch_start : batch_start + len(batch)] = batch_regular
+    return regular
+
+
 class KerenGSD(BaseGsdDetector):
     """
     Implementation of the Gait Sequence Detection (GSD) algorithm for wrist-worn accelerometer data, 
@@ -148,8 +303,8 @@ class KerenGSD(BaseGsdDetector):
 
 
         # 5. dividing signal into windows with a duration of 6 seconds, with 5-second overlap
-        window_size_samples = self.window_size * self.sampling_rate_hz
-        overlap_samples = self.overlap * self.sampling_rate_hz
+        window_size_samples = int(round(self.window_size * self.sampling_rate_hz))
+        overlap_samples = int(round(self.overlap * self.sampling_rate_hz))
         windows = create_sliding_windows(acc_detrend, window_size_samples, overlap_samples)
 
         # checking the presence of at least one peak in the center second of each window (using step 4)
@@ -172,58 +327,18 @@ class KerenGSD(BaseGsdDetector):
         binary_std_thresh = (std > self.threshold_sd).astype(int)
 
 
-        # 7. compute Power Spectral Density (PSD) using Welch's method
-        freq_results = []
-
-        for window in windows:
-            f, Pxx = welch(window, fs=self.sampling_rate_hz, window='hamming', nperseg=len(window))
-
-            # finding the frequency with the highest power
-            max_power_idx = np.argmax(Pxx)  # index of max power
-            max_freq = f[max_power_idx]  # corresponding frequency
-
-            freq_results.append(max_freq)
-
-        # converting to pd DataFrame
-        psd_df = pd.DataFrame({'Max_Freq': freq_results})
+        # 7. compute Power Spectral Density (PSD) using Welch's method (batched over all windows)
+        max_freq = dominant_frequencies(windows, self.sampling_rate_hz)
 
         # creating binary signal based on
-        binary_psd_thresh = np.array(((psd_df['Max_Freq'] > 0.5) & (psd_df['Max_Freq'] < 3)).astype(int))
+        binary_psd_thresh = ((max_freq > 0.5) & (max_freq < 3)).astype(int)
 
 
         # 8. Perform autocorrelation analysis for regularity
         # here we apply regularity check to both steps and strides as original paper does not specify which one
-        regularity_check_results = []
-
-        for window in windows:
-            # Compute autocorrelation
-            autocorr = correlate(window, window, mode='full')
-            autocorr = autocorr[autocorr.size // 2:]  # keeping positive lags
-
-            # Normalise (so value at zero lag is 1)
-            autocorr = autocorr / autocorr[0]
-
-            # Find peaks in autocorrelation
-            peaks, _ = find_peaks(autocorr, height=0)
-
-            if len(peaks) >= 2:
-                # paper mentions that first peak is step regularity and second peak is stride regularity (only first and second peaks are mentioned)
-                step_peak_idx = peaks[0]
-                stride_peak_idx = peaks[1]
-
-                step_regularity = autocorr[step_peak_idx]
-                stride_regularity = autocorr[stride_peak_idx]
-            else:
-                step_regularity, stride_regularity = np.nan, np.nan  # cases with missing peaks
-
-            # checking if both step and stride regularity are greater than 0.15
-            if step_regularity > 0.15 and stride_regularity > 0.15:
-                regularity_check_results.append(1)
-            else:
-                regularity_check_results.append(0)
-
-        # Convert results to a boolean array
-        binary_regularity_thresh = np.array(regularity_check_results)
+        # paper mentions that first peak is step regularity and second peak is stride regularity (only first and
+        # second peaks are mentioned), both need to be greater than 0.15
+        binary_regularity_thresh = autocorrelation_regularity(windows, threshold=0.15)
 
         # 9. Combining all conditions and selecting central second windows which meet all conditions
         # stacking all condition arrays
@@ -239,19 +354,11 @@ class KerenGSD(BaseGsdDetector):
         # calculating the start and end indexes of the mid second of each window
         mid_second_start = start_indexes + center_seconds_start
         mid_second_end = start_indexes + center_seconds_end
-        # creating pd.DataFrame with starts and end when all conditions are met
-        filtered_starts = mid_second_start[result == 1]
-        filtered_ends = mid_second_end[result == 1]
-        # creating the dataframe
-        seconds_walking = pd.DataFrame({
-            'start': filtered_starts,
-            'end': filtered_ends
-        })
+        # starts and ends of the mid seconds when all conditions are met
+        seconds_walking = np.column_stack([mid_second_start[result == 1], mid_second_end[result == 1]])
 
         # merging consequtive seconds
-        merge_points = seconds_walking['start'] == seconds_walking['end'].shift()
-        group = (~merge_points).cumsum()
-        gs = seconds_walking.groupby(group).agg({'start': 'first', 'end': 'last'}).reset_index(drop=True)
+        gs = pd.DataFrame(merge_interval(seconds_walking), columns=['start', 'end'])
 
         # setting the index name
         gs.index.name = 'gs_id'
@@ -0,0 +1,210 @@
+"""Gait sequence detection restricted to the candidate regions found by a cheap activity pre-screen."""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Self, Unpack
+
+from multigait.GSD.base_gsd import BaseGsdDetector
+from multigait.GSD.chunked_gsd import ChunkedGSD, DataBlock
+from multigait.utils.array import RunLengthMask, merge_interval
+
+# Number of pre-screen windows whose samples are loaded at once
+_PRESCREEN_BLOCK_WINDOWS = 3600
+
+
+def prescreen_active_regions(
+    data: pd.DataFrame,
+    *,
+    sampling_rate_hz: float,
+    window_s: float = 1.0,
+    std_threshold_ms2: float = 0.1,
+    prescreen_sampling_rate_hz: float = 10.0,
+) -> np.ndarray:
+    """Find the regions of a recording that are not clearly inactive.
+
+    The norm of the acceleration is decimated to about ``prescreen_sampling_rate_hz`` by averaging consecutive
+    samples.
+    The standard deviation of the decimated norm is calculated in non-overlapping windows of ``window_s`` seconds.
+    A window is considered inactive, if the standard deviation is not larger than ``std_threshold_ms2``.
+    All other windows (including windows containing NaN values) are returned as active.
+    The recording is processed in blocks, so that no array with the length of the recording is created.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The recording with the columns ``acc_is``, ``acc_ml`` and ``acc_pa`` in m/s^2.
+    sampling_rate_hz : float
+        The sampling rate of the recording in Hz.
+    window_s : float, default=1.0
+        Length of the pre-screen windows in seconds.
+    std_threshold_ms2 : float, default=0.1
+        Windows with a standard deviation of the decimated acceleration norm larger than this value are active.
+    prescreen_sampling_rate_hz : float, default=10.0
+        Approximate sampling rate of the decimated norm.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_regions, 2) with the start and end (exclusive) of the active regions in samples.
+    """
+    decimation = max(round(sampling_rate_hz / prescreen_sampling_rate_hz), 1)
+    # The windows consist of a whole number of decimated samples
+    window = decimation * max(round(window_s * sampling_rate_hz / decimation), 1)
+    block_size = window * _PRESCREEN_BLOCK_WINDOWS
+    n_samples = len(data)
+
+    active_windows = []
+    for block_start in range(0, n_samples, block_size):
+        # The rows are selected first, so that only the block is copied
+        acc = data.iloc[block_start : block_start + block_size][["acc_is", "acc_ml", "acc_pa"]].to_numpy()
+        norm = np.linalg.norm(acc, axis=1)
+        n_full = len(norm) // window * window
+        decimated = norm[:n_full].reshape(-1, decimation).mean(axis=1)
+        window_std = decimated.reshape(-1, window // decimation).std(axis=1)
+        if n_full < len(norm):
+            # The last window of the recording is shorter. It is decimated the same way, with a shorter last group.
+            tail = norm[n_full:]
+            group_starts = np.arange(0, len(tail), decimation)
+            tail = np.add.reduceat(tail, group_starts) / np.diff(np.append(group_starts, len(tail)))
+            window_std = np.append(window_std, np.std(tail) if len(tail) > 1 else np.nan)
+        # NaN values are treated as active to never skip data that can not be judged
+        active_windows.append(~(window_std <= std_threshold_ms2))
+
+    if not active_windows:
+        return np.empty((0, 2), dtype=np.int64)
+    active_windows = RunLengthMask.from_bool(np.concatenate(active_windows))
+    return np.minimum(active_windows.intervals * window, n_samples)
+
+
+class CascadeGSD(BaseGsdDetector):
+    """
+    Wrapper around any gait sequence detector that skips clearly inactive parts of a recording.
+
+    Most hours of a free-living recording are sedentary.
+    A cheap pre-screen (see :func:`prescreen_active_regions`) marks all windows in which the acceleration norm is
+    not clearly constant.
+    These windows are extended by ``padding_s`` seconds on both sides, to provide the context the wrapped detector
+    needs (filters, analysis windows, minimal bout durations).
+    Regions separated by less than ``min_gap_s`` seconds are merged, as skipping short gaps saves less time than the
+    additional detector calls cost.
+    The wrapped detector is only run on these candidate regions and the detected gait sequences are mapped back to
+    the samples of the recording.
+
+    Parameters
+    ----------
+    detector : BaseGsdDetector
+        The gait sequence detector to apply to each candidate region. It is cloned for each region.
+    window_s : float, default=1.0
+        Length of the pre-screen windows in seconds.
+    std_threshold_ms2 : float, default=0.1
+        Windows with a standard deviation of the decimated acceleration norm larger than this value are candidates.
+        The default is above the sensor noise of resting periods and far below the acceleration changes of walking.
+    padding_s : float, default=10.0
+        Context added to both sides of the active windows in seconds.
+    min_gap_s : float, default=300.0
+        Minimal length of a skipped gap between two candidate regions in seconds.
+    prescreen_sampling_rate_hz : float, default=10.0
+        Approximate sampling rate of the decimated acceleration norm used by the pre-screen.
+
+    Attributes
+    ----------
+    gs_list_ : pd.DataFrame
+        The detected gait sequences relative to the start of the recording.
+    candidate_regions_ : pd.DataFrame
+        Start and end (exclusive) of the regions the wrapped detector was run on.
+    skipped_fraction_ : float
+        Fraction of the samples of the recording outside of the candidate regions.
+
+    Notes
+    -----
+    - The gait sequences are identical to a full run, if all walking lies in regions that are not clearly
+      inactive and the decisions of the wrapped detector only depend on a local context shorter than ``padding_s``.
+      The benchmark ``python -m benchmarks.bench_cascade_gsd`` reports the recall relative to full runs.
+    - Detectors using data-adaptive thresholds calculated over the whole recording (e.g. ``IonescuGSD`` with the
+      version ``wrist_adaptive``, ``MacLeanGSD`` with the version ``adaptive_lowback``) calculate these values per
+      candidate region instead. ``KerenGSD`` removes the mean of the whole input before its peak detection, which
+      also differs per candidate region. On the synthetic benchmark recordings about 98 % of the walking samples
+      of a full ``KerenGSD`` run are found with the default settings.
+    - Candidate regions are passed to the detector as a whole. For recordings with long active periods, the
+      cascade can itself be wrapped by :class:`~multigait.GSD.chunked_gsd.ChunkedGSD`.
+    """
+
+    detector: BaseGsdDetector
+    window_s: float
+    std_threshold_ms2: float
+    padding_s: float
+    min_gap_s: float
+    prescreen_sampling_rate_hz: float
+
+    candidate_regions_: pd.DataFrame
+    skipped_fraction_: float
+
+    def __init__(
+        self,
+        detector: BaseGsdDetector,
+        *,
+        window_s: float = 1.0,
+        std_threshold_ms2: float = 0.1,
+        padding_s: float = 10.0,
+        min_gap_s: float = 300.0,
+        prescreen_sampling_rate_hz: float = 10.0,
+    ) -> None:
+        self.detector = detector
+        self.window_s = window_s
+        self.std_threshold_ms2 = std_threshold_ms2
+        self.padding_s = padding_s
+        self.min_gap_s = min_gap_s
+        self.prescreen_sampling_rate_hz = prescreen_sampling_rate_hz
+
+    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100, **kwargs: Unpack[dict[str, Any]]) -> Self:
+        """
+        Detect gait sequences in the candidate regions of the provided data.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The full recording.
+        sampling_rate_hz : float, optional
+            The sampling rate of the input data in Hz (default: 100).
+        kwargs
+            Further keyword arguments passed to the ``detect`` method of the wrapped detector.
+
+        Returns
+        -------
+        Self
+            The instance with the detected gait sequences stored in ``gs_list_``.
+        """
+        if self.padding_s < 0:
+            raise ValueError("padding_s must not be negative.")
+
+        self.data = data
+        self.sampling_rate_hz = sampling_rate_hz
+
+        active_regions = prescreen_active_regions(
+            data,
+            sampling_rate_hz=sampling_rate_hz,
+            window_s=self.window_s,
+            std_threshold_ms2=self.std_threshold_ms2,
+            prescreen_sampling_rate_hz=self.prescreen_sampling_rate_hz,
+        )
+        padding = round(self.padding_s * sampling_rate_hz)
+        min_gap = round(self.min_gap_s * sampling_rate_hz)
+        # Regions separated by a gap shorter than min_gap are merged
+        candidates = merge_interval(np.clip(active_regions + [-padding, padding], 0, len(data)), max(min_gap - 1, 0))
+
+        self.candidate_regions_ = pd.DataFrame(candidates.tolist(), columns=["start", "end"], dtype="int64")
+        self.candidate_regions_.index.name = "region_id"
+        n_candidate_samples = int((candidates[:, 1] - candidates[:, 0]).sum())
+        self.skipped_fraction_ = 1 - n_candidate_samples / len(data) if len(data) else 0.0
+
+        # Each candidate region is a block without overlap margins, so all its gait sequences are kept
+        blocks = (DataBlock(start, start, end, data.iloc[start:end]) for start, end in candidates)
+        self.gs_list_ = (
+            ChunkedGSD(self.detector).detect_blocks(blocks, sampling_rate_hz=sampling_rate_hz, **kwargs).gs_list_
+        )
+        return self
+
+
+__all__ = ["CascadeGSD", "prescreen_active_regions"]
@@ -0,0 +1,202 @@
+"""Block-wise gait sequence detection for long (multi-day) recordings."""
+
+import inspect
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Self, Unpack
+
+from multigait.GSD.base_gsd import BaseGsdDetector
+from multigait.GSD.utils.GSD1_utils import format_gait_sequences
+from multigait.utils.array import merge_interval
+
+
+class DataBlock(NamedTuple):
+    """A block of samples of a longer recording.
+
+    ``data`` covers the samples ``[start, start + len(data))`` of the recording.
+    Only the gait sequences within the core region ``[core_start, core_end)`` are kept from this block.
+    The remaining samples are the overlap margins that provide the context for the detection close to the core
+    boundaries.
+    """
+
+    start: int
+    core_start: int
+    core_end: int
+    data: pd.DataFrame
+
+
+def iter_overlapping_blocks(data: pd.DataFrame, *, block_size: int, overlap: int) -> Iterator[DataBlock]:
+    """Split a recording into consecutive blocks with overlap margins on both sides.
+
+    The core regions of the blocks are non-overlapping, have a length of ``block_size`` (except the last one) and
+    cover the entire recording.
+    Each block is extended by ``overlap`` samples on both sides (clipped to the recording).
+    The data of the blocks are views into ``data`` (``iloc`` slices), so no copies are created.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The full recording.
+    block_size : int
+        Length of the core region of each block in samples.
+    overlap : int
+        Number of samples added to each side of the core region.
+
+    Yields
+    ------
+    DataBlock
+        The blocks in temporal order.
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be a positive integer.")
+    if overlap < 0:
+        raise ValueError("overlap must not be negative.")
+
+    n_samples = len(data)
+    for core_start in range(0, n_samples, block_size):
+        core_end = min(core_start + block_size, n_samples)
+        start = max(core_start - overlap, 0)
+        end = min(core_end + overlap, n_samples)
+        yield DataBlock(start, core_start, core_end, data.iloc[start:end])
+
+
+def _stitch_gait_sequences(clipped_gs: list[np.ndarray]) -> np.ndarray:
+    """Merge gait sequences of consecutive blocks that touch or overlap at the core boundaries."""
+    if len(clipped_gs) == 0:
+        return np.empty((0, 2), dtype="int64")
+    return merge_interval(np.concatenate(clipped_gs))
+
+
+class ChunkedGSD(BaseGsdDetector):
+    """
+    Block-wise wrapper around any gait sequence detector for recordings that do not fit into memory.
+
+    The recording is processed in blocks of ``block_size_s`` seconds that are extended by ``overlap_s`` seconds on
+    both sides.
+    The wrapped detector is run on each block independently.
+    From every block only the parts of the gait sequences within its core region are kept, and gait sequences that
+    cross a block boundary are stitched back together.
+    This way, the peak memory is bounded by the block size and not by the length of the recording.
+
+    The blocks can either be created from a full recording (:meth:`detect`) or be provided by any iterator of
+    :class:`DataBlock` objects (:meth:`detect_blocks`), e.g. a reader that decodes a file block by block.
+
+    Parameters
+    ----------
+    detector : BaseGsdDetector
+        The gait sequence detector to apply to each block. It is cloned for each block.
+    block_size_s : float, default=3600
+        Length of the core region of each block in seconds.
+    overlap_s : float, default=60
+        Length of the margins on both sides of the core region in seconds.
+
+    Attributes
+    ----------
+    gs_list_ : pd.DataFrame
+        The detected gait sequences relative to the start of the recording.
+    n_blocks_ : int
+        Number of processed blocks.
+
+    Notes
+    -----
+    - The result is identical to a full-signal run as long as the decisions of the wrapped detector only depend on
+      a local context that is shorter than ``overlap_s``.
+      This includes the merging of close gait sequences (e.g. Continuous Walking Bouts with 3 s breaks) and minimal
+      duration checks.
+      For ``HickeyGSD`` and ``MacLeanGSD`` (versions with fixed thresholds) this is the case.
+    - Detectors using data-adaptive thresholds calculated over the whole recording (e.g. ``IonescuGSD``, the
+      adaptive versions of ``MacLeanGSD``), removing the mean of the whole input (``KerenGSD``) or resampling the
+      recording as a whole (``KheirkhahanGSD``) calculate these values per block instead.
+      Their results are close to, but not necessarily identical with a full run.
+    - ``block_size_s`` and ``overlap_s`` should be multiples of the internal window length of the wrapped detector,
+      so that the window grid of each block is aligned with the grid of a full run.
+      Whole seconds work for all detectors in this package.
+    """
+
+    detector: BaseGsdDetector
+    block_size_s: float
+    overlap_s: float
+
+    n_blocks_: int
+
+    def __init__(self, detector: BaseGsdDetector, *, block_size_s: float = 3600, overlap_s: float = 60) -> None:
+        self.detector = detector
+        self.block_size_s = block_size_s
+        self.overlap_s = overlap_s
+
+    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100, **kwargs: Unpack[dict[str, Any]]) -> Self:
+        """
+        Detect gait sequences block by block in the provided data.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The full recording.
+        sampling_rate_hz : float, optional
+            The sampling rate of the input data in Hz (default: 100).
+        kwargs
+            Further keyword arguments passed to the ``detect`` method of the wrapped detector.
+
+        Returns
+        -------
+        Self
+            The instance with the detected gait sequences stored in ``gs_list_``.
+        """
+        self.data = data
+        blocks = iter_overlapping_blocks(
+            data,
+            block_size=round(self.block_size_s * sampling_rate_hz),
+            overlap=round(self.overlap_s * sampling_rate_hz),
+        )
+        return self.detect_blocks(blocks, sampling_rate_hz=sampling_rate_hz, **kwargs)
+
+    def detect_blocks(
+        self, blocks: Iterable[DataBlock], *, sampling_rate_hz: float = 100, **kwargs: Unpack[dict[str, Any]]
+    ) -> Self:
+        """
+        Detect gait sequences in a stream of data blocks.
+
+        Only one block is kept in memory at a time.
+        The blocks must be provided in temporal order and their core regions must not overlap.
+
+        Parameters
+        ----------
+        blocks : Iterable[DataBlock]
+            The blocks of the recording (see :func:`iter_overlapping_blocks`).
+        sampling_rate_hz : float, optional
+            The sampling rate of the input data in Hz (default: 100).
+        kwargs
+            Further keyword arguments passed to the ``detect`` method of the wrapped detector.
+
+        Returns
+        -------
+        Self
+            The instance with the detected gait sequences stored in ``gs_list_``.
+        """
+        self.sampling_rate_hz = sampling_rate_hz
+
+        # Some detectors (e.g. MacLeanGSD) get the sampling rate on initialisation and not in ``detect``
+        if "sampling_rate_hz" in inspect.signature(self.detector.detect).parameters:
+            kwargs = {**kwargs, "sampling_rate_hz": sampling_rate_hz}
+
+        clipped_gs = []
+        self.n_blocks_ = 0
+        for block in blocks:
+            self.n_blocks_ += 1
+            block_gs = self.detector.clone().detect(block.data, **kwargs).gs_list_
+            if block_gs.empty:
+                continue
+            # Converting to recording coordinates and only keeping the parts within the core region
+            gs = block_gs[["start", "end"]].to_numpy(dtype="int64") + block.start
+            gs = np.clip(gs, block.core_start, block.core_end)
+            clipped_gs.append(gs[gs[:, 1] > gs[:, 0]])
+
+        gs = _stitch_gait_sequences(clipped_gs)
+        self.gs_list_ = format_gait_sequences(gs) if len(gs) else self.empty_gs_df()
+        return self
+
+
+__all__ = ["ChunkedGSD", "DataBlock", "iter_overlapping_blocks"]
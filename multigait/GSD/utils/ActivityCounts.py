@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import Union
 import numpy as np
 from scipy import signal
@@ -22,6 +23,9 @@ class ActivityCounts:
     sampling_rate = None
     activity_counts_ = None
 
+    # Overlap (in seconds) of the blocks for the anti-aliasing filter of the first downsampling step
+    _INPUT_MARGIN_S = 10
+
     def _aliasing_filter(self, data: np.ndarray, sampling_rate: Union[int, float]) -> np.ndarray:
         """
         Apply a band-pass filter to the data to mitigate aliasing effects.
@@ -87,14 +91,79 @@ class ActivityCounts:
             return signal.decimate(data, int(sampling_rate / final_sampling_rate))
         else:
             # Apply an anti-aliasing filter
-            b, a = signal.cheby1(N=8, rp=0.05, Wn=0.8 / (sampling_rate / final_sampling_rate))
-            data_lp = signal.filtfilt(a=a, b=b, x=data)
+            data_lp = self._anti_aliasing_lowpass(data, sampling_rate / final_sampling_rate)
             # Perform interpolation
             x_old = np.linspace(0, len(data_lp), num=len(data_lp), endpoint=False)
             x_new = np.linspace(0, len(data_lp), num=int(len(data_lp) / (sampling_rate / final_sampling_rate)), endpoint=False)
             interpol = interp1d(x=x_old, y=data_lp)
             return interpol(x_new)
 
+    def _anti_aliasing_lowpass(self, data: np.ndarray, downsampling_factor: float) -> np.ndarray:
+        """
+        Apply the low-pass filter used before downsampling by a non-integer factor.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The input signal data.
+        downsampling_factor : float
+            Ratio between the original and the final sampling rate.
+
+        Returns
+        -------
+        np.ndarray
+            The filtered data.
+        """
+        b, a = signal.cheby1(N=8, rp=0.05, Wn=0.8 / downsampling_factor)
+        return signal.filtfilt(a=a, b=b, x=data)
+
+    def _downsample_block(
+        self, data, sampling_rate: Union[int, float], n_samples_30hz: int, start_30hz: int, end_30hz: int
+    ) -> np.ndarray:
+        """
+        Downsample the part of the data needed for the samples ``start_30hz:end_30hz`` of the 30 Hz signal.
+
+        The samples are placed on the same grid as by ``_downsample`` applied to the entire data.
+        Only the data around these samples (extended by ``_INPUT_MARGIN_S`` seconds on both sides for the
+        anti-aliasing filter) is loaded and filtered.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The entire input signal data (or any object supporting ``len`` and slicing).
+        sampling_rate : Union[int, float]
+            The sampling rate of the input data.
+        n_samples_30hz : int
+            The number of samples of the entire 30 Hz signal.
+        start_30hz, end_30hz : int
+            The range of samples of the 30 Hz signal to return.
+
+        Returns
+        -------
+        np.ndarray
+            The downsampled data.
+        """
+        n_samples = len(data)
+        downsampling_factor = sampling_rate / 30
+        margin = int(np.ceil(self._INPUT_MARGIN_S * sampling_rate))
+        if downsampling_factor % 1 == 0:
+            q = int(downsampling_factor)
+            # The start is a multiple of q, so that decimation keeps the samples of the full signal
+            start = max(start_30hz - int(np.ceil(margin / q)), 0) * q
+            end = min((end_30hz - 1) * q + 1 + margin, n_samples)
+            decimated = signal.decimate(np.asarray(data[start:end], dtype=float), q)
+            return decimated[start_30hz - start // q : end_30hz - start // q]
+
+        # Positions of the samples on the grid of np.linspace(0, n_samples, num=n_samples_30hz, endpoint=False)
+        positions = np.arange(start_30hz, end_30hz, dtype=float) * (n_samples / n_samples_30hz)
+        start = max(int(positions[0]) - margin, 0)
+        end = min(int(positions[-1]) + 2 + margin, n_samples)
+        data_lp = self._anti_aliasing_lowpass(np.asarray(data[start:end], dtype=float), downsampling_factor)
+        # Shifting integer positions and positions on the grid by the same integer is exact
+        x_old = np.linspace(0, len(data_lp), num=len(data_lp), endpoint=False)
+        interpol = interp1d(x=x_old, y=data_lp)
+        return interpol(positions - start)
+
     def _truncate(self, data: np.ndarray) -> np.ndarray:
         """
         Truncate the input data by applying upper and lower thresholds.
@@ -179,4 +248,91 @@ class ActivityCounts:
         tmp = self._truncate(tmp)
         tmp = self._digitize_8bit(tmp)
         self.activity_counts_ = self._accumulate_second_bins(tmp)
-        return self
\ No newline at end of file
+        return self
+
+    def iter_calculate(
+        self,
+        data,
+        sampling_rate: Union[int, float],
+        *,
+        block_size_s: int = 6 * 3600,
+        overlap_s: int = 1800,
+    ) -> Iterator[np.ndarray]:
+        """
+        Calculate activity counts from the input IMU signal block by block.
+
+        The counts are calculated for blocks of ``block_size_s`` seconds and yielded as soon as a block is finished.
+        Each block is processed together with ``overlap_s`` seconds of the signal before and after it, so that the
+        filters are settled at the block boundaries.
+        This way, the intermediate signals never need to be held in memory for the entire recording.
+        The input is only accessed by slicing, so that ``data`` can also be a memory-mapped array or any other
+        object supporting ``len`` and slicing with ``data[start:end]``.
+
+        Concatenated, the yielded arrays have the same length as ``activity_counts_`` after :meth:`calculate`.
+        If the recording is not longer than a single block, they are identical.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The raw input signal data.
+        sampling_rate : Union[int, float]
+            The sampling rate of the input data.
+        block_size_s : int
+            Number of seconds (i.e. counts) per block. Default is 6 h.
+        overlap_s : int
+            Number of seconds added to both sides of each block. Default is 30 min.
+
+        Yields
+        ------
+        np.ndarray
+            The activity counts of the consecutive seconds of each block.
+
+        Notes
+        -----
+        All filters are infinite impulse response filters applied forward and backward (as ``filtfilt``).
+        Compared to filtering the entire recording, the filtered signal within a block therefore differs by the
+        remaining response to the signal beyond the overlap.
+        It decays with the slowest pole of the filters, which is the one of the 0.01 Hz high-pass edge of the
+        band-pass filter with a time constant of about 52 s.
+        The difference is bounded by about ``exp(-overlap_s / 52 s)`` relative to the amplitude of the signal,
+        i.e. in the order of 1e-15 for the default overlap.
+        As the counts are digitized, they only differ, if a filtered sample is within this distance to a
+        digitization step.
+        The anti-aliasing filter of the first downsampling step uses a fixed overlap of ``_INPUT_MARGIN_S`` seconds,
+        which is more than 50 times its time constant.
+        """
+        if block_size_s < 1:
+            raise ValueError("block_size_s must be at least 1 second.")
+        if overlap_s < 0:
+            raise ValueError("overlap_s must not be negative.")
+        block_size_s = int(block_size_s)
+        margin_30hz = int(np.ceil(overlap_s)) * 30
+
+        n_samples = len(data)
+        if (sampling_rate / 30) % 1 == 0:
+            n_samples_30hz = len(range(0, n_samples, int(sampling_rate / 30)))
+        else:
+            n_samples_30hz = int(n_samples / (sampling_rate / 30))
+        n_samples_10hz = len(range(0, n_samples_30hz, 3))
+        # _accumulate_second_bins always pads the data, so there is one more bin than full seconds
+        n_seconds = n_samples_10hz // 10 + 1
+
+        for first_second in range(0, n_seconds, block_size_s):
+            last_second = min(first_second + block_size_s, n_seconds)
+            # All boundaries at 30 Hz are multiples of 30 (or the end of the signal), so that the samples kept by the
+            # decimation to 10 Hz and the second bins are the ones of the entire signal
+            start_30hz = max(30 * first_second - margin_30hz, 0)
+            end_30hz = min(30 * last_second + margin_30hz, n_samples_30hz)
+
+            tmp = self._downsample_block(data, sampling_rate, n_samples_30hz, start_30hz, end_30hz)
+            tmp = self._aliasing_filter(tmp, 30)
+            tmp = self._actigraph_filter(tmp)
+            tmp = self._downsample(tmp, 30, 10)
+            tmp = tmp[10 * first_second - start_30hz // 3 : min(10 * last_second, n_samples_10hz) - start_30hz // 3]
+            tmp = np.abs(tmp)
+            tmp = self._truncate(tmp)
+            tmp = self._digitize_8bit(tmp)
+
+            n_bins = last_second - first_second
+            padded_data = np.pad(tmp, (0, 10 * n_bins - len(tmp)), 'constant', constant_values=0)
+            yield padded_data.reshape((n_bins, -1)).sum(axis=1)
@@ -1,13 +1,13 @@
 import pandas as pd
-import numba
 import numpy as np
-from intervaltree import IntervalTree
 from numba import njit
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.signal import find_peaks, hilbert
 from multigait.utils.array import (
+    RunLengthMask,
     merge_interval,
-    bool_array_to_start_end,
-    start_end_array_to_bool)
+    intersect_intervals,
+    filter_intervals_by_length)
 
 
 def active_regions_from_hilbert_envelop(sig: np.ndarray, smooth_window: int, duration: int) -> np.ndarray:
@@ -43,46 +43,60 @@ def active_regions_from_hilbert_envelop(sig: np.ndarray, smooth_window: int, dur
         "same",  # Smooth
     )
 
-    active = np.zeros(len(env))
+    active = np.zeros(len(env), dtype=bool)
 
     env -= np.mean(env)  # Get rid of offset
     if np.all(env == 0):
-        return active.astype(bool)
+        return active
     env /= np.max(env)  # Normalize
 
     threshold_sig = 4 * np.nanmean(env)
     noise = np.mean(env) / 3  # Noise level
     threshold = np.mean(env)  # Signal level
-    update_threshold = False
 
-    # Initialize Buffers
-    noise_buff = np.zeros(len(env) - duration + 1)
+    if np.isnan(threshold_sig) or len(env) < duration:
+        return active
+
+    # The mean and the minimum of every window of `duration` samples do not depend on the adaptive threshold and are
+    # calculated upfront. All windows are above the threshold, if their minimum is.
+    windows = sliding_window_view(env, duration)
+    active[: len(windows)] = _adaptive_threshold_active_windows(
+        windows.mean(axis=1), windows.min(axis=1), threshold_sig, noise, threshold
+    )
+    return active
 
-    if np.isnan(threshold_sig):
-        return active.astype(bool)
 
-    maxenv = max(env)
-    for i in range(len(env) - duration + 1):
+@njit(cache=True)
+def _adaptive_threshold_active_windows(
+    window_means: np.ndarray, window_mins: np.ndarray, threshold_sig: float, noise: float, threshold: float
+) -> np.ndarray:
+    n_windows = len(window_means)
+    active = np.zeros(n_windows, dtype=np.bool_)
+    # The noise buffer holds one noise level per window (0 for windows not processed yet). Only its sum is needed.
+    noise_buff_sum = 0.0
+    noise_buff_any = False
+    update_threshold = False
+    for i in range(n_windows):
         # Update threshold 10% of the maximum peaks found
-        window = env[i : i + duration]
-        mean_win = np.mean(window)
-        if (window > threshold_sig).all():
-            active[i] = maxenv
+        mean_win = window_means[i]
+        if window_mins[i] > threshold_sig:
+            active[i] = True
             threshold = 0.1 * mean_win
             update_threshold = True
         elif mean_win < threshold_sig:
             noise = mean_win
-        elif noise_buff.any():
-            noise = np.mean(noise_buff)
+        elif noise_buff_any:
+            noise = noise_buff_sum / n_windows
         # NOTE: no else case in the original implementation
 
-        noise_buff[i] = noise
+        noise_buff_sum += noise
+        noise_buff_any = noise_buff_any or noise != 0
 
         # Update threshold
         if update_threshold:
             threshold_sig = noise + 0.50 * (abs(threshold - noise))
 
-    return active.astype(bool)
+    return active
 
 
 @njit(cache=True)
@@ -145,22 +159,46 @@ def find_intersections(intervals_a: np.ndarray, intervals_b: np.ndarray) -> np.n
     -------
     np.ndarray
         Array of intervals representing overlaps between `intervals_a` and `intervals_b`.
+        Overlaps that touch each other are merged.
     """
-    # Create Interval Trees
-    intervals_a_tree = IntervalTree.from_tuples(intervals_a)
-    intervals_b_tree = IntervalTree.from_tuples(intervals_b)
+    return intersect_intervals(intervals_a, intervals_b)
+
+
+def step_stats_per_gait_sequence(steps: np.ndarray, gait_sequences: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Count the steps within each gait sequence and calculate their mean step time.
 
-    overlap_intervals = []
+    The steps within a gait sequence are found by binary search in the sorted steps, so the cost does not grow with
+    the product of the number of gait sequences and steps.
 
-    for interval in intervals_b_tree:
-        overlaps = sorted(intervals_a_tree.overlap(interval.begin, interval.end))
-        if overlaps:
-            for overlap in overlaps:
-                start = max(interval.begin, overlap.begin)
-                end = min(interval.end, overlap.end)
-                overlap_intervals.append([start, end])
+    Parameters
+    ----------
+    steps : np.ndarray
+        Sorted 1D array of step positions in samples.
+    gait_sequences : np.ndarray
+        Array of shape (n, 2) with the start and end of each gait sequence. Steps at the start or end are included.
 
-    return merge_interval(np.array(overlap_intervals)) if len(overlap_intervals) != 0 else np.array([])
+    Returns
+    -------
+    n_steps : np.ndarray
+        Number of steps within each gait sequence.
+    mean_step_times : np.ndarray
+        Mean distance between consecutive steps within each gait sequence in samples.
+        NaN for gait sequences with less than two steps.
+    """
+    gait_sequences = np.asarray(gait_sequences).reshape(-1, 2)
+    first_step = np.searchsorted(steps, gait_sequences[:, 0], side="left")
+    # Index after the last step within the gait sequence
+    last_step = np.searchsorted(steps, gait_sequences[:, 1], side="right")
+    n_steps = last_step - first_step
+
+    # The mean of the differences between consecutive steps is the distance between the first and the last step
+    # divided by the number of differences
+    has_step_time = n_steps > 1
+    mean_step_times = np.full(len(gait_sequences), np.nan)
+    mean_step_times[has_step_time] = (steps[last_step[has_step_time] - 1] - steps[first_step[has_step_time]]) / (
+        n_steps[has_step_time] - 1
+    )
+    return n_steps, mean_step_times
 
 
 class NoActivePeriodsDetectedError(Exception):
@@ -180,16 +218,12 @@ def find_active_period_peak_threshold(
     if not np.any(active_regions):
         raise NoActivePeriodsDetectedError()
 
-    active_regions_start_end = bool_array_to_start_end(active_regions)
-    to_short_active_regions = (
-        active_regions_start_end[:, 1] - active_regions_start_end[:, 0]
-    ) <= min_active_period_duration
-    active_regions_start_end = active_regions_start_end[~to_short_active_regions]
+    active_periods = RunLengthMask.from_bool(active_regions).filter_by_length(min_active_period_duration)
 
-    if len(active_regions_start_end) == 0:
+    if active_periods.n_runs == 0:
         raise NoActivePeriodsDetectedError()
 
-    final_active_area = signal[start_end_array_to_bool(active_regions_start_end, len(active_regions))]
+    final_active_area = active_periods.take(signal)
 
     _, props_p = find_peaks(final_active_area, height=0)
     _, props_n = find_peaks(-final_active_area, height=0)
@@ -239,26 +273,4 @@ def combine_intervals(intervals: np.ndarray, max_gap: int = 0) -> np.ndarray:
     np.ndarray
         Array of merged intervals.
     """
-    if intervals.shape[0] == 0:
-        return intervals
-
-    sorted_intervals = np.sort(intervals, axis=0, kind="stable")
-    merged_list = _merge_overlap_numba(sorted_intervals, max_gap)
-    return np.array(merged_list)
-
-@njit
-def _merge_overlap_numba(intervals: np.ndarray, max_gap: int) -> numba.typed.List:
-    """Helper function for merging intervals using numba for speed."""
-    merged = numba.typed.List()
-    merged.append(intervals[0])
-
-    for i in range(1, len(intervals)):
-        current_start, current_end = intervals[i]
-        last_start, last_end = merged[-1]
-
-        if last_start <= current_start <= (last_end + max_gap) <= (current_end + max_gap):
-            merged[-1][1] = current_end
-        else:
-            merged.append(intervals[i])
-
-    return merged
+    return merge_interval(intervals, max_gap)
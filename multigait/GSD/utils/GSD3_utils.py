@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 from scipy.interpolate import interp1d
+from multigait.utils.array import RunLengthMask
 
 def window(a, w=4, o=2, copy=False):
     """
@@ -125,11 +126,63 @@ def generate_gs_list(detected_walking: np.ndarray, sampling_rate=1):
     Returns:
     list: A list of tuples where each tuple contains the start and end times of a walking bout.
     """
-    cuts = np.where(np.diff(detected_walking) != 0)[0] + 1
-    wbs = np.split(detected_walking, cuts)
-    wb_list = [(int(c / sampling_rate), int((c + len(wb)) / sampling_rate)) for c, wb in zip([0] + list(cuts), wbs) if wb[0] == True]
+    # The walking bouts are the runs of values equal to True, stored as start and end (exclusive) of every run
+    walking = RunLengthMask.from_bool(np.asarray(detected_walking) == True)
+    wb_list = (walking.intervals / sampling_rate).astype(int).tolist()
 
     # Create a DataFrame from the list of tuples
     df = pd.DataFrame(wb_list, columns=['start', 'end'])
     df.index.name = 'gs_id'
-    return df
\ No newline at end of file
+    return df
+
+
+def _n_samples_up_to(positions: np.ndarray, n_seconds: int, n_samples: int) -> np.ndarray:
+    """
+    Count the samples placed at or before the given positions by ``resample_to_orginal_data_length``.
+
+    The samples are placed at ``np.linspace(0, n_seconds - 1, n_samples)``. The counts are found from an estimate that
+    is corrected with the exact floating point positions of the samples, so that the linspace array is not needed.
+    """
+    positions = np.asarray(positions, dtype=float)
+    step = (n_seconds - 1) / (n_samples - 1)
+    # Index of the last sample before the (always exact) last one with a position <= the given position
+    last = np.clip(np.floor(positions / step), -1, n_samples - 2).astype(np.int64)
+    too_far = (last >= 0) & (last * step > positions)
+    while too_far.any():
+        last[too_far] -= 1
+        too_far = (last >= 0) & (last * step > positions)
+    not_far_enough = (last < n_samples - 2) & ((last + 1) * step <= positions)
+    while not_far_enough.any():
+        last[not_far_enough] += 1
+        not_far_enough = (last < n_samples - 2) & ((last + 1) * step <= positions)
+    return np.where(positions >= n_seconds - 1, n_samples, last + 1)
+
+
+def generate_gs_list_from_seconds(walking_seconds: np.ndarray, n_samples: int) -> pd.DataFrame:
+    """
+    Generate a list of walking bouts (start and end samples) from the per-second walking detection.
+
+    The result is equal to ``generate_gs_list(resample_to_orginal_data_length(walking_seconds, n_samples).astype(bool))``,
+    but the walking bouts are determined on the per-second values and only their boundaries are mapped to samples.
+    No array with the length of the original data is created.
+
+    Parameters:
+    walking_seconds (np.ndarray): Per-second walking detection. Non-zero values indicate walking.
+    n_samples (int): Length of the original data.
+
+    Returns:
+    pd.DataFrame: The walking bouts with the columns 'start' and 'end' in samples and the index 'gs_id'.
+    """
+    n_seconds = len(walking_seconds)
+    bouts = RunLengthMask.from_bool(np.asarray(walking_seconds) != 0).intervals
+
+    # The nearest neighbour interpolation assigns a sample to the second s, if its position is within (s - 0.5, s + 0.5]
+    # So, a bout covering the seconds [start, end) covers all samples with a position within (start - 0.5, end - 0.5]
+    sample_bouts = _n_samples_up_to(bouts - 0.5, n_seconds, n_samples).reshape(-1, 2)
+    # Bouts can only become empty or touch each other, if there are fewer samples than seconds
+    sample_bouts = RunLengthMask.from_intervals(sample_bouts, n_samples).intervals
+
+    # Create a DataFrame from the list of tuples
+    df = pd.DataFrame(sample_bouts.tolist(), columns=['start', 'end'])
+    df.index.name = 'gs_id'
+    return df
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from multigait.utils.array import merge_interval
+
+
 def cwb(df, max_break_seconds=3, sampling_rate=100):
     """
     Creating a Continuous Walking Bout (CWB) from micro walking bouts.
@@ -31,27 +34,13 @@ def cwb(df, max_break_seconds=3, sampling_rate=100):
 
     max_break = max_break_seconds * sampling_rate
 
-    merged = []
-    current_start = df.iloc[0]["start"]
-    current_end = df.iloc[0]["end"]
-
-    for i in range(1, len(df)):
-        gap = df.iloc[i]["start"] - current_end
-
-        if gap <= max_break:
-            current_end = max(current_end, df.iloc[i]["end"])
-        else:
-            merged.append({"start": current_start, "end": current_end})
-            current_start = df.iloc[i]["start"]
-            current_end = df.iloc[i]["end"]
-
-    # Append final bout
-    merged.append({"start": current_start, "end": current_end})
+    # Merge bouts whose gap to the (running) end of the previous bouts is not larger than max_break
+    merged = merge_interval(df[["start", "end"]].to_numpy(), max_break)
 
     # Build output
-    out = pd.DataFrame(merged)
+    out = pd.DataFrame(merged, columns=["start", "end"])
 
     # Preserve or assign index name
     out.index.name = df.index.name or "gs_id"
 
-    return out
\ No newline at end of file
+    return out
@@ -1,10 +1,17 @@
 import numpy as np
 
+from multigait.utils.array import union_intervals
+
+
 def merge_bouts(wb_starts: np.ndarray, wb_ends: np.ndarray, non_wb_starts: np.ndarray, non_wb_ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
     Merges walking bout start and end times, including intervals originally labeled
     as non-walking that should be considered part of walking.
 
+    The walking bouts and the non-walking intervals are combined into one set of intervals, in which overlapping and
+    touching intervals are merged. A non-walking interval spanning the gap between two consecutive walking bouts
+    therefore joins both bouts.
+
     Parameters:
         wb_starts (array-like): Start times of walking bouts.
         wb_ends (array-like): End times of walking bouts.
@@ -15,31 +22,30 @@ def merge_bouts(wb_starts: np.ndarray, wb_ends: np.ndarray, non_wb_starts: np.nd
         merged_starts (numpy array): Start times of merged walking bouts.
         merged_ends (numpy array): End times of merged walking bouts.
     """
-    merged_starts = []
-    merged_ends = []
-
-    i = 0
-    while i < len(wb_starts):
-        start = wb_starts[i]
-        end = wb_ends[i]
-
-        # Check for non-WB as gaps which need to be merged
-        if i < len(wb_starts) - 1 and wb_ends[i] in non_wb_starts and wb_starts[i+1] in non_wb_ends:
-            # Merge the current bout with the next
-            end = wb_ends[i+1]
-            #i += 1 # Skip the next bout
-
-        merged_starts.append(start)
-        merged_ends.append(end)
-        i += 1
-
-        j = 0
-        while j < len(merged_starts) - 1:
-            if merged_ends[j] > merged_starts[j+1]:
-                merged_ends[j] = merged_ends[j+1]
-                del merged_starts[j+1]
-                del merged_ends[j+1]
-            else:
-                j += 1
-
-    return np.array(merged_starts), np.array(merged_ends)
\ No newline at end of file
+    merged = union_intervals(np.column_stack([wb_starts, wb_ends]), np.column_stack([non_wb_starts, non_wb_ends]))
+    return merged[:, 0], merged[:, 1]
+
+
+def merge_bouts_across_gaps(wb_starts: np.ndarray, wb_ends: np.ndarray, merge_gap: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges consecutive walking bouts, if the gap between them should be considered part of walking.
+
+    For sorted and non-overlapping walking bouts this is equal to calling ``merge_bouts`` with the gaps selected by
+    ``merge_gap`` as non-walking intervals, but the merged bouts are found from the selected gaps directly.
+
+    Parameters:
+        wb_starts (numpy array): Sorted start times of walking bouts.
+        wb_ends (numpy array): End times of walking bouts.
+        merge_gap (numpy array): Boolean array with one value per gap between consecutive walking bouts. True, if the
+            walking bouts before and after the gap should be merged.
+
+    Returns:
+        merged_starts (numpy array): Start times of merged walking bouts.
+        merged_ends (numpy array): End times of merged walking bouts.
+    """
+    if len(wb_starts) == 0:
+        return wb_starts, wb_ends
+    # A merged bout begins at the first walking bout and after every gap that is kept
+    first = np.flatnonzero(np.concatenate([[True], ~np.asarray(merge_gap, dtype=bool)]))
+    last = np.append(first[1:], len(wb_starts)) - 1
+    return wb_starts[first], wb_ends[last]
@@ -1,16 +1,162 @@
 import numpy as np
 import pandas as pd
 import warnings
-from typing import Literal
-from multigait.GSD.utils.gravity_remove_butter import gravity_motion_butterworth
+from typing import Literal, Optional
 from typing_extensions import Self
 from multigait.ICD.utils.auto_cov_unbiased import auto_cov_unbiased
-from multigait.ICD.utils.dtwDasGupta import dtwdasgupta
+from multigait.ICD.utils.dtwDasGupta import dtwdasgupta, dtwdasgupta_banded
 from multigait.ICD.utils.peakfind import peakfind
 from scipy.signal import detrend, find_peaks
 from mobgap.data_transform import ButterworthFilter, chain_transformers
 from numpy.lib.stride_tricks import sliding_window_view
 from multigait.ICD.base_ic import BaseIcDetector
+from multigait.utils.signal_context import GsSignalContext
+
+
+def _stride_section(acc: np.ndarray, middlemaxima: np.ndarray, idx: int, templatesize: int, shift: int) -> np.ndarray:
+    """Section of the signal around the middle maximum `idx`, clipped to the signal bounds."""
+    start = max(middlemaxima[idx] - shift, 0)
+    end = min(middlemaxima[idx] + templatesize, len(acc))
+    return acc[start:end]
+
+
+def _ensemble_template_exact(acc: np.ndarray, middlemaxima: np.ndarray, templatesize: int, shift: int) -> np.ndarray:
+    """Ensemble the gait template following the original implementation.
+
+    Every row of the ensemble aligns all consecutive sections of the previous row with DTW, which results in
+    O(n^2) DTW calls for n middle maxima.
+    """
+    nmiddlemaxima = len(middlemaxima)
+
+    if nmiddlemaxima == 3:
+        reference_section = _stride_section(acc, middlemaxima, 0, templatesize, shift)
+        target_section = _stride_section(acc, middlemaxima, 1, templatesize, shift)
+        return dtwdasgupta(reference_section, target_section)[:templatesize]
+
+    # Initialising variables to avoid warnings
+    reference_section = None
+    target_section = None
+
+    # initialise results section and new results section
+    resultssection = []
+    newresultssection = []
+
+    for iRowJunks in range(nmiddlemaxima, 1, -1):
+        for iJunks in range(1, iRowJunks - 1):
+            if iRowJunks == nmiddlemaxima:
+                # Extract sections
+                reference_section = _stride_section(acc, middlemaxima, iJunks - 1, templatesize, shift)
+                target_section = _stride_section(acc, middlemaxima, iJunks, templatesize, shift)
+
+                # dtw
+                dtwsection = dtwdasgupta(reference_section, target_section)
+
+                # storing results
+                resultssection.append(dtwsection[:templatesize])
+
+            else:
+                if iJunks == 1 and iRowJunks < nmiddlemaxima - 1:
+                    resultssection = newresultssection.copy()
+                    newresultssection = []
+
+            if len(resultssection) > iJunks:
+                reference_section = resultssection[iJunks]
+
+            if iJunks + 1 < len(resultssection):
+                target_section = resultssection[iJunks + 1]
+
+            # dtw
+            if reference_section is not None:
+                dtwsection = dtwdasgupta(reference_section.T, target_section.T)
+            else:
+                # Handle the case where reference_section was not assigned
+                raise ValueError("reference_section was not initialized.")
+
+            # append
+            if len(newresultssection) < len(resultssection):  # Ensure it's not out of bounds
+                newresultssection.append(dtwsection[:templatesize + 1])  # Store up to templatesize + 1
+
+    return newresultssection[0]
+
+
+def _ensemble_template_fast(
+    acc: np.ndarray, middlemaxima: np.ndarray, templatesize: int, shift: int, band: Optional[int] = None
+) -> np.ndarray:
+    """Ensemble the gait template with only the DTW calls the final template depends on.
+
+    The control flow of `_ensemble_template_exact` is replayed symbolically: each section is represented by an
+    integer id, and a DTW of two sections is only registered as a node of a dependency graph.
+    Identical alignments (same reference, target and truncation) share a single node, so already aligned sections are
+    reused across rows instead of being recalculated.
+    Afterwards, only the nodes the final template depends on are evaluated.
+    The number of evaluated DTW calls grows linearly with the number of middle maxima.
+
+    Without `band`, the result is identical to `_ensemble_template_exact`.
+    With `band`, a Sakoe-Chiba band of this half-width (in samples) constrains the DTW.
+    """
+
+    def dtw(reference, target):
+        if band is None:
+            return dtwdasgupta(reference, target)
+        return dtwdasgupta_banded(reference, target, band)
+
+    nmiddlemaxima = len(middlemaxima)
+
+    if nmiddlemaxima == 3:
+        reference_section = _stride_section(acc, middlemaxima, 0, templatesize, shift)
+        target_section = _stride_section(acc, middlemaxima, 1, templatesize, shift)
+        return dtw(reference_section, target_section)[:templatesize]
+
+    # Node ids 0 .. nmiddlemaxima - 1 are the raw stride sections, all further ids are DTW alignments
+    nodes: list[tuple[int, int, int]] = []
+    node_ids: dict[tuple[int, int, int], int] = {}
+
+    def align(reference: int, target: int, length: int) -> int:
+        key = (reference, target, length)
+        if key not in node_ids:
+            node_ids[key] = nmiddlemaxima + len(nodes)
+            nodes.append(key)
+        return node_ids[key]
+
+    reference_section = None
+    target_section = None
+    resultssection = []
+    newresultssection = []
+
+    for iRowJunks in range(nmiddlemaxima, 1, -1):
+        for iJunks in range(1, iRowJunks - 1):
+            if iRowJunks == nmiddlemaxima:
+                reference_section, target_section = iJunks - 1, iJunks
+                resultssection.append(align(reference_section, target_section, templatesize))
+            elif iJunks == 1 and iRowJunks < nmiddlemaxima - 1:
+                resultssection = newresultssection
+                newresultssection = []
+
+            if len(resultssection) > iJunks:
+                reference_section = resultssection[iJunks]
+            if iJunks + 1 < len(resultssection):
+                target_section = resultssection[iJunks + 1]
+
+            if len(newresultssection) < len(resultssection):
+                newresultssection.append(align(reference_section, target_section, templatesize + 1))
+
+    # Evaluating the dependencies of the final template. Dependencies always have smaller ids than their dependents.
+    required = {newresultssection[0]}
+    for node_id in range(nmiddlemaxima + len(nodes) - 1, nmiddlemaxima - 1, -1):
+        if node_id in required:
+            reference, target, _ = nodes[node_id - nmiddlemaxima]
+            required.update((reference, target))
+
+    sections = {}
+    for node_id in sorted(required):
+        if node_id < nmiddlemaxima:
+            sections[node_id] = _stride_section(acc, middlemaxima, node_id, templatesize, shift)
+        else:
+            reference, target, length = nodes[node_id - nmiddlemaxima]
+            sections[node_id] = dtw(sections[reference], sections[target])[:length]
+
+    return sections[newresultssection[0]]
+
 
 class MicoAmigoIC(BaseIcDetector):
     """
@@ -45,7 +191,13 @@ class MicoAmigoIC(BaseIcDetector):
 
     ic_list_: pd.DataFrame
 
-    def __init__ (self, *, version: Literal["original_lowback", "improved_lowback", "wrist"] = "wrist") -> None:
+    def __init__ (
+        self,
+        *,
+        version: Literal["original_lowback", "improved_lowback", "wrist"] = "wrist",
+        template_ensemble: Literal["exact", "fast"] = "exact",
+        dtw_band: Optional[float] = None,
+    ) -> None:
         """
         Initialise the Mico-Amigo IC detection algorithm.
 
@@ -54,6 +206,15 @@ class MicoAmigoIC(BaseIcDetector):
         version : Literal["original_lowback", "improved_lowback", "wrist"], default="wrist"
             Original lowback version according to the publication, fine-tuned lowback version,
              as well as an optimised and fine-tune version for wrist-worn devices.
+        template_ensemble : Literal["exact", "fast"], default="exact"
+            How the gait template is ensembled from the strides.
+            "exact" aligns all strides row by row as in the original implementation (O(n^2) DTW calls for n strides).
+            "fast" only calculates the alignments the final template depends on and reuses identical alignments,
+            which requires O(n) DTW calls. In combination with ``dtw_band=None`` the template is identical to "exact".
+        dtw_band : Optional[float], default=None
+            Half-width of the Sakoe-Chiba band constraining the DTW in the "fast" mode, as fraction of the template
+            size. None (default) uses an unconstrained DTW. The band speeds up the alignment of long templates but
+            changes the template and hence the detected initial contacts. Ignored in the "exact" mode.
 
         Attributes
         ----------
@@ -74,7 +235,12 @@ class MicoAmigoIC(BaseIcDetector):
         if version not in ("original_lowback", "improved_lowback", "wrist"):
             raise ValueError(f"Unsupported version: {version}. Must be 'original_lowback', 'improved_lowback', or 'wrist'.")
 
+        if template_ensemble not in ("exact", "fast"):
+            raise ValueError(f"Unsupported template_ensemble: {template_ensemble}. Must be 'exact' or 'fast'.")
+
         self.version = version
+        self.template_ensemble = template_ensemble
+        self.dtw_band = dtw_band
 
         if self.version == "wrist":
             self.factorlimit = 2
@@ -104,7 +270,13 @@ class MicoAmigoIC(BaseIcDetector):
         self.acc_size = None
 
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Detect initial contacts from raw accelerometer data.
 
@@ -114,6 +286,9 @@ class MicoAmigoIC(BaseIcDetector):
             Accelerometer data with 3 columns corresponding to x, y, z axes.
         sampling_rate_hz : float
             Sampling rate of the input accelerometer data in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -124,16 +299,14 @@ class MicoAmigoIC(BaseIcDetector):
 
         self._data = data
         self._sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         if self.version == "wrist":
             # removing gravity from the 3 axes using custom function. We remove axis in the wrist version since the
             # original used the anteroposterior axis which does not include gravity component, hence it would be appropriate
             # to remove gravity component before calculating the norm
-            acc_all = data[['acc_is', 'acc_ml', 'acc_pa']]
-            acc_nograv = gravity_motion_butterworth(acc_all, sampling_rate_hz)
-
-            # calculating norm of the acceleration
-            acc = np.linalg.norm(acc_nograv, axis=1)
+            # (followed by calculating the norm of the acceleration)
+            acc = signal_context.gravity_removed_norm(sampling_rate_hz)
             acc_size = len(acc)
         elif self.version in ("improved_lowback",  "original_lowback"):
             # Only the anteroposterior is used for the lower back version
@@ -177,7 +350,8 @@ class MicoAmigoIC(BaseIcDetector):
         # If I do not detrend in python the peak happens at 0
         detrended_signal = possitive_detrend_high - np.mean(possitive_detrend_high)
 
-        y = np.fft.fft(detrended_signal, nfft) / l
+        # Real FFT, which directly provides the single sided spectrum of the real signal
+        y = np.fft.rfft(detrended_signal, nfft) / l
 
         # Frequencies
         f = self._sampling_rate_hz / 2 * np.linspace(0, 1, nfft // 2 + 1)
@@ -211,114 +385,18 @@ class MicoAmigoIC(BaseIcDetector):
         #shift
         shift = int(np.ceil(self.shiftfactor * templatesize))
 
-        # Initialising variables to avoid warnings
-        reference_section = None
-        target_section = None
-
         # Ensambly of templates
-        if nmiddlemaxima > 3:
-            # initialise results section and new results section
-            resultssection = []
-            newresultssection = []
-
-            for iRowJunks in range(nmiddlemaxima, 1, -1):
-                for iJunks in range(1, iRowJunks - 1):
-                    if iRowJunks == nmiddlemaxima:
-                        # calculating indices of start and end
-                        ref_start = middlemaxima[iJunks- 1] - shift
-                        ref_end = middlemaxima[iJunks - 1] + templatesize
-                        tgt_start = middlemaxima[iJunks] - shift
-                        tgt_end = middlemaxima[iJunks] + templatesize
-
-                        # Checking the bounds for reference_section if they are out of bounds
-                        if ref_start < 0:
-                            print("reference_section start index is out of bounds, setting to 0")
-                            ref_start = 0
-                        if ref_end > len(acc):
-                            print("reference_section end index exceeds bounds, adjusting to max length")
-                            ref_end = len(acc)
-
-                        # Check bounds for target_section if they are out of bounds
-                        if tgt_start < 0:
-                            print("target_section start index is out of bounds, setting to 0")
-                            tgt_start = 0
-                        if tgt_end > len(acc):
-                            print("target_section end index exceeds bounds, adjusting to max length")
-                            tgt_end = len(acc)
-
-                        # Extract sections
-                        reference_section = acc[ref_start:ref_end]
-                        target_section = acc[tgt_start:tgt_end]
-
-                        # dtw
-                        dtwsection = dtwdasgupta(reference_section, target_section)
-
-                        # storing results
-                        resultssection.append(dtwsection[:templatesize])
-
-                    else:
-                        if iJunks == 1 and iRowJunks < nmiddlemaxima - 1:
-                            resultssection = newresultssection.copy()
-                            newresultssection = []
-
-                    if len(resultssection) > iJunks:
-                        reference_section = resultssection[iJunks]
-
-                    if iJunks + 1 < len(resultssection):
-                        target_section = resultssection[iJunks + 1]
-
-                    # dtw
-                    if reference_section is not None:
-                        dtwsection = dtwdasgupta(reference_section.T, target_section.T)
-                    else:
-                        # Handle the case where reference_section was not assigned
-                        raise ValueError("reference_section was not initialized.")
-
-                    # append
-                    if len(newresultssection) < len(resultssection):  # Ensure it's not out of bounds
-                        newresultssection.append(dtwsection[:templatesize + 1])  # Store up to templatesize + 1
-
-            newresultssection_array = np.array(newresultssection)
-            template = newresultssection_array[0]
-
-        elif nmiddlemaxima == 3:
-            # Handling the case where nmiddlemaxima equals 3
-            ref_start = middlemaxima[0] - shift
-            ref_end = middlemaxima[0] + templatesize
-            tgt_start = middlemaxima[1] - shift
-            tgt_end = middlemaxima[1] + templatesize
-
-            # Check bounds for reference_section
-            if ref_start < 0:
-                print("reference_section start index is out of bounds, setting to 0")
-                ref_start = 0
-            if ref_end > len(acc):
-                print("reference_section end index exceeds bounds, adjusting to max length")
-                ref_end = len(acc)
-
-            # Check bounds for target_section
-            if tgt_start < 0:
-                print("target_section start index is out of bounds, setting to 0")
-                tgt_start = 0
-            if tgt_end > len(acc):
-                print("target_section end index exceeds bounds, adjusting to max length")
-                tgt_end = len(acc)
-
-            # Extract sections
-            reference_section = acc[ref_start:ref_end]
-            target_section = acc[tgt_start:tgt_end]
-
-            # Perform DTW
-            dtwsection = dtwdasgupta(reference_section.T, target_section.T)
-
-            # Store the template result
-            template = dtwsection[:templatesize]
-
-        else:
+        if nmiddlemaxima < 3:
             warnings.warn("The number of middle maxima is not supported", UserWarning)
             self.ic_list_ = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
             return self
 
+        if self.template_ensemble == "fast":
+            band = None if self.dtw_band is None else int(np.ceil(self.dtw_band * templatesize))
+            template = _ensemble_template_fast(acc, middlemaxima, templatesize, shift, band)
+        else:
+            template = _ensemble_template_exact(acc, middlemaxima, templatesize, shift)
+
         # Redimention of signal
         # the padding with follow the 'edge' method to avoid introducing artifacts
 
@@ -1,17 +1,45 @@
 import pandas as pd
 import numpy as np
 from typing_extensions import Self
-from typing import Literal
+from typing import Literal, Optional
 from scipy import signal, integrate
 from scipy.signal import find_peaks
-from mobgap.data_transform import (
-    Resample,
-    chain_transformers,
-    ButterworthFilter,
-    CwtFilter
-)
 from multigait.ICD.utils.dominant_frequency import dominant_freqency
+from multigait.ICD.utils.batch_filters import butter_filtfilt, cwt_filter, resample
 from multigait.ICD.base_ic import BaseIcDetector
+from multigait.utils.signal_context import GsSignalContext
+
+
+def _remove_implausible_ics(ic_indices: np.ndarray, sampling_rate_hz: float) -> list:
+    """Remove ICs that are too close to (< 0.25 s) or too far away from (> 2.25 s) their neighbours."""
+    # Removing ICs which are closer to 0.25s from the previous IC, we use a dynamic approach.
+    # this method dynamically calculates the distance between the last valid IC and the current IC.
+    # If we calculated the distance once, then we may remove ICs which are valid because we would not compare the distance with the last valid IC.
+    filtered_ics_close = [ic_indices[0]]
+
+    for i in range(1, len(ic_indices)):
+        if ic_indices[i] - filtered_ics_close[-1] > 0.25 * sampling_rate_hz:
+            filtered_ics_close.append(ic_indices[i])  # keeping only if sufficiently spaced
+
+    # Removing ICs with a distance > 2.25s. We first compare n with n-1 and if further than 2.25s we compare n with n+1.
+    # We remove n if both are further than 2.25s.
+    filtered_ics_away = [filtered_ics_close[0]]
+
+    for i in range(1, len(filtered_ics_close) - 1):  # Keeping first
+        prev = filtered_ics_away[-1]
+        curr = filtered_ics_close[i]
+        next_val = filtered_ics_close[i + 1]
+
+        if (curr - prev) > 2.25 * sampling_rate_hz:
+            if (next_val - curr) > 2.25 * sampling_rate_hz:
+                continue  # not adding the current value
+        filtered_ics_away.append(curr)
+
+    # Checking last value with distance to the previous one
+    if (filtered_ics_close[-1] - filtered_ics_away[-1]) <= 2.25 * sampling_rate_hz:
+        filtered_ics_away.append(filtered_ics_close[-1])
+
+    return filtered_ics_away
 
 
 class McCamleyIC(BaseIcDetector):
@@ -77,7 +105,13 @@ class McCamleyIC(BaseIcDetector):
         elif self.version == "improved_lowback":
             self.cwt = "adaptive"
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Detect initial contact (IC) events.
 
@@ -87,6 +121,9 @@ class McCamleyIC(BaseIcDetector):
             Input accelerometer data. Must contain 3 columns representing the x, y, z axes.
         sampling_rate_hz : float
             Sampling rate of the input data in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -96,27 +133,64 @@ class McCamleyIC(BaseIcDetector):
 
         self.data = data
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
-        # selecting data based on version
-        if self.version == "wrist":
-            # we use the norm of the acceleration vector for the wrist version
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            acc = np.linalg.norm(self.data[cols].values, axis=1)
-        elif self.version in ("original_lowback", "improved_lowback"):
-            # Only the inferosuperior (vertical) is used for the lowback version
-            acc = data["acc_is"].to_numpy()
+        # Resample the signal to 50 Hz
+        acc_downsampled = signal_context.resampled(
+            self._signal_name, sampling_rate_hz=self.sampling_rate_hz, target_sampling_rate_hz=self._DOWNSAMPLED_RATE
+        )
+
+        ic_indices, self.final_signal_ = self._detect_ics(acc_downsampled, sampling_rate_hz=self.sampling_rate_hz)
+
+        # If no ICs detected then we shortcut by returning an empty df
+        if ic_indices.size == 0:
+            self.ic_list_ = pd.DataFrame(columns=['ic'])
+            self.ic_list_.index.name = 'step_id'
+            return self
+
+        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
+        final_ics["ic"] = ic_indices
+
+        self.ic_list_ = final_ics
+
+        return self
+
+    def _detect_gs_array(self, gs_signal: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """Same steps as ``detect`` on the plain array of one gait sequence (used by ``detect_batch``)."""
+        acc_downsampled = resample(
+            self._gs_array_signal(gs_signal, self._signal_name), sampling_rate_hz, self._DOWNSAMPLED_RATE
+        )
+        ic_indices, _ = self._detect_ics(acc_downsampled, sampling_rate_hz=sampling_rate_hz)
+        return ic_indices
+
+    @property
+    def _signal_name(self) -> str:
+        # we use the norm of the acceleration vector for the wrist version and only the inferosuperior (vertical)
+        # axis for the lowback versions
+        return "acc_norm" if self.version == "wrist" else "acc_is"
 
-        # Resample the signal to 50 Hz using mobgap filters
-        filter_chain = [("resampling", Resample(self._DOWNSAMPLED_RATE))]
-        acc_downsampled = chain_transformers(acc, filter_chain, sampling_rate_hz=self.sampling_rate_hz)
+    def _detect_ics(self, acc_downsampled: np.ndarray, *, sampling_rate_hz: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Numeric core of the algorithm, shared by ``detect`` and ``_detect_gs_array``.
+
+        Parameters
+        ----------
+        acc_downsampled : np.ndarray
+            The input signal of the version resampled to ``_DOWNSAMPLED_RATE``.
+        sampling_rate_hz : float
+            Original sampling rate of the signal in Hz.
 
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The IC indices at the original sampling rate and the final processed signal.
+        """
         # Detrend data
         detrended_data = signal.detrend(acc_downsampled)
 
         # Low pass Butterworth
         cutoff = 20
-        filter_chain = [("butter", ButterworthFilter(order=4, cutoff_freq_hz=cutoff, filter_type='lowpass'))]
-        acc_butter = np.asarray(chain_transformers(detrended_data, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+        acc_butter = butter_filtfilt(detrended_data, 4, cutoff, "lowpass", sampling_rate_hz)
 
         # Cumulative trapezoidal integration
         integrated_data = integrate.cumulative_trapezoid(acc_butter, initial=0)
@@ -135,21 +209,17 @@ class McCamleyIC(BaseIcDetector):
             elif freq > 5:
                 freq = 5.0
 
-        filter_chain = [("cwt", CwtFilter(wavelet='gaus1', center_frequency_hz=freq)),
-                        ("resampling", Resample(self.sampling_rate_hz))]
-        data_cwt_upsampled = np.asarray(chain_transformers(integrated_data, filter_chain, sampling_rate_hz=self._DOWNSAMPLED_RATE))
-
-        self.final_signal_ = data_cwt_upsampled
+        data_cwt = cwt_filter(
+            integrated_data, wavelet="gaus1", center_frequency_hz=freq, sampling_rate_hz=self._DOWNSAMPLED_RATE
+        )
+        data_cwt_upsampled = resample(data_cwt, self._DOWNSAMPLED_RATE, sampling_rate_hz)
 
         # Initial contact peak detection (max of the reverse of the signal)
         inverted = -data_cwt_upsampled
         ic_indices, _ = find_peaks(inverted)
 
-        # If no ICs detected then we shortcut by returning an empty df
         if ic_indices.size == 0:
-            self.ic_list_ = pd.DataFrame(columns=['ic'])
-            self.ic_list_.index.name = 'step_id'
-            return self
+            return ic_indices, data_cwt_upsampled
 
         # # This is a second cwt for toe off detection it is commented because it is not a primary aim
         # center_frequency_hz = 6.0
@@ -158,36 +228,4 @@ class McCamleyIC(BaseIcDetector):
         # coefs2 = data_cwt2[0]
         # fc_indices, properties = find_peaks(coefs2)
 
-        # Removing ICs which are closer to 0.25s from the previous IC, we use a dynamic approach.
-        # this method dynamically calculates the distance between the last valid IC and the current IC.
-        # If we calculated the distance once, then we may remove ICs which are valid because we would not compare the distance with the last valid IC.
-        filtered_ics_close = [ic_indices[0]]
-
-        for i in range(1, len(ic_indices)):
-            if ic_indices[i] - filtered_ics_close[-1] > 0.25 * self.sampling_rate_hz:
-                filtered_ics_close.append(ic_indices[i])  # keeping only if sufficiently spaced
-
-        # Removing ICs with a distance > 2.25s. We first compare n with n-1 and if further than 2.25s we compare n with n+1.
-        # We remove n if both are further than 2.25s.
-        filtered_ics_away = [filtered_ics_close[0]]
-
-        for i in range(1, len(filtered_ics_close) - 1):  # Keeping first
-            prev = filtered_ics_away[-1]
-            curr = filtered_ics_close[i]
-            next_val = filtered_ics_close[i + 1]
-
-            if (curr - prev) > 2.25 * self.sampling_rate_hz:
-                if (next_val - curr) > 2.25 * self.sampling_rate_hz:
-                    continue  # not adding the current value
-            filtered_ics_away.append(curr)
-
-        # Checking last value with distance to the previous one
-        if (filtered_ics_close[-1] - filtered_ics_away[-1]) <= 2.25 * self.sampling_rate_hz:
-            filtered_ics_away.append(filtered_ics_close[-1])
-
-        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
-        final_ics["ic"] = filtered_ics_away
-
-        self.ic_list_ = final_ics
-
-        return self
\ No newline at end of file
+        return np.asarray(_remove_implausible_ics(ic_indices, sampling_rate_hz)), data_cwt_upsampled
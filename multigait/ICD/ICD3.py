@@ -1,17 +1,13 @@
 import pandas as pd
 import numpy as np
-from typing import Literal
+from typing import Literal, Optional
 from typing_extensions import Self
 from scipy import signal, integrate
 from scipy.signal import find_peaks
-from mobgap.data_transform import (
-    chain_transformers,
-    ButterworthFilter,
-    CwtFilter,
-    Resample
-)
 from multigait.ICD.utils.dominant_frequency import dominant_freqency
+from multigait.ICD.utils.batch_filters import butter_filtfilt, cwt_filter, resample
 from multigait.ICD.base_ic import BaseIcDetector
+from multigait.utils.signal_context import GsSignalContext
 
 
 class PhamIC(BaseIcDetector):
@@ -79,7 +75,13 @@ class PhamIC(BaseIcDetector):
             self.percentage_thresh = 0.1
 
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Detect initial contact (IC) events using the Pham algorithm.
 
@@ -98,6 +100,9 @@ class PhamIC(BaseIcDetector):
             Input accelerometer data. The first three columns should contain x, y, z acceleration axes.
         sampling_rate_hz : float
             Original sampling rate of the input signal in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -108,27 +113,62 @@ class PhamIC(BaseIcDetector):
 
         self.data = data
         self.sampling_rate_hz = sampling_rate_hz
-
-        # selecting data based on version
-        if self.version == "wrist":
-            # we use the norm of the acceleration vector for the wrist version
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            acc = np.linalg.norm(self.data[cols].values, axis=1)
-        elif self.version in ["original_lowback", "improved_lowback"]:
-            # only the anteroposterior is used for the lower back
-            acc = data["acc_pa"].to_numpy()
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # Upsample data to the original sampling rate of the paper
-        filter_chain = [("resample", Resample(target_sampling_rate_hz=self._UPSAMPLED_RATE))]
-        acc_upsamp = np.asarray(chain_transformers(acc, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+        acc_upsamp = signal_context.resampled(
+            self._signal_name, sampling_rate_hz=self.sampling_rate_hz, target_sampling_rate_hz=self._UPSAMPLED_RATE
+        )
+
+        ic_indices, self.final_signal_ = self._detect_ics(acc_upsamp, sampling_rate_hz=self.sampling_rate_hz)
+
+        # If no peeaks deteted then we shortcut by returning an empty df
+        if ic_indices.size == 0:
+            self.ic_list_ = pd.DataFrame(columns=['ic'])
+            self.ic_list_.index.name = 'step_id'
+            return self
+
+        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
+        final_ics["ic"] = ic_indices
+
+        self.ic_list_ = final_ics
+
+        return self
+
+    def _detect_gs_array(self, gs_signal: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """Same steps as ``detect`` on the plain array of one gait sequence (used by ``detect_batch``)."""
+        acc_upsamp = resample(self._gs_array_signal(gs_signal, self._signal_name), sampling_rate_hz, self._UPSAMPLED_RATE)
+        ic_indices, _ = self._detect_ics(acc_upsamp, sampling_rate_hz=sampling_rate_hz)
+        return ic_indices
+
+    @property
+    def _signal_name(self) -> str:
+        # we use the norm of the acceleration vector for the wrist version and only the anteroposterior axis for the
+        # lowback versions
+        return "acc_norm" if self.version == "wrist" else "acc_pa"
+
+    def _detect_ics(self, acc_upsamp: np.ndarray, *, sampling_rate_hz: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Numeric core of the algorithm, shared by ``detect`` and ``_detect_gs_array``.
+
+        Parameters
+        ----------
+        acc_upsamp : np.ndarray
+            The input signal of the version resampled to ``_UPSAMPLED_RATE``.
+        sampling_rate_hz : float
+            Original sampling rate of the signal in Hz.
 
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The IC indices at the original sampling rate and the final processed signal.
+        """
         # Detrend data
         detrended_data = signal.detrend(acc_upsamp)
 
         # Low pass Butterworth
         cutoff = 10
-        filter_chain = [("butter", ButterworthFilter(order=2, cutoff_freq_hz=cutoff, filter_type='lowpass'))]
-        acc_pa_butter = np.asarray(chain_transformers(detrended_data, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+        acc_pa_butter = butter_filtfilt(detrended_data, 2, cutoff, "lowpass", sampling_rate_hz)
 
         # Cumulative trapezoidal integration
         integrated_data = integrate.cumulative_trapezoid(acc_pa_butter, initial=0)
@@ -146,27 +186,20 @@ class PhamIC(BaseIcDetector):
             elif freq > 5:
                 freq = 5.0
 
-        filter_chain = [("cwt", CwtFilter(wavelet='gaus1', center_frequency_hz=freq))]
-        data_cwt = np.asarray(chain_transformers(integrated_data, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+        data_cwt = cwt_filter(integrated_data, wavelet="gaus1", center_frequency_hz=freq, sampling_rate_hz=sampling_rate_hz)
 
         # Detrend data
         detrended_data = signal.detrend(data_cwt)
 
         # Downsample data to the original sampling rate
-        filter_chain = [("resample", Resample(target_sampling_rate_hz=self.sampling_rate_hz))]
-        detrended_data = np.asarray(chain_transformers(detrended_data, filter_chain, sampling_rate_hz=self._UPSAMPLED_RATE))
-
-        self.final_signal_ = detrended_data
+        detrended_data = resample(detrended_data, self._UPSAMPLED_RATE, sampling_rate_hz)
 
         # Initial contact peak detection
         inverted = -detrended_data
         ic_indices, _ = find_peaks(inverted)
 
-        # If no peeaks deteted then we shortcut by returning an empty df
         if ic_indices.size == 0:
-            self.ic_list_ = pd.DataFrame(columns=['ic'])
-            self.ic_list_.index.name = 'step_id'
-            return self
+            return ic_indices, detrended_data
 
         # Keeping only ICs above the threshold which is calculated as a percentage of the magnitude of the peaks
         # calculating the mean of peaks magnitudes
@@ -174,12 +207,6 @@ class PhamIC(BaseIcDetector):
         # threshold
         thresh = mean_peak * self.percentage_thresh
         # removing ICs below the threshold
-        if ic_indices.size > 0:
-            ic_indices = ic_indices[inverted[ic_indices] > thresh]
-
-        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
-        final_ics["ic"] = ic_indices
-
-        self.ic_list_ = final_ics
+        ic_indices = ic_indices[inverted[ic_indices] > thresh]
 
-        return self
\ No newline at end of file
+        return ic_indices, detrended_data
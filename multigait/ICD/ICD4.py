@@ -2,14 +2,12 @@ import pandas as pd
 import numpy as np
 from typing_extensions import Self
 from scipy import signal
-from mobgap.data_transform import (
-    chain_transformers,
-    ButterworthFilter
-)
-from typing import Literal
+from typing import Literal, Optional
 from multigait.ICD.utils.find_maxima import _find_maxima
 from multigait.ICD.utils.zero_crossings import detect_zero_crossings
+from multigait.ICD.utils.batch_filters import butter_filtfilt
 from multigait.ICD.base_ic import BaseIcDetector
+from multigait.utils.signal_context import GsSignalContext
 
 class ZijlstraIC(BaseIcDetector):
     """
@@ -74,7 +72,13 @@ class ZijlstraIC(BaseIcDetector):
             self.cutoff = 3.5
             self.method = "zc"
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Detect initial contact events using the Zijlstra algorithm.
 
@@ -84,6 +88,9 @@ class ZijlstraIC(BaseIcDetector):
             Input accelerometer data. The first three columns should contain the x, y, z axes.
         sampling_rate_hz : float
             Original sampling rate of the input signal in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -94,25 +101,54 @@ class ZijlstraIC(BaseIcDetector):
 
         self.data = data
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
-        if self.version in ("original_lowback", "improved_lowback"):
-            # Only the anteroposterior is used for the lowerback possition
-            acc = data["acc_pa"].to_numpy()
-        elif self.version == "wrist":
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            acc = np.linalg.norm(self.data[cols].values, axis=1)
+        acc = signal_context.signal(self._signal_name)
 
-        # Detrend data to make the signal is around 0
-        detrended_data = signal.detrend(acc)
+        ic_indices, self.final_signal_ = self._detect_ics(acc, sampling_rate_hz=self.sampling_rate_hz)
+
+        # Creating a dataframe with the IC indices
+        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
+        final_ics["ic"] = ic_indices
+
+        self.ic_list_ = final_ics
+
+        return self
 
-        # Low pass Butterworth as filter chain (the first filter has a fixed cutoff of 20 Hz)
-        filter_chain = [("butter_1", ButterworthFilter(order=4, cutoff_freq_hz=20, filter_type='lowpass')),
-                        ("butter_2", ButterworthFilter(order=4, cutoff_freq_hz=self.cutoff, filter_type='lowpass'))]
+    def _detect_gs_array(self, gs_signal: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """Same steps as ``detect`` on the plain array of one gait sequence (used by ``detect_batch``)."""
+        ic_indices, _ = self._detect_ics(
+            self._gs_array_signal(gs_signal, self._signal_name), sampling_rate_hz=sampling_rate_hz
+        )
+        return ic_indices
 
-        acc_pa_butter = np.asarray(
-            chain_transformers(detrended_data, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
+    @property
+    def _signal_name(self) -> str:
+        # Only the anteroposterior is used for the lowerback possition, the norm of the acceleration for the wrist
+        return "acc_norm" if self.version == "wrist" else "acc_pa"
+
+    def _detect_ics(self, acc: np.ndarray, *, sampling_rate_hz: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Numeric core of the algorithm, shared by ``detect`` and ``_detect_gs_array``.
 
-        self.final_signal_ = acc_pa_butter
+        Parameters
+        ----------
+        acc : np.ndarray
+            The input signal of the version (acceleration norm or anteroposterior axis).
+        sampling_rate_hz : float
+            Sampling rate of the signal in Hz.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The IC indices and the filtered signal.
+        """
+        # Detrend data to make the signal is around 0
+        detrended_data = signal.detrend(acc)
+
+        # Two low pass Butterworth filters (the first filter has a fixed cutoff of 20 Hz)
+        acc_pa_butter = butter_filtfilt(detrended_data, 4, 20, "lowpass", sampling_rate_hz)
+        acc_pa_butter = butter_filtfilt(acc_pa_butter, 4, self.cutoff, "lowpass", sampling_rate_hz)
 
         if self.method == "peak":
             # Initial contacts by finding the maxima between zero crossings
@@ -121,10 +157,4 @@ class ZijlstraIC(BaseIcDetector):
             # Initial contacts by finding zero crossings (positive to negative)
             ic_indices = detect_zero_crossings(acc_pa_butter, "pos_to_neg")
 
-        # Creating a dataframe with the IC indices
-        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
-        final_ics["ic"] = ic_indices
-
-        self.ic_list_ = final_ics
-
-        return self
\ No newline at end of file
+        return ic_indices, acc_pa_butter
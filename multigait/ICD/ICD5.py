@@ -1,14 +1,11 @@
 import pandas as pd
 import numpy as np
-from typing import Literal
+from typing import Literal, Optional
 from typing_extensions import Self
 from scipy.signal import find_peaks
-from mobgap.data_transform import (
-    chain_transformers,
-    ButterworthFilter,
-    Resample
-)
 from multigait.ICD.base_ic import BaseIcDetector
+from multigait.ICD.utils.batch_filters import butter_filtfilt, resample
+from multigait.utils.signal_context import GsSignalContext
 
 
 class DucharmeIC(BaseIcDetector):
@@ -75,7 +72,13 @@ class DucharmeIC(BaseIcDetector):
         elif version == "improved_lowback":
             self.threshold = 0.02 * 9.81
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Process accelerometer data and detect initial contact (IC) events using the Ducharme algorithm.
 
@@ -85,6 +88,9 @@ class DucharmeIC(BaseIcDetector):
             Input accelerometer data. The first three columns should contain the x, y, z axes.
         sampling_rate_hz : float
             Original sampling rate of the input signal in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -94,41 +100,52 @@ class DucharmeIC(BaseIcDetector):
 
         self.data = data
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # 1. Euclidean norm of the data
-        cols = ['acc_is', 'acc_ml', 'acc_pa']
-        acc_norm = np.linalg.norm(self.data[cols].values, axis=1)
+        acc_norm = signal_context.acc_norm()
 
+        ic_indices = self._detect_ics(acc_norm, sampling_rate_hz=self.sampling_rate_hz)
 
+        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
+        final_ics["ic"] = ic_indices
+
+        self.ic_list_ = final_ics
+
+        return self
+
+    def _detect_gs_array(self, gs_signal: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """Same steps as ``detect`` on the plain array of one gait sequence (used by ``detect_batch``)."""
+        return self._detect_ics(self._gs_array_signal(gs_signal, "acc_norm"), sampling_rate_hz=sampling_rate_hz)
+
+    def _detect_ics(self, acc_norm: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """
+        Numeric core of the algorithm, shared by ``detect`` and ``_detect_gs_array``.
+
+        Parameters
+        ----------
+        acc_norm : np.ndarray
+            Euclidean norm of the acceleration.
+        sampling_rate_hz : float
+            Sampling rate of the signal in Hz.
+
+        Returns
+        -------
+        np.ndarray
+            The IC indices at the original sampling rate.
+        """
         # 2. Detrend the signal by subtracting the mean
         acc_detr = acc_norm - np.mean(acc_norm)
 
-
         # 3. Bandpass Butterworth filtering
         # Because the original sampling rate was 80Hz (and 60Hz from another sensor),
-        # here we downsample
+        # here we downsample to 80Hz for filtering with similar cutoffs as the original algo
         downsample = 80
         cutoff = (0.25, 2.5)
-        filter_chain = [# Resample to 80Hz for filtering with similar cutoffs as the original algo
-            ("downsampling", Resample(downsample)),
-            ("butter", ButterworthFilter(order=4, cutoff_freq_hz=cutoff, filter_type='bandpass'))
-        ]
-
-        acc_filt = chain_transformers(acc_detr, filter_chain, sampling_rate_hz=self.sampling_rate_hz)
-
+        acc_filt = butter_filtfilt(resample(acc_detr, sampling_rate_hz, downsample), 4, cutoff, "bandpass", downsample)
 
         # 4. Peak detection
         peaks, _ = find_peaks(acc_filt, height=self.threshold)
 
-        # Return the indices of the peaks
-        final_ics = pd.DataFrame(columns=["ic"]).rename_axis(index="step_id")
-        final_ics["ic"] = peaks
-
         # Upsample indices of peaks to the original sampling rate
-        detected_ics_upsampled = (
-            (final_ics * self.sampling_rate_hz / downsample).round().astype("int64")
-        )
-
-        self.ic_list_ = detected_ics_upsampled
-
-        return self
\ No newline at end of file
+        return np.round(peaks * sampling_rate_hz / downsample).astype("int64")
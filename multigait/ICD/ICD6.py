@@ -1,8 +1,9 @@
 import pandas as pd
 import numpy as np
 from typing_extensions import Self
-from typing import Literal
+from typing import Literal, Optional
 from multigait.ICD.base_ic import BaseIcDetector  # <-- import base
+from multigait.utils.signal_context import GsSignalContext
 
 
 class GuIC(BaseIcDetector):
@@ -114,7 +115,13 @@ class GuIC(BaseIcDetector):
         self.cont_thres = 4
 
 
-    def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float = 100) -> Self:
+    def detect(
+        self,
+        data: pd.DataFrame,
+        *,
+        sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
+    ) -> Self:
         """
         Detect initial contacts (IC) in wrist-worn accelerometer data using the GuIC algorithm.
 
@@ -124,6 +131,9 @@ class GuIC(BaseIcDetector):
             Input acceleration data with three columns (x, y, z).
         sampling_rate_hz : float
             Sampling rate of the input data in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -136,10 +146,10 @@ class GuIC(BaseIcDetector):
 
         self.data = data
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # 1. Euclidean norm of the data
-        cols = ['acc_is', 'acc_ml', 'acc_pa']
-        acc_norm = np.linalg.norm(self.data[cols].values, axis=1)
+        acc_norm = signal_context.acc_norm()
 
         # If SD of acceleration is less than 0.025, return empty dataframe
         if np.std(acc_norm) < 0.025:
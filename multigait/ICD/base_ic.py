@@ -1,10 +1,13 @@
 from typing import Any
 import copy
 
+import numpy as np
 import pandas as pd
-from tpcp import Algorithm
+from tpcp import Algorithm, clone
 from typing_extensions import Self, Unpack
 
+from multigait.utils.signal_context import ACC_COLS
+
 
 class BaseIcDetector(Algorithm):
     """
@@ -20,22 +23,106 @@ class BaseIcDetector(Algorithm):
       - return self
 
     This base class adds a clone() helper that returns a deep copy of the detector instance.
+
+    It also provides ``detect_batch`` to process all gait sequences of a recording at once.
+    Subclasses can make it faster by implementing ``_detect_gs_array``, which receives the plain numpy array of a single
+    gait sequence. By default, ``detect`` is called for every gait sequence.
+    Subclasses implementing ``_detect_gs_array`` keep the numeric core of the algorithm in one array-based helper that
+    is called by both ``detect`` (with the signals of the ``GsSignalContext``) and ``_detect_gs_array``, so that both
+    share a single code path.
     """
 
-    _action_methods = ("detect",)
+    _action_methods = ("detect", "detect_batch")
 
     # expected attributes for type checkers / docs
     data: pd.DataFrame
     sampling_rate_hz: float
     ic_list_: pd.DataFrame
 
+    signal: np.ndarray
+    gs_bounds: np.ndarray
+    ic_positions_: np.ndarray
+    ic_gs_index_: np.ndarray
+
     def detect(self, data: pd.DataFrame, *, sampling_rate_hz: float, **kwargs: Unpack[dict[str, Any]]) -> Self:
         """Implement in subclass."""
         raise NotImplementedError
 
+    def detect_batch(self, signal: np.ndarray, gs_bounds: np.ndarray, *, sampling_rate_hz: float) -> Self:
+        """
+        Detect initial contacts in multiple gait sequences of a single recording.
+
+        Every gait sequence is processed independently and gives the same ICs as ``detect`` on the data of the gait
+        sequence, but without creating a DataFrame and a new detector instance per gait sequence.
+
+        Parameters
+        ----------
+        signal : np.ndarray
+            Acceleration of the entire recording with the shape (n_samples, 3) and the axes in the order
+            ``acc_is``, ``acc_ml``, ``acc_pa``.
+        gs_bounds : np.ndarray
+            Start and end (exclusive) sample of every gait sequence with the shape (n_gs, 2).
+        sampling_rate_hz : float
+            Sampling rate of the signal in Hz.
+
+        Returns
+        -------
+        Self
+            Returns self with the ICs of all gait sequences in ``ic_positions_`` (samples relative to the start of the
+            recording, sorted by gait sequence) and the row of the respective gait sequence in ``gs_bounds`` in
+            ``ic_gs_index_``.
+        """
+        self.signal = signal
+        self.gs_bounds = gs_bounds
+        self.sampling_rate_hz = sampling_rate_hz
+
+        signal = np.asarray(signal, dtype=float)
+        if signal.ndim != 2 or signal.shape[1] != len(ACC_COLS):
+            raise ValueError(f"The signal must have the shape (n_samples, 3) with the axes {ACC_COLS}.")
+        bounds = np.asarray(gs_bounds, dtype=np.int64).reshape(-1, 2)
+        if (bounds[:, 0] < 0).any() or (bounds[:, 1] > len(signal)).any() or (bounds[:, 0] > bounds[:, 1]).any():
+            raise ValueError("All gait sequence bounds must fulfill 0 <= start <= end <= n_samples.")
+
+        ics_per_gs = []
+        for gs_index, (start, end) in enumerate(bounds):
+            try:
+                ics = self._detect_gs_array(signal[start:end], sampling_rate_hz=sampling_rate_hz)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Error while detecting the initial contacts of gait sequence {gs_index} (samples {start}-{end})."
+                ) from e
+            ics_per_gs.append(np.asarray(ics, dtype=np.int64) + start)
+
+        n_ics = [len(ics) for ics in ics_per_gs]
+        self.ic_positions_ = np.concatenate(ics_per_gs) if ics_per_gs else np.empty(0, dtype=np.int64)
+        self.ic_gs_index_ = np.repeat(np.arange(len(bounds)), n_ics)
+        return self
+
+    def _detect_gs_array(self, gs_signal: np.ndarray, *, sampling_rate_hz: float) -> np.ndarray:
+        """ICs (samples relative to the start of the gait sequence) of the (n_samples, 3) signal of one gait sequence.
+
+        The default implementation runs ``detect`` on a fresh instance with the same parameters.
+        """
+        ic_list = (
+            clone(self)
+            .detect(pd.DataFrame(gs_signal, columns=ACC_COLS), sampling_rate_hz=sampling_rate_hz)
+            .ic_list_
+        )
+        return ic_list["ic"].to_numpy(dtype=np.int64)
+
+    @staticmethod
+    def _gs_array_signal(gs_signal: np.ndarray, name: str) -> np.ndarray:
+        """The named signal (``"acc_norm"`` or an acceleration axis) of the (n_samples, 3) signal of one gait sequence.
+
+        This is the array counterpart of ``GsSignalContext.signal`` used by the ``_detect_gs_array`` implementations.
+        """
+        if name == "acc_norm":
+            return np.linalg.norm(gs_signal, axis=1)
+        return gs_signal[:, ACC_COLS.index(name)]
+
     def clone(self) -> "BaseIcDetector":
         """Return a deep copy of this detector so callers can do clone().detect(...)."""
         return copy.deepcopy(self)
 
 
-__all__ = ["BaseIcDetector"]
\ No newline at end of file
+__all__ = ["BaseIcDetector"]
@@ -1,28 +1,48 @@
+from typing import Optional
+
 import numpy as np
-import matplotlib.pyplot as plt
+from scipy.fft import irfft, next_fast_len, rfft
+
 
-def auto_cov_unbiased(x: np.ndarray) -> np.ndarray:
+def auto_cov_unbiased(x: np.ndarray, max_lag: Optional[int] = None) -> np.ndarray:
     """
     Compute the unbiased autocovariance of a signal
 
+    The autocovariance is calculated via FFT in O(n log n).
+    If only the lags up to ``max_lag`` are required, the FFT length is reduced to ``n + max_lag`` (instead of
+    ``2 * n - 1``) without circular aliasing of the requested lags.
+
     Parameters
     ----------
     x : np.ndarray
         The signal
+    max_lag : int, optional
+        The largest lag (in samples) to calculate. Defaults to ``len(x) - 1``, i.e. all lags.
 
     Returns
     -------
     np.ndarray
-        The unbiased autocovariance
+        The unbiased autocovariance for the lags ``-max_lag`` to ``max_lag`` (length ``2 * max_lag + 1``).
+        For the default ``max_lag``, this is the same layout as ``np.correlate(x, x, mode="full")``.
     """
+    x = np.asarray(x, dtype=float)
     n = len(x)
+    if n == 0:
+        raise ValueError("The signal must not be empty.")
+    if max_lag is None:
+        max_lag = n - 1
+    if not 0 <= max_lag < n:
+        raise ValueError(f"max_lag must be between 0 and {n - 1}, but is {max_lag}.")
+
     x_centred = x - np.mean(x)
-    ac = np.correlate(x_centred, x_centred, mode='full')
 
-    # Create lags from -n+1 to n-1
-    lags = np.arange(-n + 1, n)
+    # Power spectrum -> autocorrelation of the non-negative lags
+    nfft = next_fast_len(n + max_lag, real=True)
+    spectrum = rfft(x_centred, nfft)
+    ac = irfft(spectrum.real**2 + spectrum.imag**2, nfft)[: max_lag + 1]
 
-    # Calculate unbiased autocovariance
-    unbiased_ac = ac / np.array([n - abs(lag) for lag in lags])
+    # Calculate unbiased autocovariance (number of overlapping samples per lag)
+    ac /= n - np.arange(max_lag + 1)
 
-    return unbiased_ac
\ No newline at end of file
+    # The autocovariance is symmetric
+    return np.concatenate([ac[:0:-1], ac])
@@ -0,0 +1,87 @@
+"""
+Array-only versions of the mobgap transformers used by the initial contact detectors.
+
+``detect_batch`` processes all gait sequences of a recording.
+For short gait sequences, creating the transformer instances, designing the filters and integrating the wavelet for
+every gait sequence costs more than the actual filtering.
+The functions below design every filter (and wavelet kernel) only once and apply it to plain numpy arrays.
+They call the same scipy/pywt routines as the transformers, so that the results are identical.
+"""
+
+from functools import lru_cache
+from math import ceil, floor
+from typing import Literal, Union
+
+import numpy as np
+from pywt import DiscreteContinuousWavelet, frequency2scale, integrate_wavelet
+from scipy import signal
+
+
+def resample(data: np.ndarray, sampling_rate_hz: float, target_sampling_rate_hz: float) -> np.ndarray:
+    """Resample like ``mobgap.data_transform.Resample`` (FFT based, also if the sampling rates are equal)."""
+    return signal.resample(data, round(len(data) * (target_sampling_rate_hz / sampling_rate_hz)))
+
+
+@lru_cache(maxsize=64)
+def butter_sos(
+    order: int,
+    cutoff_freq_hz: Union[float, tuple[float, float]],
+    filter_type: Literal["lowpass", "highpass", "bandpass", "bandstop"],
+    sampling_rate_hz: float,
+) -> np.ndarray:
+    """Second-order sections of the butterworth filter ``mobgap.data_transform.ButterworthFilter`` would design.
+
+    The returned array is cached and shared between all callers, hence it is read-only.
+    """
+    sos = signal.butter(order, cutoff_freq_hz, btype=filter_type, output="sos", fs=sampling_rate_hz)
+    sos.flags.writeable = False
+    return sos
+
+
+def butter_filtfilt(
+    data: np.ndarray,
+    order: int,
+    cutoff_freq_hz: Union[float, tuple[float, float]],
+    filter_type: Literal["lowpass", "highpass", "bandpass", "bandstop"],
+    sampling_rate_hz: float,
+) -> np.ndarray:
+    """Zero-phase butterworth filter like ``mobgap.data_transform.ButterworthFilter`` (with ``zero_phase=True``)."""
+    # scipy requires a writable array of second-order sections, the copy of the few coefficients is negligible
+    return signal.sosfiltfilt(butter_sos(order, cutoff_freq_hz, filter_type, sampling_rate_hz).copy(), data)
+
+
+@lru_cache(maxsize=64)
+def _cwt_scale(wavelet: str, center_frequency_hz: float, sampling_rate_hz: float) -> float:
+    return frequency2scale(wavelet, [center_frequency_hz])[0] * sampling_rate_hz
+
+
+@lru_cache(maxsize=64)
+def _cwt_kernel(wavelet: str, scale: float) -> np.ndarray:
+    """The integrated wavelet sampled at the given scale (as calculated by ``pywt.cwt`` with ``method="conv"``)."""
+    int_psi, x = integrate_wavelet(DiscreteContinuousWavelet(wavelet), precision=10)
+    int_psi = np.asarray(int_psi, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    step = x[1] - x[0]
+    j = (np.arange(scale * (x[-1] - x[0]) + 1) / (scale * step)).astype(int)
+    if j[-1] >= int_psi.size:
+        j = np.extract(j < int_psi.size, j)
+    kernel = int_psi[j][::-1]
+    kernel.flags.writeable = False
+    return kernel
+
+
+def cwt_filter(data: np.ndarray, *, wavelet: str, center_frequency_hz: float, sampling_rate_hz: float) -> np.ndarray:
+    """Single scale CWT like ``mobgap.data_transform.CwtFilter`` for a real valued wavelet."""
+    scale = _cwt_scale(wavelet, center_frequency_hz, sampling_rate_hz)
+    data = np.asarray(data, dtype=np.float64)
+    conv = np.convolve(data, _cwt_kernel(wavelet, scale))
+    coef = -np.sqrt(np.float64(scale)) * np.diff(conv)
+    d = (coef.shape[-1] - data.shape[-1]) / 2.0
+    if d > 0:
+        coef = coef[floor(d) : -ceil(d)]
+    elif d < 0:
+        raise ValueError(f"Selected scale of {scale} too small.")
+    return coef
+
+
+__all__ = ["butter_filtfilt", "butter_sos", "cwt_filter", "resample"]
@@ -3,19 +3,20 @@ import numpy as np
 
 
 def dominant_freqency(data, sampling_rate_hz: float) -> int:
-    # If data are numpy arrays, convert them to pandas Series
-    if isinstance(data, np.ndarray):
-        data = pd.Series(data)
+    # If data are pandas Series, use the underlying numpy array
+    if isinstance(data, pd.Series):
+        data = data.to_numpy()
 
     # centering the signal around 0
+    data = np.asarray(data, dtype=float)
     data = data - np.mean(data)
 
-    # Calculating the FFT of the signal
+    # Calculating the FFT of the signal. For real signals, the real FFT directly provides the positive frequencies
     n = len(data)
-    fft_signal = np.fft.fft(data)
-    frequencies = np.fft.fftfreq(n, d=1 / sampling_rate_hz)
+    fft_signal = np.fft.rfft(data)
+    frequencies = np.fft.rfftfreq(n, d=1 / sampling_rate_hz)
 
-    # Only keep the positive frequencies (real part)
+    # Only keep the positive frequencies (excluding the Nyquist frequency, as in the full FFT)
     positive_frequencies = frequencies[:n // 2]
     positive_fft_signal = np.abs(fft_signal[:n // 2])
 
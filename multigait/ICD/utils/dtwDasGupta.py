@@ -53,6 +53,107 @@ def dtwdasgupta(r, t):
         for n in range(1, N):
             D[m, n] = d[m, n] + min(D[m - 1, n], D[m, n - 1], D[m - 1, n - 1])
 
+    return _warp_along_path(D, t)
+
+
+@njit
+def dtwdasgupta_banded(r, t, window):
+    """
+      DTW-based warping function with a Sakoe-Chiba band constraint.
+
+      Same as `dtwdasgupta`, but the warping path is restricted to samples with ``|i - j| <= window``.
+      Only the cost matrix entries within the band are calculated and stored, which reduces the runtime and the
+      memory from O(M*N) to O(M*window).
+
+      Parameters
+      ----------
+      r : np.ndarray
+          Reference time series.
+      t : np.ndarray
+          Target time series to be warped.
+      window : int
+          Half-width of the band in samples. It is widened to ``|M - N|`` if required, so that a valid warping path
+          always exists. For ``window >= max(M, N)`` the result is identical to `dtwdasgupta`.
+
+      Returns
+      -------
+      np.ndarray
+          Warped version of `t`, aligned to `r` in time.
+      """
+
+    M = len(r)
+    N = len(t)
+    w = max(window, abs(M - N))
+
+    # Row m of the band stores the columns m - w to m + w of the cost matrix (entry n at position n - m + w).
+    # Entries outside the band or outside the matrix are never reachable.
+    D = np.full((M, 2 * w + 1), np.inf)
+    for m in range(M):
+        lo = max(0, m - w)
+        hi = min(N, m + w + 1)
+        for n in range(lo, hi):
+            diff = r[m] - t[n]
+            cost = diff * diff
+            if m == 0 and n == 0:
+                D[m, n - m + w] = cost
+            elif m == 0:
+                D[m, n - m + w] = cost + _band_cost(D, w, m, n - 1)
+            elif n == 0:
+                D[m, n - m + w] = cost + _band_cost(D, w, m - 1, n)
+            else:
+                D[m, n - m + w] = cost + min(
+                    _band_cost(D, w, m - 1, n), _band_cost(D, w, m, n - 1), _band_cost(D, w, m - 1, n - 1)
+                )
+
+    # Backtrack to find the warping path
+    m = M - 1
+    n = N - 1
+    path_p = np.empty(M + N, dtype=np.int32)
+    path_q = np.empty(M + N, dtype=np.int32)
+    k = 0
+
+    while m > 0 or n > 0:
+        path_p[k] = m
+        path_q[k] = n
+        k += 1
+
+        if m == 0:
+            n -= 1
+        elif n == 0:
+            m -= 1
+        else:
+            cost = np.array(
+                [_band_cost(D, w, m - 1, n), _band_cost(D, w, m, n - 1), _band_cost(D, w, m - 1, n - 1)]
+            )
+            argmin = np.argmin(cost)
+            if argmin == 0:
+                m -= 1
+            elif argmin == 1:
+                n -= 1
+            else:
+                m -= 1
+                n -= 1
+
+    path_p[k] = 0
+    path_q[k] = 0
+    k += 1
+
+    return _average_along_path(path_p[:k], path_q[:k], t)
+
+
+@njit
+def _band_cost(D, w, m, n):
+    """Entry (m, n) of the cost matrix stored as band of half-width `w` (inf outside the band)."""
+    k = n - m + w
+    if k < 0 or k > 2 * w:
+        return np.inf
+    return D[m, k]
+
+
+@njit
+def _warp_along_path(D, t):
+    """Backtrack the warping path through the cumulative cost matrix and average `t` along it."""
+    M, N = D.shape
     # Backtrack to find the warping path
     m = M - 1
     n = N - 1
@@ -85,8 +186,15 @@ def dtwdasgupta(r, t):
     path_q[k] = 0
     k += 1
 
+    return _average_along_path(path_p[:k], path_q[:k], t)
+
+
+@njit
+def _average_along_path(path_p, path_q, t):
+    """Average `t` along the backtracked warping path (from the end to the start of both series)."""
+    k = len(path_p)
     # Reverse path
-    out_len = np.max(path_p[:k]) + 1
+    out_len = np.max(path_p) + 1
     yaw2new = np.zeros(out_len)
     count = np.zeros(out_len)
 
@@ -1,13 +1,15 @@
 import warnings
 import numpy as np
 import pandas as pd
-from typing import Literal, Any
+from typing import Literal, Any, Optional
 from typing_extensions import Self, Unpack
 from mobgap.data_transform import (
     chain_transformers,
     ButterworthFilter
 )
 from multigait.SL.base_sl import BaseSlDetector
+from multigait.utils.signal_context import GsSignalContext
+from multigait.SL.utils.SL_utils import calculate_step_features
 from multigait.utils.data_conversions import seconds_to_samples
 from multigait.utils.interp import interpolate_step_metric
 
@@ -113,6 +115,7 @@ class WeinbergSL(BaseSlDetector):
             initial_contacts: pd.DataFrame,
             *,
             sampling_rate_hz: float = 100,
+            signal_context: Optional[GsSignalContext] = None,
             **kwargs: Unpack[dict[str, Any]],
     ) -> Self:
         """
@@ -126,6 +129,9 @@ class WeinbergSL(BaseSlDetector):
             DataFrame of detected initial contact indices.
         sampling_rate_hz : float
             Sampling frequency of the input signal.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -142,6 +148,7 @@ class WeinbergSL(BaseSlDetector):
         self.data = data
         self.initial_contacts = initial_contacts
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # Foot length is accessed from kwargs if provided
         # If foot_length_cm is avaialble we use that, otherwise we try using shoe_length_cm
@@ -237,8 +244,7 @@ class WeinbergSL(BaseSlDetector):
             vacc = self.data["acc_is"].to_numpy()
         elif self.version in ["wrist", "wrist_adaptive", "wrist_foot", "wrist_adaptive_foot"]:
             # Using the acceleration norm for the wrist version
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            vacc = np.linalg.norm(self.data[cols].values, axis=1)
+            vacc = signal_context.acc_norm()
 
         # turning m/s^2 to g since the multigait perform better
         vacc = vacc / 9.81
@@ -294,13 +300,13 @@ class WeinbergSL(BaseSlDetector):
         vacc_butter = np.asarray(
             chain_transformers(vacc, filter_chain, sampling_rate_hz=self.sampling_rate_hz))
 
-        # 2. Calculating maxmin of acceleration between each initial contact
-        maxmin = np.array([np.max(vacc_butter[ic:ic_next]) - np.min(vacc_butter[ic:ic_next]) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+        # 2. Calculating maxmin (and RMS) of acceleration between each initial contact
+        step_features = calculate_step_features(vacc_butter, initial_contacts)
+        maxmin = step_features.max_min
 
         # If version is adaptive calculate RMS between each initial contact
         if self.version in ["wrist_adaptive", "wrist_adaptive_foot", "lowback_adaptive", "lowback_adaptive_foot"]:
-            rms_values = np.array([np.sqrt(np.mean(np.square(vacc_butter[ic:ic_next])))
-                                for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+            rms_values = step_features.rms
 
             # calculating the mean rms
             mean_rms = np.mean(rms_values)
@@ -1,10 +1,12 @@
 import warnings
 import numpy as np
 import pandas as pd
-from typing import Literal, Any
+from typing import Literal, Any, Optional
 from typing_extensions import Self, Unpack
 from multigait.utils.data_conversions import seconds_to_samples
 from multigait.SL.base_sl import BaseSlDetector
+from multigait.utils.signal_context import GsSignalContext
+from multigait.SL.utils.SL_utils import calculate_step_features
 from multigait.utils.interp import interpolate_step_metric
 
 
@@ -97,6 +99,7 @@ class KimSL(BaseSlDetector):
         initial_contacts: pd.DataFrame,
         *,
         sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
         **kwargs: Unpack[dict[str, Any]],
     ) -> Self:
         """
@@ -107,6 +110,7 @@ class KimSL(BaseSlDetector):
         self.data = data
         self.initial_contacts = initial_contacts
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # Foot length is accessed from kwargs if provided
         # If foot_length_cm is avaialble we use that, otherwise we try using shoe_length_cm
@@ -197,8 +201,7 @@ class KimSL(BaseSlDetector):
             vacc = self.data["acc_is"].to_numpy()
         elif self.version in ["wrist", "wrist_adaptive", "wrist_foot", "wrist_adaptive_foot"]:
             # Using the acceleration norm for the wrist version
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            vacc = np.linalg.norm(self.data[cols].values, axis=1)
+            vacc = signal_context.acc_norm()
 
         # turning m/s^2 to g since the multigait perform better
         vacc = vacc / 9.81
@@ -247,12 +250,14 @@ class KimSL(BaseSlDetector):
             Array of estimated step lengths (meters) for each step.
         """
 
-        # 1. Calculating mean of acceleration between each initial contact
-        mean = np.array([np.mean(vacc[ic:ic_next]) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+        # 1. Calculating mean (and RMS) of acceleration between each initial contact
+        # Steps without samples (e.g. initial contacts after the end of the data) get a NaN mean, as np.mean did
+        step_features = calculate_step_features(vacc, initial_contacts, allow_empty_steps=True)
+        mean = step_features.mean
 
         # 2. If version is adaptive calculate RMS between each initial contact
         if self.version in ["wrist_adaptive", "wrist_adaptive_foot", "lowback_adaptive", "lowback_adaptive_foot"]:
-            rms_values = np.array([np.sqrt(np.mean(np.square(vacc[ic:ic_next]))) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+            rms_values = step_features.rms
 
             # calculating the mean rms
             mean_rms = np.mean(rms_values)
@@ -2,13 +2,14 @@ import warnings
 import numpy as np
 import pandas as pd
 from typing_extensions import Self, Unpack
-from typing import Literal, Any
+from typing import Literal, Any, Optional
 from mobgap.data_transform import (
     chain_transformers,
     ButterworthFilter
 )
-from multigait.SL.utils.SL_utils import (moving_average_filter_bylemans)
+from multigait.SL.utils.SL_utils import calculate_step_features, moving_average_filter_bylemans
 from multigait.SL.base_sl import BaseSlDetector
+from multigait.utils.signal_context import GsSignalContext
 from multigait.utils.data_conversions import seconds_to_samples
 from multigait.utils.interp import interpolate_step_metric
 
@@ -113,6 +114,7 @@ class BylemansSL(BaseSlDetector):
         initial_contacts: pd.DataFrame,
         *,
         sampling_rate_hz: float = 100,
+        signal_context: Optional[GsSignalContext] = None,
         **kwargs: Unpack[dict[str, Any]],
     ) -> Self:
         """
@@ -126,6 +128,9 @@ class BylemansSL(BaseSlDetector):
             Detected initial contact events (gait events).
         sampling_rate_hz : float
             Sampling rate of the input signal in Hz.
+        signal_context : GsSignalContext, optional
+            Shared derived signals of the gait sequence (e.g. provided by the pipeline).
+            If not provided, the required signals are calculated from ``data``.
 
         Returns
         -------
@@ -141,6 +146,7 @@ class BylemansSL(BaseSlDetector):
         self.data = data
         self.initial_contacts = initial_contacts
         self.sampling_rate_hz = sampling_rate_hz
+        signal_context = GsSignalContext.for_data(signal_context, data)
 
         # Foot length is accessed from kwargs if provided
         # If foot_length_cm is avaialble we use that, otherwise we try using shoe_length_cm
@@ -237,8 +243,7 @@ class BylemansSL(BaseSlDetector):
             vacc = self.data["acc_is"].to_numpy()
         elif self.version in ["wrist", "wrist_adaptive", "wrist_foot", "wrist_adaptive_foot"]:
             # Using the acceleration norm for the wrist version
-            cols = ['acc_is', 'acc_ml', 'acc_pa']
-            vacc = np.linalg.norm(self.data[cols].values, axis=1)
+            vacc = signal_context.acc_norm()
 
         # Calling the function to calculate step length
         raw_step_length = self._calc_step_length_bylemans(vacc, self.ic_list)
@@ -293,20 +298,17 @@ class BylemansSL(BaseSlDetector):
         # 2. Preprocessing with moving average
         vacc_butter_mav = moving_average_filter_bylemans(vacc_butter, self.sampling_rate_hz)
 
-        # 3. Calculating maxmin of acceleration between each initial contact
-        maxmin = np.array([np.max(vacc_butter_mav[ic:ic_next]) - np.min(vacc_butter_mav[ic:ic_next]) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
-
-        # 4. Calculating mean of acceleration between each initial contact
-        mean = np.array([np.mean(vacc_butter_mav[ic:ic_next]) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
-
-        # 5. Calculating time in ms between steps
-        dtime = np.array([np.abs(ic - ic_next) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+        # 3. - 5. Calculating maxmin, mean and duration (in samples) of each step between the initial contacts
+        step_features = calculate_step_features(vacc_butter_mav, initial_contacts)
+        maxmin = step_features.max_min
+        mean = step_features.mean
+        dtime = step_features.duration_samples
         # time to seconds
         dtime = dtime / self.sampling_rate_hz
 
         # 6. If version is adaptive calculate RMS between each initial contact
         if self.version in ["wrist_adaptive", "wrist_adaptive_foot", "lowback_adaptive", "lowback_adaptive_foot"]:
-            rms_values = np.array([np.sqrt(np.mean(np.square(vacc_butter_mav[ic:ic_next]))) for ic, ic_next in zip(initial_contacts, initial_contacts[1:])])
+            rms_values = step_features.rms
 
             # calculating the mean rms
             mean_rms = np.mean(rms_values)
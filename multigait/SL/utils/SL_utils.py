@@ -1,4 +1,5 @@
 import numpy as np
+from typing import NamedTuple
 
 """This module contains utility functions for stride length algos"""
 
@@ -20,3 +21,76 @@ def moving_average_filter_bylemans(
     smoothed_signal = np.convolve(data, kernel, mode='same')
 
     return smoothed_signal
+
+
+class StepFeatures(NamedTuple):
+    """Intensity features of a signal for each step (samples between two consecutive initial contacts)."""
+
+    max_min: np.ndarray
+    mean: np.ndarray
+    rms: np.ndarray
+    duration_samples: np.ndarray
+
+
+def calculate_step_features(
+    data: np.ndarray, initial_contacts: np.ndarray, *, allow_empty_steps: bool = False
+) -> StepFeatures:
+    """
+    Calculate all per-step intensity features of a signal in one pass.
+
+    Step ``i`` covers the samples ``data[initial_contacts[i]:initial_contacts[i + 1]]``.
+    The results are bit-identical to calculating ``np.max - np.min``, ``np.mean`` and
+    ``np.sqrt(np.mean(np.square(...)))`` on these slices one by one.
+
+    The range of each step is calculated with ``np.maximum.reduceat`` and ``np.minimum.reduceat``.
+    Mean and RMS are calculated together on the steps grouped by their length, with one 2D reduction per group.
+    This (instead of ``np.add.reduceat`` or cumulative sums) reproduces the pairwise summation of ``np.mean`` and hence
+    the exact values of the per-step implementation.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        1D signal.
+    initial_contacts : np.ndarray
+        Sorted and unique initial contact indices (at least 2).
+    allow_empty_steps : bool, default=False
+        Steps without samples of the signal (e.g. initial contacts after the end of the signal) raise a ValueError,
+        like ``np.max`` of an empty slice.
+        If True, all features of these steps (except the duration) are NaN instead, like ``np.mean`` of an empty
+        slice.
+
+    Returns
+    -------
+    StepFeatures
+        The range (max - min), mean, RMS and the duration in samples of each step.
+    """
+    data = np.asarray(data)
+    initial_contacts = np.asarray(initial_contacts)
+    if len(initial_contacts) < 2:
+        raise ValueError("At least two initial contacts are required to calculate step features.")
+
+    starts = initial_contacts[:-1]
+    # Steps exceeding the signal are clipped, like slicing would do
+    ends = np.minimum(initial_contacts[1:], len(data))
+    lengths = ends - starts
+    non_empty = lengths > 0
+    if not allow_empty_steps and not np.all(non_empty):
+        raise ValueError("All steps must contain at least one sample of the signal.")
+
+    max_min = np.full(len(starts), np.nan)
+    mean = np.full(len(starts), np.nan)
+    rms = np.full(len(starts), np.nan)
+    if np.any(non_empty):
+        # Reducing over [start, end) of each step. The results between the steps (from end to the next start) are
+        # discarded. The appended sample allows the end of the last step to be the end of the signal.
+        bounds = np.column_stack([starts[non_empty], ends[non_empty]]).ravel()
+        padded = np.append(data[: ends[non_empty].max()], 0)
+        max_min[non_empty] = (np.maximum.reduceat(padded, bounds) - np.minimum.reduceat(padded, bounds))[::2]
+
+    for length in np.unique(lengths[non_empty]):
+        steps = np.flatnonzero(lengths == length)
+        step_samples = data[starts[steps, None] + np.arange(length)]
+        mean[steps] = np.mean(step_samples, axis=1)
+        rms[steps] = np.sqrt(np.mean(np.square(step_samples), axis=1))
+
+    return StepFeatures(max_min=max_min, mean=mean, rms=rms, duration_samples=np.diff(initial_contacts))
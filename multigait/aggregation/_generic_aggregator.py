@@ -2,25 +2,17 @@ import typing
 import warnings
 from types import MappingProxyType
 from typing import Final
-import numpy as np
 import pandas as pd
 from pandas import option_context
 from tpcp import cf
 from tpcp.misc import set_defaults
 from typing_extensions import Self, Unpack
 from multigait.aggregation._aggregator_base import AggregatorBase
-
-
-def _custom_quantile(x: pd.Series) -> float:
-    """Calculate the 90th percentile of the passed data."""
-    if x.isna().all():
-        return np.nan
-    return np.nanpercentile(x, 90)
-
-
-def _coefficient_of_variation(x: pd.Series) -> float:
-    """Calculate variation of the passed data."""
-    return x.std() / x.mean()
+from multigait.aggregation._segment_aggregation import (
+    _coefficient_of_variation,
+    _custom_quantile,
+    aggregate_filtered,
+)
 
 
 class GenericAggregator(AggregatorBase):
@@ -427,16 +419,10 @@ class GenericAggregator(AggregatorBase):
         For each filter condition, the method subsets the data and performs the
         specified aggregations, either per group (if ``groupby`` is defined) or on
         the entire dataset.
+        The data is sorted once by the groupby keys and all filters are aggregated with vectorised segment
+        operations (see :func:`~multigait.aggregation._segment_aggregation.aggregate_filtered`).
         """
-        aggregated_results = []
-        for f, agg in available_filters_and_aggs:
-            internal_filtered = filtered_data if f is None else filtered_data.query(f)
-            if groupby:
-                data_to_agg = internal_filtered.groupby(groupby)
-            else:
-                data_to_agg = internal_filtered.groupby(pd.Series("all_wbs", index=internal_filtered.index))
-            aggregated_results.append(data_to_agg.agg(**agg))
-        return pd.concat(aggregated_results, axis=1)
+        return aggregate_filtered(filtered_data, groupby, available_filters_and_aggs)
 
     def _fillna_count_columns(self, data: pd.DataFrame) -> pd.DataFrame:
         """
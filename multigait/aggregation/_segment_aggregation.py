@@ -0,0 +1,171 @@
+"""Vectorised engine shared by the aggregators to compute filtered, grouped aggregations of walking-bout DMOs.
+
+The data is sorted once by the groupby keys.
+Every duration filter then selects a subset of the sorted rows, so that each group forms a contiguous segment, and
+all aggregations of the filter are computed for all groups at once:
+
+- ``"count"``, ``"sum"``, ``"mean"`` and ``"median"`` use the grouped (cython) reductions of pandas, one call per
+  reduction for all columns of a filter.
+- :func:`_custom_quantile` (90th percentile) and :func:`_coefficient_of_variation` are replaced by numpy kernels
+  operating on the segments, instead of calling the Python functions once per group.
+
+Any other aggregation falls back to a regular pandas groupby-aggregation of the respective column.
+"""
+
+import typing
+
+import numpy as np
+import pandas as pd
+
+Aggregation = tuple[str, typing.Union[str, typing.Callable]]
+FiltersAndAggs = list[tuple[typing.Optional[str], dict[str, Aggregation]]]
+
+_GROUPED_REDUCTIONS = ("count", "sum", "mean", "median")
+
+
+def _custom_quantile(x: pd.Series) -> float:
+    """Calculate the 90th percentile of the passed data."""
+    if x.isna().all():
+        return np.nan
+    return np.nanpercentile(x, 90)
+
+
+def _coefficient_of_variation(x: pd.Series) -> float:
+    """Calculate variation of the passed data."""
+    return x.std() / x.mean()
+
+
+def _segment_nanpercentile(values: np.ndarray, codes: np.ndarray, starts: np.ndarray, q: float) -> np.ndarray:
+    """Percentile (ignoring NaN) of every segment, identical to ``np.nanpercentile(segment, q)``.
+
+    ``codes`` must be sorted and ``starts`` are the first rows of the segments.
+    The linear interpolation replicates the one of numpy, so that the results are bit-identical.
+    """
+    sorted_values = values[np.lexsort((values, codes))]
+    n_valid = np.add.reduceat(~np.isnan(sorted_values), starts)
+    quantile = np.true_divide(q, 100)
+
+    virtual_index = (n_valid - 1) * quantile
+    previous_index = np.floor(virtual_index)
+    next_index = previous_index + 1
+    above_bounds = virtual_index >= n_valid - 1
+    previous_index[above_bounds] = -1
+    next_index[above_bounds] = -1
+    gamma = virtual_index - previous_index
+
+    # -1 refers to the last valid value of the segment (NaN values are sorted to the end of the segment)
+    last_valid = starts + n_valid - 1
+    previous_value = sorted_values[np.where(above_bounds, last_valid, starts + previous_index.astype(np.intp))]
+    next_value = sorted_values[np.where(above_bounds, last_valid, starts + next_index.astype(np.intp))]
+    diff = next_value - previous_value
+    with np.errstate(invalid="ignore"):
+        result = np.where(gamma >= 0.5, next_value - diff * (1 - gamma), previous_value + diff * gamma)
+    result[n_valid == 0] = np.nan
+    return result
+
+
+def _segment_coefficient_of_variation(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Sample standard deviation (ddof=1) divided by the mean of every segment, ignoring NaN values.
+
+    Equal to :func:`_coefficient_of_variation` up to floating point rounding (the sums are accumulated in a different
+    order).
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    count = np.add.reduceat(valid, starts).astype(float)
+    segment_lengths = np.diff(np.append(starts, len(values)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.add.reduceat(filled, starts) / count
+        squared_deviation = np.where(valid, (np.repeat(mean, segment_lengths) - filled) ** 2, 0.0)
+        std = np.sqrt(np.add.reduceat(squared_deviation, starts) / np.where(count > 1, count - 1, np.nan))
+        return std / mean
+
+
+def _pandas_aggregation(data: pd.DataFrame, groupby: typing.Optional[list[str]], aggs: dict[str, Aggregation]):
+    if groupby:
+        return data.groupby(groupby).agg(**aggs)
+    return data.groupby(pd.Series("all_wbs", index=data.index)).agg(**aggs)
+
+
+def _group_codes(data: pd.DataFrame, groupby: typing.Optional[list[str]]) -> tuple[np.ndarray, pd.Index]:
+    """Position of the group of every row in the sorted group index (-1 for rows with NA keys) and the group index."""
+    if not groupby:
+        return np.zeros(len(data), dtype=np.intp), pd.Index(["all_wbs"])
+    grouped = data.groupby(groupby)
+    codes = grouped.ngroup().to_numpy(dtype=float, na_value=np.nan)
+    return np.nan_to_num(codes, nan=-1).astype(np.intp), grouped.size().index
+
+
+def aggregate_filtered(
+    data: pd.DataFrame, groupby: typing.Optional[list[str]], filters_and_aggs: FiltersAndAggs
+) -> pd.DataFrame:
+    """
+    Apply all filters and aggregations to the data.
+
+    The result is equal to aggregating ``data.query(filter)`` with ``groupby(groupby).agg(**aggregations)`` for every
+    filter (or for all rows grouped under the label ``"all_wbs"``, if ``groupby`` is None) and concatenating the
+    results along the columns.
+    Groups without any walking bout passing a filter are NaN in the columns of that filter.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The walking-bout DMOs. The ``groupby`` keys can be columns or index levels.
+    groupby : list[str] or None
+        Keys to group by.
+    filters_and_aggs : list
+        ``(filter, aggregations)`` tuples. ``filter`` is None or a query string and ``aggregations`` maps the output
+        column names to ``(input column, aggregation)`` tuples (as for named aggregations in pandas).
+
+    Returns
+    -------
+    pd.DataFrame
+        The aggregated data with one row per group. An empty dataframe, if no aggregations are passed.
+    """
+    if not filters_and_aggs:
+        return pd.DataFrame()
+
+    codes, group_index = _group_codes(data, groupby)
+    order = np.flatnonzero(codes >= 0)
+    if not (np.diff(codes[order]) >= 0).all():
+        order = order[np.argsort(codes[order], kind="stable")]
+    sorted_data = data.iloc[order]
+    sorted_codes = codes[order]
+
+    aggregated_results = []
+    for filt, aggs in filters_and_aggs:
+        if filt is None:
+            subset, subset_codes = sorted_data, sorted_codes
+        else:
+            mask = sorted_data.eval(filt).to_numpy(dtype=bool)
+            subset, subset_codes = sorted_data[mask], sorted_codes[mask]
+        if subset.empty:
+            # Reproduces the (column types of the) result of pandas for an empty selection
+            aggregated_results.append(_pandas_aggregation(subset, groupby, aggs))
+            continue
+
+        starts = np.flatnonzero(np.diff(subset_codes, prepend=-1))
+        grouped = subset.groupby(subset_codes, sort=False)
+        reductions = {}
+        for func in _GROUPED_REDUCTIONS:
+            columns = list(dict.fromkeys(col for col, f in aggs.values() if isinstance(f, str) and f == func))
+            if columns:
+                reductions[func] = getattr(grouped[columns], func)()
+
+        result = {}
+        for name, (col, func) in aggs.items():
+            if isinstance(func, str) and func in reductions:
+                result[name] = reductions[func][col].array
+            elif func is _custom_quantile:
+                values = subset[col].to_numpy(dtype=float, na_value=np.nan)
+                result[name] = _segment_nanpercentile(values, subset_codes, starts, 90)
+            elif func is _coefficient_of_variation:
+                values = subset[col].to_numpy(dtype=float, na_value=np.nan)
+                result[name] = _segment_coefficient_of_variation(values, starts)
+            else:
+                result[name] = grouped[col].agg(func).array
+        aggregated_results.append(pd.DataFrame(result, index=group_index.take(subset_codes[starts])))
+    return pd.concat(aggregated_results, axis=1)
+
+
+__all__ = ["aggregate_filtered"]
@@ -3,6 +3,33 @@ from pathlib import Path
 from typing import Optional, Sequence, Literal, Union
 import pandas as pd
 from cwa_reader_rs import read_cwa_file, read_header
+from multigait.data_loader.imu_store import ImuStore
+from multigait.data_loader.lru_cache import MemoryBoundedLRUCache
+
+# CWA files consist of a 1024 byte metadata header followed by data blocks of 512 bytes
+_CWA_HEADER_BYTES = 1024
+_CWA_BLOCK_BYTES = 512
+
+
+def _to_read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Create a DataFrame with the data of ``df``, whose column arrays are read-only.
+
+    The data is not copied.
+
+    Args:
+        df (pd.DataFrame): DataFrame with one array per column.
+
+    Returns:
+        pd.DataFrame: DataFrame sharing the data of ``df``, which raises on any attempt to modify values in place.
+    """
+
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
 
 
 class CWADataset:
@@ -25,14 +52,28 @@ class CWADataset:
                 *.cwa
             ...
 
+    Creating the dataset does not read any file. On first access, a lightweight index
+    (participant -> sensor position -> file path and header information) is built by only reading the
+    file headers. Sensor data is decoded on demand for the requested participant and sensor and kept in a
+    least-recently-used cache bounded by ``max_cache_memory_mb``.
+
+    Optionally, each CWA file is converted once into a memory-mapped store (see ``ImuStore``) inside
+    ``cache_folder``. Later accesses open this store instead of decoding the CWA file again. A store is
+    recreated automatically, when the modification time or the size of its CWA file changes.
+
     Notes:
         -Dependencies: cwa_reader_rs, not included in pyproject.toml for now, need manual installation for this part of the code.
+        -Data read from the cache contains float32 sensor values.
+        -The values of the DataFrames returned by ``get_sensor_data`` are read-only, as they are shared with the
+         in-memory cache. Columns can be added, removed or renamed; use ``df.copy()`` to modify values in place.
     """
 
     def __init__(
         self,
         base_folder: Union[str, Path],
         missing_sensor_error_type: Literal["raise", "warn", "ignore"] = "raise",
+        cache_folder: Optional[Union[str, Path]] = None,
+        max_cache_memory_mb: float = 2048,
     ):
         """
         Initialize the dataset loader.
@@ -43,11 +84,32 @@ class CWADataset:
                 - "raise": raise an exception
                 - "warn": log a warning
                 - "ignore": silently skip
+            cache_folder (str | Path, optional): Folder for the memory-mapped stores of the decoded files.
+                If None (default), every access decodes the CWA files.
+            max_cache_memory_mb (float): Memory budget in MB for decoded sensor data kept in memory between
+                accesses. Least recently used data is evicted first. 0 disables the in-memory cache.
         """
 
         self.base_folder = Path(base_folder)
         self.missing_sensor_error_type = missing_sensor_error_type
+        self.cache_folder = Path(cache_folder) if cache_folder is not None else None
+        self.max_cache_memory_mb = max_cache_memory_mb
         self.error_log = []
+        self._index = None
+        self._data_cache = MemoryBoundedLRUCache(max_cache_memory_mb)
+
+    def _get_store_folder(self, file_path: Path) -> Path:
+        """
+        Get the folder of the memory-mapped store for a CWA file.
+
+        Args:
+            file_path (Path): Path to the CWA file.
+
+        Returns:
+            Path: cache_folder / participant_id / file stem.
+        """
+
+        return self.cache_folder / file_path.parent.name / file_path.stem
 
     def _process_file(self, file_path: Path) -> tuple[Optional[pd.DataFrame], str, Optional[float]]:
         """
@@ -64,6 +126,15 @@ class CWADataset:
         """
 
         try:
+            if self.cache_folder is not None:
+                store = ImuStore.open(self._get_store_folder(file_path), file_path)
+                if store is not None:
+                    return (
+                        store.to_dataframe(),
+                        store.header.get("hardware_type", "Unknown"),
+                        store.header.get("sample_rate_hz", None),
+                    )
+
             header = read_header(str(file_path))
             sensor_type = header.get("hardware_type", "Unknown")
             sampling_rate = header.get("sample_rate_hz", None)
@@ -79,6 +150,18 @@ class CWADataset:
             df["time"] = (df["timestamp"].astype("int64") * 1000).astype("datetime64[ns]")
             df = df[["time"] + [c for c in df.columns if c != "time"]]
             df = df.drop(columns=["timestamp"])
+
+            if self.cache_folder is not None:
+                channels = [c for c in df.columns if c != "time"]
+                store = ImuStore.write(
+                    self._get_store_folder(file_path),
+                    time_ns=df["time"].to_numpy(dtype="datetime64[ns]").view("int64"),
+                    signals=df[channels].to_numpy(),
+                    channels=channels,
+                    header=dict(header),
+                    source_file=file_path,
+                )
+                df = store.to_dataframe()
             return df, sensor_type, sampling_rate
         except Exception as e:
             msg = f"Error reading {file_path}: {e}"
@@ -114,6 +197,101 @@ class CWADataset:
                 warnings.warn(msg)
             return "Unknown"
 
+    def _get_cwa_files(self, participant_id: str) -> list[Path]:
+        """
+        List the CWA files of a participant in a fixed (sorted) order.
+
+        ``load`` and ``index`` use the same order, so that they choose the same file, if multiple files map to the
+        same sensor position.
+
+        Args:
+            participant_id (str): Participant ID.
+
+        Returns:
+            list[Path]: Sorted paths of the CWA files in the participant folder.
+        """
+
+        return sorted((self.base_folder / participant_id).glob("*.cwa"))
+
+    def _read_file_info(self, file_path: Path) -> Optional[dict[str, Union[str, float, int, Path]]]:
+        """
+        Read only the header of a CWA file and collect the information for the index.
+
+        Args:
+            file_path (Path): Path to the CWA file.
+
+        Returns:
+            dict or None: Index entry of the file or None if the header could not be read.
+        """
+
+        try:
+            header = read_header(str(file_path))
+        except Exception as e:
+            msg = f"Error reading header of {file_path}: {e}"
+            self.error_log.append(msg)
+            if self.missing_sensor_error_type == "raise":
+                raise RuntimeError(msg)
+            elif self.missing_sensor_error_type == "warn":
+                warnings.warn(msg)
+            return None
+
+        file_size = file_path.stat().st_size
+        n_samples = None
+        if self.cache_folder is not None and (store := ImuStore.open(self._get_store_folder(file_path), file_path)):
+            n_samples = store.n_samples
+
+        return {
+            "participant_id": file_path.parent.name,
+            "sensor_position": self._get_sensor_position_from_filename(file_path),
+            "file_path": file_path,
+            "hardware_type": header.get("hardware_type", "Unknown"),
+            "sampling_rate_hz": header.get("sample_rate_hz", None),
+            "file_size_bytes": file_size,
+            "n_data_blocks": max(file_size - _CWA_HEADER_BYTES, 0) // _CWA_BLOCK_BYTES,
+            "n_samples": n_samples,
+        }
+
+    @property
+    def index(self) -> pd.DataFrame:
+        """
+        Lightweight index of all CWA files, built from the file headers only.
+
+        The index is created on first access and reused afterwards.
+
+        Returns:
+            pd.DataFrame: One row per participant and sensor position (index) with the columns:
+                - file_path: Path to the CWA file.
+                - hardware_type: Hardware type from the header.
+                - sampling_rate_hz: Sampling rate from the header.
+                - file_size_bytes: Size of the CWA file.
+                - n_data_blocks: Number of data blocks in the file (proportional to the number of samples).
+                - n_samples: Exact number of samples, if known from the cache folder, otherwise None.
+        """
+
+        if self._index is None:
+            entries = []
+            for pid in self.participant_ids:
+                for file in self._get_cwa_files(pid):
+                    entry = self._read_file_info(file)
+                    if entry is not None:
+                        entries.append(entry)
+            columns = [
+                "participant_id",
+                "sensor_position",
+                "file_path",
+                "hardware_type",
+                "sampling_rate_hz",
+                "file_size_bytes",
+                "n_data_blocks",
+                "n_samples",
+            ]
+            index = pd.DataFrame(entries, columns=columns).set_index(["participant_id", "sensor_position"])
+            # If multiple files map to the same sensor position, the last one is used, but the sensor position keeps
+            # the place of its first file (as the keys of the dictionary returned by ``load``)
+            first_positions = index.index[~index.index.duplicated(keep="first")]
+            self._index = index[~index.index.duplicated(keep="last")].reindex(first_positions)
+        return self._index
+
     @property
     def participant_ids(self) -> list[str]:
         """
@@ -129,6 +307,9 @@ class CWADataset:
         """
         Load all CWA files for all participants.
 
+        This decodes every file of the dataset. To access individual recordings, prefer ``get_sensor_data``,
+        which only decodes the requested file.
+
         Returns:
             dict: Nested dictionary structured as:
                 {participant_id:
@@ -141,8 +322,7 @@ class CWADataset:
         result = {}
         for pid in self.participant_ids:
             result[pid] = {}
-            folder = self.base_folder / pid
-            for file in folder.glob("*.cwa"):
+            for file in self._get_cwa_files(pid):
                 df, sensor_type, sampling_rate = self._process_file(file)
                 sensor_pos = self._get_sensor_position_from_filename(file)
                 if df is not None:
@@ -153,33 +333,61 @@ class CWADataset:
                     }
         return result
 
-    def get_sensor_data(self, participant_id: str, sensor: Optional[str] = None) -> Optional[pd.DataFrame]:
-        """Return the DataFrame for a given participant and sensor.
+    def _get_index_entry(self, participant_id: str, sensor: Optional[str]) -> Optional[pd.Series]:
+        """
+        Find the index entry for a participant and sensor.
 
-        If the sensor is not available, a warning is issued. Valid options are 'Wrist' and 'LowerBack'.
+        If the sensor is not specified, the first available sensor of the participant is used.
+        Issues a warning and returns None, if the participant or sensor is not available.
         """
-        data = self.load()
-        if participant_id not in data:
+
+        index = self.index
+        if participant_id not in index.index.get_level_values("participant_id"):
             warnings.warn(f"No data found for participant {participant_id}")
             return None
+        participant_index = index.loc[participant_id]
 
         # If sensor not specified, return the first available
         if sensor is None:
-            sensor = next(iter(data[participant_id].keys()), None)
+            sensor = participant_index.index[0]
 
-        if sensor not in data[participant_id]:
+        if sensor not in participant_index.index:
             warnings.warn(
                 f"Sensor '{sensor}' not available for participant {participant_id}. "
-                f"Available sensors: {list(data[participant_id].keys())}"
+                f"Available sensors: {list(participant_index.index)}"
             )
             return None
 
-        return data[participant_id][sensor]["data"]
+        return participant_index.loc[sensor]
+
+    def get_sensor_data(self, participant_id: str, sensor: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Return the DataFrame for a given participant and sensor.
+
+        Only the requested file is decoded. Decoded data is kept in an LRU cache (see ``max_cache_memory_mb``).
+        Every call returns a new DataFrame, but the values are shared with the cache and therefore read-only.
+
+        If the sensor is not available, a warning is issued. Valid options are 'Wrist' and 'LowerBack'.
+        """
+        entry = self._get_index_entry(participant_id, sensor)
+        if entry is None:
+            return None
+        file_path = entry["file_path"]
+        if (df := self._data_cache.get(file_path)) is None:
+            df, _, _ = self._process_file(file_path)
+            # Failed reads are not cached, so that they are retried on the next access
+            if df is None:
+                return None
+            df = _to_read_only(df)
+            self._data_cache.put(file_path, df)
+        # Columns added, removed or renamed by the caller only change the returned frame, not the cached one
+        return df.copy(deep=False)
 
     def get_sampling_rate(self, participant_id: str, sensor: Optional[str] = None) -> Optional[float]:
         """
         Retrieve the sampling rate for a participant's sensor.
 
+        Only the index (file headers) is used, no sensor data is decoded.
+
         Args:
             participant_id (str): Participant ID.
             sensor (str, optional): Sensor position. Defaults to first available sensor if None.
@@ -188,18 +396,15 @@ class CWADataset:
             float or None: Sampling rate in Hz.
         """
 
-        data = self.load()
-        if participant_id not in data:
-            warnings.warn(f"No data found for participant {participant_id}")
-            return None
-        if sensor is None:
-            sensor = next(iter(data[participant_id].keys()), None)
-        return data[participant_id].get(sensor, {}).get("sampling_rate")
+        entry = self._get_index_entry(participant_id, sensor)
+        return None if entry is None else entry["sampling_rate_hz"]
 
     def get_hardware_type(self, participant_id: str, sensor: Optional[str] = None) -> Optional[str]:
         """
         Retrieve the hardware type for a participant's sensor.
 
+        Only the index (file headers) is used, no sensor data is decoded.
+
         Args:
             participant_id (str): Participant ID.
             sensor (str, optional): Sensor position. Defaults to first available sensor if None.
@@ -208,10 +413,5 @@ class CWADataset:
             str or None: Hardware type (e.g., 'AX6').
         """
 
-        data = self.load()
-        if participant_id not in data:
-            warnings.warn(f"No data found for participant {participant_id}")
-            return None
-        if sensor is None:
-            sensor = next(iter(data[participant_id].keys()), None)
-        return data[participant_id].get(sensor, {}).get("hardware_type")
+        entry = self._get_index_entry(participant_id, sensor)
+        return None if entry is None else entry["hardware_type"]
@@ -0,0 +1,190 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Increase, whenever the on-disk layout changes. Stores with a different version are treated as stale.
+STORE_FORMAT_VERSION = 1
+
+_TIME_FILE = "time_ns.npy"
+_SIGNALS_FILE = "signals.npy"
+_META_FILE = "meta.json"
+
+
+def _source_signature(source_file: Path) -> dict[str, int]:
+    stat = source_file.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+class ImuStore:
+    """
+    Memory-mapped columnar store of a single decoded sensor file.
+
+    The store is a folder containing:
+        - ``time_ns.npy``: int64 timestamps in nanoseconds since epoch.
+        - ``signals.npy``: float32 array of shape (n_samples, n_channels) with all sensor channels.
+        - ``meta.json``: channel names, header metadata and the signature (mtime and size) of the source file.
+
+    Opening a store only reads ``meta.json``. The arrays are memory-mapped on first access, so only the pages that
+    are actually used are read from disk.
+
+    Notes:
+        - Sensor values are stored as float32, which halves the size compared to the float64 values of the decoder.
+    """
+
+    def __init__(self, store_folder: Union[str, Path], meta: dict[str, Any]):
+        """
+        Initialize the store. Use ``ImuStore.open`` or ``ImuStore.write`` instead of calling this directly.
+
+        Args:
+            store_folder (str | Path): Folder containing the store files.
+            meta (dict): Parsed content of ``meta.json``.
+        """
+
+        self.store_folder = Path(store_folder)
+        self.meta = meta
+        self._time_ns = None
+        self._signals = None
+
+    @classmethod
+    def write(
+        cls,
+        store_folder: Union[str, Path],
+        *,
+        time_ns: np.ndarray,
+        signals: np.ndarray,
+        channels: list[str],
+        header: dict[str, Any],
+        source_file: Union[str, Path],
+    ) -> "ImuStore":
+        """
+        Write a new store, replacing an existing store in the same folder.
+
+        The files are first written to a temporary folder that is then renamed, so that an interrupted conversion
+        never leaves a half-written store behind.
+
+        Args:
+            store_folder (str | Path): Target folder of the store.
+            time_ns (np.ndarray): Timestamps in nanoseconds since epoch.
+            signals (np.ndarray): Sensor values of shape (n_samples, n_channels).
+            channels (list[str]): Names of the sensor channels (columns of ``signals``).
+            header (dict): Header metadata of the source file. Must be JSON serializable.
+            source_file (str | Path): The file the data was decoded from. Used for invalidation.
+
+        Returns:
+            ImuStore: The opened store.
+        """
+
+        store_folder = Path(store_folder)
+        signals = np.asarray(signals, dtype=np.float32)
+        if signals.ndim != 2 or signals.shape[1] != len(channels):
+            raise ValueError("`signals` must be a 2D array with one column per channel.")
+        if len(time_ns) != len(signals):
+            raise ValueError("`time_ns` and `signals` must have the same number of samples.")
+
+        meta = {
+            "format_version": STORE_FORMAT_VERSION,
+            "channels": list(channels),
+            "n_samples": len(signals),
+            "header": header,
+            "source": _source_signature(Path(source_file)),
+        }
+
+        store_folder.parent.mkdir(parents=True, exist_ok=True)
+        tmp_folder = Path(tempfile.mkdtemp(prefix=f".{store_folder.name}.", dir=store_folder.parent))
+        try:
+            np.save(tmp_folder / _TIME_FILE, np.asarray(time_ns, dtype=np.int64))
+            np.save(tmp_folder / _SIGNALS_FILE, signals)
+            with open(tmp_folder / _META_FILE, "w") as f:
+                json.dump(meta, f, default=str)
+            if store_folder.exists():
+                shutil.rmtree(store_folder)
+            os.replace(tmp_folder, store_folder)
+        finally:
+            if tmp_folder.exists():
+                shutil.rmtree(tmp_folder)
+
+        # Round-trip through JSON, so that the metadata is identical to the one of a store opened later on
+        return cls(store_folder, json.loads(json.dumps(meta, default=str)))
+
+    @classmethod
+    def open(cls, store_folder: Union[str, Path], source_file: Union[str, Path]) -> Optional["ImuStore"]:
+        """
+        Open an existing store, if it is still valid for the source file.
+
+        Args:
+            store_folder (str | Path): Folder of the store.
+            source_file (str | Path): The file the store was created from.
+
+        Returns:
+            ImuStore or None: The store, or None if it does not exist, is incomplete, was created with a different
+                store format or the source file changed (mtime or size) since its creation.
+        """
+
+        store_folder = Path(store_folder)
+        meta_file = store_folder / _META_FILE
+        if not meta_file.is_file():
+            return None
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("format_version") != STORE_FORMAT_VERSION:
+            return None
+        if meta.get("source") != _source_signature(Path(source_file)):
+            return None
+        if not all((store_folder / f).is_file() for f in (_TIME_FILE, _SIGNALS_FILE)):
+            return None
+        return cls(store_folder, meta)
+
+    @property
+    def header(self) -> dict[str, Any]:
+        """Header metadata of the source file."""
+        return self.meta["header"]
+
+    @property
+    def channels(self) -> list[str]:
+        """Names of the sensor channels."""
+        return self.meta["channels"]
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples in the store."""
+        return self.meta["n_samples"]
+
+    @property
+    def time_ns(self) -> np.ndarray:
+        """Read-only memory-mapped timestamps in nanoseconds since epoch."""
+        if self._time_ns is None:
+            self._time_ns = np.load(self.store_folder / _TIME_FILE, mmap_mode="r")
+        return self._time_ns
+
+    @property
+    def signals(self) -> np.ndarray:
+        """Read-only memory-mapped float32 sensor values of shape (n_samples, n_channels)."""
+        if self._signals is None:
+            self._signals = np.load(self.store_folder / _SIGNALS_FILE, mmap_mode="r")
+        return self._signals
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the data as DataFrame with a ``time`` column followed by the sensor channels.
+
+        The sensor columns are backed by the memory-mapped array without copying.
+
+        Returns:
+            pd.DataFrame: The sensor data.
+        """
+
+        df = pd.DataFrame(self.signals, columns=self.channels, copy=False)
+        df.insert(0, "time", self.time_ns.view("datetime64[ns]"))
+        return df
+
+
+__all__ = ["ImuStore", "STORE_FORMAT_VERSION"]
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+
+def _default_sizeof(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    return int(getattr(value, "nbytes", 0))
+
+
+class MemoryBoundedLRUCache:
+    """
+    Least-recently-used cache with a memory budget instead of a fixed number of entries.
+
+    When adding an entry would exceed the budget, the least recently used entries are evicted until the new entry
+    fits. Entries that are larger than the entire budget are not cached at all.
+
+    Notes:
+        - The size of pandas objects is measured with ``memory_usage(deep=True)``, for all other objects ``nbytes``
+          is used (0 if not available). Memory-mapped data is counted with its full size, even though it might not
+          be resident in memory.
+    """
+
+    def __init__(self, max_memory_mb: float, sizeof: Optional[Callable[[Any], int]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_memory_mb (float): Memory budget in megabytes. A budget of 0 disables caching.
+            sizeof (Callable, optional): Function returning the size of a value in bytes.
+        """
+
+        self.max_memory_mb = max_memory_mb
+        self.sizeof = sizeof or _default_sizeof
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.current_bytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """Memory budget in bytes."""
+        return int(self.max_memory_mb * 1024**2)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as most recently used.
+
+        Args:
+            key (Hashable): Key of the entry.
+            default (Any): Value returned if the key is not cached.
+
+        Returns:
+            Any: The cached value or ``default``.
+        """
+
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add an entry, evicting the least recently used entries if required.
+
+        Args:
+            key (Hashable): Key of the entry.
+            value (Any): Value to cache.
+        """
+
+        self.pop(key)
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        while self._entries and self.current_bytes + size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached value or compute and cache it.
+
+        Args:
+            key (Hashable): Key of the entry.
+            compute (Callable): Function without arguments returning the value on a cache miss.
+
+        Returns:
+            Any: The cached or computed value.
+        """
+
+        if key in self._entries:
+            return self.get(key)
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable) -> Any:
+        """
+        Remove an entry from the cache.
+
+        Args:
+            key (Hashable): Key of the entry.
+
+        Returns:
+            Any: The removed value or None if the key was not cached.
+        """
+
+        if key not in self._entries:
+            return None
+        value, size = self._entries.pop(key)
+        self.current_bytes -= size
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+
+__all__ = ["MemoryBoundedLRUCache"]
@@ -0,0 +1,174 @@
+"""Run a pipeline over all datapoints of a dataset in parallel."""
+
+import time
+import traceback
+import warnings
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Optional
+
+import pandas as pd
+from typing_extensions import Literal
+
+from multigait.pipeline.pipeline_base import PipelineBase
+
+
+@dataclass
+class BatchResult:
+    """
+    Combined results of running a pipeline over multiple datapoints.
+
+    All dataframes are indexed by the group label of the datapoint (one index level per group label field)
+    followed by the original index levels of the respective pipeline result.
+    Datapoints that failed only appear in ``errors`` and ``wall_time_s``.
+
+    Attributes
+    ----------
+    per_wb_parameters : pd.DataFrame
+        Concatenated ``per_wb_parameters_`` of all successful datapoints.
+    per_stride_parameters : pd.DataFrame
+        Concatenated ``per_stride_parameters_`` of all successful datapoints.
+    aggregated_parameters : pd.DataFrame
+        Concatenated ``aggregated_parameters_`` of all successful datapoints.
+        Empty, if the pipeline does not perform an aggregation.
+    errors : pd.DataFrame
+        One row per failed datapoint with the columns ``error`` (error type and message) and ``traceback``.
+    wall_time_s : pd.Series
+        Wall time in seconds required to process each datapoint (including failed ones).
+    """
+
+    per_wb_parameters: pd.DataFrame
+    per_stride_parameters: pd.DataFrame
+    aggregated_parameters: pd.DataFrame
+    errors: pd.DataFrame
+    wall_time_s: pd.Series
+
+
+_RESULT_ATTRIBUTES = {
+    "per_wb_parameters": "per_wb_parameters_",
+    "per_stride_parameters": "per_stride_parameters_",
+    "aggregated_parameters": "aggregated_parameters_",
+}
+
+
+def _group_label_to_key(group_label: Any) -> tuple[tuple, list[str]]:
+    """Convert a group label (named tuple, dict or scalar) into a hashable key and the corresponding level names."""
+    if hasattr(group_label, "_fields"):
+        return tuple(group_label), list(group_label._fields)
+    if isinstance(group_label, dict):
+        return tuple(group_label.values()), list(group_label.keys())
+    return (group_label,), ["group_label"]
+
+
+def _run_single_datapoint(datapoint: Any, *, pipeline: PipelineBase) -> dict[str, Any]:
+    """Run a copy of the pipeline on a single datapoint and catch all errors.
+
+    This function is executed in the workers and only returns picklable objects.
+    Hence, the group label (which might be a dynamically created named tuple) is converted into a plain tuple.
+    """
+    start = time.perf_counter()
+    key, level_names = _group_label_to_key(datapoint.group_label)
+    result = {"key": key, "level_names": level_names, "error": None, "traceback": None}
+    try:
+        pipe = pipeline.clone().safe_run(datapoint)
+        for name, attribute in _RESULT_ATTRIBUTES.items():
+            result[name] = getattr(pipe, attribute, None)
+    except Exception as e:  # noqa: BLE001
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["wall_time_s"] = time.perf_counter() - start
+    return result
+
+
+def _concat_results(per_datapoint: list[tuple[tuple, pd.DataFrame]], level_names: list[str]) -> pd.DataFrame:
+    per_datapoint = [(key, df) for key, df in per_datapoint if df is not None]
+    if not per_datapoint:
+        return pd.DataFrame()
+    keys, dfs = zip(*per_datapoint)
+    return pd.concat(dfs, keys=list(keys), names=[*level_names, *dfs[0].index.names])
+
+
+def run_batch(
+    pipeline: PipelineBase,
+    dataset: Iterable[Any],
+    *,
+    n_jobs: Optional[int] = None,
+    backend: Literal["serial", "thread", "process"] = "process",
+) -> BatchResult:
+    """
+    Run a pipeline on every datapoint of a dataset and combine the results.
+
+    Each datapoint is processed by an independent clone of the pipeline.
+    Errors raised while processing a datapoint are caught and recorded in ``BatchResult.errors``, so that a single
+    faulty recording does not abort the entire batch.
+    A warning is issued for every failed datapoint.
+
+    Parameters
+    ----------
+    pipeline : PipelineBase
+        The (unfitted) pipeline instance to run. It is never modified.
+    dataset : Iterable
+        A tpcp dataset or any iterable of datapoints exposing a ``group_label``.
+        For tpcp datasets, iterating yields one single-row subset per datapoint.
+    n_jobs : Optional[int], default=None
+        Maximum number of workers. If None, the default of the respective ``concurrent.futures`` executor is used.
+    backend : {"serial", "thread", "process"}, default="process"
+        How the datapoints are distributed. "process" requires the pipeline and the dataset to be picklable.
+
+    Returns
+    -------
+    BatchResult
+        The combined results keyed by the group label of each datapoint.
+
+    Raises
+    ------
+    ValueError
+        If an unknown backend is selected.
+    """
+    if backend not in ("serial", "thread", "process"):
+        raise ValueError(f"Unknown backend '{backend}'. Valid options are 'serial', 'thread' and 'process'.")
+
+    datapoints = list(dataset)
+    worker = partial(_run_single_datapoint, pipeline=pipeline)
+
+    if backend == "serial" or len(datapoints) == 0:
+        results = [worker(dp) for dp in datapoints]
+    else:
+        executor_type = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+        with executor_type(max_workers=n_jobs) as executor:
+            results = list(executor.map(worker, datapoints))
+
+    level_names = results[0]["level_names"] if results else ["group_label"]
+    keys = [r["key"] for r in results]
+    for r in results:
+        if r["error"] is not None:
+            warnings.warn(
+                f"Processing of datapoint {dict(zip(r['level_names'], r['key']))} failed with {r['error']}",
+                stacklevel=2,
+            )
+
+    key_index = pd.MultiIndex.from_tuples(keys, names=level_names) if keys else pd.Index([], name="group_label")
+    failed = [r["error"] is not None for r in results]
+
+    return BatchResult(
+        **{
+            key: _concat_results(
+                [(k, r[key]) for k, r, f in zip(keys, results, failed) if not f],
+                level_names,
+            )
+            for key in _RESULT_ATTRIBUTES
+        },
+        errors=pd.DataFrame(
+            {
+                "error": [r["error"] for r in results],
+                "traceback": [r["traceback"] for r in results],
+            },
+            index=key_index,
+        )[failed],
+        wall_time_s=pd.Series([r["wall_time_s"] for r in results], index=key_index, name="wall_time_s"),
+    )
+
+
+__all__ = ["BatchResult", "run_batch"]
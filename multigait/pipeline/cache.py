@@ -0,0 +1,247 @@
+"""Content-addressed on-disk cache for the results of the expensive pipeline stages."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+from tpcp.misc import custom_hash
+
+# Increase, if the format of the cached results changes, so that old entries are not used anymore.
+_CACHE_FORMAT_VERSION = 1
+
+_ENTRY_SUFFIX = ".pkl"
+
+
+def hash_signal(data: pd.DataFrame, sampling_rate_hz: float) -> str:
+    """
+    Hash the content of a recording (values, columns, index and sampling rate).
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The sensor data.
+    sampling_rate_hz : float
+        The sampling rate of the data.
+
+    Returns
+    -------
+    str
+        Hex digest of the content.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr((float(sampling_rate_hz), list(map(str, data.columns)), list(map(str, data.dtypes)))).encode())
+    for _, column in data.items():
+        h.update(_array_bytes(column))
+    if isinstance(data.index, pd.RangeIndex):
+        h.update(repr((data.index.start, data.index.stop, data.index.step)).encode())
+    else:
+        h.update(_array_bytes(data.index))
+    return h.hexdigest()
+
+
+def _array_bytes(values: Union[pd.Series, pd.Index]) -> np.ndarray:
+    arr = values.to_numpy()
+    if arr.dtype == object:
+        return pd.util.hash_pandas_object(values, index=False).to_numpy().view(np.uint8)
+    return np.ascontiguousarray(arr).view(np.uint8)
+
+
+def hash_algorithm(algorithm: Any) -> str:
+    """
+    Hash an algorithm instance based on its type and its parameters (``get_params``).
+
+    ``None`` (i.e. an optional step that is not used) is a valid input.
+    """
+    if algorithm is None:
+        return custom_hash(None)
+    return custom_hash((type(algorithm).__module__, type(algorithm).__qualname__, algorithm.get_params()))
+
+
+def combine_keys(stage: str, *parts: str) -> str:
+    """Combine the stage name and the keys of all inputs (signal and upstream stages) into a single key."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr((_CACHE_FORMAT_VERSION, stage, parts)).encode())
+    return f"{stage}-{h.hexdigest()}"
+
+
+class StageCache:
+    """
+    On-disk cache for the results of pipeline stages, addressed by the content of their inputs.
+
+    The key of a stage combines a hash of the input signal with the type and parameters (``get_params``) of the
+    algorithm of the stage and of all upstream stages.
+    Hence, changing the parameters of a downstream step (e.g. stride selection or walking bout assembly) reuses the
+    cached results of gait sequence and initial contact detection, while changing any upstream parameter (or the
+    data) results in a new key.
+
+    Every entry is stored as a separate pickle file in ``cache_dir``.
+    If ``max_size_bytes`` is set, the least recently used entries are removed after each write until the total size
+    of all entries is below the limit.
+    The access time of an entry is tracked via the modification time of its file, so that the order is also valid
+    across multiple processes using the same directory.
+
+    Parameters
+    ----------
+    cache_dir : str or Path
+        Directory to store the entries in. It is created, if it does not exist.
+    max_size_bytes : Optional[int], default=None
+        Maximum total size of all entries. If None, entries are never removed.
+
+    Attributes
+    ----------
+    hits : dict[str, int]
+        Number of cache hits per stage of this instance.
+    misses : dict[str, int]
+        Number of cache misses per stage of this instance.
+    evictions : int
+        Number of entries removed by this instance to stay within ``max_size_bytes``.
+
+    Notes
+    -----
+    The key only depends on the data and the parameters, not on the code of the algorithms.
+    After updating the algorithms, the cache should be cleared (``clear``).
+
+    The statistics are not part of the state that is pickled or copied (e.g. when a pipeline is cloned), so that
+    copies of the cache start with empty statistics and the statistics do not influence the hash of a pipeline.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size_bytes: Optional[int] = None) -> None:
+        if max_size_bytes is not None and max_size_bytes < 0:
+            raise ValueError("max_size_bytes must be a positive integer or None.")
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self.evictions = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"cache_dir": self.cache_dir, "max_size_bytes": self.max_size_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_stats()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(cache_dir={str(self.cache_dir)!r}, max_size_bytes={self.max_size_bytes})"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                # Removed by another process in the meantime
+                continue
+        return entries
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Load the entry for a key.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry (see ``combine_keys``). The part before the first "-" is used as stage name for the
+            statistics.
+
+        Returns
+        -------
+        Optional[dict[str, Any]]
+            The stored results or None, if there is no (readable) entry for the key.
+        """
+        stage = key.split("-", 1)[0]
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            value = None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Incomplete or outdated entry. We remove it, so that it is replaced by the next ``put``.
+            path.unlink(missing_ok=True)
+            value = None
+
+        if value is None:
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+        else:
+            self.hits[stage] = self.hits.get(stage, 0) + 1
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        """
+        Store the results for a key and remove the least recently used entries, if the size limit is exceeded.
+
+        The entry is first written to a temporary file and then moved to its final location, so that concurrent
+        readers never see a partially written entry.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._evict(keep=self._path(key))
+
+    def _evict(self, keep: Path) -> None:
+        if self.max_size_bytes is None:
+            return
+        entries = self._entries()
+        total_size = sum(stat.st_size for _, stat in entries)
+        # Oldest access first. The entry that was just written is removed last, i.e. only if it alone exceeds the
+        # limit.
+        for path, stat in sorted(entries, key=lambda e: (e[0] == keep, e[1].st_mtime_ns)):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
+            self.evictions += 1
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all entries in the cache directory."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def stats(self) -> pd.DataFrame:
+        """
+        Hit/miss statistics per stage.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per stage (index "stage") with the columns "hits", "misses" and "hit_rate".
+        """
+        stages = sorted(set(self.hits) | set(self.misses))
+        stats = pd.DataFrame(
+            {
+                "hits": [self.hits.get(s, 0) for s in stages],
+                "misses": [self.misses.get(s, 0) for s in stages],
+            },
+            index=pd.Index(stages, name="stage"),
+        )
+        return stats.assign(hit_rate=lambda df_: df_.hits / (df_.hits + df_.misses))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+        self._reset_stats()
+
+
+__all__ = ["StageCache", "combine_keys", "hash_algorithm", "hash_signal"]
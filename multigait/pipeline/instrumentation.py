@@ -0,0 +1,260 @@
+"""Timing and memory instrumentation of the pipeline stages."""
+
+import json
+import time
+import tracemalloc
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+_NULL_CONTEXT = nullcontext()
+
+STAGE_COLUMNS = ["wall_time_s", "cpu_time_s", "peak_memory_bytes"]
+PER_GS_COLUMNS = ["wall_time_s", "cpu_time_s"]
+
+
+@dataclass
+class PerfReport:
+    """
+    Timing and memory usage of a single pipeline run.
+
+    Attributes
+    ----------
+    stages : pd.DataFrame
+        One row per stage (index "stage", in execution order) with the columns ``wall_time_s``, ``cpu_time_s`` and
+        ``peak_memory_bytes``.
+        The peak memory is the maximal additional memory allocated by Python (``tracemalloc``) during the stage.
+        It is NaN, if memory tracing is disabled.
+        The per-GS steps (ICD, cadence, stride length, walking speed) are included as rows ``per_gs.<step>`` with the
+        summed times over all GSs.
+    per_gs : pd.DataFrame
+        Wall and CPU time of every per-GS step, indexed by ``gs_id`` and ``step``.
+        The CPU time is measured per thread, so that it is also valid for the parallel executors.
+    counters : dict[str, float]
+        Size of the input and of the (intermediate) results, e.g. the number of gait sequences, initial contacts,
+        strides and walking bouts, and the throughput in samples per second of wall time.
+    total_wall_time_s : float
+        Wall time of the entire run.
+    """
+
+    stages: pd.DataFrame
+    per_gs: pd.DataFrame
+    counters: dict[str, float]
+    total_wall_time_s: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the report into a JSON serializable dictionary."""
+        return {
+            "total_wall_time_s": self.total_wall_time_s,
+            "counters": self.counters,
+            "stages": _records(self.stages.reset_index()),
+            "per_gs": _records(self.per_gs.reset_index()),
+        }
+
+    def to_json(self, path: Union[str, Path]) -> None:
+        """Write the report as JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+
+def _records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    # ``to_json`` converts NaN to null and numpy scalars to plain numbers.
+    return json.loads(df.to_json(orient="records"))
+
+
+@dataclass
+class PipelineInstrumentation:
+    """
+    Settings of the pipeline instrumentation.
+
+    Pass an instance as ``instrumentation`` to a pipeline to record a :class:`PerfReport` (``perf_report_``) for every
+    run.
+
+    Parameters
+    ----------
+    trace_memory : bool, default=True
+        Record the peak memory of every stage with ``tracemalloc``.
+        Memory tracing slows down allocation heavy code considerably (and hence inflates the recorded times) and is
+        only started, if it is not already active.
+        Allocations in worker processes (``per_gs_executor="process"``) are not traced.
+    callbacks : Sequence[Callable[[PerfReport, Any], None]], default=()
+        Functions that are called with the report and the datapoint at the end of every run (e.g.
+        :class:`JsonReportWriter`).
+    """
+
+    trace_memory: bool = True
+    callbacks: Sequence[Callable[[PerfReport, Any], None]] = field(default_factory=tuple)
+
+
+class JsonReportWriter:
+    """
+    Callback that writes the report of every run to ``<directory>/<group label>.json``.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Output directory. It is created, if it does not exist.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+
+    def __call__(self, report: PerfReport, datapoint: Any) -> None:
+        group_label = datapoint.group_label
+        if hasattr(group_label, "_fields"):
+            name = "_".join(str(v) for v in group_label)
+        elif isinstance(group_label, dict):
+            name = "_".join(str(v) for v in group_label.values())
+        else:
+            name = str(group_label)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        report.to_json(self.directory / f"{name}.json")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(directory={str(self.directory)!r})"
+
+
+@contextmanager
+def _time_step(timings: dict[str, tuple[float, float]], name: str) -> Iterator[None]:
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+
+def time_step(timings: Optional[dict[str, tuple[float, float]]], name: str) -> Any:
+    """
+    Record wall and CPU time (of the current thread) of a block in ``timings[name]``.
+
+    If ``timings`` is None, a shared no-op context is returned.
+    """
+    if timings is None:
+        return _NULL_CONTEXT
+    return _time_step(timings, name)
+
+
+class PerfRecorder:
+    """
+    Records the stages of a single pipeline run.
+
+    Stages must not be nested.
+    Use :data:`NULL_RECORDER` to disable the recording with (almost) no overhead.
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Record the peak memory of every stage with ``tracemalloc``.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self._stages: dict[str, list[float]] = {}
+        self._per_gs: list[tuple[Any, str, float, float]] = []
+        self.counters: dict[str, float] = {}
+        self._started_tracing = False
+        self._start = time.perf_counter()
+
+    def __enter__(self) -> "PerfRecorder":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._total_wall_time_s = time.perf_counter() - self._start
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record wall time, CPU time and peak memory of a stage. Repeated stages are summed up."""
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak = tracemalloc.get_traced_memory()[1] - memory_start if tracing else np.nan
+            if name in self._stages:
+                previous = self._stages[name]
+                self._stages[name] = [previous[0] + wall, previous[1] + cpu, np.fmax(previous[2], peak)]
+            else:
+                self._stages[name] = [wall, cpu, peak]
+
+    def add_per_gs_timings(self, gs_id: Any, timings: dict[str, tuple[float, float]]) -> None:
+        """Add the step timings (see :func:`time_step`) of a single gait sequence."""
+        for step, (wall, cpu) in timings.items():
+            self._per_gs.append((gs_id, step, wall, cpu))
+
+    def count(self, **counters: float) -> None:
+        """Set one or multiple counters."""
+        self.counters.update(counters)
+
+    def report(self) -> PerfReport:
+        """Create the report. Must be called after the recorder was exited."""
+        per_gs = pd.DataFrame(self._per_gs, columns=["gs_id", "step", *PER_GS_COLUMNS]).set_index(["gs_id", "step"])
+        stages = pd.DataFrame.from_dict(self._stages, orient="index", columns=STAGE_COLUMNS).rename_axis("stage")
+        per_step = (
+            per_gs.groupby("step", sort=False)[PER_GS_COLUMNS]
+            .sum()
+            .rename(index=lambda step: f"per_gs.{step}")
+            .rename_axis("stage")
+            .assign(peak_memory_bytes=np.nan)
+        )
+        if not per_step.empty:
+            stages = pd.concat([stages, per_step]) if not stages.empty else per_step
+        counters = dict(self.counters)
+        if "n_samples" in counters:
+            counters["samples_per_s"] = counters["n_samples"] / self._total_wall_time_s
+        return PerfReport(
+            stages=stages, per_gs=per_gs, counters=counters, total_wall_time_s=self._total_wall_time_s
+        )
+
+
+class _NullRecorder:
+    """Drop-in replacement for :class:`PerfRecorder` that does nothing."""
+
+    enabled = False
+
+    def __enter__(self) -> "_NullRecorder":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+    def stage(self, name: str) -> nullcontext:  # noqa: ARG002
+        return _NULL_CONTEXT
+
+    def add_per_gs_timings(self, gs_id: Any, timings: Any) -> None:
+        return None
+
+    def count(self, **counters: float) -> None:
+        return None
+
+
+NULL_RECORDER = _NullRecorder()
+
+
+__all__ = [
+    "NULL_RECORDER",
+    "JsonReportWriter",
+    "PerfRecorder",
+    "PerfReport",
+    "PipelineInstrumentation",
+    "time_step",
+]
@@ -1,10 +1,14 @@
+import inspect
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from types import MappingProxyType
 from typing import Any, Final, Generic, Optional
 import pandas as pd
 from tpcp import cf
+from tpcp.misc import custom_hash
 from tpcp.misc import set_defaults
-from typing_extensions import Self
+from typing_extensions import Literal, Self
 
 
 # Multimobility imports
@@ -20,22 +24,33 @@ from multigait.WS.walking_speed import Ws
 from multigait.WS.base_ws import BaseWsDetector
 
 # Multimobility function imports
-from multigait.pipeline.utils.ic_to_stride import strides_list_from_ic_list_no_lrc
+from multigait.pipeline.utils.ic_to_stride import strides_list_from_grouped_ic_list_no_lrc
 from multigait.pipeline.utils._wb_assembly import WbAssembly
 from multigait.pipeline.utils._thresholds import get_thresholds, apply_thresholds
 from multigait.aggregation._generic_aggregator import GenericAggregator
 from multigait.pipeline.utils._stride_filtering import StrideFiltering
-from multigait.pipeline.iterator import GsIterator, FullPipelinePerGsResult
-from multigait.pipeline.utils._operations import create_multi_groupby
-from multigait.utils.interp import map_seconds_to_regions
+from multigait.pipeline.iterator import GsIterator, FullPipelinePerGsResult, iter_gs
+from multigait.utils.interp import map_seconds_to_grouped_regions
 from multigait.aggregation._aggregator_base import AggregatorBase
 from multigait.pipeline.pipeline_base import PipelineBase
 from multigait.pipeline.pipeline_base import GaitDatasetT
+from multigait.pipeline.batch import BatchResult, _group_label_to_key, run_batch
+from multigait.pipeline.cache import StageCache, combine_keys, hash_algorithm, hash_signal
+from multigait.pipeline.instrumentation import NULL_RECORDER, PerfRecorder, PerfReport, PipelineInstrumentation, time_step
 from multigait.utils.data_conversions import rename_axes_to_body
-from multigait.pipeline.utils._var_dmos import within_wb_var
+from multigait.utils.signal_context import GsSignalContext
+from multigait.pipeline.utils._var_dmos import WithinWbStats, var_dmos_from_stats, within_wb_stats, within_wb_var
 from multigait.pipeline.utils.alpha import compute_alpha_mle
 
 
+# Per-stride parameters that are averaged per WB
+PER_WB_PARAMETERS = [
+    "stride_duration_s",
+    "cadence_spm",
+    "stride_length_m",
+    "walking_speed_mps",
+]
+
 # Expected variability DMO columns (keep in sync with within_wb_var output)
 VAR_DMO_COLUMNS = [
     "stride_duration_s_cv",
@@ -48,6 +63,106 @@ VAR_DMO_COLUMNS = [
     "walking_speed_mps_rmssd",
 ]
 
+
+def _signal_context_kwargs(method: Any, signal_context: GsSignalContext) -> dict[str, GsSignalContext]:
+    """Only pass the signal context to algorithms that accept it, so that all other algorithms work unchanged."""
+    if "signal_context" in inspect.signature(method).parameters:
+        return {"signal_context": signal_context}
+    return {}
+
+
+def _process_single_gs(
+    gs_data: pd.DataFrame,
+    *,
+    initial_contact_detection: BaseIcDetector,
+    cadence_calculation: Optional[BaseCadDetector],
+    stride_length_calculation: Optional[BaseSlDetector],
+    walking_speed_calculation: Optional[BaseWsDetector],
+    action_kwargs: dict[str, Any],
+    record_timings: bool = False,
+) -> tuple[dict[str, pd.DataFrame], Optional[dict[str, tuple[float, float]]]]:
+    """
+    Run ICD, cadence, stride length and walking speed on the data of a single gait sequence.
+
+    Only the results of the calculators that are provided are returned, so that unset fields of the per-GS result
+    object stay unset (and are ignored by the aggregation of the GS iterator).
+
+    A single :class:`GsSignalContext` is shared by all algorithms that accept a ``signal_context`` argument, so that
+    derived signals (e.g. the acceleration norm) are only calculated once per gait sequence.
+
+    Parameters
+    ----------
+    gs_data : pd.DataFrame
+        Sensor data of a single gait sequence.
+    initial_contact_detection, cadence_calculation, stride_length_calculation, walking_speed_calculation
+        Algorithm instances. They are cloned before use, so the passed instances are never modified.
+    action_kwargs : dict
+        Additional keyword arguments (participant/recording metadata) passed to the stride length calculation.
+    record_timings : bool, default=False
+        Whether to record the wall and CPU time of every step.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        Mapping from the field names of :class:`FullPipelinePerGsResult` to the respective results.
+    Optional[dict[str, tuple[float, float]]]
+        Wall and CPU time of every step ("icd", "cad", "sl", "ws") or None, if ``record_timings`` is False.
+    """
+    gs_result = {}
+    timings = {} if record_timings else None
+    signal_context = GsSignalContext(gs_data)
+
+    with time_step(timings, "icd"):
+        icd = initial_contact_detection.clone()
+        icd = icd.detect(gs_data, **_signal_context_kwargs(icd.detect, signal_context))
+    gs_result["ic_list"] = icd.ic_list_
+
+    cad_r = None
+    if cadence_calculation:
+        with time_step(timings, "cad"):
+            cad = cadence_calculation.clone()
+            cad = cad.calculate(
+                gs_data,
+                initial_contacts=icd.ic_list_,
+                **_signal_context_kwargs(cad.calculate, signal_context),
+            )
+        cad_r = cad.cadence_per_sec_
+        gs_result["cadence_per_sec"] = cad_r
+
+    sl_r = None
+    if stride_length_calculation:
+        with time_step(timings, "sl"):
+            sl = stride_length_calculation.clone()
+            sl = sl.calculate(
+                gs_data, initial_contacts=icd.ic_list_,
+                **action_kwargs,
+                **_signal_context_kwargs(sl.calculate, signal_context),
+            )
+        sl_r = sl.stride_length_per_sec_
+        gs_result["stride_length_per_sec"] = sl_r
+
+    if walking_speed_calculation:
+        with time_step(timings, "ws"):
+            ws = walking_speed_calculation.clone()
+            ws = ws.calculate(
+                gs_data,
+                initial_contacts=icd.ic_list_,
+                cadence_per_sec=cad_r,
+                stride_length_per_sec=sl_r,
+                **_signal_context_kwargs(ws.calculate, signal_context),
+            )
+        gs_result["walking_speed_per_sec"] = ws.walking_speed_per_sec_
+
+    return gs_result, timings
+
+
+def _process_gs_chunk(
+    gs_data_chunk: list[pd.DataFrame], **kwargs: Any
+) -> list[tuple[dict[str, pd.DataFrame], Optional[dict[str, tuple[float, float]]]]]:
+    """Process a chunk of gait sequences in a worker. The results are returned in the order of the input."""
+    return [_process_single_gs(gs_data, **kwargs) for gs_data in gs_data_chunk]
+
+
 class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
     """
     Multimobility pipeline for wrist-worn devices. This pipeline is based on the MobGap pipeline
@@ -93,11 +208,36 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         Thresholds for DMO computation, e.g., physiological thresholds.
     dmo_aggregation : Optional[BaseAggregator], default=None
         Aggregator instance to compute aggregated DMOs from per-WB results.
+    per_gs_executor : {"serial", "thread", "process"}, default="serial"
+        How the per-gait-sequence steps (ICD, cadence, stride length, walking speed) are executed.
+        "serial" processes one GS after the other in the main process.
+        "thread" and "process" send chunks of GSs to a thread or process pool.
+        The results are identical for all executors.
+    n_jobs : Optional[int], default=None
+        Maximum number of workers used by the "thread" and "process" executors.
+        If None, the default of the respective ``concurrent.futures`` executor is used.
+    gs_chunk_size : int, default=16
+        Number of gait sequences sent to a worker at once.
+        Larger chunks reduce the communication overhead for recordings with many short gait sequences.
+    stage_cache : Optional[StageCache], default=None
+        On-disk cache for the results of gait sequence detection (``gs_list_``) and of the per-GS steps
+        (``raw_ic_list_``, ``raw_per_sec_parameters_`` and ``raw_per_stride_parameters_``).
+        The results are reused, if the input signal and the parameters of the respective algorithm and of all
+        upstream algorithms are identical.
+        This allows to tune the downstream steps (stride selection, WBA, thresholds, aggregation) without
+        recalculating the upstream steps.
+        If None, no cache is used.
+    instrumentation : Optional[PipelineInstrumentation], default=None
+        If provided, the wall time, CPU time and peak memory of every stage (GSD, per-GS steps, conversion to strides,
+        stride selection, WBA, variability DMOs, thresholds and aggregation) as well as the size of the intermediate
+        results are recorded in ``perf_report_`` and passed to the callbacks of the instrumentation.
+        If None, nothing is recorded.
 
     Raises
     ------
     ValueError
-        If the input datapoint lacks required metadata (participant_metadata).
+        If the input datapoint lacks required metadata (participant_metadata) or if an unknown
+        ``per_gs_executor`` is selected.
 
     Attributes
     ----------
@@ -109,6 +249,7 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         Aggregated daily mobility outcomes (DMOs) across the dataset.
     gait_sequence_detection_ : BaseGSD
         Instance used for gait sequence detection.
+        None, if the gait sequences were loaded from the ``stage_cache``.
     initial_contact_detection_ : BaseIC
         Instance used for initial contact detection.
     cadence_calculation_ : BaseCadence
@@ -129,6 +270,7 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         Detected gait sequences (start/end times).
     gs_iterator_ : iterator
         Iterator over gait sequences for intermediate pipeline processing.
+        None, if the per-GS results were loaded from the ``stage_cache``.
     per_wb_parameter_mask_ : pd.Series
         Boolean mask indicating valid strides per walking bout.
     raw_ic_list_ : list
@@ -139,6 +281,11 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         Raw per-second gait parameters.
     var_dmos : pd.DataFrame
         Within-WB variability DMOs computed from per-stride parameters.
+    stage_cache_hits_ : dict[str, bool]
+        For each cached stage ("gsd" and "per_gs"), whether its results were loaded from the ``stage_cache``.
+        Empty, if no cache is used.
+    perf_report_ : Optional[PerfReport]
+        Timing, memory usage and counters of the run. None, if no ``instrumentation`` is used.
 
     Examples
     --------
@@ -166,6 +313,11 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
     wba: WbAssembly
     dmo_thresholds: Optional[pd.DataFrame]
     dmo_aggregation: AggregatorBase
+    per_gs_executor: Literal["serial", "thread", "process"]
+    n_jobs: Optional[int]
+    gs_chunk_size: int
+    stage_cache: Optional[StageCache]
+    instrumentation: Optional[PipelineInstrumentation]
 
     datapoint: GaitDatasetT
 
@@ -181,6 +333,8 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
     raw_ic_list_: pd.DataFrame
     raw_per_sec_parameters_: pd.DataFrame
     raw_per_stride_parameters_: pd.DataFrame
+    stage_cache_hits_: dict[str, bool]
+    perf_report_: Optional[PerfReport]
 
     _all_action_kwargs: dict[str, Any]
 
@@ -212,6 +366,11 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         wba: WbAssembly,
         dmo_thresholds: Optional[pd.DataFrame],
         dmo_aggregation: Optional[AggregatorBase],
+        per_gs_executor: Literal["serial", "thread", "process"] = "serial",
+        n_jobs: Optional[int] = None,
+        gs_chunk_size: int = 16,
+        stage_cache: Optional[StageCache] = None,
+        instrumentation: Optional[PipelineInstrumentation] = None,
     ) -> None:
         self.gait_sequence_detection = gait_sequence_detection
         self.initial_contact_detection = initial_contact_detection
@@ -222,6 +381,11 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         self.wba = wba
         self.dmo_thresholds = dmo_thresholds
         self.dmo_aggregation = dmo_aggregation
+        self.per_gs_executor = per_gs_executor
+        self.n_jobs = n_jobs
+        self.gs_chunk_size = gs_chunk_size
+        self.stage_cache = stage_cache
+        self.instrumentation = instrumentation
 
 
     def run(self, datapoint: GaitDatasetT, **kwargs) -> Self:
@@ -270,116 +434,262 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
             "sampling_rate_hz": datapoint.sampling_rate_hz,
         }
 
-        imu_data = rename_axes_to_body(datapoint.data_ss)
-        sampling_rate_hz = datapoint.sampling_rate_hz
+        if self.instrumentation is None:
+            self._perf = NULL_RECORDER
+        else:
+            self._perf = PerfRecorder(trace_memory=self.instrumentation.trace_memory)
 
-        self.gait_sequence_detection_ = self.gait_sequence_detection.clone().detect(imu_data)
-        self.gs_list_ = self.gait_sequence_detection_.gs_list_
-        self.gs_iterator_ = self._run_per_gs(self.gs_list_, imu_data)
+        with self._perf:
+            self._run_stages(datapoint)
 
-        results = self.gs_iterator_.results_
+        if self._perf.enabled:
+            self.perf_report_ = self._perf.report()
+            for callback in self.instrumentation.callbacks:
+                callback(self.perf_report_, datapoint)
+        else:
+            self.perf_report_ = None
+        del self._perf
 
-        self.raw_per_sec_parameters_ = pd.concat(
-            [
-                results.cadence_per_sec,
-                results.stride_length_per_sec,
-                results.walking_speed_per_sec,
-            ],
-            axis=1,
-        )
+        return self
 
-        if self.raw_per_sec_parameters_.empty:
-            expected_results = [
-                calc
-                for calc, available in [
-                    ("cadence_per_sec", self.cadence_calculation),
-                    ("stride_length_per_sec", self.stride_length_calculation),
-                    ("walking_speed_per_sec", self.walking_speed_calculation),
-                ]
-                if available
-            ]
-            index_names = ["gs_id", "sec_center_samples"]
-            self.raw_per_sec_parameters_ = pd.DataFrame(columns=[*expected_results, *index_names]).set_index(
-                index_names
+    def _run_stages(self, datapoint: GaitDatasetT) -> None:
+        """Run all pipeline steps (see ``run``) and record them with the current ``PerfRecorder``."""
+        perf = self._perf
+
+        imu_data = rename_axes_to_body(datapoint.data_ss)
+        sampling_rate_hz = datapoint.sampling_rate_hz
+        perf.count(n_samples=len(imu_data), recording_duration_s=len(imu_data) / sampling_rate_hz)
+
+        self.stage_cache_hits_ = {}
+        gsd_key = per_gs_key = None
+        if self.stage_cache is not None:
+            with perf.stage("cache_keys"):
+                gsd_key = combine_keys(
+                    "gsd", hash_signal(imu_data, sampling_rate_hz), hash_algorithm(self.gait_sequence_detection)
+                )
+                per_gs_key = self._per_gs_cache_key(gsd_key)
+
+        with perf.stage("gsd"):
+            if (cached := self._get_cached_stage("gsd", gsd_key)) is not None:
+                self.gait_sequence_detection_ = None
+                self.gs_list_ = cached["gs_list_"]
+            else:
+                self.gait_sequence_detection_ = self.gait_sequence_detection.clone().detect(imu_data)
+                self.gs_list_ = self.gait_sequence_detection_.gs_list_
+                self._put_cached_stage(gsd_key, {"gs_list_": self.gs_list_})
+
+        if (cached := self._get_cached_stage("per_gs", per_gs_key)) is not None:
+            self.gs_iterator_ = None
+            with perf.stage("per_gs"):
+                self.raw_ic_list_ = cached["raw_ic_list_"]
+                self.raw_per_sec_parameters_ = cached["raw_per_sec_parameters_"]
+                self.raw_per_stride_parameters_ = cached["raw_per_stride_parameters_"]
+        else:
+            self._calculate_raw_parameters(imu_data, sampling_rate_hz)
+            self._put_cached_stage(
+                per_gs_key,
+                {
+                    "raw_ic_list_": self.raw_ic_list_,
+                    "raw_per_sec_parameters_": self.raw_per_sec_parameters_,
+                    "raw_per_stride_parameters_": self.raw_per_stride_parameters_,
+                },
             )
 
-        if "r_gs_id" in self.raw_per_sec_parameters_.index.names:
-            self.raw_per_sec_parameters_ = self.raw_per_sec_parameters_.reset_index(
-                "r_gs_id",
-                drop=True,
+        with perf.stage("stride_selection"):
+            flat_index = pd.Index(
+                ["_".join(str(e) for e in s_id) for s_id in self.raw_per_stride_parameters_.index], name="s_id"
             )
+            raw_per_stride_parameters = self.raw_per_stride_parameters_.reset_index("gs_id").rename(
+                columns={"gs_id": "original_gs_id"}
+            )
+            raw_per_stride_parameters.index = flat_index
 
-        if (ic_list := results.ic_list).empty:
-            index_names = ["gs_id", "step_id"]
-            empty_index = pd.MultiIndex.from_tuples([], names=index_names)
-            ic_list = pd.DataFrame(columns=["ic"], index=empty_index)
-        self.raw_ic_list_ = ic_list
-        self.raw_per_stride_parameters_ = self._sec_to_stride(
-            self.raw_per_sec_parameters_, self.raw_ic_list_, sampling_rate_hz
-        )
+            self.stride_selection_ = self.stride_selection.clone().filter(
+                raw_per_stride_parameters, sampling_rate_hz=sampling_rate_hz
+            )
+        with perf.stage("wba"):
+            self.wba_ = self.wba.clone().assemble(
+                self.stride_selection_.filtered_stride_list_,
+                raw_initial_contacts=self.raw_ic_list_,
+                sampling_rate_hz=sampling_rate_hz,
+            )
 
-        flat_index = pd.Index(
-            ["_".join(str(e) for e in s_id) for s_id in self.raw_per_stride_parameters_.index], name="s_id"
-        )
-        raw_per_stride_parameters = self.raw_per_stride_parameters_.reset_index("gs_id").rename(
-            columns={"gs_id": "original_gs_id"}
-        )
-        raw_per_stride_parameters.index = flat_index
+        with perf.stage("per_wb_aggregation"):
+            self.per_stride_parameters_ = self.wba_.annotated_stride_list_
+            # Mean, CV and RMSSD of all per-stride parameters are computed in a single pass over the strides
+            stride_stats = None
+            if len(self.per_stride_parameters_) > 0:
+                stride_stats = within_wb_stats(self.per_stride_parameters_, PER_WB_PARAMETERS)
+            self.per_wb_parameters_ = self._aggregate_per_wb(
+                self.per_stride_parameters_, self.wba_.wb_meta_parameters_, stride_stats
+            )
 
-        self.stride_selection_ = self.stride_selection.clone().filter(
-            raw_per_stride_parameters, sampling_rate_hz=sampling_rate_hz
-        )
-        self.wba_ = self.wba.clone().assemble(
-            self.stride_selection_.filtered_stride_list_,
-            raw_initial_contacts=ic_list,
-            sampling_rate_hz=sampling_rate_hz,
+        with perf.stage("var_dmos"):
+            # Variability DMOs calculation
+            if stride_stats is None:
+                self.var_dmos = within_wb_var(self.per_stride_parameters_)
+            else:
+                self.var_dmos = var_dmos_from_stats(stride_stats)
+
+            # Ensure the variability DMO DataFrame contains the expected columns even if empty,
+            # and aligns with per_wb_parameters_ index so we can safely concat later.
+            if self.var_dmos.empty:
+                # create an empty dataframe with expected columns and same index as per_wb_parameters_
+                self.var_dmos = pd.DataFrame(index=self.per_wb_parameters_.index, columns=VAR_DMO_COLUMNS)
+
+            # Variability DMOs append to per_wb_parameters_
+            self.per_wb_parameters_ = pd.concat([self.per_wb_parameters_, self.var_dmos], axis=1)
+
+            # drop temporary or object columns if present
+            if "rule_obj" in self.per_wb_parameters_.columns:
+                self.per_wb_parameters_ = self.per_wb_parameters_.drop(columns="rule_obj")
+
+        perf.count(
+            n_gs=len(self.gs_list_),
+            n_ic=len(self.raw_ic_list_),
+            n_strides=len(self.raw_per_stride_parameters_),
+            n_selected_strides=len(self.stride_selection_.filtered_stride_list_),
+            n_wbs=len(self.per_wb_parameters_),
         )
 
-        self.per_stride_parameters_ = self.wba_.annotated_stride_list_
-        self.per_wb_parameters_ = self._aggregate_per_wb(self.per_stride_parameters_, self.wba_.wb_meta_parameters_)
+        with perf.stage("alpha"):
+            # Alpha calculation
+            # Alpha is only relevant in the aggregated results. We compute it on a copy of the per-wb table
+            # and we do NOT store it in self.per_wb_parameters_ so the per-wb output does not contain alpha.
+            per_wb_with_alpha = compute_alpha_mle(self.per_wb_parameters_.copy())
+
+        with perf.stage("thresholds"):
+            if self.dmo_thresholds is None:
+                self.per_wb_parameter_mask_ = None
+            else:
+                self.per_wb_parameter_mask_ = apply_thresholds(
+                    self.per_wb_parameters_,
+                    self.dmo_thresholds,
+                    height_m=datapoint.participant_metadata["height_m"],
+                )
 
-        # Variability DMOs calculation
-        self.var_dmos = within_wb_var(self.per_stride_parameters_)
+        if self.dmo_aggregation is None:
+            self.aggregated_parameters_ = None
+            return
 
-        # Ensure the variability DMO DataFrame contains the expected columns even if empty,
-        # and aligns with per_wb_parameters_ index so we can safely concat later.
-        if self.var_dmos.empty:
-            # create an empty dataframe with expected columns and same index as per_wb_parameters_
-            self.var_dmos = pd.DataFrame(index=self.per_wb_parameters_.index, columns=VAR_DMO_COLUMNS)
+        with perf.stage("aggregation"):
+            # Use the per-wb table that includes alpha for aggregation, but we keep self.per_wb_parameters_
+            # alpha-free.
+            self.dmo_aggregation_ = self.dmo_aggregation.clone().aggregate(
+                per_wb_with_alpha, wb_dmos_mask=self.per_wb_parameter_mask_
+            )
+            self.aggregated_parameters_ = self.dmo_aggregation_.aggregated_data_
 
-        # Variability DMOs append to per_wb_parameters_
-        self.per_wb_parameters_ = pd.concat([self.per_wb_parameters_, self.var_dmos], axis=1)
+        del self._all_action_kwargs
 
-        # drop temporary or object columns if present
-        if "rule_obj" in self.per_wb_parameters_.columns:
-            self.per_wb_parameters_ = self.per_wb_parameters_.drop(columns="rule_obj")
+    def _calculate_raw_parameters(self, imu_data: pd.DataFrame, sampling_rate_hz: float) -> None:
+        """Run the per-GS steps and set ``gs_iterator_``, ``raw_per_sec_parameters_``, ``raw_ic_list_`` and
+        ``raw_per_stride_parameters_``."""
+        with self._perf.stage("per_gs"):
+            self.gs_iterator_ = self._run_per_gs(self.gs_list_, imu_data)
+
+            results = self.gs_iterator_.results_
+
+            self.raw_per_sec_parameters_ = pd.concat(
+                [
+                    results.cadence_per_sec,
+                    results.stride_length_per_sec,
+                    results.walking_speed_per_sec,
+                ],
+                axis=1,
+            )
+
+            if self.raw_per_sec_parameters_.empty:
+                expected_results = [
+                    calc
+                    for calc, available in [
+                        ("cadence_per_sec", self.cadence_calculation),
+                        ("stride_length_per_sec", self.stride_length_calculation),
+                        ("walking_speed_per_sec", self.walking_speed_calculation),
+                    ]
+                    if available
+                ]
+                index_names = ["gs_id", "sec_center_samples"]
+                self.raw_per_sec_parameters_ = pd.DataFrame(columns=[*expected_results, *index_names]).set_index(
+                    index_names
+                )
 
-        # Alpha calculation
-        # Alpha is only relevant in the aggregated results. We compute it on a copy of the per-wb table
-        # and we do NOT store it in self.per_wb_parameters_ so the per-wb output does not contain alpha.
-        per_wb_with_alpha = compute_alpha_mle(self.per_wb_parameters_.copy())
+            if "r_gs_id" in self.raw_per_sec_parameters_.index.names:
+                self.raw_per_sec_parameters_ = self.raw_per_sec_parameters_.reset_index(
+                    "r_gs_id",
+                    drop=True,
+                )
 
-        if self.dmo_thresholds is None:
-            self.per_wb_parameter_mask_ = None
-        else:
-            self.per_wb_parameter_mask_ = apply_thresholds(
-                self.per_wb_parameters_,
-                self.dmo_thresholds,
-                height_m=datapoint.participant_metadata["height_m"],
+            if (ic_list := results.ic_list).empty:
+                index_names = ["gs_id", "step_id"]
+                empty_index = pd.MultiIndex.from_tuples([], names=index_names)
+                ic_list = pd.DataFrame(columns=["ic"], index=empty_index)
+            self.raw_ic_list_ = ic_list
+
+        with self._perf.stage("sec_to_stride"):
+            self.raw_per_stride_parameters_ = self._sec_to_stride(
+                self.raw_per_sec_parameters_, self.raw_ic_list_, sampling_rate_hz
             )
 
-        if self.dmo_aggregation is None:
-            self.aggregated_parameters_ = None
-            return self
+    def _per_gs_cache_key(self, gsd_key: str) -> str:
+        """Cache key of the per-GS stage.
 
-        # Use the per-wb table that includes alpha for aggregation, but we keep self.per_wb_parameters_ alpha-free.
-        self.dmo_aggregation_ = self.dmo_aggregation.clone().aggregate(
-            per_wb_with_alpha, wb_dmos_mask=self.per_wb_parameter_mask_
+        It depends on the GSD stage (and hence the signal), on all per-GS algorithms and on the action kwargs
+        (participant/recording metadata), which are passed to the stride length calculation.
+        The executor settings are not part of the key, as they do not change the results.
+        """
+        action_kwargs = dict(self._all_action_kwargs)
+        action_kwargs["dp_group"] = _group_label_to_key(action_kwargs["dp_group"])
+        return combine_keys(
+            "per_gs",
+            gsd_key,
+            hash_algorithm(self.initial_contact_detection),
+            hash_algorithm(self.cadence_calculation),
+            hash_algorithm(self.stride_length_calculation),
+            hash_algorithm(self.walking_speed_calculation),
+            custom_hash(sorted(action_kwargs.items())),
         )
-        self.aggregated_parameters_ = self.dmo_aggregation_.aggregated_data_
 
-        del self._all_action_kwargs
-        return self
+    def _get_cached_stage(self, stage: str, key: Optional[str]) -> Optional[dict[str, Any]]:
+        if key is None:
+            return None
+        cached = self.stage_cache.get(key)
+        self.stage_cache_hits_[stage] = cached is not None
+        return cached
+
+    def _put_cached_stage(self, key: Optional[str], value: dict[str, Any]) -> None:
+        if key is not None:
+            self.stage_cache.put(key, value)
+
+    def run_batch(
+        self,
+        dataset: GaitDatasetT,
+        *,
+        n_jobs: Optional[int] = None,
+        backend: Literal["serial", "thread", "process"] = "process",
+    ) -> BatchResult:
+        """
+        Run the pipeline on all datapoints of a dataset, distributing the datapoints over multiple workers.
+
+        This is a shortcut for :func:`~multigait.pipeline.batch.run_batch`.
+        The pipeline instance itself is not modified; every datapoint is processed by a clone.
+
+        Parameters
+        ----------
+        dataset : GaitDatasetT
+            Dataset with one or more datapoints (e.g. participants x recording days).
+        n_jobs : Optional[int], default=None
+            Maximum number of workers.
+        backend : {"serial", "thread", "process"}, default="process"
+            How the datapoints are distributed.
+
+        Returns
+        -------
+        BatchResult
+            ``per_wb_parameters``, ``per_stride_parameters`` and ``aggregated_parameters`` of all datapoints keyed by
+            their group label, the errors of failed datapoints and the wall time per datapoint.
+        """
+        return run_batch(self, dataset, n_jobs=n_jobs, backend=backend)
 
     def _run_per_gs(
         self,
@@ -394,6 +704,11 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
           - runs cadence, stride length and walking speed calculators if provided,
           - populates fields on the per-GS result object (r) that are later concatenated.
 
+        Depending on ``per_gs_executor``, the gait sequences are either processed one after the other or in chunks
+        of ``gs_chunk_size`` by a thread/process pool.
+        In the latter case, the per-GS results are afterwards fed back into the iterator in the original GS order,
+        so that ``results_`` is identical to the serial execution.
+
         Parameters
         ----------
         gait_sequences : pd.DataFrame
@@ -406,39 +721,53 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         GsIterator
             The iterator object containing per-gs results in its .results_ attribute after iteration.
         """
+        if self.per_gs_executor not in ("serial", "thread", "process"):
+            raise ValueError(
+                f"Unknown per_gs_executor '{self.per_gs_executor}'. Valid options are 'serial', 'thread' and 'process'."
+            )
 
-        gs_iterator = GsIterator[FullPipelinePerGsResult]()
+        process_kwargs = {
+            "initial_contact_detection": self.initial_contact_detection,
+            "cadence_calculation": self.cadence_calculation,
+            "stride_length_calculation": self.stride_length_calculation,
+            "walking_speed_calculation": self.walking_speed_calculation,
+            "action_kwargs": self._all_action_kwargs,
+            "record_timings": self._perf.enabled,
+        }
 
-        for (_, gs_data), r in gs_iterator.iterate(imu_data, gait_sequences):
-            icd = self.initial_contact_detection.clone().detect(gs_data)
-            r.ic_list = icd.ic_list_
+        gs_iterator = GsIterator[FullPipelinePerGsResult]()
 
-            cad_r = None
-            if self.cadence_calculation:
-                cad = self.cadence_calculation.clone().calculate(
-                    gs_data,
-                    initial_contacts=icd.ic_list_,
-                )
-                cad_r = cad.cadence_per_sec_
-                r.cadence_per_sec = cad_r
-
-            sl_r = None
-            if self.stride_length_calculation:
-                sl = self.stride_length_calculation.clone().calculate(
-                    gs_data, initial_contacts=icd.ic_list_,
-                    **self._all_action_kwargs
-                )
-                sl_r = sl.stride_length_per_sec_
-                r.stride_length_per_sec = sl.stride_length_per_sec_
-
-            if self.walking_speed_calculation:
-                ws = self.walking_speed_calculation.clone().calculate(
-                    gs_data,
-                    initial_contacts=icd.ic_list_,
-                    cadence_per_sec=cad_r,
-                    stride_length_per_sec=sl_r
-                )
-                r.walking_speed_per_sec = ws.walking_speed_per_sec_
+        if self.per_gs_executor == "serial":
+            for (gs, gs_data), r in gs_iterator.iterate(imu_data, gait_sequences):
+                gs_result, timings = _process_single_gs(gs_data, **process_kwargs)
+                for key, value in gs_result.items():
+                    setattr(r, key, value)
+                if timings is not None:
+                    self._perf.add_per_gs_timings(gs.id, timings)
+            return gs_iterator
+
+        if self.gs_chunk_size < 1:
+            raise ValueError("gs_chunk_size must be a positive integer.")
+
+        all_gs_data = [gs_data for _, gs_data in iter_gs(imu_data, gait_sequences)]
+        chunks = [
+            all_gs_data[i : i + self.gs_chunk_size] for i in range(0, len(all_gs_data), self.gs_chunk_size)
+        ]
+        per_gs_results = []
+        if chunks:
+            executor_type = ThreadPoolExecutor if self.per_gs_executor == "thread" else ProcessPoolExecutor
+            with executor_type(max_workers=self.n_jobs) as executor:
+                # ``map`` returns the results in the order of the chunks, independent of the completion order.
+                for chunk_results in executor.map(partial(_process_gs_chunk, **process_kwargs), chunks):
+                    per_gs_results.extend(chunk_results)
+
+        per_gs_results_iter = iter(per_gs_results)
+        for (gs, _), r in gs_iterator.iterate(imu_data, gait_sequences):
+            gs_result, timings = next(per_gs_results_iter)
+            for key, value in gs_result.items():
+                setattr(r, key, value)
+            if timings is not None:
+                self._perf.add_per_gs_timings(gs.id, timings)
 
         return gs_iterator
 
@@ -450,8 +779,9 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
 
         Behaviour:
           - If ic_list is empty, a stride list with correct index/columns is created via helper.
-          - If strides exist, compute stride duration and map per-second parameters into stride regions
-            using naive_sec_paras_to_regions.
+          - If strides exist, compute stride duration and map per-second parameters into stride regions.
+            The strides and the per-second integration of all GSs are computed at once on flat arrays
+            (see ``map_seconds_to_grouped_regions``) instead of one pandas apply per GS.
           - If no strides are present, returns an empty DataFrame with appropriate columns.
 
         Parameters
@@ -468,32 +798,25 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
         pd.DataFrame
             Per-stride DataFrame with stride-level parameters and a MultiIndex identifying strides.
         """
-        if ic_list.empty:
-            # We still call the function to get the correct index
-            # We need to do that in a separate step, as the groupby is not working with an empty dataframe
-            stride_list = strides_list_from_ic_list_no_lrc(ic_list)
-        else:
-            stride_list = ic_list.groupby("gs_id", group_keys=False).apply(strides_list_from_ic_list_no_lrc)
-
+        stride_list = strides_list_from_grouped_ic_list_no_lrc(ic_list, "gs_id")
         stride_list = stride_list.assign(stride_duration_s=lambda df_: (df_.end - df_.start) / sampling_rate_hz)
 
         # If there are no strides, return empty dataframe with correct columns
         if stride_list.empty:
-            # Ensure the returned empty dataframe contains columns from sec_level_paras as your original except-block did.
             stride_list = stride_list.reindex(columns=[*stride_list.columns, *sec_level_paras.columns])
             return stride_list
 
-        # If there are strides we join per-second params into stride regions
-        stride_list = create_multi_groupby(
-            stride_list,
-            sec_level_paras,
-            "gs_id",
-            group_keys=False,
-        ).apply(map_seconds_to_regions, sampling_rate_hz=sampling_rate_hz)
-
-        return stride_list
+        # If there are strides we join per-second params into stride regions of all GSs at once
+        return map_seconds_to_grouped_regions(
+            stride_list, sec_level_paras, groupby="gs_id", sampling_rate_hz=sampling_rate_hz
+        )
 
-    def _aggregate_per_wb(self, per_stride_parameters: pd.DataFrame, wb_meta_parameters: pd.DataFrame) -> pd.DataFrame:
+    def _aggregate_per_wb(
+        self,
+        per_stride_parameters: pd.DataFrame,
+        wb_meta_parameters: pd.DataFrame,
+        stride_stats: Optional[WithinWbStats] = None,
+    ) -> pd.DataFrame:
         """
         Aggregate per-stride parameters into per-walking-bout (WB) features.
 
@@ -506,27 +829,20 @@ class MultimobilityPipeline(PipelineBase[GaitDatasetT], Generic[GaitDatasetT]):
             Per-stride annotated parameters (must include columns in params_to_aggregate and a 'wb_id').
         wb_meta_parameters : pd.DataFrame
             Metadata about walking bouts (indexed by wb_id).
+        stride_stats : WithinWbStats, optional
+            Precomputed per-WB statistics of ``PER_WB_PARAMETERS`` (see ``within_wb_stats``).
+            If provided, their means are used instead of grouping the strides again.
 
         Returns
         -------
         pd.DataFrame
             DataFrame indexed by wb_id containing WB metadata plus aggregated stride-parameter means.
         """
-        params_to_aggregate = [
-            "stride_duration_s",
-            "cadence_spm",
-            "stride_length_m",
-            "walking_speed_mps",
-        ]
-        return pd.concat(
-            [
-                wb_meta_parameters,
-                per_stride_parameters.reindex(columns=params_to_aggregate)
-                .groupby(["wb_id"])
-                .mean(),
-            ],
-            axis=1,
-        )
+        if stride_stats is not None:
+            means = stride_stats.mean
+        else:
+            means = per_stride_parameters.reindex(columns=PER_WB_PARAMETERS).groupby(["wb_id"]).mean()
+        return pd.concat([wb_meta_parameters, means], axis=1)
 
 class MultimobilityPipelineSuggested(MultimobilityPipeline[GaitDatasetT], Generic[GaitDatasetT]):
     """This pipeline is constructed with a predefined set of algorithms which exhibited the best performance in [1].
@@ -557,6 +873,11 @@ class MultimobilityPipelineSuggested(MultimobilityPipeline[GaitDatasetT], Generi
         wba: WbAssembly,
         dmo_thresholds: Optional[pd.DataFrame],
         dmo_aggregation: AggregatorBase,
+        per_gs_executor: Literal["serial", "thread", "process"] = "serial",
+        n_jobs: Optional[int] = None,
+        gs_chunk_size: int = 16,
+        stage_cache: Optional[StageCache] = None,
+        instrumentation: Optional[PipelineInstrumentation] = None,
     ) -> None:
         super().__init__(
             gait_sequence_detection=gait_sequence_detection,
@@ -568,4 +889,9 @@ class MultimobilityPipelineSuggested(MultimobilityPipeline[GaitDatasetT], Generi
             wba=wba,
             dmo_thresholds=dmo_thresholds,
             dmo_aggregation=dmo_aggregation,
+            per_gs_executor=per_gs_executor,
+            n_jobs=n_jobs,
+            gs_chunk_size=gs_chunk_size,
+            stage_cache=stage_cache,
+            instrumentation=instrumentation,
         )
\ No newline at end of file
@@ -10,7 +10,7 @@ Intended usage:
 
 final_strides: DataFrame indexed by (wb_id, s_id) where level 0 is wb_id.
 """
-from typing import Iterable, Optional, Sequence
+from typing import Iterable, NamedTuple, Optional, Sequence
 import numpy as np
 import pandas as pd
 
@@ -22,12 +22,125 @@ DEFAULT_COLS = [
 ]
 
 
-def _rmssd_series(series: pd.Series) -> float:
-    """Compute RMSSD for a 1-D series (ignoring NA)."""
-    dif = series.dropna().diff().dropna()
-    if dif.size == 0:
-        return np.nan
-    return float(np.sqrt(np.mean(dif.values ** 2)))
+class WithinWbStats(NamedTuple):
+    """Per-WB statistics of per-stride parameters (each indexed by wb_id with one column per parameter).
+
+    - count: number of non-NA values
+    - mean: mean of the non-NA values
+    - cv: coefficient of variation (std / mean), NaN for fewer than 2 non-NA values
+    - rmssd: root mean square of the successive differences of the non-NA values, NaN for fewer than 2 non-NA values
+    """
+
+    count: pd.DataFrame
+    mean: pd.DataFrame
+    cv: pd.DataFrame
+    rmssd: pd.DataFrame
+
+
+def _segment_stats(
+    values: np.ndarray, group_starts: np.ndarray, ddof: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Count, mean, CV and RMSSD of all columns of ``values`` for contiguous, non-empty row segments.
+
+    NA values are skipped. For the RMSSD, the successive differences are calculated between the non-NA values of the
+    same segment (like ``series.dropna().diff()``), i.e. differences never cross a segment boundary.
+    """
+    n_rows = len(values)
+    segment_lengths = np.diff(np.append(group_starts, n_rows))
+    row_segment = np.repeat(np.arange(len(group_starts)), segment_lengths)
+
+    valid = ~np.isnan(values)
+    count = np.add.reduceat(valid, group_starts, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.add.reduceat(np.where(valid, values, 0.0), group_starts, axis=0) / count
+
+        squared_deviation = np.where(valid, (values - mean[row_segment]) ** 2, 0.0)
+        dof = count - ddof
+        std = np.sqrt(np.add.reduceat(squared_deviation, group_starts, axis=0) / np.where(dof > 0, dof, np.nan))
+        cv = std / mean
+
+        # Index of the previous non-NA value of the same column for every row
+        rows = np.broadcast_to(np.arange(n_rows)[:, None], values.shape)
+        last_valid = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+        previous_valid = np.vstack([np.full((1, values.shape[1]), -1), last_valid[:-1]])
+        has_pair = valid & (previous_valid >= group_starts[row_segment][:, None])
+        successive_diff = values - np.take_along_axis(values, np.maximum(previous_valid, 0), axis=0)
+        squared_diff = np.where(has_pair, successive_diff**2, 0.0)
+        n_pairs = np.add.reduceat(has_pair, group_starts, axis=0)
+        rmssd = np.sqrt(np.add.reduceat(squared_diff, group_starts, axis=0) / n_pairs)
+
+    cv[~np.isfinite(cv)] = np.nan
+    too_few = count < 2
+    cv[too_few] = np.nan
+    rmssd[too_few] = np.nan
+    return count, mean, cv, rmssd
+
+
+def within_wb_stats(
+    final_strides: pd.DataFrame,
+    cols: Sequence[str],
+    groupby: Optional[str] = None,
+    ddof: int = 0,
+) -> WithinWbStats:
+    """
+    Compute count, mean, CV and RMSSD of per-stride columns for all walking bouts at once.
+
+    All statistics are calculated with segment reductions over the stride table sorted by wb id, instead of one
+    pandas operation per WB.
+
+    Parameters
+    ----------
+    final_strides
+        Per-stride DataFrame.
+    cols
+        Columns to compute the statistics for. Missing columns are treated as all-NA.
+    groupby
+        Name of the column with the wb ids. If None, the first index level is used.
+    ddof
+        Degrees of freedom for the standard deviation of the CV.
+
+    Returns
+    -------
+    WithinWbStats
+        Statistics indexed by the sorted wb ids (NA ids are dropped, like in ``groupby``).
+    """
+    if groupby is None:
+        wb_ids = final_strides.index.get_level_values(0)
+        wb_index_name = final_strides.index.names[0] or "wb_id"
+    else:
+        wb_ids = final_strides[groupby]
+        wb_index_name = groupby
+    codes, uniques = pd.factorize(wb_ids, sort=True)
+    values = final_strides.reindex(columns=list(cols)).to_numpy(dtype="float64")
+
+    if (codes < 0).any():
+        values = values[codes >= 0]
+        codes = codes[codes >= 0]
+    if (np.diff(codes) < 0).any():
+        order = np.argsort(codes, kind="stable")
+        values = values[order]
+        codes = codes[order]
+
+    index = pd.Index(uniques, name=wb_index_name)
+    columns = pd.Index(list(cols))
+    if len(codes) == 0:
+        empty = pd.DataFrame(np.empty((0, len(columns))), index=index, columns=columns)
+        return WithinWbStats(count=empty.astype("int64"), mean=empty, cv=empty, rmssd=empty)
+
+    group_starts = np.flatnonzero(np.diff(codes, prepend=-1))
+    count, mean, cv, rmssd = _segment_stats(values, group_starts, ddof)
+    return WithinWbStats(
+        *(pd.DataFrame(stat, index=index, columns=columns) for stat in (count, mean, cv, rmssd))
+    )
+
+
+def var_dmos_from_stats(stats: WithinWbStats) -> pd.DataFrame:
+    """Arrange the CV and RMSSD of `within_wb_stats` as "<col>_cv", "<col>_rmssd" columns (per column)."""
+    parts = {}
+    for c in stats.cv.columns:
+        parts[f"{c}_cv"] = stats.cv[c]
+        parts[f"{c}_rmssd"] = stats.rmssd[c]
+    return pd.DataFrame(parts, index=stats.cv.index)
 
 
 def within_wb_var(
@@ -62,9 +175,10 @@ def within_wb_var(
     ------
     TypeError
         If final_strides is not a pandas DataFrame or ddof is not an int.
-    ValueError
-        If the input does not contain a usable wb identifier (level 0 of index or 'wb_id' column),
-        or if none of the requested cols exist in final_strides.
+
+    Notes
+    -----
+    All statistics are computed at once for all WBs (see `within_wb_stats`).
     """
     # Basic type checks
     if not isinstance(final_strides, pd.DataFrame):
@@ -101,87 +215,11 @@ def within_wb_var(
         return pd.DataFrame(index=wb_ids)
 
     # Decide grouping: prefer explicit 'wb_id' column if present, otherwise group by level 0
-    if "wb_id" in final_strides.columns:
-        grouping = final_strides["wb_id"]
-        wb_index_name = "wb_id"
-        grouped = final_strides[cols_present].groupby(grouping)
-    else:
-        # Validate that level 0 exists and is meaningful
-        try:
-            # This will work for RangeIndex as well; we want to ensure the user expects level 0 as wb_id.
-            level0_name = final_strides.index.names[0]
-            grouped = final_strides[cols_present].groupby(level=0)
-            wb_index_name = level0_name or "wb_id"
-        except Exception:
-            raise ValueError(
-                "Could not determine wb identifier. Provide a DataFrame indexed by (wb_id, ...) "
-                "or include a 'wb_id' column."
-            )
+    groupby = "wb_id" if "wb_id" in final_strides.columns else None
+    wb_index_name = "wb_id" if groupby else (final_strides.index.names[0] or "wb_id")
 
     # Quick path: empty input
     if final_strides.shape[0] == 0:
         return pd.DataFrame(index=pd.Index([], name=wb_index_name))
 
-    # Counts of non-NA values per group (used to enforce NaN for single-stride WBs)
-    counts = grouped.count()
-
-    # Means and stds
-    mean = grouped.mean()
-    std = grouped.std(ddof=ddof)
-
-    # CV = std / mean; guard divide-by-zero and inf
-    with np.errstate(divide="ignore", invalid="ignore"):
-        cv = std / mean
-    cv = cv.replace([np.inf, -np.inf], np.nan)
-
-    # enforce NaN for groups with fewer than 2 valid samples (one stride or zero)
-    mask_too_few = counts < 2
-    # mask_too_few has same shape/columns as cv; align and mask
-    cv = cv.mask(mask_too_few)
-
-    # Compute RMSSD for each group and column. The result of groupby.apply will have an index with wb_id.
-    # We compute per-group by passing series to _rmssd_series via DataFrame.apply.
-    rmssd = grouped.apply(lambda df: df.apply(_rmssd_series))
-    # After groupby.apply the rmssd DataFrame may have a name in its index; ensure alignment with mean/cv indexes
-    # If rmssd comes back as a Series (happens for single-column), convert to DataFrame
-    if isinstance(rmssd, pd.Series):
-        rmssd = rmssd.unstack(level=-1) if isinstance(rmssd.index, pd.MultiIndex) else rmssd.to_frame()
-
-    # rmssd already yields NaN if not enough diffs, but ensure mask consistency
-    # Reindex rmssd like mean (index and columns) to ensure consistent layout, then mask
-    try:
-        rmssd = rmssd.reindex(index=mean.index, columns=mean.columns)
-    except Exception:
-        # If reindexing fails for some reason, fall back to aligning via concat
-        rmssd = pd.DataFrame(rmssd).reindex(index=mean.index, columns=mean.columns)
-
-    rmssd = rmssd.mask(mask_too_few)
-
-    # rename columns to indicate metric, preserving the order of cols_present
-    cv = cv.rename(columns={c: f"{c}_cv" for c in cv.columns})
-    rmssd = rmssd.rename(columns={c: f"{c}_rmssd" for c in rmssd.columns})
-
-    # combine results side-by-side in order: for each original col, its cv then rmssd
-    parts = []
-    for c in cols_present:
-        cv_col = f"{c}_cv"
-        rmssd_col = f"{c}_rmssd"
-        # If a metric column is missing (e.g., all-NA column), create it filled with NaN to preserve shape/order
-        if cv_col not in cv.columns:
-            cv_piece = pd.DataFrame(index=mean.index, columns=[cv_col], data=np.nan)
-        else:
-            cv_piece = cv[[cv_col]]
-        if rmssd_col not in rmssd.columns:
-            rmssd_piece = pd.DataFrame(index=mean.index, columns=[rmssd_col], data=np.nan)
-        else:
-            rmssd_piece = rmssd[[rmssd_col]]
-        parts.append(cv_piece)
-        parts.append(rmssd_piece)
-
-    result = pd.concat(parts, axis=1)
-
-    # ensure index name is set to wb id name for clarity
-    if result.index.name is None:
-        result.index.name = wb_index_name or "wb_id"
-
-    return result
+    return var_dmos_from_stats(within_wb_stats(final_strides, cols_present, groupby=groupby, ddof=ddof))
@@ -2,9 +2,10 @@
 
 import warnings
 from collections.abc import Hashable
-from itertools import count
+from functools import partial
+from itertools import count, repeat
 from types import MappingProxyType
-from typing import Final, Optional
+from typing import Callable, Final, Optional
 
 import numpy as np
 import pandas as pd
@@ -14,7 +15,7 @@ from typing_extensions import Self
 
 from multigait.pipeline.wba_base import BaseWbRule, EndOfStrideList
 
-from multigait.pipeline.utils._wb_criteria import BreakCriteria, StridesCriteria
+from multigait.pipeline.utils._wb_criteria import BreakCriteria, LeftRightCriteria, StridesCriteria
 
 
 class WbAssembly(Algorithm):
@@ -133,12 +134,12 @@ class WbAssembly(Algorithm):
             .astype({"start": int, "end": int, "n_strides": int, "duration_s": float})
         )
         if self.raw_initial_contacts is not None:
-            n_initial_contacts = pd.Series(index=df.index, dtype="Int64")
-            for wb_id, wb in df.iterrows():
-                n_initial_contacts[wb_id] = self.raw_initial_contacts[
-                    self.raw_initial_contacts["ic"].between(wb["start"], wb["end"])
-                ].shape[0]
-            df["n_raw_initial_contacts"] = n_initial_contacts
+            # Number of ICs with start <= ic <= end
+            ics = np.sort(self.raw_initial_contacts["ic"].to_numpy(dtype="float64"))
+            n_initial_contacts = np.searchsorted(ics, df["end"].to_numpy(), side="right") - np.searchsorted(
+                ics, df["start"].to_numpy(), side="left"
+            )
+            df["n_raw_initial_contacts"] = pd.Series(n_initial_contacts, index=df.index, dtype="Int64")
 
         return df
 
@@ -164,6 +165,12 @@ class WbAssembly(Algorithm):
         """
         Assemble final walking bouts from a pre-filtered list of strides.
 
+        If all rules are one of the built-in rules (`BreakCriteria`, `StridesCriteria`, `LeftRightCriteria`), an
+        array-based engine is used that finds all potential termination points at once and only evaluates the rules
+        at these points.
+        For all other rules, the rules are evaluated stride by stride.
+        Both approaches produce identical results.
+
         Parameters
         ----------
         filtered_stride_list : pd.DataFrame
@@ -191,39 +198,58 @@ class WbAssembly(Algorithm):
         self.sampling_rate_hz = sampling_rate_hz
         stride_list_sorted = self.filtered_stride_list.sort_values(by=["start", "end"])
 
+        use_fast_path = self._supports_fast_path()
+        if use_fast_path and len(stride_list_sorted) > 0:
+            find_wb = partial(
+                self._find_first_preliminary_wb_fast,
+                termination_candidates=self._termination_candidates(stride_list_sorted),
+            )
+        else:
+            find_wb = self._find_first_preliminary_wb
+
         (
-            preliminary_wb_list,
-            excluded_wb_list,
+            preliminary_wbs,
+            excluded_wbs,
             exclusion_reasons,
             termination_reasons,
-            excluded_strides,
-            stride_exclusion_reasons,
-        ) = self._apply_termination_rules(stride_list_sorted)
-        wb_list, excluded_wb_list_2, exclusion_reasons_2 = self._apply_inclusion_rules(preliminary_wb_list)
+            excluded_stride_ranges,
+        ) = self._apply_termination_rules(stride_list_sorted, find_wb)
+        if use_fast_path:
+            wbs, excluded_wbs_2, exclusion_reasons_2 = self._apply_inclusion_rules_fast(
+                stride_list_sorted, preliminary_wbs
+            )
+        else:
+            wbs, excluded_wbs_2, exclusion_reasons_2 = self._apply_inclusion_rules(stride_list_sorted, preliminary_wbs)
+
         # After we have the final wbs, we rewrite the wb_ids to be easier to read.
-        self._wb_id_map = {k: i for i, k in enumerate(wb_list.keys())}
+        self._wb_id_map = {k: i for i, k in enumerate(wbs.keys())}
         stride_index_col_name = filtered_stride_list.index.names
         new_index_cols = ["wb_id", *stride_index_col_name]
-        if len(wb_list) > 0:
-            self.annotated_stride_list_ = pd.concat(wb_list, names=new_index_cols).reset_index()
+        if len(wbs) > 0:
+            self.annotated_stride_list_ = _select_wbs(stride_list_sorted, wbs, "wb_id")
             self.annotated_stride_list_["wb_id"] = self.annotated_stride_list_["wb_id"].map(self._wb_id_map)
         else:
             self.annotated_stride_list_ = pd.DataFrame(columns=[*filtered_stride_list.columns, *new_index_cols])
         self.annotated_stride_list_ = self.annotated_stride_list_.set_index(new_index_cols)
 
         pre_id_index_cols = ["pre_wb_id", *stride_index_col_name]
-        if (
-            len(
-                combined_excluded_stride_list := {
-                    **excluded_wb_list,
-                    **excluded_wb_list_2,
-                }
-            )
-            > 0
-        ):
-            excluded_strides_in_wbs = pd.concat(combined_excluded_stride_list, names=pre_id_index_cols).reset_index()
+        if len(combined_excluded_wbs := {**excluded_wbs, **excluded_wbs_2}) > 0:
+            excluded_strides_in_wbs = _select_wbs(stride_list_sorted, combined_excluded_wbs, "pre_wb_id")
         else:
             excluded_strides_in_wbs = pd.DataFrame(columns=[*filtered_stride_list.columns, *pre_id_index_cols])
+
+        positions = np.arange(len(stride_list_sorted))
+        excluded_stride_rows = [
+            (rows, reason) for start, stop, reason in excluded_stride_ranges if len(rows := positions[start:stop]) > 0
+        ]
+        if len(excluded_stride_rows) > 0:
+            excluded_strides = stride_list_sorted.iloc[np.concatenate([rows for rows, _ in excluded_stride_rows])]
+        else:
+            excluded_strides = pd.DataFrame(columns=stride_list_sorted.columns)
+        stride_exclusion_reasons = {}
+        for rows, reason in excluded_stride_rows:
+            stride_exclusion_reasons.update(zip(stride_list_sorted.index[rows], repeat(reason)))
+
         other_excluded_strides = excluded_strides.assign(pre_wb_id=None).reset_index()
         with warnings.catch_warnings():
             # We ignore Pandas Future Warning here, as we actually want the new behaviour, but there is no way to
@@ -247,24 +273,36 @@ class WbAssembly(Algorithm):
         ).rename_axis(index=filtered_stride_list.index.name)
         return self
 
+    def _supports_fast_path(self) -> bool:
+        # Subclasses of the built-in rules might change their behaviour and are hence evaluated stride by stride.
+        return all(type(rule) in _FAST_PATH_RULES for _, rule in self.rules or [])
+
     def _apply_termination_rules(
-        self, stride_list: pd.DataFrame
+        self,
+        stride_list: pd.DataFrame,
+        find_wb: Callable[
+            [pd.DataFrame, int],
+            tuple[int, int, int, Optional[tuple[str, BaseWbRule]], Optional[tuple[str, BaseWbRule]]],
+        ],
     ) -> tuple[
-        dict[str, pd.DataFrame],
-        dict[str, pd.DataFrame],
-        dict[str, tuple[str, BaseWbRule]],
+        dict[str, tuple[int, int]],
+        dict[str, tuple[int, int]],
         dict[str, tuple[str, BaseWbRule]],
-        pd.DataFrame,
         dict[str, tuple[str, BaseWbRule]],
+        list[tuple[int, int, tuple[str, BaseWbRule]]],
     ]:
+        """Split the stride list into preliminary WBs.
+
+        All WBs and excluded strides are returned as ``(start, stop)`` positions in the stride list (``iloc`` slices),
+        so that no dataframes need to be created per WB.
+        """
         id_counter = count(start=1)
         end = 0
-        preliminary_wb_list = {}
+        preliminary_wbs = {}
         termination_reasons = {}
-        excluded_wb_list = {}
+        excluded_wbs = {}
         exclusion_reasons = {}
-        excluded_strides = []
-        stride_exclusion_reasons = {}
+        excluded_stride_ranges = []
         last_end = -1
         while end < len(stride_list):
             start = end
@@ -274,55 +312,79 @@ class WbAssembly(Algorithm):
                 restart_at,
                 start_delay_reason,
                 termination_reason,
-            ) = self._find_first_preliminary_wb(stride_list, start)
+            ) = find_wb(stride_list, start)
             preliminary_wb_id = f"pre_{next(id_counter)}"
 
             if final_start > final_end:
                 # There was a termination criteria, but the WB was never properly started
                 final_start = final_end + 1
-                excluded_wb_list[preliminary_wb_id] = stride_list.iloc[start:final_start]
-                exclusion_reasons[preliminary_wb_id] = start_delay_reason
+                excluded_wbs[preliminary_wb_id] = (start, final_start)
+                # Without a start delay, the WB was excluded because the termination removed all its strides
+                exclusion_reasons[preliminary_wb_id] = start_delay_reason or termination_reason
                 termination_reasons[preliminary_wb_id] = termination_reason
             else:
                 # The preliminary WB is saved
-                preliminary_wb_list[preliminary_wb_id] = stride_list.iloc[final_start : final_end + 1]
+                preliminary_wbs[preliminary_wb_id] = (final_start, final_end + 1)
                 termination_reasons[preliminary_wb_id] = termination_reason
                 # Save strides that were excluded in the beginning as an excluded strides
-                removed_strides = stride_list.iloc[start:final_start]
-                if len(removed_strides) > 0:
-                    for s in removed_strides.index:
-                        stride_exclusion_reasons[s] = start_delay_reason
-                    excluded_strides.append(removed_strides)
+                excluded_stride_ranges.append((start, final_start, start_delay_reason))
                 # Save strides that were excluded in the end as an excluded strides
-                removed_strides = stride_list.iloc[final_end + 1 : restart_at]
-                if len(removed_strides) > 0:
-                    for s in removed_strides.index:
-                        stride_exclusion_reasons[s] = termination_reason
-                    excluded_strides.append(removed_strides)
+                excluded_stride_ranges.append((final_end + 1, restart_at, termination_reason))
                 # Save strides that were not considered a valid start of a WB.
                 # I.e. all strides since the end of the last WB until the original start of the WB
                 if start > last_end + 1:
-                    removed_strides = stride_list.iloc[last_end + 1 : start]
-                    for s in removed_strides.index:
-                        stride_exclusion_reasons[s] = ("no_start", None)
-                    excluded_strides.append(removed_strides)
+                    excluded_stride_ranges.append((last_end + 1, start, ("no_start", None)))
 
                 last_end = restart_at - 1
 
             end = restart_at
-        if len(excluded_strides) > 0:
-            excluded_strides = pd.concat(excluded_strides)
-        else:
-            excluded_strides = pd.DataFrame(columns=stride_list.columns)
         return (
-            preliminary_wb_list,
-            excluded_wb_list,
+            preliminary_wbs,
+            excluded_wbs,
             exclusion_reasons,
             termination_reasons,
-            excluded_strides,
-            stride_exclusion_reasons,
+            excluded_stride_ranges,
         )
 
+    def _termination_candidates(self, stride_list: pd.DataFrame) -> np.ndarray:
+        """All ``current_end`` values at which any of the (built-in) rules could terminate a WB."""
+        candidates = np.zeros(len(stride_list) + 1, dtype=bool)
+        for _, rule in self.rules or []:
+            if hasattr(rule, "_termination_candidates"):
+                candidates |= rule._termination_candidates(stride_list, sampling_rate_hz=self.sampling_rate_hz)
+        return np.flatnonzero(candidates)
+
+    def _find_first_preliminary_wb_fast(
+        self,
+        stride_list: pd.DataFrame,
+        original_start: int,
+        *,
+        termination_candidates: np.ndarray,
+    ) -> tuple[
+        int,
+        int,
+        int,
+        Optional[tuple[str, BaseWbRule]],
+        Optional[tuple[str, BaseWbRule]],
+    ]:
+        # The built-in rules never delay the start of a WB and can only terminate it from the second stride on.
+        # Hence, we can jump directly to the first termination candidate after the start and only evaluate the rules
+        # there.
+        candidate = np.searchsorted(termination_candidates, original_start + 1)
+        if candidate == len(termination_candidates):
+            return (
+                original_start,
+                len(stride_list),
+                len(stride_list),
+                None,
+                ("end_of_list", EndOfStrideList()),
+            )
+        current_end = int(termination_candidates[candidate])
+        _, tmp_end, tmp_restart_at, _, termination_reason = self._check_wb_start_end(
+            stride_list, original_start, original_start, current_end
+        )
+        return original_start, tmp_end, tmp_restart_at, None, termination_reason
+
     def _find_first_preliminary_wb(
         self,
         stride_list: pd.DataFrame,
@@ -410,21 +472,73 @@ class WbAssembly(Algorithm):
         return tmp_start, tmp_end, tmp_restart_at, start_delay_rule, termination_rule
 
     def _apply_inclusion_rules(
-        self, preliminary_wb_list: dict[str, pd.DataFrame]
+        self, stride_list: pd.DataFrame, preliminary_wbs: dict[str, tuple[int, int]]
     ) -> tuple[
-        dict[str, pd.DataFrame],
-        dict[str, pd.DataFrame],
+        dict[str, tuple[int, int]],
+        dict[str, tuple[int, int]],
         dict[str, tuple[str, BaseWbRule]],
     ]:
-        wb_list = {}
-        removed_wb_list = {}
+        wbs = {}
+        removed_wbs = {}
         exclusion_reasons = {}
-        for wb_id, stride_list in preliminary_wb_list.items():
+        for wb_id, (start, stop) in preliminary_wbs.items():
+            wb_stride_list = stride_list.iloc[start:stop]
             for rule_name, rule in self.rules or []:
-                if not rule.check_include(stride_list, sampling_rate_hz=self.sampling_rate_hz):
-                    removed_wb_list[wb_id] = stride_list
+                if not rule.check_include(wb_stride_list, sampling_rate_hz=self.sampling_rate_hz):
+                    removed_wbs[wb_id] = (start, stop)
                     exclusion_reasons[wb_id] = (rule_name, rule)
                     break
             else:
-                wb_list[wb_id] = stride_list
-        return wb_list, removed_wb_list, exclusion_reasons
\ No newline at end of file
+                wbs[wb_id] = (start, stop)
+        return wbs, removed_wbs, exclusion_reasons
+
+    def _apply_inclusion_rules_fast(
+        self, stride_list: pd.DataFrame, preliminary_wbs: dict[str, tuple[int, int]]
+    ) -> tuple[
+        dict[str, tuple[int, int]],
+        dict[str, tuple[int, int]],
+        dict[str, tuple[str, BaseWbRule]],
+    ]:
+        wb_ids = list(preliminary_wbs)
+        bounds = np.array(list(preliminary_wbs.values()), dtype=np.int64).reshape(-1, 2)
+        # Normalize the slices, so that they can be used as positions
+        bounds = np.clip(bounds, 0, len(stride_list))
+        included = np.ones(len(wb_ids), dtype=bool)
+        exclusion_rule = np.full(len(wb_ids), -1)
+        for i, (_, rule) in enumerate(self.rules or []):
+            # Rules are only evaluated for WBs, which were not excluded by a previous rule
+            if not hasattr(rule, "_check_include_multiple") or not included.any():
+                continue
+            passed = rule._check_include_multiple(
+                stride_list, bounds[:, 0], bounds[:, 1], sampling_rate_hz=self.sampling_rate_hz
+            )
+            exclusion_rule[included & ~passed] = i
+            included &= passed
+
+        rules = self.rules or []
+        wbs = {}
+        removed_wbs = {}
+        exclusion_reasons = {}
+        for wb_id, rule_index in zip(wb_ids, exclusion_rule):
+            if rule_index == -1:
+                wbs[wb_id] = preliminary_wbs[wb_id]
+            else:
+                removed_wbs[wb_id] = preliminary_wbs[wb_id]
+                exclusion_reasons[wb_id] = tuple(rules[rule_index])
+        return wbs, removed_wbs, exclusion_reasons
+
+
+def _select_wbs(stride_list: pd.DataFrame, wbs: dict[str, tuple[int, int]], id_col: str) -> pd.DataFrame:
+    """Concatenate the strides of multiple WBs (``iloc`` slices) and add the WB id as first column.
+
+    This is equivalent to ``pd.concat({wb_id: stride_list.iloc[start:stop], ...}, names=[id_col, ...]).reset_index()``
+    but selects all strides at once.
+    """
+    positions = np.arange(len(stride_list))
+    rows = [positions[start:stop] for start, stop in wbs.values()]
+    selected = stride_list.iloc[np.concatenate(rows)].reset_index()
+    selected.insert(0, id_col, np.repeat(np.array(list(wbs), dtype=object), [len(r) for r in rows]))
+    return selected
+
+
+_FAST_PATH_RULES: Final = (BreakCriteria, LeftRightCriteria, StridesCriteria)
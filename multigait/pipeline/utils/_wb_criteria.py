@@ -1,6 +1,7 @@
 """Custom wb criteria inheriting from MobGap base criteria."""
 
 from typing import Optional, Union
+import numpy as np
 import pandas as pd
 from typing_extensions import Literal
 from multigait.pipeline.wba_base import BaseWbRule
@@ -67,6 +68,32 @@ class StridesCriteria(BaseWbRule):
         # Nothing configured -> do not include
         return False
 
+    def _check_include_multiple(
+        self,
+        stride_list: pd.DataFrame,
+        wb_starts: np.ndarray,
+        wb_stops: np.ndarray,
+        *,
+        sampling_rate_hz: Optional[float] = None,  # noqa: ARG002
+    ) -> np.ndarray:
+        """Vectorised version of `check_include` for the WBs ``stride_list.iloc[wb_starts[i]:wb_stops[i]]``."""
+        if self.min_strides is not None:
+            if self.min_strides < 0:
+                raise ValueError(f"Only positive values are allowed for `min_strides` not {self.min_strides}")
+            return (wb_stops - wb_starts) >= self.min_strides
+
+        if self.min_contacts is not None:
+            if self.min_contacts < 0:
+                raise ValueError(f"Only positive values are allowed for `min_contacts` not {self.min_contacts}")
+            if self.contacts_col not in stride_list.columns:
+                raise ValueError(f"Contacts column '{self.contacts_col}' not found in stride_list")
+            contacts = np.nan_to_num(stride_list[self.contacts_col].to_numpy(dtype="float64"))
+            cumulative = np.concatenate(([0.0], np.cumsum(contacts)))
+            total_contacts = np.trunc(cumulative[wb_stops] - cumulative[wb_starts])
+            return total_contacts >= self.min_contacts
+
+        return np.zeros(len(wb_starts), dtype=bool)
+
 
 class BreakCriteria(BaseWbRule):
     """Test if the break between the last two strides of a window list is larger than a threshold.
@@ -147,6 +174,30 @@ class BreakCriteria(BaseWbRule):
         # Break -> terminate
         return self._process_break(stride_list, original_start, current_end)
 
+    def _termination_candidates(
+        self, stride_list: pd.DataFrame, *, sampling_rate_hz: Optional[float] = None
+    ) -> np.ndarray:
+        """Mark all ``current_end`` values at which `check_wb_start_end` terminates a WB started before them.
+
+        The returned boolean array has one entry more than the stride list (the check including the final stride).
+        The break between all consecutive strides is computed at once.
+        """
+        if sampling_rate_hz is None:
+            raise ValueError("The sampling rate must be provided if the BreakCriteria is used.")
+
+        if self.max_break_s < 0:
+            raise ValueError(f'Only positive values are allowed for "max_break" not {self.max_break_s}')
+
+        if not isinstance(self.remove_last_ic, bool) and not self.remove_last_ic == "per_foot":
+            raise ValueError("`remove_last_ic` must be a Boolean or the string 'per_foot'.")
+
+        candidates = np.zeros(len(stride_list) + 1, dtype=bool)
+        starts = stride_list[self._START_COL_NAME].to_numpy()
+        ends = stride_list[self._END_COL_NAME].to_numpy()
+        candidates[1:-1] = ~((starts[1:] - ends[:-1]) / sampling_rate_hz <= self.max_break_s)
+        candidates[-1] = self.consider_end_as_break is True
+        return candidates
+
     def _process_break(
         self,
         stride_list: pd.DataFrame,
@@ -185,6 +236,7 @@ class LeftRightCriteria(BaseWbRule):
     """Test a left stride is always followed by a right stride.
 
     The WB is broken if two consecutive strides are performed with the same foot.
+    The WB ends with the first of the two strides and the second one starts the next WB.
     """
 
     max_break: float
@@ -195,16 +247,30 @@ class LeftRightCriteria(BaseWbRule):
         self,
         stride_list: pd.DataFrame,
         *,
-        original_start: int,  # noqa: ARG002
+        original_start: int,
         current_start: int,  # noqa: ARG002
         current_end: int,
         sampling_rate_hz: Optional[float] = None,  # noqa: ARG002
     ) -> tuple[Optional[int], Optional[int], Optional[int]]:
-        if current_end < 1:
+        # The first stride of a WB can not break it and the final check (after the last stride) has no foot to
+        # compare with.
+        if current_end - original_start < 1 or current_end >= len(stride_list):
             return None, None, None
         feet = stride_list[self._FOOT_COL_NAME]
         last_foot = feet.iloc[current_end - 1]
         this_foot = feet.iloc[current_end]
         if last_foot and this_foot and last_foot == this_foot:
-            return None, current_end - 1, current_end - 1
-        return None, None, None
\ No newline at end of file
+            return None, current_end - 1, current_end
+        return None, None, None
+
+    def _termination_candidates(
+        self, stride_list: pd.DataFrame, *, sampling_rate_hz: Optional[float] = None  # noqa: ARG002
+    ) -> np.ndarray:
+        """Mark all ``current_end`` values at which `check_wb_start_end` terminates a WB started before them."""
+        candidates = np.zeros(len(stride_list) + 1, dtype=bool)
+        if len(stride_list) < 2:
+            return candidates
+        feet = stride_list[self._FOOT_COL_NAME].to_numpy(dtype=object)
+        truthy = np.array([bool(foot) for foot in feet])
+        candidates[1:-1] = truthy[:-1] & truthy[1:] & (feet[:-1] == feet[1:]).astype(bool)
+        return candidates
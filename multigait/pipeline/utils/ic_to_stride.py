@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 
+
 def _to_stride_list_no_lr(ic_list: pd.DataFrame) -> pd.DataFrame:
     """Make start/end stride rows from an ic-only DataFrame.
 
@@ -42,4 +44,28 @@ def strides_list_from_ic_list_no_lrc(ic_list: pd.DataFrame) -> pd.DataFrame:
         ic_list.sort_values("ic")
         .pipe(_to_stride_list_no_lr)
         .pipe(_unify_stride_list_no_lr)
-    )
\ No newline at end of file
+    )
+
+def strides_list_from_grouped_ic_list_no_lrc(ic_list: pd.DataFrame, groupby: str = "gs_id") -> pd.DataFrame:
+    """Convert the initial contacts of multiple groups (e.g. gait sequences) to a stride list in a single pass.
+
+    This is equivalent to
+    ``ic_list.groupby(groupby, group_keys=False).apply(strides_list_from_ic_list_no_lrc)``, but sorts all ICs at
+    once by group and IC and pairs consecutive ICs of the same group, instead of processing every group separately.
+    Strides never span two groups.
+    """
+    if ic_list.empty:
+        return strides_list_from_ic_list_no_lrc(ic_list)
+
+    group_codes, _ = pd.factorize(ic_list.index.get_level_values(groupby), sort=True)
+    ics = ic_list["ic"].to_numpy()
+    valid = np.flatnonzero((group_codes >= 0) & ~pd.isna(ics))
+    # Stable sort by group first and IC second
+    rows = valid[np.lexsort((ics[valid].astype("float64"), group_codes[valid]))]
+    same_group = group_codes[rows[1:]] == group_codes[rows[:-1]]
+    start_rows = rows[:-1][same_group]
+    end_rows = rows[1:][same_group]
+
+    return pd.DataFrame(
+        {"start": ics[start_rows], "end": ics[end_rows]}, index=ic_list.index[start_rows]
+    ).pipe(_unify_stride_list_no_lr)
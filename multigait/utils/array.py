@@ -1,10 +1,9 @@
 """Helper functions for common array manipulations."""
 
 from numpy.lib.stride_tricks import sliding_window_view as np_stride_window
+from dataclasses import dataclass
 from typing import Optional
-import numba
 import numpy as np
-from numba import njit
 
 def create_sliding_windows(array: np.ndarray, window_size_samples: int, overlap_samples: int) -> np.ndarray:
     """Generate overlapping windows along the first axis of the array.
@@ -48,61 +47,332 @@ def create_sliding_windows(array: np.ndarray, window_size_samples: int, overlap_
     return windowed_view
 
 
-def merge_interval(input_intervals: np.ndarray, gap_size: int = 0) -> np.ndarray:
+def _as_intervals(intervals: np.ndarray) -> np.ndarray:
+    """Return the intervals as array of shape (n, 2) (also for empty inputs)."""
+    return np.asarray(intervals).reshape(-1, 2)
+
+
+def merge_interval(input_intervals: np.ndarray, gap_size: float = 0) -> np.ndarray:
     """Combine overlapping or closely spaced intervals into single intervals.
 
     Intervals with overlap or distance <= gap_size are merged.
 
+    The intervals are sorted by their start and merged in a single sweep using the running maximum of the ends, so
+    the runtime is O(n log n).
+
     Parameters
     ----------
     input_intervals : np.ndarray of shape (n, 2)
         Array of intervals, each row is [start, end].
-    gap_size : int
-        Maximum allowed gap between intervals to merge them. Default is 0.
+    gap_size : float
+        Maximum allowed gap between intervals to merge them. Default is 0, i.e. only overlapping and touching intervals
+        are merged.
 
     Returns
     -------
     np.ndarray of shape (m, 2)
-        Array of merged intervals.
+        Array of merged intervals sorted by start, with the same dtype as the input.
 
     Examples
     --------
     >>> arr = np.array([[1, 3], [2, 4], [6, 8], [5, 7], [10, 12], [11, 15], [18, 20]])
-    >>> merge_intervals(arr)
+    >>> merge_interval(arr)
     array([[ 1,  4],
            [ 5,  8],
            [10, 15],
            [18, 20]])
 
-    >>> merge_intervals(arr, 2)
+    >>> merge_interval(arr, 2)
     array([[ 1, 15],
            [18, 20]])
     """
     if input_intervals.shape[0] == 0:
         return input_intervals
 
-    # Sort rows by start values using stable sort
-    sorted_intervals = np.sort(input_intervals, axis=0, kind="stable")
-    return np.array(_merge_intervals_numba(sorted_intervals, gap_size))
+    sorted_intervals = input_intervals[np.argsort(input_intervals[:, 0], kind="stable")]
+
+    # A new interval starts, whenever the start is further than gap_size after the end of all previous intervals
+    running_end = np.maximum.accumulate(sorted_intervals[:, 1])
+    new_interval = np.ones(len(sorted_intervals), dtype=bool)
+    new_interval[1:] = sorted_intervals[1:, 0] - running_end[:-1] > gap_size
+    first = np.flatnonzero(new_interval)
+    last = np.append(first[1:], len(sorted_intervals)) - 1
+    return np.column_stack([sorted_intervals[first, 0], running_end[last]])
+
+
+def union_intervals(intervals_a: np.ndarray, intervals_b: np.ndarray, gap_size: float = 0) -> np.ndarray:
+    """Combine two sets of intervals into one set of merged intervals.
+
+    Parameters
+    ----------
+    intervals_a : np.ndarray of shape (n, 2)
+        First set of intervals, each row is [start, end].
+    intervals_b : np.ndarray of shape (m, 2)
+        Second set of intervals, each row is [start, end].
+    gap_size : float
+        Maximum allowed gap between intervals to merge them. Default is 0.
+
+    Returns
+    -------
+    np.ndarray of shape (k, 2)
+        The merged intervals of both sets sorted by start.
+
+    Examples
+    --------
+    >>> union_intervals(np.array([[1, 3], [8, 10]]), np.array([[3, 5]]))
+    array([[ 1,  5],
+           [ 8, 10]])
+    """
+    return merge_interval(np.concatenate([_as_intervals(intervals_a), _as_intervals(intervals_b)]), gap_size)
+
+
+def intersect_intervals(intervals_a: np.ndarray, intervals_b: np.ndarray) -> np.ndarray:
+    """Find the regions covered by both sets of intervals.
+
+    The intervals are treated as half-open [start, end), i.e. intervals that only touch do not intersect.
+    Overlapping intervals within each set are merged first.
+    Afterwards, the intervals of ``intervals_a`` overlapping each interval of ``intervals_b`` are found with a binary
+    search, so that the runtime is O((n + m) log(n + m) + k) for k intersections.
+
+    Parameters
+    ----------
+    intervals_a : np.ndarray of shape (n, 2)
+        First set of intervals, each row is [start, end].
+    intervals_b : np.ndarray of shape (m, 2)
+        Second set of intervals, each row is [start, end].
+
+    Returns
+    -------
+    np.ndarray of shape (k, 2)
+        The non-empty intersections sorted by start.
+
+    Examples
+    --------
+    >>> intersect_intervals(np.array([[0, 10], [20, 30]]), np.array([[5, 25], [28, 40]]))
+    array([[ 5, 10],
+           [20, 25],
+           [28, 30]])
+    """
+    a = merge_interval(_as_intervals(intervals_a))
+    b = merge_interval(_as_intervals(intervals_b))
+
+    # After merging, starts and ends are sorted. Interval j of b overlaps the intervals first[j]:last[j] of a.
+    first = np.searchsorted(a[:, 1], b[:, 0], side="right")
+    last = np.searchsorted(a[:, 0], b[:, 1], side="left")
+    n_overlaps = np.maximum(last - first, 0)
+    b_idx = np.repeat(np.arange(len(b)), n_overlaps)
+    a_idx = np.arange(n_overlaps.sum()) - np.repeat(np.cumsum(n_overlaps) - n_overlaps - first, n_overlaps)
+
+    starts = np.maximum(a[a_idx, 0], b[b_idx, 0])
+    ends = np.minimum(a[a_idx, 1], b[b_idx, 1])
+    # Drops the intersections with empty (zero length) intervals
+    non_empty = starts < ends
+    return np.column_stack([starts[non_empty], ends[non_empty]])
+
+
+def subtract_intervals(intervals_a: np.ndarray, intervals_b: np.ndarray) -> np.ndarray:
+    """Remove the regions covered by ``intervals_b`` from ``intervals_a``.
 
+    The intervals are treated as half-open [start, end).
 
-@njit
-def _merge_intervals_numba(sorted_intervals: np.ndarray, gap_size: int) -> numba.typed.List:
-    """Numba-accelerated merge for sorted intervals."""
-    merged = numba.typed.List()
-    merged.append(sorted_intervals[0])
+    Parameters
+    ----------
+    intervals_a : np.ndarray of shape (n, 2)
+        Intervals to subtract from, each row is [start, end].
+    intervals_b : np.ndarray of shape (m, 2)
+        Intervals to remove, each row is [start, end].
+
+    Returns
+    -------
+    np.ndarray of shape (k, 2)
+        The merged regions of ``intervals_a`` not covered by ``intervals_b`` sorted by start.
+
+    Examples
+    --------
+    >>> subtract_intervals(np.array([[0, 10], [20, 30]]), np.array([[5, 25]]))
+    array([[ 0,  5],
+           [25, 30]])
+    """
+    a = merge_interval(_as_intervals(intervals_a))
+    b = merge_interval(_as_intervals(intervals_b))
+    if len(a) == 0 or len(b) == 0:
+        return a
 
-    for i in range(1, len(sorted_intervals)):
-        current = sorted_intervals[i]
-        last = merged[-1]
+    # The gaps between the intervals of b (extended to cover all of a)
+    lower = min(a[0, 0], b[0, 0])
+    upper = max(a[-1, 1], b[-1, 1])
+    gaps = np.column_stack([np.append(lower, b[:, 1]), np.append(b[:, 0], upper)])
+    return intersect_intervals(a, gaps)
 
-        # Merge if current interval starts before last ends + gap
-        if last[0] <= current[0] <= last[1] + gap_size <= current[1] + gap_size:
-            last[1] = current[1]
-        else:
-            merged.append(current)
 
-    return merged
+def filter_intervals_by_length(intervals: np.ndarray, min_length: float) -> np.ndarray:
+    """Remove all intervals that are not longer than ``min_length``.
+
+    Parameters
+    ----------
+    intervals : np.ndarray of shape (n, 2)
+        Array of intervals, each row is [start, end].
+    min_length : float
+        Intervals with a length (end - start) smaller or equal to this value are removed.
+
+    Returns
+    -------
+    np.ndarray of shape (m, 2)
+        The remaining intervals in their original order.
+
+    Examples
+    --------
+    >>> filter_intervals_by_length(np.array([[0, 2], [5, 10], [12, 15]]), 3)
+    array([[ 5, 10]])
+    """
+    intervals = _as_intervals(intervals)
+    return intervals[(intervals[:, 1] - intervals[:, 0]) > min_length]
+
+
+@dataclass(frozen=True, eq=False)
+class RunLengthMask:
+    """Boolean mask stored as the [start, end) intervals of its True runs.
+
+    The memory of the mask scales with the number of runs instead of its length.
+    Use the constructors :meth:`from_bool`, :meth:`from_threshold` and :meth:`from_intervals`, which ensure that the
+    intervals are sorted, non-empty and separated by at least one False element.
+
+    Parameters
+    ----------
+    intervals : np.ndarray of shape (n_runs, 2)
+        Start and end (exclusive) of every True run.
+    length : int
+        Length of the mask.
+
+    Notes
+    -----
+    Two masks are equal, if they have the same length and the same intervals. Masks are not hashable.
+
+    Examples
+    --------
+    >>> mask = RunLengthMask.from_bool(np.array([0, 1, 1, 0, 0, 1], dtype=bool))
+    >>> mask.intervals
+    array([[1, 3],
+           [5, 6]])
+    >>> (~mask).intervals
+    array([[0, 1],
+           [3, 5]])
+    """
+
+    intervals: np.ndarray
+    length: int
+
+    @classmethod
+    def from_bool(cls, bool_array: np.ndarray) -> "RunLengthMask":
+        """Create the mask from a dense boolean array."""
+        bool_array = np.asarray(bool_array, dtype=bool)
+        length = len(bool_array)
+        if length == 0:
+            return cls(np.empty((0, 2), dtype=np.int64), 0)
+        changes = np.flatnonzero(bool_array[1:] != bool_array[:-1]) + 1
+        rising = bool_array[changes]
+        starts = changes[rising]
+        ends = changes[~rising]
+        if bool_array[0]:
+            starts = np.concatenate([[0], starts])
+        if bool_array[-1]:
+            ends = np.concatenate([ends, [length]])
+        return cls(np.column_stack([starts, ends]).astype(np.int64, copy=False), length)
+
+    @classmethod
+    def from_threshold(cls, values: np.ndarray, threshold: float, *, block_size: int = 2**20) -> "RunLengthMask":
+        """Create the mask of ``values > threshold``.
+
+        The comparison is evaluated block by block, so that no boolean array with the length of ``values`` is created.
+        """
+        length = len(values)
+        runs = [
+            cls.from_bool(values[block_start : block_start + block_size] > threshold).intervals + block_start
+            for block_start in range(0, length, block_size)
+        ]
+        if not runs:
+            return cls(np.empty((0, 2), dtype=np.int64), 0)
+        # Runs crossing a block boundary touch each other and are merged
+        return cls(merge_interval(np.concatenate(runs)), length)
+
+    @classmethod
+    def from_intervals(cls, intervals: np.ndarray, length: int) -> "RunLengthMask":
+        """Create the mask that is True within any of the intervals (clipped to the length of the mask)."""
+        intervals = np.clip(_as_intervals(intervals), 0, length).astype(np.int64)
+        return cls(merge_interval(intervals[intervals[:, 1] > intervals[:, 0]]), int(length))
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Start of every True run."""
+        return self.intervals[:, 0]
+
+    @property
+    def ends(self) -> np.ndarray:
+        """End (exclusive) of every True run."""
+        return self.intervals[:, 1]
+
+    @property
+    def run_lengths(self) -> np.ndarray:
+        """Number of elements of every True run."""
+        return self.intervals[:, 1] - self.intervals[:, 0]
+
+    @property
+    def n_runs(self) -> int:
+        """Number of True runs."""
+        return len(self.intervals)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RunLengthMask):
+            return NotImplemented
+        return self.length == other.length and np.array_equal(self.intervals, other.intervals)
+
+    # The intervals are a mutable array, so the mask can not be used as dictionary key
+    __hash__ = None
+
+    def __invert__(self) -> "RunLengthMask":
+        edges = np.concatenate([[0], self.intervals.ravel(), [self.length]]).reshape(-1, 2)
+        return RunLengthMask(edges[edges[:, 1] > edges[:, 0]], self.length)
+
+    def __and__(self, other: "RunLengthMask") -> "RunLengthMask":
+        return RunLengthMask(intersect_intervals(self.intervals, other.intervals), min(self.length, other.length))
+
+    def __or__(self, other: "RunLengthMask") -> "RunLengthMask":
+        return RunLengthMask(union_intervals(self.intervals, other.intervals), max(self.length, other.length))
+
+    def filter_by_length(self, min_length: float) -> "RunLengthMask":
+        """Remove all True runs that are not longer than ``min_length``."""
+        return RunLengthMask(filter_intervals_by_length(self.intervals, min_length), self.length)
+
+    def count_true(self, intervals: np.ndarray) -> np.ndarray:
+        """Count the True elements within each of the [start, end) intervals.
+
+        The counts are looked up in the cumulative sum of the run lengths, so that the cost does not depend on the
+        length of the intervals.
+        """
+        intervals = _as_intervals(intervals)
+        return self._n_true_before(intervals[:, 1]) - self._n_true_before(intervals[:, 0])
+
+    def _n_true_before(self, positions: np.ndarray) -> np.ndarray:
+        """Number of True elements with an index smaller than each of the positions."""
+        positions = np.clip(positions, 0, self.length)
+        n_true = np.concatenate([[0], np.cumsum(self.run_lengths)])
+        ends = np.concatenate([[0], self.ends])
+        # Number of runs starting before the position. The last of these runs may continue after the position.
+        n_runs = np.searchsorted(self.starts, positions, side="left")
+        return n_true[n_runs] - np.maximum(ends[n_runs] - positions, 0)
+
+    def take(self, values: np.ndarray) -> np.ndarray:
+        """Select the elements of ``values`` within the True runs (equal to ``values[mask]``)."""
+        run_lengths = self.run_lengths
+        offsets = np.repeat(self.starts - (np.cumsum(run_lengths) - run_lengths), run_lengths)
+        return values[np.arange(len(offsets)) + offsets]
+
+    def to_dense(self, dtype: type = bool) -> np.ndarray:
+        """Convert the mask to a dense array with 1 (True) within and 0 (False) outside of the runs."""
+        edges = np.concatenate([[0], self.intervals.ravel(), [self.length]])
+        values = np.zeros(len(edges) - 1, dtype=dtype)
+        values[1::2] = 1
+        return np.repeat(values, np.diff(edges))
 
 
 def bool_array_to_start_end(bool_array: np.ndarray) -> np.ndarray:
@@ -135,8 +405,7 @@ def bool_array_to_start_end(bool_array: np.ndarray) -> np.ndarray:
     if len(bool_array) == 0:
         return np.array([])
 
-    slices = np.ma.flatnotmasked_contiguous(np.ma.masked_equal(bool_array, 0))
-    return np.array([[s.start, s.stop] for s in slices])
+    return RunLengthMask.from_bool(bool_array).intervals
 
 
 def start_end_array_to_bool(start_end_array: np.ndarray, pad_to_length: Optional[int] = None) -> np.ndarray:
@@ -172,8 +441,6 @@ def start_end_array_to_bool(start_end_array: np.ndarray, pad_to_length: Optional
             raise ValueError("pad_to_length must be non-negative")
         n_elements = pad_to_length
 
-    bool_array = np.zeros(n_elements, dtype=bool)
-    for start, end in start_end_array:
-        bool_array[start:end] = True
+    bool_array = RunLengthMask.from_intervals(start_end_array, n_elements).to_dense()
 
     return bool_array
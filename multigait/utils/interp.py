@@ -183,3 +183,126 @@ def map_seconds_to_regions(
 
     out = pd.DataFrame(means, columns=second_params.columns, index=regions.index).astype(second_params.dtypes)
     return pd.concat([regions, out], axis=1)
+
+
+def map_seconds_to_grouped_regions(
+    regions: pd.DataFrame,
+    second_params: pd.DataFrame,
+    *,
+    groupby: str,
+    sampling_rate_hz: float,
+) -> pd.DataFrame:
+    """
+    Aggregate per-second metrics over the regions of multiple groups (e.g. gait sequences) in a single pass.
+
+    This gives the same result as applying :func:`map_seconds_to_regions` per group
+    (``create_multi_groupby(regions, second_params, groupby, group_keys=False).apply(map_seconds_to_regions, ...)``),
+    but integrates the per-second values of all groups on flat arrays.
+    The regions of each group are only mapped to the seconds of the same group.
+    Regions of groups without any per-second values get NaN.
+
+    Parameters
+    ----------
+    regions : DataFrame
+        Must contain 'start' and 'end' columns and the index level ``groupby``.
+    second_params : DataFrame
+        Indexed by ``groupby`` and 'sec_center_samples', each row corresponding to one second.
+    groupby : str
+        Name of the index level identifying the groups in both dataframes.
+    sampling_rate_hz : float
+        Conversion factor for sample indexing.
+
+    Returns
+    -------
+    DataFrame
+        Regions (sorted by group) with additional columns representing averaged second metrics.
+    """
+    if regions.empty:
+        return regions.reindex(columns=list(regions.columns) + list(second_params.columns))
+
+    region_codes, groups = pd.factorize(regions.index.get_level_values(groupby), sort=True)
+    if (region_codes < 0).any():
+        regions = regions[region_codes >= 0]
+        region_codes = region_codes[region_codes >= 0]
+    if (np.diff(region_codes) < 0).any():
+        order = np.argsort(region_codes, kind="stable")
+        regions = regions.iloc[order]
+        region_codes = region_codes[order]
+
+    def _without_seconds() -> pd.DataFrame:
+        empty_block = pd.DataFrame(np.nan, index=regions.index, columns=second_params.columns)
+        return pd.concat([regions, empty_block], axis=1)
+
+    if second_params.empty:
+        return _without_seconds()
+
+    invalid_cols = [col for col, dt in second_params.dtypes.items() if not is_float_dtype(dt)]
+    if invalid_cols:
+        raise ValueError(
+            f"Non-float columns found in second_params: {invalid_cols}. "
+            "Convert to floats before region aggregation."
+        )
+
+    # Seconds of each group in their original order, groups in the order of the regions
+    sec_codes = pd.Index(groups).get_indexer(second_params.index.get_level_values(groupby))
+    sec_rows = np.flatnonzero(sec_codes >= 0)
+    if len(sec_rows) == 0:
+        return _without_seconds()
+    sec_rows = sec_rows[np.argsort(sec_codes[sec_rows], kind="stable")]
+    sec_codes = sec_codes[sec_rows]
+    sec_positions = second_params.index.get_level_values("sec_center_samples").to_numpy()[sec_rows]
+    values = second_params.to_numpy(dtype="float64")[sec_rows]
+
+    # Same knots as in `map_seconds_to_regions`: second ends with one padding second in front of every group
+    n_secs = np.bincount(sec_codes, minlength=len(groups))
+    n_knots = np.where(n_secs > 0, n_secs + 1, 0)
+    knot_starts = np.concatenate(([0], np.cumsum(n_knots)[:-1]))
+    first_sec = np.concatenate(([0], np.cumsum(n_secs)[:-1]))[n_secs > 0]
+
+    shifted_positions = sec_positions + sampling_rate_hz * 0.5
+    knot_positions = np.insert(shifted_positions, first_sec, shifted_positions[first_sec] - sampling_rate_hz)
+    knot_values = np.insert(values, first_sec, values[first_sec], axis=0)
+    knot_codes = np.insert(sec_codes, first_sec, sec_codes[first_sec])
+
+    # The cumulative sum restarts for every group, so that NaN values only affect their own group.
+    cumulative = np.empty_like(knot_values)
+    for start, n in zip(knot_starts[n_knots > 0], n_knots[n_knots > 0]):
+        np.cumsum(knot_values[start : start + n], axis=0, out=cumulative[start : start + n])
+    cumulative *= sampling_rate_hz
+
+    # `interp1d` sorts the knots by position (after calculating the cumulative sum)
+    knot_order = np.lexsort((knot_positions, knot_codes))
+    knot_positions = knot_positions[knot_order]
+    cumulative = cumulative[knot_order]
+
+    # Linear interpolation/extrapolation on the knots of the respective group (same operations as `interp1d`)
+    key_dtype = np.dtype([("group", "int64"), ("position", "float64")])
+    knot_keys = np.empty(len(knot_positions), dtype=key_dtype)
+    knot_keys["group"] = knot_codes[knot_order]
+    knot_keys["position"] = knot_positions
+
+    starts = regions["start"].to_numpy()
+    ends = regions["end"].to_numpy()
+    has_secs = n_secs[region_codes] > 0
+    integrated = []
+    for x_new in (starts, ends):
+        query = np.empty(len(x_new), dtype=key_dtype)
+        query["group"] = region_codes
+        query["position"] = x_new
+        local = np.searchsorted(knot_keys, query) - knot_starts[region_codes]
+        local = np.clip(local, 1, np.maximum(n_knots[region_codes] - 1, 1))
+        hi = np.where(has_secs, knot_starts[region_codes] + local, 0)
+        lo = np.where(has_secs, hi - 1, 0)
+        x_lo = knot_positions[lo]
+        y_lo = cumulative[lo]
+        # Regions of groups without seconds use a dummy knot and are set to NaN below
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (cumulative[hi] - y_lo) / (knot_positions[hi] - x_lo)[:, None]
+        integrated.append(slope * (x_new - x_lo)[:, None] + y_lo)
+
+    durations = (ends - starts)[:, None]
+    means = (integrated[1] - integrated[0]) / durations
+    means[~has_secs] = np.nan
+
+    out = pd.DataFrame(means, columns=second_params.columns, index=regions.index).astype(second_params.dtypes)
+    return pd.concat([regions, out], axis=1)
@@ -0,0 +1,199 @@
+"""Memoised derived signals of a single gait sequence that can be shared between algorithms."""
+
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, Optional, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+from mobgap.data_transform import Resample, chain_transformers
+from mobgap.data_transform.base import BaseTransformer
+
+from multigait.GSD.utils.gravity_remove_butter import gravity_motion_butterworth
+
+ACC_COLS = ["acc_is", "acc_ml", "acc_pa"]
+
+# Names of the derived signals that can be used as input for ``resampled`` and ``filtered`` (besides data columns)
+DERIVED_SIGNALS = ("acc_norm", "gravity_removed_norm")
+
+T = TypeVar("T")
+
+
+def _transformer_key(transformer: BaseTransformer) -> tuple:
+    """Hashable key of a transformer based on its type and its parameters."""
+    params = tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(transformer.get_params().items())
+    )
+    return type(transformer).__name__, params
+
+
+class GsSignalContext:
+    """
+    Derived signals of the data of a single gait sequence, each calculated at most once.
+
+    The pipeline creates one context per gait sequence and passes it to all algorithms that accept a
+    ``signal_context`` argument.
+    This way, signals like the acceleration norm or the gravity-free acceleration are only calculated once per gait
+    sequence, even though multiple algorithms (initial contact detection, stride length, ...) use them.
+
+    All derived signals are calculated with the same functions the algorithms use on their own, so that the results
+    are identical with and without a context.
+    The returned arrays are read-only, as they are shared between the algorithms.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The sensor data of the gait sequence (at least the columns ``acc_is``, ``acc_ml`` and ``acc_pa``).
+
+    Attributes
+    ----------
+    n_computations : int
+        Number of derived signals that were actually calculated (i.e. cache misses).
+
+    Notes
+    -----
+    Rate dependent signals (gravity removal, resampling, filtering) take the sampling rate as argument and are cached
+    per sampling rate. Hence, algorithms that (deliberately or not) use different sampling rates never share
+    results calculated with a wrong sampling rate.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        self.data = data
+        self.n_computations = 0
+        self._cache: dict[Hashable, Any] = {}
+
+    @classmethod
+    def for_data(cls, signal_context: Optional["GsSignalContext"], data: pd.DataFrame) -> "GsSignalContext":
+        """Return the passed context, if it belongs to ``data``, otherwise a new (private) context for ``data``.
+
+        Algorithms use this, so that the same code path is used with and without a shared context.
+        """
+        if signal_context is not None and signal_context.data is data:
+            return signal_context
+        return cls(data)
+
+    def _get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        if key not in self._cache:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+            self.n_computations += 1
+        return self._cache[key]
+
+    def acc_norm(self) -> np.ndarray:
+        """Euclidean norm of the acceleration."""
+        return self._get_or_compute("acc_norm", lambda: np.linalg.norm(self.data[ACC_COLS].values, axis=1))
+
+    def gravity_removed(self, sampling_rate_hz: float) -> pd.DataFrame:
+        """Acceleration with the gravity component removed (see ``gravity_motion_butterworth``)."""
+        return self._get_or_compute(
+            ("gravity_removed", sampling_rate_hz),
+            lambda: gravity_motion_butterworth(self.data[ACC_COLS], sampling_rate_hz),
+        )
+
+    def gravity_removed_norm(self, sampling_rate_hz: float) -> np.ndarray:
+        """Euclidean norm of the acceleration with the gravity component removed."""
+        return self._get_or_compute(
+            ("gravity_removed_norm", sampling_rate_hz),
+            lambda: np.linalg.norm(self.gravity_removed(sampling_rate_hz), axis=1),
+        )
+
+    def signal(self, name: str, sampling_rate_hz: Optional[float] = None) -> np.ndarray:
+        """
+        Return a named 1D signal.
+
+        Parameters
+        ----------
+        name : str
+            Either one of the derived signals ("acc_norm", "gravity_removed_norm") or a column of the data.
+        sampling_rate_hz : float, optional
+            Sampling rate of the data. Required for "gravity_removed_norm".
+
+        Returns
+        -------
+        np.ndarray
+            The signal.
+        """
+        if name == "acc_norm":
+            return self.acc_norm()
+        if name == "gravity_removed_norm":
+            if sampling_rate_hz is None:
+                raise ValueError("The sampling rate is required to remove the gravity component.")
+            return self.gravity_removed_norm(sampling_rate_hz)
+        if name not in self.data.columns:
+            raise ValueError(f"Unknown signal '{name}'. Must be one of {DERIVED_SIGNALS} or a column of the data.")
+        return self._get_or_compute(("column", name), lambda: self.data[name].to_numpy())
+
+    def resampled(self, name: str, *, sampling_rate_hz: float, target_sampling_rate_hz: float) -> np.ndarray:
+        """
+        Return a named signal (see ``signal``) resampled to a different sampling rate.
+
+        Parameters
+        ----------
+        name : str
+            The name of the signal.
+        sampling_rate_hz : float
+            Sampling rate of the data.
+        target_sampling_rate_hz : float
+            The sampling rate to resample to.
+
+        Returns
+        -------
+        np.ndarray
+            The resampled signal.
+        """
+        return self.transformed(
+            name, [("resample", Resample(target_sampling_rate_hz=target_sampling_rate_hz))], sampling_rate_hz
+        )
+
+    def filtered(
+        self, name: str, filter_chain: Sequence[tuple[str, BaseTransformer]], sampling_rate_hz: float
+    ) -> np.ndarray:
+        """
+        Return a named signal (see ``signal``) after applying a chain of filters (e.g. ``ButterworthFilter``).
+
+        The results are cached by the type and the parameters of the filters, so that equivalent filter instances
+        share the cached result.
+
+        Parameters
+        ----------
+        name : str
+            The name of the signal.
+        filter_chain : Sequence[tuple[str, BaseTransformer]]
+            Filters in the format of ``chain_transformers``.
+        sampling_rate_hz : float
+            Sampling rate of the data.
+
+        Returns
+        -------
+        np.ndarray
+            The filtered signal.
+        """
+        return self.transformed(name, filter_chain, sampling_rate_hz)
+
+    def transformed(
+        self,
+        name: str,
+        transformer_chain: Sequence[tuple[str, BaseTransformer]],
+        sampling_rate_hz: float,
+    ) -> np.ndarray:
+        """Return a named signal after applying an arbitrary chain of transformers (used by ``resampled`` and
+        ``filtered``)."""
+        key: tuple[Union[str, float, tuple], ...] = (
+            "transformed",
+            name,
+            sampling_rate_hz,
+            tuple(_transformer_key(transformer) for _, transformer in transformer_chain),
+        )
+        return self._get_or_compute(
+            key,
+            lambda: np.asarray(
+                chain_transformers(
+                    self.signal(name, sampling_rate_hz), list(transformer_chain), sampling_rate_hz=sampling_rate_hz
+                )
+            ),
+        )
+
+
+__all__ = ["ACC_COLS", "DERIVED_SIGNALS", "GsSignalContext"]
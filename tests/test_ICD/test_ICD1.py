@@ -1,7 +1,11 @@
 import numpy as np
 import pandas as pd
 import pytest
-from multigait.ICD.ICD1 import MicoAmigoIC
+from numpy.testing import assert_array_equal
+from multigait.ICD.ICD1 import MicoAmigoIC, _ensemble_template_exact, _ensemble_template_fast
+from multigait.ICD.utils.auto_cov_unbiased import auto_cov_unbiased
+from multigait.ICD.utils.dtwDasGupta import dtwdasgupta, dtwdasgupta_banded
+from multigait.utils.data_loader import load_imu_data_lowback, load_imu_data_wrist
 
 class TestMicoAmigoIC:
 
@@ -35,3 +39,118 @@ class TestMicoAmigoIC:
         assert isinstance(result.ic_list_, pd.DataFrame)
         assert result.ic_list_.columns.tolist() == ["ic"]
         assert result.ic_list_.index.name == "step_id"
+
+    def test_invalid_template_ensemble(self):
+        with pytest.raises(ValueError):
+            MicoAmigoIC(template_ensemble="invalid")
+
+
+class TestFastTemplateEnsemble:
+
+    @pytest.mark.parametrize(
+        ("version", "loader"),
+        [
+            ("wrist", load_imu_data_wrist),
+            ("original_lowback", load_imu_data_lowback),
+            ("improved_lowback", load_imu_data_lowback),
+        ],
+    )
+    @pytest.mark.parametrize("repeats", [1, 3])
+    def test_fast_matches_exact_on_example_data(self, version, loader, repeats):
+        data = pd.concat([loader()] * repeats, ignore_index=True)
+        exact = MicoAmigoIC(version=version, template_ensemble="exact").detect(data, sampling_rate_hz=100).ic_list_
+        fast = MicoAmigoIC(version=version, template_ensemble="fast").detect(data, sampling_rate_hz=100).ic_list_
+
+        assert not exact.empty
+        pd.testing.assert_frame_equal(fast, exact)
+
+    @pytest.mark.parametrize("n_maxima", [3, 4, 5, 6, 9, 20])
+    def test_templates_identical(self, n_maxima):
+        rng = np.random.default_rng(n_maxima)
+        templatesize, shift = 50, 8
+        acc = rng.normal(size=(n_maxima + 2) * templatesize)
+        # Includes maxima close to the signal bounds, so that the sections are clipped
+        middlemaxima = np.linspace(5, len(acc) - 5, n_maxima).astype(int)
+
+        assert_array_equal(
+            _ensemble_template_fast(acc, middlemaxima, templatesize, shift),
+            _ensemble_template_exact(acc, middlemaxima, templatesize, shift),
+        )
+
+    def test_banded_mode_runs(self):
+        data = load_imu_data_wrist()
+        ic_list = MicoAmigoIC(template_ensemble="fast", dtw_band=0.5).detect(data, sampling_rate_hz=100).ic_list_
+
+        assert ic_list.columns.tolist() == ["ic"]
+        assert ic_list.index.name == "step_id"
+        assert not ic_list.empty
+
+
+class TestBandedDtw:
+
+    @pytest.mark.parametrize(("m", "n"), [(40, 40), (40, 45), (45, 40)])
+    def test_wide_band_matches_unconstrained(self, m, n):
+        rng = np.random.default_rng(0)
+        r, t = rng.normal(size=m), rng.normal(size=n)
+
+        assert_array_equal(dtwdasgupta_banded(r, t, max(m, n)), dtwdasgupta(r, t))
+
+    @pytest.mark.parametrize(("m", "n"), [(40, 40), (40, 55), (55, 40)])
+    def test_narrow_band_output(self, m, n):
+        rng = np.random.default_rng(1)
+        r, t = rng.normal(size=m), rng.normal(size=n)
+        warped = dtwdasgupta_banded(r, t, 2)
+
+        # The warped target is aligned to the reference and only contains averaged values of the target
+        assert len(warped) == m
+        assert np.all(np.isfinite(warped))
+        assert warped.min() >= t.min()
+        assert warped.max() <= t.max()
+
+    def test_long_series_with_narrow_band(self):
+        # The full cost matrix would need 80 GB, only the band of 21 entries per sample is stored
+        rng = np.random.default_rng(2)
+        r = rng.normal(size=100_000)
+        t = np.roll(r, 3)
+        warped = dtwdasgupta_banded(r, t, 10)
+
+        assert len(warped) == len(r)
+        assert_array_equal(warped[10:-10], r[10:-10])
+
+
+class TestAutoCovUnbiased:
+
+    @staticmethod
+    def _direct(x):
+        n = len(x)
+        x_centred = x - np.mean(x)
+        ac = np.correlate(x_centred, x_centred, mode="full")
+        lags = np.arange(-n + 1, n)
+        return ac / (n - np.abs(lags))
+
+    @pytest.mark.parametrize("n", [1, 2, 7, 100, 1001])
+    def test_matches_direct_correlation(self, n):
+        x = np.random.default_rng(n).normal(size=n) + 3
+        expected = self._direct(x)
+        result = auto_cov_unbiased(x)
+
+        assert result.shape == expected.shape
+        # Tolerance relative to the variance, as the last lags are divided by 1
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12 * np.var(x) * n)
+
+    @pytest.mark.parametrize("max_lag", [0, 1, 10, 499])
+    def test_max_lag(self, max_lag):
+        x = np.random.default_rng(0).normal(size=500)
+        full = auto_cov_unbiased(x)
+        mid = len(full) // 2
+
+        np.testing.assert_allclose(auto_cov_unbiased(x, max_lag), full[mid - max_lag : mid + max_lag + 1], atol=1e-12)
+
+    @pytest.mark.parametrize("max_lag", [-1, 5])
+    def test_invalid_max_lag(self, max_lag):
+        with pytest.raises(ValueError):
+            auto_cov_unbiased(np.ones(5), max_lag)
+
+    def test_empty(self):
+        with pytest.raises(ValueError):
+            auto_cov_unbiased(np.array([]))
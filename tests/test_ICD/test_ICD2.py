@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from multigait.ICD.ICD2 import McCamleyIC
+from multigait.ICD.utils.dominant_frequency import dominant_freqency
 
 class TestMcCamleyIC:
 
@@ -52,3 +53,23 @@ class TestMcCamleyIC:
         result2 = algo2.detect(data, sampling_rate_hz=100)
 
         assert np.array_equal(result1.ic_list_["ic"], result2.ic_list_["ic"])
+
+
+class TestDominantFrequency:
+
+    @staticmethod
+    def _full_fft(data, sampling_rate_hz):
+        data = np.asarray(data) - np.mean(data)
+        n = len(data)
+        frequencies = np.fft.fftfreq(n, d=1 / sampling_rate_hz)
+        return int(frequencies[: n // 2][np.argmax(np.abs(np.fft.fft(data))[: n // 2])])
+
+    @pytest.mark.parametrize("n", [64, 101, 1000, 4097])
+    @pytest.mark.parametrize("sampling_rate_hz", [40, 100])
+    def test_matches_full_fft(self, n, sampling_rate_hz):
+        rng = np.random.default_rng(n)
+        t = np.arange(n) / sampling_rate_hz
+        data = np.sin(2 * np.pi * rng.uniform(0.5, 5) * t) + 0.5 * rng.normal(size=n)
+
+        assert dominant_freqency(data, sampling_rate_hz) == self._full_fft(data, sampling_rate_hz)
+        assert dominant_freqency(pd.Series(data), sampling_rate_hz) == self._full_fft(data, sampling_rate_hz)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.ICD.ICD2 import McCamleyIC
+from multigait.ICD.ICD3 import PhamIC
+from multigait.ICD.ICD4 import ZijlstraIC
+from multigait.ICD.ICD5 import DucharmeIC
+from multigait.ICD.ICD6 import GuIC
+from multigait.ICD.utils.batch_filters import butter_filtfilt, butter_sos
+from multigait.utils.data_loader import load_imu_data_wrist
+
+ACC_COLS = ["acc_is", "acc_ml", "acc_pa"]
+
+
+@pytest.fixture(scope="module")
+def recording():
+    wrist_data = load_imu_data_wrist()[ACC_COLS]
+    rest = pd.DataFrame(np.tile([[0.0, -9.81, 0.0]], (500, 1)), columns=ACC_COLS)
+    return pd.concat([rest, wrist_data, rest, wrist_data], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def gs_bounds(recording):
+    n = len(recording)
+    return np.array([[500, 1500], [400, 2600], [3000, 3600], [n - 1200, n], [2000, 4000]])
+
+
+def _detect_per_gs(algorithm, recording, gs_bounds):
+    ics, gs_index = [], []
+    for i, (start, end) in enumerate(gs_bounds):
+        ic_list = algorithm.clone().detect(recording.iloc[start:end], sampling_rate_hz=100).ic_list_
+        ics.append(ic_list["ic"].to_numpy(dtype=np.int64) + start)
+        gs_index.append(np.full(len(ic_list), i))
+    return np.concatenate(ics), np.concatenate(gs_index)
+
+
+@pytest.mark.parametrize("detector", [McCamleyIC, PhamIC, ZijlstraIC, DucharmeIC])
+@pytest.mark.parametrize("version", ["wrist", "original_lowback", "improved_lowback"])
+def test_batch_equals_detect(detector, version, recording, gs_bounds):
+    algorithm = detector(version=version)
+    expected_ics, expected_gs_index = _detect_per_gs(algorithm, recording, gs_bounds)
+
+    result = algorithm.clone().detect_batch(recording.to_numpy(), gs_bounds, sampling_rate_hz=100)
+
+    assert len(expected_ics) > 0
+    np.testing.assert_array_equal(result.ic_positions_, expected_ics)
+    np.testing.assert_array_equal(result.ic_gs_index_, expected_gs_index)
+    assert result.ic_positions_.dtype == np.int64
+
+
+def test_fallback_to_detect(recording, gs_bounds):
+    # GuIC has no array implementation and runs ``detect`` per gait sequence
+    expected_ics, expected_gs_index = _detect_per_gs(GuIC(), recording, gs_bounds[:2])
+    result = GuIC().detect_batch(recording.to_numpy(), gs_bounds[:2], sampling_rate_hz=100)
+    np.testing.assert_array_equal(result.ic_positions_, expected_ics)
+    np.testing.assert_array_equal(result.ic_gs_index_, expected_gs_index)
+
+
+def test_no_gait_sequences(recording):
+    result = McCamleyIC().detect_batch(recording.to_numpy(), np.empty((0, 2)), sampling_rate_hz=100)
+    assert result.ic_positions_.shape == (0,)
+    assert result.ic_gs_index_.shape == (0,)
+
+
+@pytest.mark.parametrize(
+    ("signal", "gs_bounds"),
+    [
+        (np.zeros((100, 2)), [[0, 50]]),
+        (np.zeros((100, 3)), [[50, 150]]),
+        (np.zeros((100, 3)), [[60, 50]]),
+    ],
+)
+def test_invalid_input(signal, gs_bounds):
+    with pytest.raises(ValueError):
+        McCamleyIC().detect_batch(signal, gs_bounds, sampling_rate_hz=100)
+
+
+def test_error_names_gait_sequence(recording):
+    # Too short for the zero-phase filter
+    with pytest.raises(RuntimeError, match="gait sequence 1"):
+        ZijlstraIC().detect_batch(recording.to_numpy(), [[0, 1000], [1000, 1005]], sampling_rate_hz=100)
+
+
+@pytest.mark.parametrize("detector", [McCamleyIC, PhamIC, ZijlstraIC, DucharmeIC])
+def test_detect_and_batch_share_core(detector, recording, gs_bounds, monkeypatch):
+    # Both paths run the same numeric core, only the input signals are prepared differently
+    calls = []
+    core = detector._detect_ics
+
+    def spy(self, *args, **kwargs):
+        calls.append(len(args[0]))
+        return core(self, *args, **kwargs)
+
+    monkeypatch.setattr(detector, "_detect_ics", spy)
+    detector().detect(recording.iloc[500:1500], sampling_rate_hz=100)
+    detector().detect_batch(recording.to_numpy(), gs_bounds[:1], sampling_rate_hz=100)
+
+    assert len(calls) == 2
+    assert calls[0] == calls[1]
+
+
+def test_cached_filter_is_read_only():
+    sos = butter_sos(4, 20, "lowpass", 100)
+
+    assert butter_sos(4, 20, "lowpass", 100) is sos
+    with pytest.raises(ValueError):
+        sos[0, 0] = 1.0
+    assert butter_filtfilt(np.random.default_rng(0).normal(size=200), 4, 20, "lowpass", 100).shape == (200,)
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from multigait.SL.SL2 import KimSL
+from multigait.utils.data_loader import load_imu_data_wrist
 
 
 class TestKimSL:
@@ -94,3 +95,19 @@ class TestKimSL:
         assert sl.step_length_per_sec_["step_length_m"].isna().all()
         assert sl.stride_length_per_sec_["stride_length_m"].isna().all()
         assert len(sl.raw_step_length_per_step_) == 0
+
+    @pytest.mark.parametrize("version", ["wrist"])
+    def test_ics_after_end_of_data(self, version):
+        """Steps without samples (ICs after the end of the data) get a NaN step length instead of raising."""
+        data = load_imu_data_wrist()
+        n_samples = len(data)
+        initial_contacts = pd.DataFrame({"ic": [0, 100, 200, n_samples + 5, n_samples + 50]})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            sl = KimSL(version=version).calculate(data, initial_contacts, sampling_rate_hz=100)
+
+        assert sl.stride_length_per_sec_.shape == (27, 1)
+        step_lengths = sl.raw_step_length_per_step_["step_length_m"]
+        # The step clipped at the end of the data still has samples, the step after the end of the data has none
+        assert step_lengths.iloc[:3].notna().all()
+        assert np.isnan(step_lengths.iloc[3])
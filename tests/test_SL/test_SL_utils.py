@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from multigait.SL.utils.SL_utils import calculate_step_features
+
+
+class TestCalculateStepFeatures:
+
+    @pytest.mark.parametrize("max_step", [2, 30, 150, 3000])
+    def test_bit_identical_to_per_step_calculation(self, max_step):
+        rng = np.random.default_rng(max_step)
+        data = rng.normal(size=50000) * 3 + 1
+        initial_contacts = np.unique(np.cumsum(rng.integers(1, max_step, size=500)))
+        initial_contacts = initial_contacts[initial_contacts < len(data)]
+        steps = list(zip(initial_contacts, initial_contacts[1:]))
+
+        features = calculate_step_features(data, initial_contacts)
+
+        assert_array_equal(features.max_min, [np.max(data[s:e]) - np.min(data[s:e]) for s, e in steps])
+        assert_array_equal(features.mean, [np.mean(data[s:e]) for s, e in steps])
+        assert_array_equal(features.rms, [np.sqrt(np.mean(np.square(data[s:e]))) for s, e in steps])
+        assert_array_equal(features.duration_samples, [e - s for s, e in steps])
+
+    def test_last_step_exceeding_signal_is_clipped(self):
+        data = np.arange(10.0)
+        features = calculate_step_features(data, np.array([0, 4, 15]))
+
+        assert_array_equal(features.max_min, [3, 5])
+        assert_array_equal(features.mean, [1.5, 6.5])
+        assert_array_equal(features.duration_samples, [4, 11])
+
+    @pytest.mark.parametrize("initial_contacts", [[5], [10, 12]])
+    def test_invalid_initial_contacts(self, initial_contacts):
+        with pytest.raises(ValueError):
+            calculate_step_features(np.arange(10.0), np.array(initial_contacts))
+
+    def test_empty_steps(self):
+        data = np.arange(10.0)
+        initial_contacts = np.array([0, 4, 12, 15])
+
+        # Like np.max of an empty slice
+        with pytest.raises(ValueError):
+            calculate_step_features(data, initial_contacts)
+
+        features = calculate_step_features(data, initial_contacts, allow_empty_steps=True)
+        # Like np.mean of an empty slice
+        assert_array_equal(features.mean, [1.5, 6.5, np.nan])
+        assert_array_equal(features.rms, [np.sqrt(3.5), np.sqrt(np.mean(np.arange(4.0, 10) ** 2)), np.nan])
+        assert_array_equal(features.max_min, [3, 5, np.nan])
+        assert_array_equal(features.duration_samples, [4, 8, 3])
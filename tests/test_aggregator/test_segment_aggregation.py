@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas._testing import assert_frame_equal
+
+from multigait.aggregation._generic_aggregator import GenericAggregator
+from multigait.aggregation._lab_aggregator import LaboratoryAggregator
+from multigait.aggregation._segment_aggregation import (
+    _coefficient_of_variation,
+    _custom_quantile,
+    _segment_nanpercentile,
+    aggregate_filtered,
+)
+
+
+def _reference_aggregation(data, groupby, filters_and_aggs):
+    """The per-filter pandas groupby-aggregation with Python callables the engine replaces."""
+    aggregated_results = []
+    for f, agg in filters_and_aggs:
+        internal_filtered = data if f is None else data.query(f)
+        if groupby:
+            data_to_agg = internal_filtered.groupby(groupby)
+        else:
+            data_to_agg = internal_filtered.groupby(pd.Series("all_wbs", index=internal_filtered.index))
+        aggregated_results.append(data_to_agg.agg(**agg))
+    return pd.concat(aggregated_results, axis=1)
+
+
+def _random_wb_dmos(seed, n=300, nan_fraction=0.2):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        {
+            "participant_id": rng.choice(["p1", "p2", "p3", "p4"], n),
+            "measurement_date": rng.choice(["2025-01-01", "2025-01-02", "2025-01-03"], n),
+            "wb_id": np.arange(n),
+            "duration_s": rng.lognormal(np.log(20), 1, n),
+            "n_raw_initial_contacts": rng.integers(4, 400, n),
+        }
+    )
+    for col in GenericAggregator.INPUT_COLUMNS:
+        if col not in data.columns:
+            data[col] = rng.uniform(0.5, 1.5, n)
+    for col in data.columns[3:]:
+        if col != "n_raw_initial_contacts":
+            data.loc[rng.random(n) < nan_fraction, col] = np.nan
+    # A participant with only short walking bouts (missing from the duration filters)
+    data.loc[data["participant_id"] == "p4", "duration_s"] = 5.0
+    return data.sample(frac=1, random_state=seed).set_index(["participant_id", "measurement_date", "wb_id"])
+
+
+def _all_filters_and_aggs(aggregator, data):
+    return aggregator._select_aggregations(data.columns)
+
+
+class TestAggregateFiltered:
+    @pytest.mark.parametrize("groupby", [None, ["participant_id"], ["participant_id", "measurement_date"]])
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_equal_to_reference(self, groupby, seed):
+        data = _random_wb_dmos(seed)
+        filters_and_aggs = _all_filters_and_aggs(GenericAggregator(), data)
+
+        expected = _reference_aggregation(data, groupby, filters_and_aggs)
+        result = aggregate_filtered(data, groupby, filters_and_aggs)
+
+        assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+        # Everything but the coefficient of variation (different summation order) is bit-identical
+        exact = [
+            name for _, aggs in filters_and_aggs for name, (_, f) in aggs.items() if f is not _coefficient_of_variation
+        ]
+        assert_frame_equal(result[exact], expected[exact], check_exact=True)
+
+    def test_groups_missing_from_filter(self):
+        data = _random_wb_dmos(0)
+        filters_and_aggs = _all_filters_and_aggs(GenericAggregator(), data)
+        result = aggregate_filtered(data, ["participant_id"], filters_and_aggs)
+        assert result.loc["p4", "wb_all_sum"] == (data.reset_index()["participant_id"] == "p4").sum()
+        assert np.isnan(result.loc["p4", "wb_10_sum"])
+        assert np.isnan(result.loc["p4", "ws_10_p90"])
+
+    def test_empty_filter_selection(self):
+        data = _random_wb_dmos(0).assign(duration_s=5.0)
+        filters_and_aggs = _all_filters_and_aggs(GenericAggregator(), data)
+        assert_frame_equal(
+            aggregate_filtered(data, ["participant_id"], filters_and_aggs),
+            _reference_aggregation(data, ["participant_id"], filters_and_aggs),
+        )
+
+    def test_custom_aggregation_falls_back_to_pandas(self):
+        data = _random_wb_dmos(0)
+        filters_and_aggs = [
+            (None, {"ws_max": ("walking_speed_mps", "max"), "ws_range": ("walking_speed_mps", np.ptp)})
+        ]
+        assert_frame_equal(
+            aggregate_filtered(data, ["participant_id"], filters_and_aggs),
+            _reference_aggregation(data, ["participant_id"], filters_and_aggs),
+        )
+
+    def test_nanpercentile_bit_identical(self):
+        rng = np.random.default_rng(0)
+        sizes = rng.integers(1, 30, 200)
+        codes = np.repeat(np.arange(len(sizes)), sizes)
+        values = rng.normal(size=len(codes))
+        values[rng.random(len(values)) < 0.3] = np.nan
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+
+        result = _segment_nanpercentile(values, codes, starts, 90)
+        expected = [_custom_quantile(pd.Series(values[codes == c])) for c in range(len(sizes))]
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("aggregator", [GenericAggregator, LaboratoryAggregator])
+@pytest.mark.parametrize("groupby", [None, ["participant_id", "measurement_date"]])
+def test_aggregators_use_engine(aggregator, groupby):
+    data = _random_wb_dmos(3)
+    mask = data.notna() | data.isna()
+    mask.iloc[::7, 0] = False
+    algo = aggregator(groupby, unique_wb_id_column="wb_id", use_original_names=False).aggregate(
+        data, wb_dmos_mask=mask
+    )
+    expected = _reference_aggregation(
+        algo.filtered_wb_dmos_, groupby, algo._select_aggregations(algo.filtered_wb_dmos_.columns)
+    )
+    expected = algo._convert_units(algo._fillna_count_columns(expected)).rename(
+        columns=aggregator.ALTERNATIVE_NAMES, errors="ignore"
+    )
+    assert_frame_equal(algo.aggregated_data_, expected, check_exact=False, rtol=1e-12)
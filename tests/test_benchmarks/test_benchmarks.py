@@ -0,0 +1,147 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.suite import (
+    BENCHMARKS,
+    compare_results,
+    ground_truth_per_wb_dmos,
+    ground_truth_strides,
+    load_results,
+    run_benchmark,
+    run_suite,
+    save_results,
+    select_benchmarks,
+)
+from benchmarks.synthetic import SyntheticRecordingConfig, generate_recording
+
+
+@pytest.fixture(scope="module")
+def recording():
+    return generate_recording(SyntheticRecordingConfig(days=1 / 24, bouts_per_hour=30))
+
+
+class TestSyntheticRecording:
+    def test_deterministic(self, recording):
+        again = generate_recording(SyntheticRecordingConfig(days=1 / 24, bouts_per_hour=30))
+        pd.testing.assert_frame_equal(recording.data, again.data)
+        pd.testing.assert_frame_equal(recording.initial_contacts, again.initial_contacts)
+
+        other_seed = generate_recording(SyntheticRecordingConfig(days=1 / 24, bouts_per_hour=30, seed=1))
+        assert not np.array_equal(recording.data.to_numpy(), other_seed.data.to_numpy())
+
+    def test_days_independent_of_length(self):
+        one_day = generate_recording(SyntheticRecordingConfig(days=1, bouts_per_hour=1, movements_per_hour=1))
+        longer = generate_recording(SyntheticRecordingConfig(days=1.1, bouts_per_hour=1, movements_per_hour=1))
+        np.testing.assert_array_equal(longer.data.to_numpy()[: len(one_day.data)], one_day.data.to_numpy())
+        assert len(longer.data) == int(round(1.1 * 24 * 3600 * 100))
+
+    def test_ground_truth(self, recording):
+        config = recording.config
+        bouts = recording.walking_bouts
+        assert len(recording.data) == 3600 * config.sampling_rate_hz
+        assert list(recording.data.columns) == ["acc_is", "acc_ml", "acc_pa"]
+        assert len(bouts) > 0
+        assert (bouts["start"].iloc[1:].to_numpy() > bouts["end"].iloc[:-1].to_numpy()).all()
+        assert bouts["cadence_spm"].between(*config.cadence_spm).all()
+
+        for wb_id, start, end, cadence in bouts[["start", "end", "cadence_spm"]].itertuples():
+            ics = recording.initial_contacts.loc[wb_id, "ic"].to_numpy()
+            assert ics[0] == start
+            assert (ics < end).all()
+            step_time_s = np.median(np.diff(ics)) / config.sampling_rate_hz
+            assert step_time_s == pytest.approx(60 / cadence, rel=0.05)
+
+    def test_awake_hours(self):
+        recording = generate_recording(SyntheticRecordingConfig(days=1 / 24, awake_hours=(2, 3)))
+        assert recording.walking_bouts.empty
+        assert recording.initial_contacts.empty
+
+
+class TestSuite:
+    def test_ground_truth_inputs(self, recording):
+        strides = ground_truth_strides(recording)
+        assert len(strides) == len(recording.initial_contacts) - len(recording.walking_bouts)
+        assert (strides["end"] > strides["start"]).all()
+
+        per_wb = ground_truth_per_wb_dmos(recording)
+        assert {"duration_s", "cadence_spm", "stride_duration_s_cv", "measurement_date"} <= set(per_wb.columns)
+
+    @pytest.mark.parametrize("name", ["gsd.HickeyGSD", "icd.McCamleyIC", "sl.WeinbergSL", "wba.WbAssembly"])
+    def test_run_benchmark(self, recording, name):
+        result = run_benchmark(name, recording, "test", repeats=2).to_dict()
+        assert result["error"] is None
+        assert len(result["times_s"]) == 2
+        assert result["min_s"] <= result["median_s"]
+
+    def test_errors_are_recorded(self, recording, monkeypatch):
+        def broken(_):
+            raise RuntimeError("broken benchmark")
+
+        monkeypatch.setitem(BENCHMARKS, "broken", broken)
+        result = run_benchmark("broken", recording, "test", repeats=1).to_dict()
+        assert "broken benchmark" in result["error"]
+        assert result["min_s"] is None
+
+    def test_select(self):
+        assert select_benchmarks(None) == list(BENCHMARKS)
+        assert select_benchmarks([r"^gsd\.", "WeinbergSL"]) == [
+            *[name for name in BENCHMARKS if name.startswith("gsd.")],
+            "sl.WeinbergSL",
+        ]
+
+    def test_run_suite_and_save(self, tmp_path):
+        results = run_suite(["tiny"], ["HickeyGSD"], repeats=1, days_override={"tiny": 0.005})
+        save_results(results, tmp_path / "results.json")
+
+        content = json.loads((tmp_path / "results.json").read_text())
+        assert content["recordings"]["tiny"]["n_samples"] == 43200
+        loaded = load_results(tmp_path / "results.json")
+        assert list(loaded.index) == [("gsd.HickeyGSD", "tiny")]
+
+        with pytest.raises(ValueError):
+            run_suite(["unknown"])
+
+
+def _results(times, errors=None):
+    errors = errors or {}
+    return pd.DataFrame(
+        {"min_s": list(times.values()), "error": [errors.get(k) for k in times]},
+        index=pd.MultiIndex.from_tuples([(k, "1h") for k in times], names=["benchmark", "size"]),
+    )
+
+
+class TestCompare:
+    def test_classification(self):
+        baseline = _results({"slower": 1.0, "faster": 1.0, "same": 1.0, "tiny": 0.0001, "broken": 1.0, "old": 1.0})
+        candidate = _results(
+            {"slower": 1.2, "faster": 0.5, "same": 1.05, "tiny": 0.0009, "broken": None, "new": 1.0},
+            errors={"broken": "RuntimeError"},
+        )
+        status = compare_results(baseline, candidate, threshold=0.1)["status"].droplevel("size")
+        assert status.to_dict() == {
+            "broken": "error",
+            "faster": "improvement",
+            "new": "missing",
+            "old": "missing",
+            "same": "unchanged",
+            "slower": "regression",
+            "tiny": "unchanged",
+        }
+
+    def test_cli_exit_code(self, tmp_path, capsys):
+        def write(path, min_s):
+            result = {"benchmark": "gsd.HickeyGSD", "size": "1h", "n_samples": 1, "min_s": min_s, "error": None}
+            save_results({"format_version": 1, "results": [result]}, path)
+
+        write(tmp_path / "base.json", 1.0)
+        write(tmp_path / "same.json", 1.02)
+        write(tmp_path / "slow.json", 2.0)
+
+        assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "same.json")]) == 0
+        assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "slow.json")]) == 1
+        assert "gsd.HickeyGSD [1h]: regression" in capsys.readouterr().out
+        assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "slow.json"), "--threshold", "1.5"]) == 0
@@ -0,0 +1,173 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+MODULE_NAME = "multigait.data_loader.cwa_data_loader"
+N_SAMPLES = 50
+
+
+class FakeCwaReader:
+    """Replacement for ``cwa_reader_rs`` that records which files are read."""
+
+    def __init__(self):
+        self.header_calls = []
+        self.decode_calls = []
+
+    def read_header(self, path):
+        self.header_calls.append(path)
+        return {"hardware_type": "AX6", "sample_rate_hz": 100.0}
+
+    def read_cwa_file(self, path, **kwargs):
+        self.decode_calls.append(path)
+        return {
+            "timestamp": np.arange(N_SAMPLES, dtype="int64") * 10_000,
+            # The values identify the file
+            "acc_x": np.full(N_SAMPLES, float(ord(Path(path).name[0]))),
+            "acc_y": np.zeros(N_SAMPLES),
+            "acc_z": np.ones(N_SAMPLES),
+        }
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    fake = FakeCwaReader()
+    fake_module = types.ModuleType("cwa_reader_rs")
+    fake_module.read_header = fake.read_header
+    fake_module.read_cwa_file = fake.read_cwa_file
+    monkeypatch.setitem(sys.modules, "cwa_reader_rs", fake_module)
+    # The loader binds the reader functions on import, so it is imported again with the fake module
+    previous_module = sys.modules.pop(MODULE_NAME, None)
+    fake.module = importlib.import_module(MODULE_NAME)
+    yield fake
+    if previous_module is None:
+        sys.modules.pop(MODULE_NAME, None)
+    else:
+        sys.modules[MODULE_NAME] = previous_module
+
+
+def _create_files(base_folder, files):
+    for name in files:
+        path = base_folder / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Header of 1024 bytes followed by 3 data blocks of 512 bytes
+        path.write_bytes(b"\0" * (1024 + 3 * 512))
+
+
+@pytest.fixture
+def dataset_folder(tmp_path):
+    _create_files(tmp_path, ["P01/P01_wrist.cwa", "P01/P01_lb.cwa", "P02/P02_lowback.cwa"])
+    return tmp_path
+
+
+class TestCWADataset:
+    def test_creation_reads_no_file(self, reader, dataset_folder):
+        reader.module.CWADataset(dataset_folder)
+
+        assert reader.header_calls == []
+        assert reader.decode_calls == []
+
+    def test_index_reads_headers_only(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+
+        index = dataset.index
+
+        assert len(reader.header_calls) == 3
+        assert reader.decode_calls == []
+        assert set(index.index) == {("P01", "Wrist"), ("P01", "LowerBack"), ("P02", "LowerBack")}
+        entry = index.loc[("P01", "Wrist")]
+        assert entry["file_path"] == dataset_folder / "P01" / "P01_wrist.cwa"
+        assert entry["hardware_type"] == "AX6"
+        assert entry["sampling_rate_hz"] == 100.0
+        assert entry["n_data_blocks"] == 3
+        # The index is built once
+        dataset.index
+        assert len(reader.header_calls) == 3
+
+    def test_metadata_from_index(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+
+        assert dataset.get_sampling_rate("P01", "Wrist") == 100.0
+        assert dataset.get_hardware_type("P02") == "AX6"
+        assert reader.decode_calls == []
+
+    def test_get_sensor_data_decodes_only_requested_file(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+
+        df = dataset.get_sensor_data("P01", "Wrist")
+
+        assert reader.decode_calls == [str(dataset_folder / "P01" / "P01_wrist.cwa")]
+        assert len(df) == N_SAMPLES
+        assert list(df.columns) == ["time", "acc_x", "acc_y", "acc_z"]
+        assert df["time"].dtype == "datetime64[ns]"
+        assert df["time"].iloc[1] - df["time"].iloc[0] == pd.Timedelta(milliseconds=10)
+
+    def test_second_call_served_from_cache(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+
+        first = dataset.get_sensor_data("P01", "Wrist")
+        second = dataset.get_sensor_data("P01", "Wrist")
+
+        assert len(reader.decode_calls) == 1
+        assert second is not first
+        assert np.shares_memory(second["acc_x"].to_numpy(), first["acc_x"].to_numpy())
+
+    def test_mutating_result_does_not_change_cache(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+        expected = dataset.get_sensor_data("P01", "Wrist").copy()
+
+        df = dataset.get_sensor_data("P01", "Wrist")
+        df["acc_norm"] = np.sqrt(df["acc_x"] ** 2 + df["acc_y"] ** 2 + df["acc_z"] ** 2)
+        df.rename(columns={"acc_x": "x"}, inplace=True)
+        df.drop(columns="acc_y", inplace=True)
+        df["acc_z"] *= 2
+
+        df = dataset.get_sensor_data("P01", "Wrist")
+        # The values are shared with the cache, so they can not be changed in place
+        with pytest.raises(ValueError, match="read-only"):
+            df.loc[0, "acc_x"] = 10.0
+        with pytest.raises(ValueError, match="read-only"):
+            df.iloc[1:3, 3] = 0.0
+        # A copy of the result can be modified
+        modified = df.copy()
+        modified.loc[0, "acc_x"] = 10.0
+
+        pd.testing.assert_frame_equal(dataset.get_sensor_data("P01", "Wrist"), expected)
+        assert len(reader.decode_calls) == 1
+
+    def test_disabled_cache_decodes_again(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder, max_cache_memory_mb=0)
+
+        dataset.get_sensor_data("P01", "Wrist")
+        dataset.get_sensor_data("P01", "Wrist")
+
+        assert len(reader.decode_calls) == 2
+
+    def test_missing_participant_or_sensor(self, reader, dataset_folder):
+        dataset = reader.module.CWADataset(dataset_folder)
+
+        with pytest.warns(UserWarning, match="No data found"):
+            assert dataset.get_sensor_data("P03") is None
+        with pytest.warns(UserWarning, match="not available"):
+            assert dataset.get_sensor_data("P02", "Wrist") is None
+        assert reader.decode_calls == []
+
+    def test_same_file_and_default_sensor_as_load(self, reader, tmp_path):
+        # Two files map to the wrist position, the wrist file that is first in sorted order comes before the
+        # lower back file
+        _create_files(tmp_path, ["P01/a_wrist.cwa", "P01/b_lb.cwa", "P01/c_wrist.cwa"])
+        dataset = reader.module.CWADataset(tmp_path)
+
+        loaded = dataset.load()["P01"]
+        assert list(loaded) == ["Wrist", "LowerBack"]
+        assert list(dataset.index.loc["P01"].index) == ["Wrist", "LowerBack"]
+        assert dataset.index.loc[("P01", "Wrist"), "file_path"] == tmp_path / "P01" / "c_wrist.cwa"
+
+        reader.decode_calls.clear()
+        default = dataset.get_sensor_data("P01")
+        assert reader.decode_calls == [str(tmp_path / "P01" / "c_wrist.cwa")]
+        pd.testing.assert_frame_equal(default, loaded["Wrist"]["data"])
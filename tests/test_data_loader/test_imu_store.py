@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.data_loader.imu_store import ImuStore
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "P01_wrist.cwa"
+    path.write_bytes(b"raw sensor file")
+    return path
+
+
+@pytest.fixture
+def decoded():
+    rng = np.random.default_rng(0)
+    time_ns = (np.arange(1000) * 10_000_000 + 1_700_000_000_000_000_000).astype("int64")
+    signals = rng.normal(size=(1000, 3))
+    return time_ns, signals
+
+
+def _write(store_folder, source_file, decoded):
+    time_ns, signals = decoded
+    return ImuStore.write(
+        store_folder,
+        time_ns=time_ns,
+        signals=signals,
+        channels=["acc_x", "acc_y", "acc_z"],
+        header={"hardware_type": "AX3", "sample_rate_hz": 100.0},
+        source_file=source_file,
+    )
+
+
+class TestImuStore:
+    def test_roundtrip(self, tmp_path, source_file, decoded):
+        _write(tmp_path / "store", source_file, decoded)
+        store = ImuStore.open(tmp_path / "store", source_file)
+
+        assert store is not None
+        assert store.header == {"hardware_type": "AX3", "sample_rate_hz": 100.0}
+        assert store.n_samples == 1000
+        assert isinstance(store.signals, np.memmap)
+        assert store.signals.dtype == np.float32
+
+        df = store.to_dataframe()
+        assert list(df.columns) == ["time", "acc_x", "acc_y", "acc_z"]
+        np.testing.assert_array_equal(df["time"].to_numpy().view("int64"), decoded[0])
+        np.testing.assert_array_equal(df[["acc_x", "acc_y", "acc_z"]].to_numpy(), decoded[1].astype(np.float32))
+
+    def test_missing_store(self, tmp_path, source_file):
+        assert ImuStore.open(tmp_path / "store", source_file) is None
+
+    def test_invalidated_by_source_change(self, tmp_path, source_file, decoded):
+        _write(tmp_path / "store", source_file, decoded)
+
+        # Same size, but different modification time
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert ImuStore.open(tmp_path / "store", source_file) is None
+
+        # Rewriting the store makes it valid again
+        _write(tmp_path / "store", source_file, decoded)
+        assert ImuStore.open(tmp_path / "store", source_file) is not None
+
+        # Different size
+        source_file.write_bytes(b"raw sensor file with more data")
+        assert ImuStore.open(tmp_path / "store", source_file) is None
+
+    def test_invalid_shape(self, tmp_path, source_file, decoded):
+        with pytest.raises(ValueError):
+            ImuStore.write(
+                tmp_path / "store",
+                time_ns=decoded[0],
+                signals=decoded[1],
+                channels=["acc_x", "acc_y"],
+                header={},
+                source_file=source_file,
+            )
+        assert not (tmp_path / "store").exists()
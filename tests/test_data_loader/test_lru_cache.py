@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from multigait.data_loader.lru_cache import MemoryBoundedLRUCache
+
+MB = 1024**2
+
+
+def _array_mb(n_mb):
+    return np.zeros(int(n_mb * MB), dtype=np.uint8)
+
+
+class TestMemoryBoundedLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = MemoryBoundedLRUCache(max_memory_mb=3)
+        cache.put("a", _array_mb(1))
+        cache.put("b", _array_mb(1))
+        cache.put("c", _array_mb(1))
+        # Accessing "a" makes "b" the least recently used entry
+        cache.get("a")
+        cache.put("d", _array_mb(1))
+
+        assert "b" not in cache
+        assert all(k in cache for k in ["a", "c", "d"])
+        assert cache.current_bytes == 3 * MB
+
+    def test_entry_larger_than_budget_is_not_cached(self):
+        cache = MemoryBoundedLRUCache(max_memory_mb=1)
+        cache.put("a", _array_mb(0.5))
+        cache.put("big", _array_mb(2))
+
+        assert "big" not in cache
+        assert "a" in cache
+
+    def test_get_or_compute(self):
+        cache = MemoryBoundedLRUCache(max_memory_mb=1)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return pd.DataFrame({"x": np.arange(10.0)})
+
+        first = cache.get_or_compute("a", compute)
+        second = cache.get_or_compute("a", compute)
+
+        assert first is second
+        assert len(calls) == 1
+        assert cache.current_bytes == first.memory_usage(deep=True).sum()
+
+    def test_replace_and_pop(self):
+        cache = MemoryBoundedLRUCache(max_memory_mb=2)
+        cache.put("a", _array_mb(1))
+        cache.put("a", _array_mb(0.5))
+        assert cache.current_bytes == 0.5 * MB
+
+        cache.pop("a")
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
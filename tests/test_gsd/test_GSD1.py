@@ -1,7 +1,12 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_equal
+from scipy.signal import hilbert
 from multigait.GSD.GSD1 import IonescuGSD
+from multigait.GSD.utils.GSD1_utils import active_regions_from_hilbert_envelop, step_stats_per_gait_sequence
 from multigait.utils.data_loader import load_imu_data_wrist
 
 
@@ -38,3 +43,66 @@ class TestIonescuGSD:
 
         # Optional: check that at least one gait sequence was detected
         assert len(gs_list) >= 1
+
+
+def _reference_active_regions(sig, smooth_window, duration):
+    """The original sample by sample implementation of the adaptive envelope threshold."""
+    env = np.convolve(np.abs(hilbert(sig)), np.ones(smooth_window) / smooth_window, "same")
+    active = np.zeros(len(env))
+    env -= np.mean(env)
+    if np.all(env == 0):
+        return active.astype(bool)
+    env /= np.max(env)
+    threshold_sig = 4 * np.nanmean(env)
+    noise = np.mean(env) / 3
+    threshold = np.mean(env)
+    update_threshold = False
+    noise_buff = np.zeros(len(env) - duration + 1)
+    if np.isnan(threshold_sig):
+        return active.astype(bool)
+    maxenv = max(env)
+    for i in range(len(env) - duration + 1):
+        window = env[i : i + duration]
+        mean_win = np.mean(window)
+        if (window > threshold_sig).all():
+            active[i] = maxenv
+            threshold = 0.1 * mean_win
+            update_threshold = True
+        elif mean_win < threshold_sig:
+            noise = mean_win
+        elif noise_buff.any():
+            noise = np.mean(noise_buff)
+        noise_buff[i] = noise
+        if update_threshold:
+            threshold_sig = noise + 0.50 * (abs(threshold - noise))
+    return active.astype(bool)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("window", [1, 5, 40])
+def test_active_regions_equal_to_reference(seed, window):
+    rng = np.random.default_rng(seed)
+    # Random walks with bursts of oscillations
+    sig = np.cumsum(rng.normal(size=3000)) * 0.1 + np.sin(np.arange(3000) / 3) * (rng.random(3000) > 0.5)
+
+    assert_array_equal(
+        active_regions_from_hilbert_envelop(sig, window, window), _reference_active_regions(sig, window, window)
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_step_stats_equal_to_reference(seed):
+    rng = np.random.default_rng(seed)
+    steps = np.unique(rng.integers(0, 5000, 400))
+    gait_sequences = np.sort(rng.integers(0, 5000, (60, 2)), axis=1)
+    # Gait sequences starting or ending exactly at a step
+    gait_sequences[:10, 0] = steps[:10]
+    gait_sequences[10:20, 1] = steps[-10:]
+
+    n_steps, mean_step_times = step_stats_per_gait_sequence(steps, gait_sequences)
+
+    steps_per_gs = [[x for x in steps if gs[0] <= x <= gs[1]] for gs in gait_sequences]
+    assert_array_equal(n_steps, [len(s) for s in steps_per_gs])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        assert_array_equal(mean_step_times, [np.mean(np.diff(s)) for s in steps_per_gs])
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 import pytest
-from multigait.GSD.GSD2 import HickeyGSD  # Adjust import path
+from multigait.GSD.GSD2 import HickeyGSD, _merge_active_windows, _window_mean, _window_std
 from multigait.utils.data_loader import load_imu_data_wrist
 
 
@@ -42,3 +42,44 @@ class TestHickeyGSD:
 
         # Optional: check that at least one gait sequence was detected
         assert len(gs_list) >= 1 or gs_list.empty
+
+
+class TestHickeyGSDHelpers:
+    """Compare the vectorised helpers with straightforward loop implementations."""
+
+    @pytest.mark.parametrize("window_size", [3, 10])
+    def test_window_stats(self, window_size):
+        rng = np.random.default_rng(0)
+        signal = rng.normal(size=1003)
+        win_num = len(signal) // window_size
+        expected_std = [np.std(signal[i * window_size : (i + 1) * window_size]) for i in range(win_num)]
+        expected_mean = [np.mean(signal[i * window_size : (i + 1) * window_size]) for i in range(win_num)]
+
+        np.testing.assert_array_equal(_window_std(signal, window_size), expected_std)
+        np.testing.assert_array_equal(_window_mean(pd.Series(signal), window_size), expected_mean)
+        np.testing.assert_array_equal(_window_mean(pd.DataFrame({"a": signal}), window_size), expected_mean)
+
+    def test_window_mean_float_index(self):
+        """With a float index (after resampling), the windows are label based and include both ends."""
+        rng = np.random.default_rng(1)
+        signal = pd.Series(rng.normal(size=200), index=np.arange(200) * 0.5)
+        expected = [signal[i * 10 : (i + 1) * 10].mean() for i in range(20)]
+
+        np.testing.assert_allclose(_window_mean(signal, 10), expected, rtol=1e-12)
+
+    def test_merge_active_windows(self):
+        active = np.zeros(200)
+        active[10:14] = 1  # 4 windows, merged with the next bout (break of 20 windows)
+        active[34:40] = 1  # 6 windows
+        active[70:73] = 1  # 3 windows, too short on its own
+        active[120:130] = 1  # 10 windows
+        active[140:142] = 1  # merged with the previous bout
+
+        bouts = _merge_active_windows(active, max_break=22.5, min_length=5)
+
+        np.testing.assert_array_equal(bouts, [[10, 40], [120, 142]])
+
+    def test_merge_active_windows_no_bouts(self):
+        active = np.zeros(50)
+        active[0] = 1
+        assert _merge_active_windows(active, max_break=22.5, min_length=5).shape == (0, 2)
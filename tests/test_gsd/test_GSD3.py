@@ -1,7 +1,15 @@
 import numpy as np
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_equal
+from scipy.signal import resample_poly
 from multigait.GSD.GSD3 import KheirkhahanGSD
+from multigait.GSD.utils.ActivityCounts import ActivityCounts
+from multigait.GSD.utils.GSD3_utils import (
+    generate_gs_list,
+    generate_gs_list_from_seconds,
+    resample_to_orginal_data_length,
+)
 from multigait.utils.data_loader import load_imu_data_wrist
 
 
@@ -42,3 +50,59 @@ class TestKheirkhahanGSD:
 
         # Optional: check that at least one gait sequence was detected
         assert len(gs_list) >= 1 or gs_list.empty
+
+
+def _long_norm_signal(sampling_rate_hz, n_repeats=30):
+    """About 20 min of wrist data (the example recording repeated with short rest periods in between)."""
+    wrist = np.linalg.norm(load_imu_data_wrist()[['acc_is', 'acc_ml', 'acc_pa']], axis=1) / 9.81
+    rest = np.random.default_rng(0).normal(1, 0.01, 3000)
+    signal = np.tile(np.concatenate([wrist, rest]), n_repeats)
+    return resample_poly(signal, sampling_rate_hz, 100)
+
+
+class TestActivityCountsBlocks:
+    @pytest.mark.parametrize("sampling_rate_hz", [100, 90, 50])
+    @pytest.mark.parametrize("block_size_s", [120, 10**6])
+    def test_equal_to_calculate(self, sampling_rate_hz, block_size_s):
+        data = _long_norm_signal(sampling_rate_hz)
+        expected = ActivityCounts().calculate(data.copy(), sampling_rate_hz).activity_counts_
+
+        blocks = list(ActivityCounts().iter_calculate(data, sampling_rate_hz, block_size_s=block_size_s, overlap_s=600))
+
+        assert len(blocks) == int(np.ceil(len(expected) / block_size_s))
+        assert_array_equal(np.concatenate(blocks), expected)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            next(ActivityCounts().iter_calculate(np.zeros(1000), 100, block_size_s=0))
+        with pytest.raises(ValueError):
+            next(ActivityCounts().iter_calculate(np.zeros(1000), 100, overlap_s=-1))
+
+
+@pytest.mark.parametrize("n_seconds", [7, 100, 1001])
+@pytest.mark.parametrize("n_samples", [5, 700, 99_997, 100_100])
+def test_gs_list_from_seconds(n_seconds, n_samples):
+    rng = np.random.default_rng(n_seconds + n_samples)
+    walking_seconds = rng.integers(0, 3, n_seconds) * (rng.random(n_seconds) < 0.6)
+
+    expected = generate_gs_list(resample_to_orginal_data_length(walking_seconds, n_samples).astype(bool))
+
+    pd.testing.assert_frame_equal(generate_gs_list_from_seconds(walking_seconds, n_samples), expected)
+
+
+@pytest.mark.parametrize("sampling_rate", [1, 3, 100])
+def test_gs_list_equal_to_split_reference(sampling_rate):
+    detected_walking = np.random.default_rng(sampling_rate).integers(0, 3, 1000)
+
+    # Reference: the original implementation splitting the array at every change of value
+    cuts = np.where(np.diff(detected_walking) != 0)[0] + 1
+    wbs = np.split(detected_walking, cuts)
+    expected = [
+        (int(c / sampling_rate), int((c + len(wb)) / sampling_rate))
+        for c, wb in zip([0] + list(cuts), wbs)
+        if wb[0] == True
+    ]
+
+    result = generate_gs_list(detected_walking, sampling_rate)
+    assert result.index.name == "gs_id"
+    assert result.values.tolist() == [list(wb) for wb in expected]
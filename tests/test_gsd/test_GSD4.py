@@ -1,8 +1,12 @@
 import numpy as np
 import pandas as pd
 import pytest
+from mobgap.data_transform import chain_transformers, GaussianFilter, ButterworthFilter
+from numpy.testing import assert_array_equal
+from benchmarks.synthetic import ACC_COLS, SyntheticRecordingConfig, generate_recording
 from multigait.GSD.GSD4 import MacLeanGSD
-from multigait.utils.data_loader import load_imu_data_wrist
+from multigait.GSD.utils.merge_bouts import merge_bouts, merge_bouts_across_gaps
+from multigait.utils.data_loader import load_imu_data_wrist, load_imu_data_lowback
 
 
 class TestMacLeanGSD:
@@ -48,3 +52,65 @@ class TestMacLeanGSD:
 
         # Optional: check that at least one gait sequence was detected
         assert len(gs_list) >= 1 or gs_list.empty
+
+
+def _reference_gs_list(gsd, data):
+    """The original implementation of the gap and bout checks with one slice per gap and bout (without cwb)."""
+    acc = data[['acc_is', 'acc_ml', 'acc_pa']]
+    filter_chain = [("butter", ButterworthFilter(order=4, cutoff_freq_hz=0.25, filter_type='lowpass'))]
+    magnitude = np.linalg.norm(acc - chain_transformers(acc, filter_chain, sampling_rate_hz=gsd.sampling_rate_hz), axis=1)
+
+    magnitude_thresh = (magnitude > gsd.threshold_binary).astype(int)
+    if magnitude_thresh[0] == 1:
+        magnitude_thresh = np.insert(magnitude_thresh, 0, 0)
+    if magnitude_thresh[-1] == 1:
+        magnitude_thresh = np.append(magnitude_thresh, 0)
+    mtdiff = np.diff(magnitude_thresh)
+    start = np.where(mtdiff == 1)[0] + 1
+    end = np.where(mtdiff == -1)[0] + 1
+
+    filter_chain = [("gaussian_1", GaussianFilter(sigma_s=10 / gsd.sampling_rate_hz))]
+    smoothed_data = np.asarray(chain_transformers(magnitude_thresh.astype(float), filter_chain, sampling_rate_hz=gsd.sampling_rate_hz))
+    gap_sums = np.array([np.sum(smoothed_data[s:e] < gsd.gap_threshold) for s, e in zip(end[:-1], start[1:])])
+    invalid_gaps = gap_sums < gsd.gap_index
+    merged_starts, merged_ends = merge_bouts(start, end, end[:-1][invalid_gaps], start[1:][invalid_gaps])
+
+    filter_chain = [("gaussian_1", GaussianFilter(sigma_s=2 / gsd.sampling_rate_hz))]
+    magnitude_smooth = np.asarray(chain_transformers(magnitude, filter_chain, sampling_rate_hz=gsd.sampling_rate_hz))
+    walk_index_values = np.round((merged_ends - merged_starts) * gsd.walk_index).astype(int)
+    valid = [
+        i for i in range(len(merged_starts))
+        if np.sum(magnitude_smooth[merged_starts[i]:merged_ends[i]] > gsd.walk_threshold) < walk_index_values[i]
+    ]
+    bouts = np.column_stack([merged_starts[valid], merged_ends[valid]])
+    bouts = bouts[bouts[:, 1] - bouts[:, 0] > 2 * gsd.sampling_rate_hz]
+    return np.clip(bouts, 0, len(data))
+
+
+@pytest.mark.parametrize(
+    "version", ["original_lowback", "improved_lowback", "adaptive_lowback", "original_personalised_lowback", "wrist"]
+)
+@pytest.mark.parametrize("data", ["synthetic", "lowback", "wrist"])
+def test_equal_to_reference_implementation(version, data):
+    data = {
+        # Half an hour with many candidate bouts and gaps
+        "synthetic": lambda: generate_recording(SyntheticRecordingConfig(days=0.02)).data[ACC_COLS],
+        "lowback": load_imu_data_lowback,
+        "wrist": load_imu_data_wrist,
+    }[data]()
+    gsd = MacLeanGSD(version=version, cwb=False).detect(data)
+
+    assert_array_equal(gsd.gs_list_[["start", "end"]].to_numpy(), _reference_gs_list(gsd, data).reshape(-1, 2))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_bouts_across_gaps(seed):
+    rng = np.random.default_rng(seed)
+    edges = np.cumsum(rng.integers(1, 50, 400))
+    starts, ends = edges[::2], edges[1::2]
+    merge_gap = rng.random(len(starts) - 1) < 0.5
+
+    result = merge_bouts_across_gaps(starts, ends, merge_gap)
+    expected = merge_bouts(starts, ends, ends[:-1][merge_gap], starts[1:][merge_gap])
+    for r, e in zip(result, expected):
+        assert_array_equal(r, e)
@@ -1,7 +1,15 @@
 import numpy as np
 import pandas as pd
 import pytest
-from multigait.GSD.GSD5 import KerenGSD  # adjust import path
+from numpy.testing import assert_array_equal
+from multigait.GSD.GSD5 import (  # adjust import path
+    KerenGSD,
+    _dominant_frequency_single,
+    _regularity_single,
+    autocorrelation_regularity,
+    dominant_frequencies,
+)
+from multigait.utils.array import create_sliding_windows
 from multigait.utils.data_loader import load_imu_data_wrist
 
 
@@ -44,3 +52,60 @@ class TestKerenGSD:
         assert "start" in gs_list.columns and "end" in gs_list.columns
         # At least one walking bout may be detected, or empty if data has no gait
         assert len(gs_list) >= 0
+
+    def test_float_sampling_rate(self):
+        """Window sizes are cast to samples, so float sampling rates behave like the equivalent int."""
+        imu_data = load_imu_data_wrist()
+        expected = KerenGSD().detect(imu_data, sampling_rate_hz=100).gs_list_
+        gs_list = KerenGSD().detect(imu_data, sampling_rate_hz=100.0).gs_list_
+
+        pd.testing.assert_frame_equal(gs_list, expected)
+
+
+def _windows(signal, sampling_rate_hz):
+    return create_sliding_windows(signal, int(6 * sampling_rate_hz), int(5 * sampling_rate_hz))
+
+
+def _wrist_norm():
+    imu_data = load_imu_data_wrist()
+    norm = np.linalg.norm(imu_data[["acc_is", "acc_ml", "acc_pa"]].to_numpy(), axis=1)
+    return norm - norm.mean()
+
+
+class TestKerenGSDBatchedChecks:
+    """The batched checks must reproduce the per-window SciPy calls exactly."""
+
+    @pytest.mark.parametrize("sampling_rate_hz", [100, 128])
+    @pytest.mark.parametrize("source", ["wrist", "noise", "quantised", "with_rest"])
+    def test_matches_per_window_implementation(self, source, sampling_rate_hz):
+        rng = np.random.default_rng(1)
+        if source == "wrist":
+            signal = np.tile(_wrist_norm(), 3)
+        elif source == "noise":
+            signal = rng.normal(size=20000)
+        elif source == "quantised":
+            # Creates plateaus in the autocorrelation
+            signal = np.round(rng.normal(size=20000) * 3)
+        else:
+            t = np.arange(30000) / sampling_rate_hz
+            signal = np.sin(2 * np.pi * 1.8 * t) + 0.5 * np.sin(2 * np.pi * 0.9 * t) + 0.3 * rng.normal(size=t.size)
+            signal[5000:10000] = 0
+            signal[15000:20000] = 1e-3
+        windows = _windows(signal, sampling_rate_hz)
+
+        expected_freq = np.array([_dominant_frequency_single(w, sampling_rate_hz) for w in windows])
+        expected_regularity = np.array([_regularity_single(w, 0.15) for w in windows])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            assert_array_equal(dominant_frequencies(windows, sampling_rate_hz), expected_freq)
+            assert_array_equal(autocorrelation_regularity(windows, threshold=0.15), expected_regularity)
+
+    def test_zero_windows(self):
+        windows = np.zeros((3, 600))
+        assert_array_equal(autocorrelation_regularity(windows), [0, 0, 0])
+        assert_array_equal(dominant_frequencies(windows, 100), [0, 0, 0])
+
+    def test_empty(self):
+        windows = np.empty((0, 600))
+        assert len(autocorrelation_regularity(windows)) == 0
+        assert len(dominant_frequencies(windows, 100)) == 0
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import multigait.GSD.cascade_gsd as cascade_gsd
+from multigait.GSD.GSD1 import IonescuGSD
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.GSD.GSD4 import MacLeanGSD
+from multigait.GSD.cascade_gsd import CascadeGSD, prescreen_active_regions
+from multigait.utils.data_loader import load_imu_data_wrist
+
+COLUMNS = ["acc_is", "acc_ml", "acc_pa"]
+
+
+@pytest.fixture(scope="module")
+def sparse_wrist_data():
+    """Example walking data repeated with long resting periods of random length in between."""
+    wrist_data = load_imu_data_wrist()[COLUMNS]
+    rng = np.random.default_rng(2)
+    parts = []
+    for _ in range(5):
+        rest = np.tile([[0.0, -9.81, 0.0]], (int(rng.integers(6000, 20000)), 1)) + rng.normal(0, 0.02, (1, 3))
+        parts.append(pd.DataFrame(rest + rng.normal(0, 0.01, rest.shape), columns=COLUMNS))
+        parts.append(wrist_data)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _resting_data(n_samples):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(np.tile([[9.81, 0.0, 0.0]], (n_samples, 1)) + rng.normal(0, 0.01, (n_samples, 3)), columns=COLUMNS)
+
+
+class TestPrescreenActiveRegions:
+    def test_resting_data_is_inactive(self):
+        assert prescreen_active_regions(_resting_data(5000), sampling_rate_hz=100).shape == (0, 2)
+
+    def test_movement_marks_windows(self):
+        data = _resting_data(5050)
+        data.iloc[1230:1420, 0] += np.sin(np.arange(190) / 3) * 5
+        # NaN values can not be judged as inactive
+        data.iloc[3000, 1] = np.nan
+
+        regions = prescreen_active_regions(data, sampling_rate_hz=100)
+
+        np.testing.assert_array_equal(regions, [[1200, 1500], [3000, 3100]])
+
+    @pytest.mark.parametrize(("n_samples", "last_window_start"), [(4999, 4900), (4955, 4900), (5005, 5000)])
+    def test_short_last_window(self, n_samples, last_window_start):
+        data = _resting_data(n_samples)
+        data.iloc[-5:, 0] += 5
+        np.testing.assert_array_equal(
+            prescreen_active_regions(data, sampling_rate_hz=100), [[last_window_start, n_samples]]
+        )
+
+    def test_independent_of_block_size(self, sparse_wrist_data, monkeypatch):
+        expected = prescreen_active_regions(sparse_wrist_data, sampling_rate_hz=100)
+        monkeypatch.setattr(cascade_gsd, "_PRESCREEN_BLOCK_WINDOWS", 7)
+
+        np.testing.assert_array_equal(prescreen_active_regions(sparse_wrist_data, sampling_rate_hz=100), expected)
+
+
+class TestCascadeGSD:
+    @pytest.mark.parametrize(
+        "detector", [HickeyGSD(), IonescuGSD(), MacLeanGSD()], ids=["hickey", "ionescu", "maclean"]
+    )
+    def test_identical_to_full_run(self, sparse_wrist_data, detector):
+        full = detector.clone().detect(sparse_wrist_data).gs_list_
+        cascade = CascadeGSD(detector, padding_s=10, min_gap_s=30).detect(sparse_wrist_data)
+
+        assert len(full) > 0
+        assert len(cascade.candidate_regions_) == 5
+        assert 0.5 < cascade.skipped_fraction_ < 1
+        pd.testing.assert_frame_equal(full, cascade.gs_list_)
+
+    def test_min_gap_merges_regions(self, sparse_wrist_data):
+        cascade = CascadeGSD(HickeyGSD(), min_gap_s=300).detect(sparse_wrist_data)
+
+        assert len(cascade.candidate_regions_) < 5
+        regions = cascade.candidate_regions_.to_numpy()
+        assert (regions[1:, 0] - regions[:-1, 1] >= 300 * 100).all()
+
+    def test_no_activity(self):
+        cascade = CascadeGSD(HickeyGSD()).detect(_resting_data(20000))
+
+        assert cascade.skipped_fraction_ == 1
+        assert cascade.candidate_regions_.empty
+        assert list(cascade.gs_list_.columns) == ["start", "end"]
+        assert cascade.gs_list_.index.name == "gs_id"
+        assert cascade.gs_list_.empty
+
+    def test_invalid_padding(self):
+        with pytest.raises(ValueError):
+            CascadeGSD(HickeyGSD(), padding_s=-1).detect(_resting_data(1000))
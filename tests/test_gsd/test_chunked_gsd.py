@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import ACC_COLS, SyntheticRecordingConfig, generate_recording
+from multigait.GSD.GSD1 import IonescuGSD
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.GSD.GSD3 import KheirkhahanGSD
+from multigait.GSD.GSD4 import MacLeanGSD
+from multigait.GSD.GSD5 import KerenGSD
+from multigait.GSD.chunked_gsd import ChunkedGSD, iter_overlapping_blocks
+from multigait.utils.array import intersect_intervals
+from multigait.utils.data_loader import load_imu_data_wrist
+
+
+@pytest.fixture(scope="module")
+def long_wrist_data():
+    """Example walking data repeated with resting periods of random length in between."""
+    wrist_data = load_imu_data_wrist()
+    rng = np.random.default_rng(1)
+    parts = []
+    for _ in range(8):
+        parts.append(wrist_data)
+        rest = np.tile([[0.0, -9.81, 0.0]], (int(rng.integers(300, 2000)), 1)) + rng.normal(0, 0.02, (1, 3))
+        parts.append(pd.DataFrame(rest, columns=wrist_data.columns))
+    return pd.concat(parts, ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def synthetic_data():
+    """One hour of synthetic free-living wrist data."""
+    return generate_recording(SyntheticRecordingConfig(days=1 / 24)).data[ACC_COLS]
+
+
+def _overlap_fractions(reference, candidate):
+    """Fractions of the GS samples of the reference and of the candidate that are within GSs of the other."""
+    reference = reference[["start", "end"]].to_numpy(dtype="int64")
+    candidate = candidate[["start", "end"]].to_numpy(dtype="int64")
+    overlap = intersect_intervals(reference, candidate)
+    n_overlap = (overlap[:, 1] - overlap[:, 0]).sum()
+    return n_overlap / (reference[:, 1] - reference[:, 0]).sum(), n_overlap / (candidate[:, 1] - candidate[:, 0]).sum()
+
+
+class TestIterOverlappingBlocks:
+    def test_cores_cover_recording(self):
+        data = pd.DataFrame({"a": np.arange(1050)})
+        blocks = list(iter_overlapping_blocks(data, block_size=200, overlap=30))
+
+        assert len(blocks) == 6
+        assert blocks[0].core_start == 0
+        assert blocks[-1].core_end == 1050
+        for prev, curr in zip(blocks, blocks[1:]):
+            assert prev.core_end == curr.core_start
+        for block in blocks:
+            assert block.data["a"].iloc[0] == block.start
+            assert block.start == max(block.core_start - 30, 0)
+            assert block.start + len(block.data) == min(block.core_end + 30, 1050)
+
+    def test_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            list(iter_overlapping_blocks(pd.DataFrame({"a": [1, 2]}), block_size=0, overlap=0))
+
+
+class TestChunkedGSD:
+    @pytest.mark.parametrize("detector", [HickeyGSD(), MacLeanGSD()], ids=["hickey", "maclean"])
+    @pytest.mark.parametrize(("block_size_s", "overlap_s"), [(60, 20), (100, 30)])
+    def test_identical_to_full_run(self, long_wrist_data, detector, block_size_s, overlap_s):
+        full = detector.clone().detect(long_wrist_data).gs_list_
+        chunked = ChunkedGSD(detector, block_size_s=block_size_s, overlap_s=overlap_s).detect(long_wrist_data)
+
+        assert chunked.n_blocks_ > 1
+        pd.testing.assert_frame_equal(full, chunked.gs_list_)
+
+    def test_adaptive_detector_close_to_full_run(self, long_wrist_data):
+        full = IonescuGSD().detect(long_wrist_data).gs_list_
+        chunked = ChunkedGSD(IonescuGSD(), block_size_s=60, overlap_s=30).detect(long_wrist_data).gs_list_
+
+        assert len(full) == len(chunked)
+        np.testing.assert_allclose(full.to_numpy(), chunked.to_numpy(), atol=10)
+
+    @pytest.mark.parametrize("detector", [KerenGSD(), KheirkhahanGSD()], ids=["keren", "kheirkhahan"])
+    def test_close_to_full_run_on_synthetic_data(self, synthetic_data, detector):
+        # KerenGSD removes the mean per block and KheirkhahanGSD resamples each block, so small differences are
+        # expected (e.g. short additional GSs of KerenGSD)
+        full = detector.clone().detect(synthetic_data, sampling_rate_hz=100).gs_list_
+        chunked = ChunkedGSD(detector, block_size_s=600, overlap_s=60).detect(synthetic_data, sampling_rate_hz=100)
+        recall, precision = _overlap_fractions(full, chunked.gs_list_)
+
+        assert chunked.n_blocks_ == 6
+        assert len(full) > 5
+        assert abs(len(full) - len(chunked.gs_list_)) <= 2
+        assert recall > 0.95
+        assert precision > 0.95
+
+    def test_no_gait(self):
+        data = pd.DataFrame(np.zeros((20000, 3)), columns=["acc_is", "acc_ml", "acc_pa"])
+        gs_list = ChunkedGSD(HickeyGSD(), block_size_s=60, overlap_s=20).detect(data).gs_list_
+
+        assert list(gs_list.columns) == ["start", "end"]
+        assert gs_list.index.name == "gs_id"
+        assert gs_list.empty
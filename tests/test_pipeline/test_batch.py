@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tpcp import Dataset
+
+from multigait.CAD.cad import Cadence
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.ICD.ICD2 import McCamleyIC
+from multigait.SL.SL1 import WeinbergSL
+from multigait.WS.walking_speed import Ws
+from multigait.aggregation._generic_aggregator import GenericAggregator
+from multigait.pipeline.batch import run_batch
+from multigait.pipeline.multimobility_pipeline import MultimobilityPipeline
+from multigait.pipeline.utils._stride_filtering import StrideFiltering
+from multigait.pipeline.utils._thresholds import get_thresholds
+from multigait.pipeline.utils._wb_assembly import WbAssembly
+from multigait.utils.data_loader import load_imu_data_wrist
+
+
+# Defined on module level, so that the dataset can be pickled for the process pool
+class DummyGaitDataset(Dataset):
+    sampling_rate_hz = 100.0
+
+    def create_index(self) -> pd.DataFrame:
+        return pd.DataFrame({"participant_id": ["p1", "p2", "broken"], "day": [1, 2, 1]})
+
+    @property
+    def data_ss(self) -> pd.DataFrame:
+        self.assert_is_single(None, "data_ss")
+        wrist_data = load_imu_data_wrist()
+        rest = pd.DataFrame(np.tile([[0.0, -9.81, 0.0]], (1000, 1)), columns=wrist_data.columns)
+        n_repeats = 2 if self.group_label.participant_id == "p1" else 3
+        return pd.concat([wrist_data, rest] * n_repeats, ignore_index=True)
+
+    @property
+    def participant_metadata(self) -> dict:
+        self.assert_is_single(None, "participant_metadata")
+        if self.group_label.participant_id == "broken":
+            # Missing height, which is required for the thresholds
+            return {}
+        return {"height_m": 1.75}
+
+    @property
+    def recording_metadata(self) -> dict:
+        return {"device": "wrist"}
+
+
+@pytest.fixture
+def pipeline():
+    return MultimobilityPipeline(
+        gait_sequence_detection=HickeyGSD(),
+        initial_contact_detection=McCamleyIC(),
+        cadence_calculation=Cadence(),
+        stride_length_calculation=WeinbergSL(),
+        walking_speed_calculation=Ws(),
+        stride_selection=StrideFiltering(),
+        wba=WbAssembly(),
+        dmo_thresholds=get_thresholds(),
+        dmo_aggregation=GenericAggregator(**GenericAggregator.PredefinedParameters.single_day),
+    )
+
+
+class TestRunBatch:
+    @pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+    def test_results_match_individual_runs(self, pipeline, backend):
+        dataset = DummyGaitDataset()
+        with pytest.warns(UserWarning, match="broken"):
+            result = pipeline.run_batch(dataset, n_jobs=2, backend=backend)
+
+        assert list(result.wall_time_s.index.names) == ["participant_id", "day"]
+        assert len(result.wall_time_s) == 3
+        assert (result.wall_time_s > 0).all()
+
+        assert list(result.errors.index) == [("broken", 1)]
+        assert result.errors["error"].iloc[0].startswith("KeyError")
+
+        for dp in dataset[:2]:
+            single = pipeline.clone().run(dp)
+            key = tuple(dp.group_label)
+            pd.testing.assert_frame_equal(
+                result.per_wb_parameters.loc[key], single.per_wb_parameters_, check_names=False
+            )
+            pd.testing.assert_frame_equal(
+                result.per_stride_parameters.loc[key], single.per_stride_parameters_, check_names=False
+            )
+            pd.testing.assert_frame_equal(
+                result.aggregated_parameters.loc[key], single.aggregated_parameters_, check_names=False
+            )
+
+    def test_invalid_backend(self, pipeline):
+        with pytest.raises(ValueError):
+            run_batch(pipeline, DummyGaitDataset(), backend="gpu")
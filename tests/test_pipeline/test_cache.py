@@ -0,0 +1,201 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.CAD.cad import Cadence
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.ICD.ICD2 import McCamleyIC
+from multigait.SL.SL1 import WeinbergSL
+from multigait.WS.walking_speed import Ws
+from multigait.aggregation._generic_aggregator import GenericAggregator
+from multigait.pipeline.cache import StageCache, combine_keys, hash_algorithm, hash_signal
+from multigait.pipeline.multimobility_pipeline import MultimobilityPipeline
+from multigait.pipeline.utils._stride_filtering import StrideFiltering
+from multigait.pipeline.utils._thresholds import get_thresholds
+from multigait.pipeline.utils._wb_assembly import WbAssembly
+from multigait.utils.data_loader import load_imu_data_wrist
+
+
+@pytest.fixture
+def datapoint():
+    class DummyDataset:
+        participant_metadata = {"height_m": 1.75}
+        recording_metadata = {"device": "wrist"}
+        sampling_rate_hz = 100.0
+        group_label = "test"
+
+        wrist_data = load_imu_data_wrist()
+        rest = pd.DataFrame(np.tile([[0.0, -9.81, 0.0]], (1000, 1)), columns=wrist_data.columns)
+        data_ss = pd.concat([wrist_data, rest] * 2, ignore_index=True)
+
+    return DummyDataset()
+
+
+@pytest.fixture
+def algorithms():
+    return dict(
+        gait_sequence_detection=HickeyGSD(),
+        initial_contact_detection=McCamleyIC(),
+        cadence_calculation=Cadence(),
+        stride_length_calculation=WeinbergSL(),
+        walking_speed_calculation=Ws(),
+        stride_selection=StrideFiltering(),
+        wba=WbAssembly(),
+        dmo_thresholds=get_thresholds(),
+        dmo_aggregation=GenericAggregator(**GenericAggregator.PredefinedParameters.single_day),
+    )
+
+
+def _assert_same_results(a, b):
+    pd.testing.assert_frame_equal(a.gs_list_, b.gs_list_)
+    pd.testing.assert_frame_equal(a.raw_ic_list_, b.raw_ic_list_)
+    pd.testing.assert_frame_equal(a.raw_per_sec_parameters_, b.raw_per_sec_parameters_)
+    pd.testing.assert_frame_equal(a.raw_per_stride_parameters_, b.raw_per_stride_parameters_)
+    pd.testing.assert_frame_equal(a.per_stride_parameters_, b.per_stride_parameters_)
+    pd.testing.assert_frame_equal(a.per_wb_parameters_, b.per_wb_parameters_)
+    pd.testing.assert_frame_equal(a.aggregated_parameters_, b.aggregated_parameters_)
+
+
+class TestStageCache:
+    def test_put_get(self, tmp_path):
+        cache = StageCache(tmp_path / "cache")
+        key = combine_keys("gsd", "abc")
+        assert cache.get(key) is None
+        cache.put(key, {"value": pd.DataFrame({"a": [1, 2]})})
+        pd.testing.assert_frame_equal(cache.get(key)["value"], pd.DataFrame({"a": [1, 2]}))
+
+        assert cache.hits == {"gsd": 1}
+        assert cache.misses == {"gsd": 1}
+        assert cache.stats().loc["gsd", "hit_rate"] == 0.5
+
+    def test_lru_eviction(self, tmp_path):
+        cache = StageCache(tmp_path)
+        payload = {"value": np.zeros(1000)}
+        keys = [combine_keys("gsd", str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, payload)
+            # Make the access order independent of the timestamp resolution of the file system
+            os.utime(cache._path(key), ns=(i * 10**9, i * 10**9))
+        entry_size = cache.size_bytes // 3
+
+        # Accessing the oldest entry makes it the most recently used one
+        assert cache.get(keys[0]) is not None
+        cache.max_size_bytes = 3 * entry_size
+        new_key = combine_keys("gsd", "new")
+        cache.put(new_key, payload)
+
+        assert cache.evictions == 1
+        assert cache.get(keys[1]) is None
+        assert all(cache.get(k) is not None for k in [keys[0], keys[2], new_key])
+        assert cache.size_bytes <= cache.max_size_bytes
+
+    def test_corrupted_entry(self, tmp_path):
+        cache = StageCache(tmp_path)
+        key = combine_keys("gsd", "abc")
+        cache._path(key).write_bytes(b"not a pickle")
+        assert cache.get(key) is None
+        assert not cache._path(key).exists()
+
+    def test_stats_not_copied(self, tmp_path):
+        cache = StageCache(tmp_path, max_size_bytes=100)
+        cache.get(combine_keys("gsd", "abc"))
+        copied = MultimobilityPipeline(
+            **{
+                "gait_sequence_detection": HickeyGSD(),
+                "initial_contact_detection": McCamleyIC(),
+                "cadence_calculation": None,
+                "stride_length_calculation": None,
+                "walking_speed_calculation": None,
+                "stride_selection": StrideFiltering(),
+                "wba": WbAssembly(),
+                "dmo_thresholds": None,
+                "dmo_aggregation": None,
+            },
+            stage_cache=cache,
+        ).clone().stage_cache
+        assert copied.cache_dir == cache.cache_dir
+        assert copied.max_size_bytes == 100
+        assert copied.misses == {}
+
+    def test_clear(self, tmp_path):
+        cache = StageCache(tmp_path)
+        cache.put(combine_keys("gsd", "abc"), {"value": 1})
+        cache.clear()
+        assert cache.size_bytes == 0
+        assert cache.hits == {} and cache.misses == {}
+
+    def test_invalid_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            StageCache(tmp_path, max_size_bytes=-1)
+
+
+class TestHashes:
+    def test_signal_hash(self):
+        data = pd.DataFrame({"acc_is": np.arange(10.0), "acc_ml": np.zeros(10)})
+        reference = hash_signal(data, 100)
+        assert hash_signal(data.copy(), 100) == reference
+        assert hash_signal(data, 50) != reference
+        assert hash_signal(data.assign(acc_is=data.acc_is + 1e-12), 100) != reference
+        assert hash_signal(data.rename(columns={"acc_ml": "acc_pa"}), 100) != reference
+        assert hash_signal(data.set_axis(np.arange(1, 11)), 100) != reference
+
+    def test_algorithm_hash(self):
+        assert hash_algorithm(WeinbergSL()) == hash_algorithm(WeinbergSL())
+        assert hash_algorithm(WeinbergSL()) != hash_algorithm(WeinbergSL(version="lowback"))
+        assert hash_algorithm(None) != hash_algorithm(WeinbergSL())
+
+
+class TestPipelineStageCache:
+    def test_rerun_identical(self, tmp_path, datapoint, algorithms):
+        reference = MultimobilityPipeline(**algorithms).run(datapoint)
+        assert reference.stage_cache_hits_ == {}
+
+        cache = StageCache(tmp_path)
+        first = MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+        assert first.stage_cache_hits_ == {"gsd": False, "per_gs": False}
+        second = MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+        assert second.stage_cache_hits_ == {"gsd": True, "per_gs": True}
+        assert second.gait_sequence_detection_ is None
+        assert second.gs_iterator_ is None
+
+        _assert_same_results(reference, first)
+        _assert_same_results(reference, second)
+        assert cache.hits == {"gsd": 1, "per_gs": 1}
+        assert cache.misses == {"gsd": 1, "per_gs": 1}
+
+    def test_downstream_change_reuses_cache(self, tmp_path, datapoint, algorithms):
+        cache = StageCache(tmp_path)
+        MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+
+        downstream = {**algorithms, "dmo_thresholds": None, "wba": WbAssembly(rules=[])}
+        cached = MultimobilityPipeline(**downstream, stage_cache=cache).run(datapoint)
+        assert cached.stage_cache_hits_ == {"gsd": True, "per_gs": True}
+        _assert_same_results(MultimobilityPipeline(**downstream).run(datapoint), cached)
+
+    def test_upstream_change_invalidates(self, tmp_path, datapoint, algorithms):
+        cache = StageCache(tmp_path)
+        MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+
+        changed_sl = {**algorithms, "stride_length_calculation": WeinbergSL(version="wrist_adaptive")}
+        result = MultimobilityPipeline(**changed_sl, stage_cache=cache).run(datapoint)
+        assert result.stage_cache_hits_ == {"gsd": True, "per_gs": False}
+        _assert_same_results(MultimobilityPipeline(**changed_sl).run(datapoint), result)
+
+        changed_gsd = {**algorithms, "gait_sequence_detection": HickeyGSD(version="improved_lowback")}
+        result = MultimobilityPipeline(**changed_gsd, stage_cache=cache).run(datapoint)
+        assert result.stage_cache_hits_ == {"gsd": False, "per_gs": False}
+
+    def test_metadata_is_part_of_key(self, tmp_path, datapoint, algorithms):
+        cache = StageCache(tmp_path)
+        MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+        datapoint.participant_metadata = {"height_m": 1.60}
+        result = MultimobilityPipeline(**algorithms, stage_cache=cache).run(datapoint)
+        assert result.stage_cache_hits_ == {"gsd": True, "per_gs": False}
+
+    def test_safe_run(self, tmp_path, datapoint, algorithms):
+        cache = StageCache(tmp_path)
+        MultimobilityPipeline(**algorithms, stage_cache=cache).safe_run(datapoint)
+        result = MultimobilityPipeline(**algorithms, stage_cache=cache).safe_run(datapoint)
+        assert result.stage_cache_hits_ == {"gsd": True, "per_gs": True}
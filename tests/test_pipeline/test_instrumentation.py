@@ -0,0 +1,159 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.CAD.cad import Cadence
+from multigait.GSD.GSD2 import HickeyGSD
+from multigait.ICD.ICD2 import McCamleyIC
+from multigait.SL.SL1 import WeinbergSL
+from multigait.WS.walking_speed import Ws
+from multigait.aggregation._generic_aggregator import GenericAggregator
+from multigait.pipeline.instrumentation import (
+    NULL_RECORDER,
+    JsonReportWriter,
+    PerfRecorder,
+    PipelineInstrumentation,
+    time_step,
+)
+from multigait.pipeline.multimobility_pipeline import MultimobilityPipeline
+from multigait.pipeline.utils._stride_filtering import StrideFiltering
+from multigait.pipeline.utils._thresholds import get_thresholds
+from multigait.pipeline.utils._wb_assembly import WbAssembly
+from multigait.utils.data_loader import load_imu_data_wrist
+
+
+@pytest.fixture
+def datapoint():
+    class DummyDataset:
+        participant_metadata = {"height_m": 1.75}
+        recording_metadata = {"device": "wrist"}
+        sampling_rate_hz = 100.0
+        group_label = "test"
+
+        wrist_data = load_imu_data_wrist()
+        rest = pd.DataFrame(np.tile([[0.0, -9.81, 0.0]], (1000, 1)), columns=wrist_data.columns)
+        data_ss = pd.concat([wrist_data, rest] * 2, ignore_index=True)
+
+    return DummyDataset()
+
+
+@pytest.fixture
+def algorithms():
+    return dict(
+        gait_sequence_detection=HickeyGSD(),
+        initial_contact_detection=McCamleyIC(),
+        cadence_calculation=Cadence(),
+        stride_length_calculation=WeinbergSL(),
+        walking_speed_calculation=Ws(),
+        stride_selection=StrideFiltering(),
+        wba=WbAssembly(),
+        dmo_thresholds=get_thresholds(),
+        dmo_aggregation=GenericAggregator(**GenericAggregator.PredefinedParameters.single_day),
+    )
+
+
+EXPECTED_STAGES = [
+    "gsd",
+    "per_gs",
+    "sec_to_stride",
+    "stride_selection",
+    "wba",
+    "per_wb_aggregation",
+    "var_dmos",
+    "alpha",
+    "thresholds",
+    "aggregation",
+    "per_gs.icd",
+    "per_gs.cad",
+    "per_gs.sl",
+    "per_gs.ws",
+]
+
+
+class TestPerfRecorder:
+    def test_stages(self):
+        with PerfRecorder(trace_memory=True) as recorder:
+            with recorder.stage("alloc"):
+                data = np.ones(1_000_000)
+            del data
+            with recorder.stage("nothing"):
+                pass
+            with recorder.stage("nothing"):
+                pass
+        report = recorder.report()
+
+        assert list(report.stages.index) == ["alloc", "nothing"]
+        assert report.stages.loc["alloc", "peak_memory_bytes"] >= 8_000_000
+        assert report.stages.loc["nothing", "peak_memory_bytes"] < 8_000_000
+        assert report.total_wall_time_s >= report.stages.wall_time_s.sum()
+        assert not tracemalloc.is_tracing()
+
+    def test_no_memory_tracing(self):
+        with PerfRecorder(trace_memory=False) as recorder, recorder.stage("a"):
+            pass
+        assert np.isnan(recorder.report().stages.loc["a", "peak_memory_bytes"])
+
+    def test_per_gs_and_counters(self):
+        with PerfRecorder(trace_memory=False) as recorder:
+            recorder.add_per_gs_timings(0, {"icd": (1.0, 0.5), "sl": (2.0, 1.0)})
+            recorder.add_per_gs_timings(1, {"icd": (3.0, 1.5)})
+            recorder.count(n_samples=100)
+        report = recorder.report()
+
+        assert report.per_gs.loc[(1, "icd"), "wall_time_s"] == 3.0
+        assert report.stages.loc["per_gs.icd", "wall_time_s"] == 4.0
+        assert report.stages.loc["per_gs.sl", "cpu_time_s"] == 1.0
+        assert report.counters["samples_per_s"] == 100 / report.total_wall_time_s
+
+    def test_null_recorder(self):
+        with NULL_RECORDER as recorder, recorder.stage("a"):
+            recorder.count(n_samples=1)
+        assert not recorder.enabled
+        timings = {}
+        with time_step(timings, "a"):
+            pass
+        assert set(timings) == {"a"}
+        assert time_step(None, "a") is time_step(None, "b")
+
+
+class TestPipelineInstrumentation:
+    def test_disabled(self, datapoint, algorithms):
+        result = MultimobilityPipeline(**algorithms).run(datapoint)
+        assert result.perf_report_ is None
+
+    @pytest.mark.parametrize("executor", ["serial", "thread"])
+    def test_report(self, datapoint, algorithms, executor):
+        reference = MultimobilityPipeline(**algorithms).run(datapoint)
+        result = MultimobilityPipeline(
+            **algorithms, instrumentation=PipelineInstrumentation(), per_gs_executor=executor
+        ).run(datapoint)
+        report = result.perf_report_
+
+        assert list(report.stages.index) == EXPECTED_STAGES
+        assert (report.stages[["wall_time_s", "cpu_time_s"]] >= 0).all().all()
+        assert report.stages.drop(index=[s for s in EXPECTED_STAGES if s.startswith("per_gs.")]).notna().all().all()
+        assert set(report.per_gs.index.get_level_values("gs_id")) == set(result.gs_list_.index)
+        assert report.counters["n_samples"] == len(datapoint.data_ss)
+        assert report.counters["n_gs"] == len(result.gs_list_)
+        assert report.counters["n_ic"] == len(result.raw_ic_list_)
+        assert report.counters["n_strides"] == len(result.raw_per_stride_parameters_)
+        assert report.counters["n_wbs"] == len(result.per_wb_parameters_)
+        pd.testing.assert_frame_equal(reference.per_wb_parameters_, result.per_wb_parameters_)
+        pd.testing.assert_frame_equal(reference.aggregated_parameters_, result.aggregated_parameters_)
+
+    def test_callbacks(self, tmp_path, datapoint, algorithms):
+        received = []
+        instrumentation = PipelineInstrumentation(
+            trace_memory=False,
+            callbacks=[JsonReportWriter(tmp_path), lambda report, dp: received.append((report, dp))],
+        )
+        result = MultimobilityPipeline(**algorithms, instrumentation=instrumentation).run(datapoint)
+
+        assert received == [(result.perf_report_, datapoint)]
+        written = json.loads((tmp_path / "test.json").read_text())
+        assert written["counters"]["n_gs"] == len(result.gs_list_)
+        assert [s["stage"] for s in written["stages"]] == EXPECTED_STAGES
+        assert written["stages"][0]["peak_memory_bytes"] is None
@@ -11,6 +11,9 @@ from multigait.pipeline.utils._stride_filtering import StrideFiltering
 from multigait.pipeline.utils._wb_assembly import WbAssembly
 from multigait.aggregation._generic_aggregator import GenericAggregator
 from multigait.pipeline.utils._thresholds import get_thresholds
+from multigait.ICD.base_ic import BaseIcDetector
+from multigait.utils.signal_context import GsSignalContext
+import multigait.pipeline.multimobility_pipeline as multimobility_pipeline
 
 # Minimal example GaitDatasetT fixture
 @pytest.fixture
@@ -67,3 +70,94 @@ class TestFullMultimobilityPipeline:
         ]
         for col in expected_cols:
             assert col in result.per_wb_parameters_.columns
+
+
+@pytest.fixture
+def multi_gs_datapoint():
+    from multigait.utils.data_loader import load_imu_data_wrist
+
+    class DummyDataset:
+        participant_metadata = {"height_m": 1.75}
+        recording_metadata = {"device": "wrist"}
+        sampling_rate_hz = 100.0
+        group_label = "test"
+
+        # Repeat the example walking data with resting periods in between to get multiple gait sequences
+        wrist_data = load_imu_data_wrist()
+        rest = pd.DataFrame(np.tile([[0.0, -9.81, 0.0]], (1000, 1)), columns=wrist_data.columns)
+        data_ss = pd.concat([wrist_data, rest] * 4, ignore_index=True)
+
+    return DummyDataset()
+
+
+class TestPerGsExecutor:
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    @pytest.mark.parametrize("chunk_size", [1, 2, 100])
+    def test_parallel_identical_to_serial(self, multi_gs_datapoint, example_pipeline_algorithms, executor, chunk_size):
+        serial = MultimobilityPipeline(**example_pipeline_algorithms).run(multi_gs_datapoint)
+        parallel = MultimobilityPipeline(
+            **example_pipeline_algorithms, per_gs_executor=executor, n_jobs=2, gs_chunk_size=chunk_size
+        ).run(multi_gs_datapoint)
+
+        assert len(serial.gs_list_) > 1
+        pd.testing.assert_frame_equal(serial.raw_ic_list_, parallel.raw_ic_list_)
+        pd.testing.assert_frame_equal(serial.raw_per_sec_parameters_, parallel.raw_per_sec_parameters_)
+        pd.testing.assert_frame_equal(serial.per_stride_parameters_, parallel.per_stride_parameters_)
+        pd.testing.assert_frame_equal(serial.per_wb_parameters_, parallel.per_wb_parameters_)
+
+    def test_invalid_executor(self, multi_gs_datapoint, example_pipeline_algorithms):
+        with pytest.raises(ValueError):
+            MultimobilityPipeline(**example_pipeline_algorithms, per_gs_executor="gpu").run(multi_gs_datapoint)
+
+
+class _ContextUnawareIC(BaseIcDetector):
+    """IC detector with the signature used before the signal context was introduced."""
+
+    def detect(self, data, *, sampling_rate_hz=100):
+        self.ic_list_ = McCamleyIC().detect(data, sampling_rate_hz=sampling_rate_hz).ic_list_
+        return self
+
+
+class TestSignalContext:
+    @staticmethod
+    def _assert_same_results(a, b):
+        pd.testing.assert_frame_equal(a.raw_ic_list_, b.raw_ic_list_)
+        pd.testing.assert_frame_equal(a.raw_per_sec_parameters_, b.raw_per_sec_parameters_)
+        pd.testing.assert_frame_equal(a.per_wb_parameters_, b.per_wb_parameters_)
+
+    def test_norm_calculated_once_per_gs(self, multi_gs_datapoint, example_pipeline_algorithms, monkeypatch):
+        contexts = []
+
+        class RecordingContext(GsSignalContext):
+            def __init__(self, data):
+                super().__init__(data)
+                self.n_norm_requests = 0
+                contexts.append(self)
+
+            def acc_norm(self):
+                self.n_norm_requests += 1
+                return super().acc_norm()
+
+        monkeypatch.setattr(multimobility_pipeline, "GsSignalContext", RecordingContext)
+        result = MultimobilityPipeline(**example_pipeline_algorithms).run(multi_gs_datapoint)
+
+        assert len(contexts) == len(result.gs_list_) > 1
+        for context in contexts:
+            # Used by McCamleyIC (via the resampled norm) and WeinbergSL, but only calculated once
+            assert context.n_norm_requests >= 2
+            assert "acc_norm" in context._cache
+            assert context.n_computations == len(context._cache)
+
+    def test_identical_to_run_without_context(self, multi_gs_datapoint, example_pipeline_algorithms, monkeypatch):
+        with_context = MultimobilityPipeline(**example_pipeline_algorithms).run(multi_gs_datapoint)
+        monkeypatch.setattr(multimobility_pipeline, "_signal_context_kwargs", lambda method, signal_context: {})
+        without_context = MultimobilityPipeline(**example_pipeline_algorithms).run(multi_gs_datapoint)
+
+        self._assert_same_results(with_context, without_context)
+
+    def test_context_unaware_detector(self, multi_gs_datapoint, example_pipeline_algorithms):
+        reference = MultimobilityPipeline(**example_pipeline_algorithms).run(multi_gs_datapoint)
+        algorithms = {**example_pipeline_algorithms, "initial_contact_detection": _ContextUnawareIC()}
+        result = MultimobilityPipeline(**algorithms).run(multi_gs_datapoint)
+
+        self._assert_same_results(reference, result)
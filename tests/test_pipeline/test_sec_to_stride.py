@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.pipeline.multimobility_pipeline import MultimobilityPipeline
+from multigait.pipeline.utils._operations import create_multi_groupby
+from multigait.pipeline.utils.ic_to_stride import (
+    strides_list_from_grouped_ic_list_no_lrc,
+    strides_list_from_ic_list_no_lrc,
+)
+from multigait.utils.interp import map_seconds_to_grouped_regions, map_seconds_to_regions
+
+SAMPLING_RATE_HZ = 100.0
+PARAS = ["cadence_spm", "stride_length_m", "walking_speed_mps"]
+
+
+def _reference_sec_to_stride(sec_level_paras, ic_list, sampling_rate_hz):
+    """Per-GS implementation, which was used before the vectorised version."""
+    stride_list = ic_list.groupby("gs_id", group_keys=False).apply(strides_list_from_ic_list_no_lrc)
+    stride_list = stride_list.assign(stride_duration_s=lambda df_: (df_.end - df_.start) / sampling_rate_hz)
+    return create_multi_groupby(stride_list, sec_level_paras, "gs_id", group_keys=False).apply(
+        map_seconds_to_regions, sampling_rate_hz=sampling_rate_hz
+    )
+
+
+def _random_gs_results(seed, gs_ids, nan_fraction=0.0):
+    rng = np.random.default_rng(seed)
+    ics, secs = {}, {}
+    for gs_id in gs_ids:
+        start = int(rng.integers(0, 10**6))
+        n_steps = int(rng.integers(1, 40))
+        gs_ics = start + np.cumsum(rng.integers(40, 80, n_steps))
+        # ICs are not necessarily sorted within a GS
+        ics[gs_id] = pd.DataFrame({"ic": rng.permutation(gs_ics)}).rename_axis("step_id")
+        n_secs = int(np.ceil((gs_ics[-1] - start) / SAMPLING_RATE_HZ)) + 1
+        values = rng.uniform(0.5, 2, (n_secs, len(PARAS)))
+        values[rng.random(values.shape) < nan_fraction] = np.nan
+        centers = start + np.arange(n_secs) * int(SAMPLING_RATE_HZ) + int(SAMPLING_RATE_HZ) // 2
+        secs[gs_id] = pd.DataFrame(values, columns=PARAS, index=pd.Index(centers, name="sec_center_samples"))
+    return pd.concat(secs, names=["gs_id"]), pd.concat(ics, names=["gs_id"])
+
+
+class TestVectorisedSecToStride:
+    @pytest.mark.parametrize("nan_fraction", [0.0, 0.05])
+    @pytest.mark.parametrize("gs_ids", [[3, 0, 12, 1, 7], ["1_2", "0_10", "0_2"]])
+    def test_matches_per_gs_implementation(self, gs_ids, nan_fraction):
+        sec_paras, ic_list = _random_gs_results(0, gs_ids, nan_fraction)
+        expected = _reference_sec_to_stride(sec_paras, ic_list, SAMPLING_RATE_HZ)
+        result = MultimobilityPipeline._sec_to_stride(None, sec_paras, ic_list, SAMPLING_RATE_HZ)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+    def test_strides_do_not_span_gs(self):
+        _, ic_list = _random_gs_results(1, [0, 1, 2])
+        strides = strides_list_from_grouped_ic_list_no_lrc(ic_list)
+        expected = ic_list.groupby("gs_id", group_keys=False).apply(strides_list_from_ic_list_no_lrc)
+
+        pd.testing.assert_frame_equal(strides, expected)
+        assert len(strides) == len(ic_list) - 3
+
+    def test_gs_without_seconds(self):
+        sec_paras, ic_list = _random_gs_results(2, [0, 1, 2])
+        sec_paras = sec_paras.drop(index=1, level="gs_id")
+        strides = strides_list_from_grouped_ic_list_no_lrc(ic_list)
+        result = map_seconds_to_grouped_regions(
+            strides, sec_paras, groupby="gs_id", sampling_rate_hz=SAMPLING_RATE_HZ
+        )
+
+        assert result.loc[1, PARAS].isna().all().all()
+        assert result.loc[[0, 2], PARAS].notna().all().all()
+        assert (result[PARAS].dtypes == "float64").all()
+
+    def test_empty(self):
+        sec_paras, ic_list = _random_gs_results(3, [0])
+        empty_ics = ic_list.iloc[:0]
+        result = MultimobilityPipeline._sec_to_stride(None, sec_paras, empty_ics, SAMPLING_RATE_HZ)
+        assert result.empty
+        assert list(result.columns) == ["start", "end", "stride_duration_s", *PARAS]
+        assert list(result.index.names) == ["gs_id", "s_id"]
+
+        strides = strides_list_from_grouped_ic_list_no_lrc(ic_list)
+        result = map_seconds_to_grouped_regions(
+            strides, sec_paras.iloc[:0], groupby="gs_id", sampling_rate_hz=SAMPLING_RATE_HZ
+        )
+        assert result[PARAS].isna().all().all()
+
+    def test_non_float_seconds(self):
+        sec_paras, ic_list = _random_gs_results(4, [0])
+        strides = strides_list_from_grouped_ic_list_no_lrc(ic_list)
+        with pytest.raises(ValueError, match="Non-float"):
+            map_seconds_to_grouped_regions(
+                strides, sec_paras.astype(int), groupby="gs_id", sampling_rate_hz=SAMPLING_RATE_HZ
+            )
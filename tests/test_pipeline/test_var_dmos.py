@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.pipeline.utils._var_dmos import DEFAULT_COLS, within_wb_stats, within_wb_var
+
+
+def _rmssd(series):
+    diff = series.dropna().diff().dropna()
+    return np.sqrt(np.mean(diff.to_numpy() ** 2)) if len(diff) else np.nan
+
+
+def _reference_var(final_strides, ddof):
+    """Per-WB pandas implementation of the variability DMOs."""
+    grouped = final_strides.groupby(level="wb_id")
+    count = grouped.count()
+    mean = grouped.mean()
+    cv = (grouped.std(ddof=ddof) / mean).replace([np.inf, -np.inf], np.nan).mask(count < 2)
+    rmssd = grouped.agg(_rmssd).mask(count < 2)
+    parts = {}
+    for c in final_strides.columns:
+        parts[f"{c}_cv"] = cv[c]
+        parts[f"{c}_rmssd"] = rmssd[c]
+    return pd.DataFrame(parts)
+
+
+def _random_strides(seed, shuffle_wbs=False):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, 8, 25)
+    wb_ids = np.repeat(rng.permutation(25) if shuffle_wbs else np.arange(25), lengths)
+    values = rng.normal(1, 0.3, (len(wb_ids), len(DEFAULT_COLS)))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:, 2] = np.where(wb_ids % 5 == 0, 0.0, values[:, 2])
+    index = pd.MultiIndex.from_arrays([wb_ids, np.arange(len(wb_ids))], names=["wb_id", "s_id"])
+    return pd.DataFrame(values, columns=DEFAULT_COLS, index=index)
+
+
+class TestWithinWbVar:
+    @pytest.mark.parametrize("ddof", [0, 1])
+    @pytest.mark.parametrize("shuffle_wbs", [False, True])
+    def test_matches_per_wb_implementation(self, ddof, shuffle_wbs):
+        strides = _random_strides(0, shuffle_wbs)
+        pd.testing.assert_frame_equal(within_wb_var(strides, ddof=ddof), _reference_var(strides, ddof), rtol=1e-12)
+
+    def test_wb_id_column(self):
+        strides = _random_strides(1)
+        pd.testing.assert_frame_equal(within_wb_var(strides.reset_index("wb_id")), within_wb_var(strides))
+
+    def test_nan_semantics(self):
+        strides = pd.DataFrame(
+            {"cadence_spm": [100.0, np.nan, 110.0, 120.0, np.nan, 90.0, np.nan, np.nan]},
+            index=pd.MultiIndex.from_arrays([[0, 0, 0, 1, 1, 2, 3, 3], range(8)], names=["wb_id", "s_id"]),
+        )
+        result = within_wb_var(strides)
+        # The NaN in WB 0 is skipped for the successive difference
+        assert result.loc[0, "cadence_spm_rmssd"] == pytest.approx(10.0)
+        # Fewer than 2 valid strides -> NaN, differences never cross WB boundaries
+        assert result.loc[[1, 2, 3]].isna().all().all()
+
+    def test_stats(self):
+        strides = _random_strides(2)
+        stats = within_wb_stats(strides, [*DEFAULT_COLS, "missing"])
+        grouped = strides.reindex(columns=[*DEFAULT_COLS, "missing"]).groupby(level="wb_id")
+
+        pd.testing.assert_frame_equal(stats.count, grouped.count())
+        pd.testing.assert_frame_equal(stats.mean, grouped.mean(), rtol=1e-12)
+        assert stats.cv["missing"].isna().all()
+
+    def test_empty(self):
+        strides = _random_strides(3).iloc[:0]
+        assert within_wb_var(strides).empty
+        assert within_wb_stats(strides, DEFAULT_COLS).mean.empty
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multigait.pipeline.utils._wb_assembly import WbAssembly
+from multigait.pipeline.utils._wb_criteria import BreakCriteria, LeftRightCriteria, StridesCriteria
+from multigait.pipeline.wba_base import EndOfStrideList
+
+
+class _GenericBreak(BreakCriteria):
+    pass
+
+
+class _GenericLeftRight(LeftRightCriteria):
+    pass
+
+
+class _GenericStrides(StridesCriteria):
+    pass
+
+
+_GENERIC = {BreakCriteria: _GenericBreak, LeftRightCriteria: _GenericLeftRight, StridesCriteria: _GenericStrides}
+
+RULE_SETS = [
+    None,
+    [("min_strides", StridesCriteria(min_strides=4)), ("max_break", BreakCriteria(max_break_s=3))],
+    [
+        ("max_break", BreakCriteria(max_break_s=1.5, remove_last_ic=True)),
+        ("min_strides", StridesCriteria(min_strides=2)),
+    ],
+    [("max_break", BreakCriteria(max_break_s=1, remove_last_ic="per_foot")), ("left_right", LeftRightCriteria())],
+    [("left_right", LeftRightCriteria()), ("max_break", BreakCriteria(max_break_s=2, consider_end_as_break=False))],
+    [("min_contacts", StridesCriteria(min_contacts=7)), ("max_break", BreakCriteria(max_break_s=0.5))],
+]
+
+
+def _as_generic(rules):
+    """Same rules as subclasses, which forces the stride by stride evaluation."""
+    if rules is None:
+        return None
+    return [(name, _GENERIC[type(rule)](**rule.__dict__)) for name, rule in rules]
+
+
+def _random_stride_list(seed, n):
+    rng = np.random.default_rng(seed)
+    gaps = np.where(rng.random(n) < 0.15, rng.integers(50, 500, n), rng.integers(0, 5, n))
+    durations = rng.integers(80, 130, n)
+    starts = np.cumsum(gaps + np.concatenate(([0], durations[:-1])))
+    stride_list = pd.DataFrame(
+        {
+            "start": starts,
+            "end": starts + durations,
+            "foot": rng.choice(np.array(["left", "right", None], dtype=object), n, p=[0.45, 0.45, 0.1]),
+            "contacts": rng.integers(1, 4, n).astype(float),
+        },
+        index=pd.Index([f"0_{i}" for i in range(n)], name="s_id"),
+    )
+    raw_ics = pd.DataFrame({"ic": np.sort(rng.integers(0, starts[-1] + 200, 3 * n))})
+    return stride_list.sample(frac=1, random_state=seed), raw_ics
+
+
+def _assert_same_reasons(fast, generic):
+    pd.testing.assert_series_equal(fast["rule_name"], generic["rule_name"])
+    # The generic run uses the subclasses of the rules
+    generic_types = [
+        type(rule).__mro__[1] if type(rule) in _GENERIC.values() else type(rule) for rule in generic["rule_obj"]
+    ]
+    assert [type(rule) for rule in fast["rule_obj"]] == generic_types
+
+
+class TestFastPath:
+    def test_fast_path_selection(self):
+        assert WbAssembly()._supports_fast_path()
+        assert WbAssembly(rules=None)._supports_fast_path()
+        assert not WbAssembly(rules=[("max_break", _GenericBreak(max_break_s=3))])._supports_fast_path()
+
+    @pytest.mark.parametrize("rules", RULE_SETS)
+    @pytest.mark.parametrize("seed", range(8))
+    def test_same_as_generic(self, rules, seed):
+        stride_list, raw_ics = _random_stride_list(seed, 60)
+        fast = WbAssembly(rules=rules).assemble(stride_list, raw_initial_contacts=raw_ics, sampling_rate_hz=100.0)
+        generic = WbAssembly(rules=_as_generic(rules)).assemble(
+            stride_list, raw_initial_contacts=raw_ics, sampling_rate_hz=100.0
+        )
+
+        pd.testing.assert_frame_equal(fast.annotated_stride_list_, generic.annotated_stride_list_)
+        pd.testing.assert_frame_equal(fast.excluded_stride_list_, generic.excluded_stride_list_)
+        pd.testing.assert_frame_equal(
+            fast.wb_meta_parameters_.drop(columns="rule_obj"), generic.wb_meta_parameters_.drop(columns="rule_obj")
+        )
+        for attr in ["termination_reasons_", "exclusion_reasons_", "stride_exclusion_reasons_"]:
+            _assert_same_reasons(getattr(fast, attr), getattr(generic, attr))
+
+    def test_empty(self):
+        stride_list, _ = _random_stride_list(0, 5)
+        wba = WbAssembly().assemble(stride_list.iloc[:0], sampling_rate_hz=100.0)
+        assert wba.annotated_stride_list_.empty
+        assert wba.wb_meta_parameters_.empty
+
+
+class TestRules:
+    def test_break_splits_wbs(self):
+        stride_list = pd.DataFrame(
+            {"start": [0, 100, 200, 300, 1000, 1100, 1200, 1300], "end": [100, 200, 300, 400, 1100, 1200, 1300, 1400]}
+        ).rename_axis("s_id")
+        wba = WbAssembly().assemble(stride_list, sampling_rate_hz=100.0)
+
+        assert wba.wb_meta_parameters_[["start", "end", "n_strides"]].to_numpy().tolist() == [
+            [0, 400, 4],
+            [1000, 1400, 4],
+        ]
+        assert wba.termination_reasons_["rule_name"].tolist() == ["max_break", "max_break"]
+
+    def test_left_right_starts_new_wb(self):
+        stride_list = pd.DataFrame(
+            {
+                "start": np.arange(7) * 100,
+                "end": np.arange(1, 8) * 100,
+                "foot": ["left", "right", "left", "left", "right", "left", "right"],
+            }
+        ).rename_axis("s_id")
+        wba = WbAssembly(rules=[("left_right", LeftRightCriteria())]).assemble(stride_list, sampling_rate_hz=100.0)
+
+        assert wba.annotated_stride_list_.index.get_level_values("wb_id").tolist() == [0, 0, 0, 1, 1, 1, 1]
+        assert wba.termination_reasons_["rule_name"].tolist() == ["left_right", "end_of_list"]
+        assert isinstance(wba.termination_reasons_["rule_obj"].iloc[-1], EndOfStrideList)
+
+    def test_wb_removed_by_termination(self):
+        stride_list = pd.DataFrame({"start": [0, 1000, 1100, 1200], "end": [100, 1100, 1200, 1300]}).rename_axis("s_id")
+        rules = [("max_break", BreakCriteria(max_break_s=3, remove_last_ic=True))]
+        wba = WbAssembly(rules=rules).assemble(stride_list, sampling_rate_hz=100.0)
+
+        assert wba.exclusion_reasons_["rule_name"].tolist() == ["max_break"]
+        assert wba.annotated_stride_list_.index.get_level_values("s_id").tolist() == [1, 2]
@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_equal
+
+from multigait.GSD.utils.cwb import cwb
+from multigait.GSD.utils.GSD1_utils import find_intersections
+from multigait.GSD.utils.merge_bouts import merge_bouts
+from multigait.utils.array import (
+    RunLengthMask,
+    bool_array_to_start_end,
+    filter_intervals_by_length,
+    intersect_intervals,
+    merge_interval,
+    start_end_array_to_bool,
+    subtract_intervals,
+    union_intervals,
+)
+
+
+def _random_intervals(rng, n, length=2000, max_duration=60):
+    starts = rng.integers(0, length - max_duration, n)
+    return np.column_stack([starts, starts + rng.integers(1, max_duration, n)])
+
+
+def _random_bouts(rng, n):
+    """Sorted, non-overlapping bouts as produced by thresholding a signal."""
+    edges = np.cumsum(rng.integers(1, 50, 2 * n))
+    return edges.reshape(-1, 2)
+
+
+def _covered(intervals, length=2100):
+    return start_end_array_to_bool(np.asarray(intervals, dtype=int), pad_to_length=length)
+
+
+def _reference_merge_bouts(wb_starts, wb_ends, non_wb_starts, non_wb_ends):
+    """The original quadratic implementation of merge_bouts."""
+    merged_starts, merged_ends = [], []
+    for i in range(len(wb_starts)):
+        start, end = wb_starts[i], wb_ends[i]
+        if i < len(wb_starts) - 1 and wb_ends[i] in non_wb_starts and wb_starts[i + 1] in non_wb_ends:
+            end = wb_ends[i + 1]
+        merged_starts.append(start)
+        merged_ends.append(end)
+        j = 0
+        while j < len(merged_starts) - 1:
+            if merged_ends[j] > merged_starts[j + 1]:
+                merged_ends[j] = merged_ends[j + 1]
+                del merged_starts[j + 1]
+                del merged_ends[j + 1]
+            else:
+                j += 1
+    return np.array(merged_starts), np.array(merged_ends)
+
+
+def _reference_cwb(df, max_break):
+    """The original row by row implementation of cwb."""
+    df = df.sort_values("start")
+    merged = []
+    current_start, current_end = df.iloc[0]["start"], df.iloc[0]["end"]
+    for i in range(1, len(df)):
+        if df.iloc[i]["start"] - current_end <= max_break:
+            current_end = max(current_end, df.iloc[i]["end"])
+        else:
+            merged.append({"start": current_start, "end": current_end})
+            current_start, current_end = df.iloc[i]["start"], df.iloc[i]["end"]
+    merged.append({"start": current_start, "end": current_end})
+    return pd.DataFrame(merged)
+
+
+class TestIntervalAlgebra:
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("gap_size", [0, 3, 25.5])
+    def test_merge_interval(self, seed, gap_size):
+        intervals = _random_intervals(np.random.default_rng(seed), 200)
+        merged = merge_interval(intervals, gap_size)
+
+        # Reference: the contiguous regions covered by the intervals, merged one by one
+        expected = [list(bool_array_to_start_end(_covered(intervals))[0])]
+        for start, end in bool_array_to_start_end(_covered(intervals))[1:]:
+            if start - expected[-1][1] <= gap_size:
+                expected[-1][1] = end
+            else:
+                expected.append([start, end])
+
+        assert merged.dtype == intervals.dtype
+        assert_array_equal(merged, expected)
+
+    def test_merge_interval_examples(self):
+        arr = np.array([[1, 3], [2, 4], [6, 8], [5, 7], [10, 12], [11, 15], [18, 20]])
+        assert_array_equal(merge_interval(arr), [[1, 4], [5, 8], [10, 15], [18, 20]])
+        assert_array_equal(merge_interval(arr, 2), [[1, 15], [18, 20]])
+        # Contained intervals
+        assert_array_equal(merge_interval(np.array([[0, 10], [2, 3], [12, 13]])), [[0, 10], [12, 13]])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_intersect_union_subtract(self, seed):
+        rng = np.random.default_rng(seed)
+        a = _random_intervals(rng, 100)
+        b = _random_intervals(rng, 80)
+
+        assert_array_equal(_covered(intersect_intervals(a, b)), _covered(a) & _covered(b))
+        assert_array_equal(_covered(union_intervals(a, b)), _covered(a) | _covered(b))
+        assert_array_equal(_covered(subtract_intervals(a, b)), _covered(a) & ~_covered(b))
+        # Results are equal to the contiguous regions of the respective masks
+        assert_array_equal(intersect_intervals(a, b), bool_array_to_start_end(_covered(a) & _covered(b)))
+        assert_array_equal(subtract_intervals(a, b), bool_array_to_start_end(_covered(a) & ~_covered(b)))
+
+    def test_touching_intervals_do_not_intersect(self):
+        assert intersect_intervals(np.array([[0, 5]]), np.array([[5, 10]])).shape == (0, 2)
+        assert_array_equal(subtract_intervals(np.array([[0, 10]]), np.array([[5, 5]])), [[0, 10]])
+
+    @pytest.mark.parametrize("empty", [np.empty((0, 2), dtype=int), np.array([])])
+    def test_empty_inputs(self, empty):
+        a = np.array([[0, 5], [8, 10]])
+        assert intersect_intervals(a, empty).shape == (0, 2)
+        assert intersect_intervals(empty, a).shape == (0, 2)
+        assert_array_equal(union_intervals(a, empty), a)
+        assert_array_equal(subtract_intervals(a, empty), a)
+        assert subtract_intervals(empty, a).shape == (0, 2)
+        assert filter_intervals_by_length(empty, 1).shape == (0, 2)
+
+    def test_filter_intervals_by_length(self):
+        intervals = np.array([[10, 12], [0, 5], [20, 23]])
+        assert_array_equal(filter_intervals_by_length(intervals, 2), [[0, 5], [20, 23]])
+        assert_array_equal(filter_intervals_by_length(intervals, 3), [[0, 5]])
+
+
+class TestRunLengthMask:
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("edges", [(False, False), (True, True), (True, False), (False, True)])
+    def test_round_trip(self, seed, edges):
+        mask = np.random.default_rng(seed).random(500) > 0.6
+        mask[0], mask[-1] = edges
+        rle = RunLengthMask.from_bool(mask)
+
+        assert_array_equal(rle.to_dense(), mask)
+        assert_array_equal(rle.to_dense(float), mask.astype(float))
+        assert rle.run_lengths.sum() == mask.sum()
+        # The runs are the contiguous regions of the mask
+        slices = np.ma.flatnotmasked_contiguous(np.ma.masked_equal(mask, 0))
+        assert_array_equal(rle.intervals, [[s.start, s.stop] for s in slices])
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 2**20])
+    def test_from_threshold(self, block_size):
+        values = np.random.default_rng(0).normal(size=1000)
+        rle = RunLengthMask.from_threshold(values, 0.3, block_size=block_size)
+
+        assert rle.length == len(values)
+        assert_array_equal(rle.intervals, RunLengthMask.from_bool(values > 0.3).intervals)
+
+    def test_from_intervals(self):
+        rle = RunLengthMask.from_intervals(np.array([[5, 8], [-2, 2], [2, 3], [9, 9], [11, 20]]), 12)
+        assert_array_equal(rle.intervals, [[0, 3], [5, 8], [11, 12]])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_operations_equal_to_dense(self, seed):
+        rng = np.random.default_rng(seed)
+        a, b = rng.random(400) > 0.5, rng.random(400) > 0.3
+        rle_a, rle_b = RunLengthMask.from_bool(a), RunLengthMask.from_bool(b)
+        values = rng.normal(size=400)
+
+        assert_array_equal((~rle_a).to_dense(), ~a)
+        assert_array_equal((rle_a & rle_b).to_dense(), a & b)
+        assert_array_equal((rle_a | rle_b).to_dense(), a | b)
+        assert_array_equal(rle_a.take(values), values[a])
+        filtered = rle_a.filter_by_length(2)
+        assert_array_equal(filtered.to_dense(), start_end_array_to_bool(filter_intervals_by_length(rle_a.intervals, 2), 400))
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_count_true(self, seed):
+        rng = np.random.default_rng(seed)
+        mask = rng.random(300) > rng.random()
+        # Intervals may extend beyond the mask, as slices do
+        intervals = np.sort(rng.integers(-5, 310, (100, 2)), axis=1)
+
+        expected = [mask[max(start, 0):max(end, 0)].sum() for start, end in intervals]
+        assert_array_equal(RunLengthMask.from_bool(mask).count_true(intervals), expected)
+        assert_array_equal(RunLengthMask.from_bool(np.zeros(300, dtype=bool)).count_true(intervals), 0)
+
+    def test_empty(self):
+        rle = RunLengthMask.from_bool(np.zeros(10, dtype=bool))
+        assert rle.n_runs == 0
+        assert_array_equal((~rle).intervals, [[0, 10]])
+        assert rle.take(np.arange(10)).size == 0
+        assert RunLengthMask.from_bool(np.array([], dtype=bool)).to_dense().size == 0
+        assert RunLengthMask.from_threshold(np.array([]), 0).n_runs == 0
+
+    def test_equality(self):
+        mask = np.array([0, 1, 1, 0, 0, 1], dtype=bool)
+        rle = RunLengthMask.from_bool(mask)
+
+        assert rle == RunLengthMask.from_bool(mask.copy())
+        assert rle == RunLengthMask.from_intervals(np.array([[1, 3], [5, 6]]), 6)
+        assert rle != RunLengthMask.from_bool(~mask)
+        # The same runs in a longer mask
+        assert rle != RunLengthMask.from_bool(np.append(mask, False))
+        assert rle != "mask"
+        with pytest.raises(TypeError):
+            hash(rle)
+
+
+class TestIntervalHelpersOfGsds:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_merge_bouts_equal_to_reference(self, seed):
+        rng = np.random.default_rng(seed)
+        bouts = _random_bouts(rng, 300)
+        gaps = np.column_stack([bouts[:-1, 1], bouts[1:, 0]])
+        invalid_gaps = gaps[rng.random(len(gaps)) < 0.4]
+
+        args = (bouts[:, 0], bouts[:, 1], invalid_gaps[:, 0], invalid_gaps[:, 1])
+        for result, expected in zip(merge_bouts(*args), _reference_merge_bouts(*args)):
+            assert_array_equal(result, expected)
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("dtype", [int, float])
+    def test_cwb_equal_to_reference(self, seed, dtype):
+        rng = np.random.default_rng(seed)
+        gs = pd.DataFrame(_random_intervals(rng, 150, length=20000, max_duration=500), columns=["start", "end"])
+        gs = gs.astype(dtype).rename_axis("gs_id")
+
+        result = cwb(gs, max_break_seconds=3, sampling_rate=100)
+
+        pd.testing.assert_frame_equal(result, _reference_cwb(gs, 300).rename_axis("gs_id"))
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_find_intersections_equal_to_interval_tree(self, seed):
+        intervaltree = pytest.importorskip("intervaltree")
+        rng = np.random.default_rng(seed)
+        a = _random_bouts(rng, 100).astype(np.int32)
+        b = _random_bouts(rng, 100).astype(np.int32)
+
+        tree_a = intervaltree.IntervalTree.from_tuples(a)
+        overlaps = [
+            [max(iv.begin, ov.begin), min(iv.end, ov.end)]
+            for iv in intervaltree.IntervalTree.from_tuples(b)
+            for ov in tree_a.overlap(iv.begin, iv.end)
+        ]
+        expected = merge_interval(np.array(overlaps))
+
+        result = find_intersections(a, b)
+        assert result.dtype == np.int32
+        assert_array_equal(result, expected)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mobgap.data_transform import ButterworthFilter, Resample, chain_transformers
+from numpy.testing import assert_array_equal
+
+from multigait.GSD.utils.gravity_remove_butter import gravity_motion_butterworth
+from multigait.utils.data_loader import load_imu_data_wrist
+from multigait.utils.signal_context import GsSignalContext
+
+COLS = ["acc_is", "acc_ml", "acc_pa"]
+
+
+@pytest.fixture
+def data():
+    return load_imu_data_wrist()
+
+
+class TestGsSignalContext:
+    def test_acc_norm(self, data):
+        context = GsSignalContext(data)
+        norm = context.acc_norm()
+
+        assert_array_equal(norm, np.linalg.norm(data[COLS].values, axis=1))
+        assert context.acc_norm() is norm
+        assert context.n_computations == 1
+
+    def test_results_are_read_only(self, data):
+        norm = GsSignalContext(data).acc_norm()
+        with pytest.raises(ValueError):
+            norm[0] = 0
+
+    def test_gravity_removed(self, data):
+        context = GsSignalContext(data)
+
+        pd.testing.assert_frame_equal(context.gravity_removed(100), gravity_motion_butterworth(data[COLS], 100))
+        assert_array_equal(
+            context.gravity_removed_norm(100), np.linalg.norm(gravity_motion_butterworth(data[COLS], 100), axis=1)
+        )
+        context.gravity_removed_norm(100)
+        assert context.n_computations == 2
+        # A different sampling rate is a different signal
+        context.gravity_removed(50)
+        assert context.n_computations == 3
+
+    @pytest.mark.parametrize("name", ["acc_norm", "acc_is"])
+    def test_resampled(self, data, name):
+        context = GsSignalContext(data)
+        source = np.linalg.norm(data[COLS].values, axis=1) if name == "acc_norm" else data[name].to_numpy()
+        expected = chain_transformers(source, [("resample", Resample(50))], sampling_rate_hz=100)
+
+        assert_array_equal(context.resampled(name, sampling_rate_hz=100, target_sampling_rate_hz=50), expected)
+        n_computations = context.n_computations
+        context.resampled(name, sampling_rate_hz=100, target_sampling_rate_hz=50)
+        assert context.n_computations == n_computations
+        context.resampled(name, sampling_rate_hz=100, target_sampling_rate_hz=40)
+        assert context.n_computations == n_computations + 1
+
+    def test_filtered_keyed_by_filter_parameters(self, data):
+        context = GsSignalContext(data)
+        chain = [("butter", ButterworthFilter(order=4, cutoff_freq_hz=2, filter_type="lowpass"))]
+        expected = chain_transformers(np.linalg.norm(data[COLS].values, axis=1), chain, sampling_rate_hz=100)
+
+        filtered = context.filtered("acc_norm", chain, 100)
+        assert_array_equal(filtered, expected)
+        # An equivalent filter instance with a different name in the chain reuses the result
+        same_chain = [("other", ButterworthFilter(order=4, cutoff_freq_hz=2, filter_type="lowpass"))]
+        assert context.filtered("acc_norm", same_chain, 100) is filtered
+        different_chain = [("butter", ButterworthFilter(order=2, cutoff_freq_hz=2, filter_type="lowpass"))]
+        assert context.filtered("acc_norm", different_chain, 100) is not filtered
+
+    def test_unknown_signal(self, data):
+        with pytest.raises(ValueError):
+            GsSignalContext(data).signal("unknown")
+        with pytest.raises(ValueError):
+            GsSignalContext(data).signal("gravity_removed_norm")
+
+    def test_for_data(self, data):
+        context = GsSignalContext(data)
+
+        assert GsSignalContext.for_data(context, data) is context
+        other = GsSignalContext.for_data(context, data.copy())
+        assert other is not context
+        assert GsSignalContext.for_data(None, data).data is data